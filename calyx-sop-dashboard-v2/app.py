@@ -92,6 +92,16 @@ except ImportError as e:
     REV_OPS_MODULE_LOADED = False
     REV_OPS_IMPORT_ERROR = str(e)
 
+# =============================================================================
+# CACHE MODULE IMPORT
+# =============================================================================
+try:
+    from src.memory_cache import clear_all_caches, render_cache_stats
+    from src.cache_warmer import get_cache_warmer, render_warmup_admin
+    CACHE_MODULE_LOADED = True
+except ImportError:
+    CACHE_MODULE_LOADED = False
+
 # Configure logging
 try:
     setup_logging()
@@ -456,6 +466,8 @@ def render_sidebar():
         section_label("Operations", "#10b981")
         nav_button("🛡️  Quality Management", "🛡️ Quality Management")
         nav_button("🎮  Rev Ops Playground", "🎮 Revenue Operations Playground")
+        if CACHE_MODULE_LOADED:
+            nav_button("🧰  Cache Admin", "🧰 Cache Admin")
 
         # Spacer
         st.markdown('<div style="height: 20px;"></div>', unsafe_allow_html=True)
@@ -481,9 +493,20 @@ def render_sidebar():
 
         # Refresh
         if st.button("↻  Refresh Data", use_container_width=True, key="refresh_btn"):
-            st.cache_data.clear()
+            if CACHE_MODULE_LOADED:
+                clear_all_caches()
+                warmer = get_cache_warmer()
+                if warmer is not None:
+                    warmer.trigger()
+            else:
+                st.cache_data.clear()
             st.rerun()
 
+        # Cache memory / hit rate
+        if CACHE_MODULE_LOADED:
+            with st.expander("Cache", expanded=False):
+                render_cache_stats()
+
         # Footer
         st.markdown("""
         <div style="
@@ -801,12 +824,32 @@ def render_rev_ops_playground_section():
         """)
 
 
+# =============================================================================
+# CACHE ADMIN SECTION
+# =============================================================================
+def render_cache_admin_section():
+    """Cache warm-up progress and cache usage."""
+    st.markdown("## 🧰 Cache Admin")
+    st.markdown("Background warm-up of section data and what the caches hold")
+
+    st.markdown("### Warm-up")
+    render_warmup_admin()
+
+    st.markdown("### Caches")
+    render_cache_stats()
+
+
 # =============================================================================
 # MAIN APPLICATION
 # =============================================================================
 def main():
     """Main application entry point."""
     inject_custom_css()
+
+    # Start background cache warm-up (once per server process)
+    if CACHE_MODULE_LOADED:
+        get_cache_warmer()
+
     section = render_sidebar()
 
     # Detect section change — force a clean rerun when switching sections
@@ -850,6 +893,8 @@ def main():
             render_2026_yearly_planning_section()
         elif section == "🎮 Revenue Operations Playground":
             render_rev_ops_playground_section()
+        elif section == "🧰 Cache Admin" and CACHE_MODULE_LOADED:
+            render_cache_admin_section()
 
 
 if __name__ == "__main__":
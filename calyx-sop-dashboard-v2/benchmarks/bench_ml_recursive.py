@@ -0,0 +1,110 @@
+"""
+Recursive ML Forecast Benchmark
+Rebuilt features vs RecursiveFeatureState in forecast_ml's horizon loop
+
+For each history length, times the feature step of the recursive loop on
+its own (create_ml_features over the whole extended series + pd.concat,
+vs one ring-buffer update and row read per step), then whole forecast_ml
+calls in both feature modes, and checks the forecasts are the same.
+
+Usage:
+    python benchmarks/bench_ml_recursive.py [--lengths 36,120,600] [--horizon 24]
+        [--model random_forest] [--repeat 3]
+
+Author: Xander @ Calyx Containers
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.forecasting_models import RecursiveFeatureState, create_ml_features, forecast_ml
+
+LAGS = [1, 2, 3, 6, 12]
+WINDOWS = [3, 6, 12]
+
+
+def make_series(length: int, seed: int = 0) -> pd.Series:
+    """Trending, seasonal monthly demand"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    values = np.maximum(0, 100 + 0.5 * t + 20 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 5, length))
+    return pd.Series(values, index=pd.date_range('2000-01-01', periods=length, freq='MS'))
+
+
+def rebuild_steps(series: pd.Series, feature_cols, horizon: int) -> np.ndarray:
+    """The feature step as forecast_ml did it (both loops 'predict' last year's value)"""
+    rows = []
+    current = series.copy()
+    for _ in range(horizon):
+        rows.append(create_ml_features(current, LAGS, WINDOWS)[feature_cols].iloc[-1:].values)
+        current = pd.concat([current, pd.Series([current.iloc[-12]],
+                                                index=[current.index[-1] + pd.DateOffset(months=1)])])
+    return np.vstack(rows)
+
+
+def incremental_steps(series: pd.Series, feature_cols, horizon: int) -> np.ndarray:
+    rows = []
+    state = RecursiveFeatureState(series, LAGS, WINDOWS)
+    for _ in range(horizon):
+        rows.append(state.features(feature_cols))
+        state.append(state.buffer[(state.end - 11) % state.capacity], state.last_date + pd.DateOffset(months=1))
+    return np.vstack(rows)
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest wall time over `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lengths', default='36,120,600')
+    parser.add_argument('--horizon', type=int, default=24)
+    parser.add_argument('--model', default='random_forest', choices=['random_forest', 'gradient_boosting'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"horizon: {args.horizon}, model: {args.model}")
+    for length in [int(n) for n in args.lengths.split(',')]:
+        series = make_series(length)
+        feature_cols = [c for c in create_ml_features(series, LAGS, WINDOWS).columns if c != 'value']
+
+        rebuilt = best_of(lambda: rebuild_steps(series, feature_cols, args.horizon), args.repeat)
+        incremental = best_of(lambda: incremental_steps(series, feature_cols, args.horizon), args.repeat)
+        feature_diff = np.nanmax(np.abs(rebuild_steps(series, feature_cols, args.horizon)
+                                        - incremental_steps(series, feature_cols, args.horizon)))
+
+        results = {}
+        timings = {}
+        for mode in ('rebuild', 'incremental'):
+            timings[mode] = best_of(
+                lambda: results.__setitem__(mode, forecast_ml(series, horizon=args.horizon,
+                                                              model_type=args.model, feature_mode=mode)),
+                args.repeat
+            )
+        same = np.array_equal(results['rebuild'].forecast.values, results['incremental'].forecast.values)
+
+        print(f"\nhistory: {length} months")
+        print(f"  feature steps, rebuild:     {rebuilt * 1000:8.1f} ms")
+        print(f"  feature steps, incremental: {incremental * 1000:8.1f} ms")
+        print(f"  speedup:                    {rebuilt / incremental:8.1f}x")
+        print(f"  largest feature difference: {feature_diff:8.1e}")
+        print(f"  forecast_ml, rebuild:       {timings['rebuild'] * 1000:8.1f} ms")
+        print(f"  forecast_ml, incremental:   {timings['incremental'] * 1000:8.1f} ms")
+        print(f"  identical forecasts:        {'yes' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Numeric Cleaning Benchmark
+Per-cell clean_numeric (.apply) vs the vectorized sheet_schemas.coerce_numeric
+
+Builds a synthetic invoice Amount column with the formats the NetSuite
+export actually produces ($, thousands separators, accounting negatives,
+blanks, #N/A / #REF!) and times both approaches on it.
+
+Usage:
+    python benchmarks/bench_numeric_cleaning.py [--rows 100000] [--repeat 5]
+
+Author: Xander @ Calyx Containers
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.sheet_schemas import coerce_numeric
+
+
+def legacy_clean_numeric(value):
+    """The per-cell helper previously copied into each revenue module"""
+    if pd.isna(value) or str(value).strip() == '':
+        return 0
+    cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
+    try:
+        return float(cleaned)
+    except (ValueError, TypeError):
+        return 0
+
+
+def make_amount_column(rows: int, mixed: bool = True, seed: int = 42) -> pd.Series:
+    """Invoice Amount strings; mixed=False gives plain "1234.50" values only"""
+    rng = np.random.default_rng(seed)
+    amounts = rng.gamma(2.0, 1500.0, rows).round(2)
+    if not mixed:
+        return pd.Series([f"{a:.2f}" for a in amounts], name='Amount')
+    kind = rng.choice(6, size=rows, p=[0.45, 0.3, 0.15, 0.04, 0.03, 0.03])
+
+    values = np.empty(rows, dtype=object)
+    values[kind == 0] = [f"{a:.2f}" for a in amounts[kind == 0]]
+    values[kind == 1] = [f"${a:,.2f}" for a in amounts[kind == 1]]
+    values[kind == 2] = [f"{a:,.2f}" for a in amounts[kind == 2]]
+    values[kind == 3] = [f"(${a:,.2f})" for a in amounts[kind == 3]]
+    values[kind == 4] = ''
+    values[kind == 5] = rng.choice(['#N/A', '#REF!'], size=(kind == 5).sum())
+    return pd.Series(values, name='Amount')
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest wall time over `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"rows: {args.rows:,}")
+    for label, mixed in (('mixed formats', True), ('plain decimals', False)):
+        column = make_amount_column(args.rows, mixed=mixed)
+
+        legacy = best_of(lambda: column.apply(legacy_clean_numeric), args.repeat)
+        vectorized = best_of(lambda: coerce_numeric(column, fill_value=0), args.repeat)
+
+        # Same values except accounting negatives, which the old helper zeroed
+        plain = ~column.str.startswith('(')
+        assert np.allclose(column[plain].apply(legacy_clean_numeric),
+                           coerce_numeric(column[plain], fill_value=0))
+
+        print(f"\n{label}")
+        print(f"  apply:       {legacy * 1000:8.1f} ms")
+        print(f"  vectorized:  {vectorized * 1000:8.1f} ms")
+        print(f"  speedup:     {legacy / vectorized:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
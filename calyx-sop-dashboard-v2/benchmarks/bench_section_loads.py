@@ -0,0 +1,127 @@
+"""
+Section Load Benchmark
+End-to-end data loads of the dashboard sections against recorded Sheets
+
+Runs each section's loader (Q2 Snapshot, QBR, Rev Ops annual tracker,
+S&OP) on the sheets_replay stand-in, so results are reproducible on a
+laptop or CI box with no network or credentials. Record a cassette first
+by running the app once with CALYX_SHEETS_RECORD=<dir>, or write a
+synthetic one at any volume with
+`python -m src.synthetic_data --scale 10 --out <dir>`.
+
+Each repeat is a cold load (in-process caches and sheet registry cleared)
+followed by a warm load of the same section.
+
+Usage:
+    python benchmarks/bench_section_loads.py --cassettes DIR
+        [--latency-ms 120] [--row-latency-us 1.5] [--scale 1] [--repeat 3]
+        [--sections q2,qbr,revops,sop] [--snapshots] [--verbose]
+
+Author: Xander @ Calyx Containers
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Section key -> (label, module, loader)
+SECTIONS = {
+    'q2': ('Q2 Revenue Snapshot', 'src.q2_revenue_snapshot', 'load_all_data'),
+    'qbr': ('QBR', 'src.yearly_planning_2026', 'load_qbr_data'),
+    'revops': ('Rev Ops tracker', 'src.Rev_Ops_Playground', 'load_annual_tracker_data'),
+    'sop': ('S&OP', 'src.sop_data_loader', 'load_all_sop_data'),
+}
+
+
+def configure(args) -> str:
+    """Point every Google client at the cassettes; returns the spreadsheet id."""
+    os.environ['CALYX_SHEETS_REPLAY'] = args.cassettes
+    os.environ['CALYX_REPLAY_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['CALYX_REPLAY_ROW_LATENCY_US'] = str(args.row_latency_us)
+    os.environ['CALYX_REPLAY_SCALE'] = str(args.scale)
+    if args.snapshots:
+        os.environ.setdefault('CALYX_SNAPSHOT_DIR', tempfile.mkdtemp(prefix='calyx-snapshots-'))
+    else:
+        os.environ['CALYX_SNAPSHOTS'] = '0'
+
+    from src.sheets_replay import get_replay_session
+    ids = get_replay_session().spreadsheet_ids()
+    spreadsheet_id = args.spreadsheet_id or (ids[0] if len(ids) == 1 else None)
+    if spreadsheet_id is None:
+        sys.exit(f"Pass --spreadsheet-id (cassettes found: {', '.join(ids) or 'none'})")
+
+    # Loaders read the spreadsheet id from secrets
+    secrets = os.path.join(tempfile.mkdtemp(prefix='calyx-secrets-'), 'secrets.toml')
+    with open(secrets, 'w') as f:
+        f.write(f'SPREADSHEET_ID = "{spreadsheet_id}"\n')
+    import streamlit.config
+    streamlit.config.set_option('secrets.files', [secrets])
+    return spreadsheet_id
+
+
+def reset_caches() -> None:
+    """Forget everything a fresh process wouldn't have."""
+    from src import data_cache
+    from src.memory_cache import clear_all_caches
+    from src.sheet_registry import get_sheet_registry
+    from src.snapshot_store import get_snapshot_store
+
+    clear_all_caches()
+    get_sheet_registry().clear()
+    with data_cache._probe_lock:
+        data_cache._probe_results.clear()
+    store = get_snapshot_store()
+    if store is not None:
+        store._warmed.clear()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cassettes', required=True, help='Directory of recorded cassettes')
+    parser.add_argument('--spreadsheet-id', default=None)
+    parser.add_argument('--latency-ms', type=float, default=120.0)
+    parser.add_argument('--row-latency-us', type=float, default=1.5)
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sections', default=','.join(SECTIONS))
+    parser.add_argument('--snapshots', action='store_true', help='Keep the on-disk snapshot store on')
+    parser.add_argument('--verbose', action='store_true', help='Show loader logging')
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    spreadsheet_id = configure(args)
+    from src.sheets_replay import get_replay_session
+    session = get_replay_session()
+
+    print(f"spreadsheet: {spreadsheet_id}  latency: {args.latency_ms:g} ms + "
+          f"{args.row_latency_us:g} us/row  scale: {args.scale:g}x")
+    print(f"\n{'section':<22}{'cold (ms)':>12}{'warm (ms)':>12}{'requests':>10}")
+
+    for key in args.sections.split(','):
+        label, module_name, loader_name = SECTIONS[key]
+        loader = getattr(importlib.import_module(module_name), loader_name)
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            reset_caches()
+            before = session.requests
+            cold.append(timed(loader))
+            requests = session.requests - before
+            warm.append(timed(loader))
+        print(f"{label:<22}{min(cold) * 1000:>12.1f}{min(warm) * 1000:>12.1f}{requests:>10}")
+
+
+if __name__ == '__main__':
+    main()
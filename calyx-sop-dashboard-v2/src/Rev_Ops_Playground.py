@@ -15,13 +15,15 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import base64
 import io
 import re
 import uuid
 
+from .data_cache import revision_cached
+from .sheets_ingest import MAX_CONCURRENT_FETCHES, fetch_sheet_batch, fetch_sheet_range, get_spreadsheet_id
+from .sheet_schemas import clean_numeric, coerce_numeric, compact_dimensions
+
 # ========== CONFIGURATION ==========
 DEFAULT_SPREADSHEET_ID = "15JhBZ_7aHHZA1W1qsoC2163borL6RYjk0xTDWPmWPfA"
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
@@ -3377,75 +3379,55 @@ def generate_combined_summary_html(customers_data, rep_name, date_label="All Tim
 
 
 # ========== DATA LOADING ==========
-@st.cache_data
+# Raw tabs are cached per spreadsheet revision in the shared sheet registry
+# (one copy for every section), so these loaders need no cache of their own
 def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION, silent=False):
-    """Load data from Google Sheets with caching"""
-    try:
-        spreadsheet_id = st.secrets.get("SPREADSHEET_ID", DEFAULT_SPREADSHEET_ID)
-        
-        if "service_account" not in st.secrets:
-            if not silent:
-                st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
-            return pd.DataFrame()
-        
-        creds_dict = dict(st.secrets["service_account"])
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
-        
-        result = sheet.values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!{range_name}"
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        if not values:
-            if not silent:
-                st.warning(f"⚠️ No data found in {sheet_name}!{range_name}")
-            return pd.DataFrame()
-        
-        # Handle mismatched column counts
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        df = pd.DataFrame(values[1:], columns=values[0])
-        return df
-        
-    except Exception as e:
-        if not silent:
-            st.error(f"❌ Error loading data from {sheet_name}: {str(e)}")
-        return pd.DataFrame()
+    """Load data from Google Sheets (re-pulled only when the workbook changes)"""
+    return fetch_sheet_range(sheet_name, range_name, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent=silent,
+                             on_refresh=_clear_sheet_caches)
+
+
+def load_google_sheets_batch(ranges, version=CACHE_VERSION, silent_sheets=(), concurrency=1):
+    """Load several tabs in one batchGet round trip (or `concurrency` parallel requests), keyed by (sheet_name, range_name)"""
+    return fetch_sheet_batch(ranges, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent_sheets=silent_sheets,
+                             on_refresh=_clear_sheet_caches, concurrency=concurrency)
+
+
+def _clear_sheet_caches():
+    """Drop data built from sheet tabs once a warm-start snapshot has been revalidated"""
+    load_forecast_data.clear()
+    load_annual_tracker_data.clear()
 
 
-def clean_numeric(value):
-    """Clean and convert a value to numeric"""
-    if pd.isna(value) or str(value).strip() == '':
-        return 0
-    cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-    try:
-        return float(cleaned)
-    except:
-        return 0
 
 
 def load_qbr_data():
     """Load all data needed for QBR generation"""
     
+    # Every tab the QBR needs is fetched in parallel (bounded pool), so wall
+    # time tracks the slowest tab instead of the sum of all of them
+    sheet_frames = load_google_sheets_batch(
+        [
+            ("_NS_SalesOrders_Data", "A:AG"),
+            ("_NS_Invoices_Data", "A:U"),
+            ("All Reps All Pipelines", "A:Z"),
+            ("Invoice Line Item", "A:Z"),
+            ("Non-Conformance Details", "A:W"),
+            ("HB NCR", "A2:O"),
+        ],
+        version=CACHE_VERSION,
+        silent_sheets=("Invoice Line Item", "Non-Conformance Details", "HB NCR"),
+        concurrency=MAX_CONCURRENT_FETCHES,
+    )
+    
     # Load Sales Orders (A:AG to include all columns through Updated Status)
-    sales_orders_df = load_google_sheets_data("_NS_SalesOrders_Data", "A:AG", version=CACHE_VERSION)
+    sales_orders_df = sheet_frames[("_NS_SalesOrders_Data", "A:AG")]
     
     # Load Invoices (A:U to include Rep Master)
-    invoices_df = load_google_sheets_data("_NS_Invoices_Data", "A:U", version=CACHE_VERSION)
+    invoices_df = sheet_frames[("_NS_Invoices_Data", "A:U")]
     
     # Load HubSpot Deals - load wider range to ensure we get Company Name
-    deals_df = load_google_sheets_data("All Reps All Pipelines", "A:Z", version=CACHE_VERSION)
+    deals_df = sheet_frames[("All Reps All Pipelines", "A:Z")]
     
     # =========================================================================
     # PROCESS SALES ORDERS - use column names directly from sheet
@@ -3461,7 +3443,7 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in sales_orders_df.columns:
-            sales_orders_df['Amount'] = sales_orders_df['Amount'].apply(clean_numeric)
+            sales_orders_df['Amount'] = coerce_numeric(sales_orders_df['Amount'], fill_value=0)
         
         # Clean date data
         if 'Order Start Date' in sales_orders_df.columns:
@@ -3478,6 +3460,9 @@ def load_qbr_data():
         for col in ['Corrected Customer Name', 'Rep Master', 'Updated Status', 'Order Type', 'Status']:
             if col in sales_orders_df.columns:
                 sales_orders_df[col] = sales_orders_df[col].astype(str).str.strip()
+        # Rep / customer / status labels as categoricals (read-only from here on)
+        sales_orders_df = compact_dimensions(
+            sales_orders_df, columns=('Corrected Customer Name', 'Rep Master', 'Updated Status', 'Status'))
     
     # =========================================================================
     # PROCESS INVOICES - use column names directly from sheet
@@ -3493,9 +3478,9 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in invoices_df.columns:
-            invoices_df['Amount'] = invoices_df['Amount'].apply(clean_numeric)
+            invoices_df['Amount'] = coerce_numeric(invoices_df['Amount'], fill_value=0)
         if 'Amount Remaining' in invoices_df.columns:
-            invoices_df['Amount Remaining'] = invoices_df['Amount Remaining'].apply(clean_numeric)
+            invoices_df['Amount Remaining'] = coerce_numeric(invoices_df['Amount Remaining'], fill_value=0)
         
         # Clean date data
         if 'Date' in invoices_df.columns:
@@ -3507,6 +3492,7 @@ def load_qbr_data():
         for col in ['Corrected Customer', 'Rep Master', 'Status']:
             if col in invoices_df.columns:
                 invoices_df[col] = invoices_df[col].astype(str).str.strip()
+        invoices_df = compact_dimensions(invoices_df, columns=('Corrected Customer', 'Rep Master', 'Status'))
         
         # Extract SO Number from Created From
         if 'Created From' in invoices_df.columns:
@@ -3572,9 +3558,9 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in deals_df.columns:
-            deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+            deals_df['Amount'] = coerce_numeric(deals_df['Amount'], fill_value=0)
         if 'Probability Rev' in deals_df.columns:
-            deals_df['Probability Rev'] = deals_df['Probability Rev'].apply(clean_numeric)
+            deals_df['Probability Rev'] = coerce_numeric(deals_df['Probability Rev'], fill_value=0)
         else:
             deals_df['Probability Rev'] = deals_df.get('Amount', 0)
         
@@ -3597,7 +3583,7 @@ def load_qbr_data():
     # LOAD AND PROCESS INVOICE LINE ITEMS
     # This is the drill-down layer explaining realized revenue composition
     # =========================================================================
-    invoice_line_items_df = load_google_sheets_data("Invoice Line Item", "A:Z", version=CACHE_VERSION, silent=True)
+    invoice_line_items_df = sheet_frames[("Invoice Line Item", "A:Z")]
     
     if not invoice_line_items_df.empty:
         # Remove duplicate columns
@@ -3606,11 +3592,11 @@ def load_qbr_data():
         
         # Clean numeric data - Amount is line-level revenue
         if 'Amount' in invoice_line_items_df.columns:
-            invoice_line_items_df['Amount'] = invoice_line_items_df['Amount'].apply(clean_numeric)
+            invoice_line_items_df['Amount'] = coerce_numeric(invoice_line_items_df['Amount'], fill_value=0)
         
         # Quantity is unit-level volume
         if 'Quantity' in invoice_line_items_df.columns:
-            invoice_line_items_df['Quantity'] = invoice_line_items_df['Quantity'].apply(clean_numeric)
+            invoice_line_items_df['Quantity'] = coerce_numeric(invoice_line_items_df['Quantity'], fill_value=0)
         
         # Clean date data
         if 'Date' in invoice_line_items_df.columns:
@@ -3635,7 +3621,7 @@ def load_qbr_data():
     
     # --- NetSuite NCR Data (Nov 2024+) ---
     ncr_df = pd.DataFrame()  # Initialize as empty
-    ncr_raw = load_google_sheets_data("Non-Conformance Details", "A:W", version=CACHE_VERSION, silent=True)
+    ncr_raw = sheet_frames[("Non-Conformance Details", "A:W")]
     
     if not ncr_raw.empty:
         ncr_df = ncr_raw.copy()
@@ -3654,13 +3640,13 @@ def load_qbr_data():
         
         # Clean numeric data - Total Quantity Affected
         if 'Total Quantity Affected' in ncr_df.columns:
-            ncr_df['Total Quantity Affected'] = ncr_df['Total Quantity Affected'].apply(clean_numeric)
+            ncr_df['Total Quantity Affected'] = coerce_numeric(ncr_df['Total Quantity Affected'], fill_value=0)
         
         # Clean Cost fields if present
         if 'Cost of Rework' in ncr_df.columns:
-            ncr_df['Cost of Rework'] = ncr_df['Cost of Rework'].apply(clean_numeric)
+            ncr_df['Cost of Rework'] = coerce_numeric(ncr_df['Cost of Rework'], fill_value=0)
         if 'Cost Avoided' in ncr_df.columns:
-            ncr_df['Cost Avoided'] = ncr_df['Cost Avoided'].apply(clean_numeric)
+            ncr_df['Cost Avoided'] = coerce_numeric(ncr_df['Cost Avoided'], fill_value=0)
         
         # Clean date data
         if 'Date Submitted' in ncr_df.columns:
@@ -3676,7 +3662,7 @@ def load_qbr_data():
     
     # --- HubSpot NCR Data (Historical, pre-Nov 2024) ---
     hb_ncr_df = pd.DataFrame()  # Initialize as empty
-    hb_ncr_raw = load_google_sheets_data("HB NCR", "A2:O", version=CACHE_VERSION, silent=True)
+    hb_ncr_raw = sheet_frames[("HB NCR", "A2:O")]
     
     if not hb_ncr_raw.empty:
         hb_ncr_df = hb_ncr_raw.copy()
@@ -4138,7 +4124,7 @@ def render_pending_orders_section(customer_orders):
     
     # Breakdown by Updated Status
     st.markdown("**Breakdown by Status:**")
-    status_summary = pending_orders.groupby('Updated Status').agg({
+    status_summary = pending_orders.groupby('Updated Status', observed=True).agg({
         'Amount': ['sum', 'count']
     }).round(0)
     status_summary.columns = ['Total Value', 'Count']
@@ -6505,7 +6491,7 @@ def parse_forecast_sheet(raw_df):
     return pd.DataFrame(all_data)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=lambda: get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), stale_while_revalidate=True)
 def load_forecast_data():
     """Load and parse the 2026 Forecast data"""
     raw_df = load_google_sheets_data("2026 Forecast", "A1:S80", version=CACHE_VERSION, silent=True)
@@ -6516,29 +6502,48 @@ def load_forecast_data():
     return parse_forecast_sheet(raw_df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=lambda: get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), stale_while_revalidate=True)
 def load_annual_tracker_data():
     """Load all data needed for the Annual Goal Tracker"""
     
-    line_items_df = load_google_sheets_data("Invoice Line Item", "A:Z", version=CACHE_VERSION)
-    invoices_df = load_google_sheets_data("_NS_Invoices_Data", "A:U", version=CACHE_VERSION)
-    sales_orders_df = load_google_sheets_data("_NS_SalesOrders_Data", "A:AG", version=CACHE_VERSION)
-    deals_df = load_google_sheets_data("All Reps All Pipelines", "A:Z", version=CACHE_VERSION)
-    forecast_df = load_forecast_data()
+    # All eight tabs are fetched in parallel (bounded pool) instead of eight
+    # sequential requests; each tab is parsed as soon as it arrives
+    sheet_frames = load_google_sheets_batch(
+        [
+            ("Invoice Line Item", "A:Z"),
+            ("_NS_Invoices_Data", "A:U"),
+            ("_NS_SalesOrders_Data", "A:AG"),
+            ("All Reps All Pipelines", "A:Z"),
+            ("2026 Forecast", "A1:S80"),
+            ("Sales Order Line Item", "A:W"),
+            ("Copy of Deals Line Item", "A2:AB"),
+            ("Deals Line Item", "A2:V"),
+        ],
+        version=CACHE_VERSION,
+        silent_sheets=("2026 Forecast", "Sales Order Line Item", "Copy of Deals Line Item", "Deals Line Item"),
+        concurrency=MAX_CONCURRENT_FETCHES,
+    )
+    
+    line_items_df = sheet_frames[("Invoice Line Item", "A:Z")]
+    invoices_df = sheet_frames[("_NS_Invoices_Data", "A:U")]
+    sales_orders_df = sheet_frames[("_NS_SalesOrders_Data", "A:AG")]
+    deals_df = sheet_frames[("All Reps All Pipelines", "A:Z")]
+    forecast_raw_df = sheet_frames[("2026 Forecast", "A1:S80")]
+    forecast_df = parse_forecast_sheet(forecast_raw_df) if not forecast_raw_df.empty else pd.DataFrame()
     
     # Load Sales Order Line Item for proper categorization (same structure as Invoice Line Item)
-    sales_order_line_items_df = load_google_sheets_data("Sales Order Line Item", "A:W", version=CACHE_VERSION, silent=True)
+    sales_order_line_items_df = sheet_frames[("Sales Order Line Item", "A:W")]
     
     # Load Copy of Deals Line Item for Close Rate Analysis
     # Note: Column headers are in row 2 of the sheet
     # Range extended to AB to include Effective unit price column
-    deals_line_items_df = load_google_sheets_data("Copy of Deals Line Item", "A2:AB", version=CACHE_VERSION, silent=True)
+    deals_line_items_df = sheet_frames[("Copy of Deals Line Item", "A2:AB")]
     
     # Load Deals Line Item for Pipeline Section (Plan vs Full Pipeline)
     # Note: Column headers are in row 2 of the sheet
     # This is the active pipeline view - no standard reorder/Gonzalez filtering
     # Extended to Column V to include "Pending Approval Date"
-    pipeline_deals_df = load_google_sheets_data("Deals Line Item", "A2:V", version=CACHE_VERSION, silent=True)
+    pipeline_deals_df = sheet_frames[("Deals Line Item", "A2:V")]
     
     # Standard Reorder Date columns - if ANY of these have a value, exclude the deal
     # These are columns R through Y in the Copy of Deals Line Item sheet
@@ -6559,9 +6564,9 @@ def load_annual_tracker_data():
             line_items_df = line_items_df.loc[:, ~line_items_df.columns.duplicated()]
         
         if 'Amount' in line_items_df.columns:
-            line_items_df['Amount'] = line_items_df['Amount'].apply(clean_numeric)
+            line_items_df['Amount'] = coerce_numeric(line_items_df['Amount'], fill_value=0)
         if 'Quantity' in line_items_df.columns:
-            line_items_df['Quantity'] = line_items_df['Quantity'].apply(clean_numeric)
+            line_items_df['Quantity'] = coerce_numeric(line_items_df['Quantity'], fill_value=0)
         if 'Date' in line_items_df.columns:
             line_items_df['Date'] = pd.to_datetime(line_items_df['Date'], errors='coerce')
         
@@ -6660,7 +6665,7 @@ def load_annual_tracker_data():
             sales_orders_df = sales_orders_df.rename(columns={'Amount (Transaction Total)': 'Amount'})
         
         if 'Amount' in sales_orders_df.columns:
-            sales_orders_df['Amount'] = sales_orders_df['Amount'].apply(clean_numeric)
+            sales_orders_df['Amount'] = coerce_numeric(sales_orders_df['Amount'], fill_value=0)
         if 'Order Start Date' in sales_orders_df.columns:
             sales_orders_df['Order Start Date'] = pd.to_datetime(sales_orders_df['Order Start Date'], errors='coerce')
         
@@ -6694,9 +6699,9 @@ def load_annual_tracker_data():
         
         # Clean numeric columns
         if 'Amount' in sales_order_line_items_df.columns:
-            sales_order_line_items_df['Amount'] = sales_order_line_items_df['Amount'].apply(clean_numeric)
+            sales_order_line_items_df['Amount'] = coerce_numeric(sales_order_line_items_df['Amount'], fill_value=0)
         if 'Quantity Ordered' in sales_order_line_items_df.columns:
-            sales_order_line_items_df['Quantity'] = sales_order_line_items_df['Quantity Ordered'].apply(clean_numeric)
+            sales_order_line_items_df['Quantity'] = coerce_numeric(sales_order_line_items_df['Quantity Ordered'], fill_value=0)
         
         # Parse dates
         if 'Date Created' in sales_order_line_items_df.columns:
@@ -6816,7 +6821,7 @@ def load_annual_tracker_data():
             deals_df = deals_df.loc[:, ~deals_df.columns.duplicated()]
         
         if 'Amount' in deals_df.columns:
-            deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+            deals_df['Amount'] = coerce_numeric(deals_df['Amount'], fill_value=0)
         if 'Close Date' in deals_df.columns:
             deals_df['Close Date'] = pd.to_datetime(deals_df['Close Date'], errors='coerce')
         
@@ -6893,15 +6898,15 @@ def load_annual_tracker_data():
         
         # Clean numeric columns - use Effective Unit Price × Quantity for Amount
         if 'Effective unit price' in deals_line_items_df.columns:
-            deals_line_items_df['Effective unit price'] = deals_line_items_df['Effective unit price'].apply(clean_numeric)
+            deals_line_items_df['Effective unit price'] = coerce_numeric(deals_line_items_df['Effective unit price'], fill_value=0)
         if 'Quantity' in deals_line_items_df.columns:
-            deals_line_items_df['Quantity'] = deals_line_items_df['Quantity'].apply(clean_numeric)
+            deals_line_items_df['Quantity'] = coerce_numeric(deals_line_items_df['Quantity'], fill_value=0)
         
         # Calculate Amount as Effective Unit Price × Quantity
         if 'Effective unit price' in deals_line_items_df.columns and 'Quantity' in deals_line_items_df.columns:
             deals_line_items_df['Amount'] = deals_line_items_df['Effective unit price'] * deals_line_items_df['Quantity']
         elif 'Amount' in deals_line_items_df.columns:
-            deals_line_items_df['Amount'] = deals_line_items_df['Amount'].apply(clean_numeric)
+            deals_line_items_df['Amount'] = coerce_numeric(deals_line_items_df['Amount'], fill_value=0)
         
         # Parse dates
         if 'Create Date' in deals_line_items_df.columns:
@@ -6979,15 +6984,15 @@ def load_annual_tracker_data():
         
         # Clean numeric columns - use Effective Unit Price × Quantity for Amount
         if 'Effective unit price' in pipeline_deals_df.columns:
-            pipeline_deals_df['Effective unit price'] = pipeline_deals_df['Effective unit price'].apply(clean_numeric)
+            pipeline_deals_df['Effective unit price'] = coerce_numeric(pipeline_deals_df['Effective unit price'], fill_value=0)
         if 'Quantity' in pipeline_deals_df.columns:
-            pipeline_deals_df['Quantity'] = pipeline_deals_df['Quantity'].apply(clean_numeric)
+            pipeline_deals_df['Quantity'] = coerce_numeric(pipeline_deals_df['Quantity'], fill_value=0)
         
         # Calculate Amount as Effective Unit Price × Quantity
         if 'Effective unit price' in pipeline_deals_df.columns and 'Quantity' in pipeline_deals_df.columns:
             pipeline_deals_df['Amount'] = pipeline_deals_df['Effective unit price'] * pipeline_deals_df['Quantity']
         elif 'Amount' in pipeline_deals_df.columns:
-            pipeline_deals_df['Amount'] = pipeline_deals_df['Amount'].apply(clean_numeric)
+            pipeline_deals_df['Amount'] = coerce_numeric(pipeline_deals_df['Amount'], fill_value=0)
         
         # Parse dates
         if 'Close Date' in pipeline_deals_df.columns:
@@ -40,6 +40,16 @@ from .sop_data_loader import (
     allocate_topdown_forecast
 )
 
+# Shared Sheets client pool & ingestion
+from .sheets_client import get_sheets_service, get_gspread_client
+from .sheets_ingest import (
+    fetch_sheet_batch,
+    fetch_sheet_range
+)
+from .sheet_schemas import apply_schema, coerce_numeric
+from .sheet_registry import get_sheet_registry
+from .request_scheduler import get_request_scheduler
+
 from .sales_rep_view import render_sales_rep_view
 
 # Export all
@@ -72,6 +82,15 @@ __all__ = [
     'get_pipeline_by_period',
     'calculate_lead_times',
     'allocate_topdown_forecast',
+    # Sheets ingestion
+    'get_sheets_service',
+    'get_gspread_client',
+    'fetch_sheet_batch',
+    'fetch_sheet_range',
+    'apply_schema',
+    'coerce_numeric',
+    'get_sheet_registry',
+    'get_request_scheduler',
     # Views
     'render_sales_rep_view',
 ]
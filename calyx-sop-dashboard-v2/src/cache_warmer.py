@@ -0,0 +1,304 @@
+"""
+Cache Warmer Module
+Background pre-warming of the data caches on start-up and on a schedule
+
+Features:
+- One daemon thread per process loads every section's data (Q2 snapshot,
+  QBR, Rev Ops annual tracker, Quality NC log, S&OP) and the heaviest
+  derived results (per-rep account rosters, the default top-down item
+  forecast) before anyone opens those pages
+- Starts with the first session after a restart (Streamlit runs no app
+  code before that) and re-runs on a schedule, so revision / TTL expiry
+  is paid by the warmer instead of the next user
+- Tasks run one after another; each loader already fetches its tabs in
+  parallel, and the revision-cached loaders are single-flight, so a user
+  who opens a page while it is being warmed waits on the same load
+- A failing task is logged and recorded; the remaining tasks still run
+- Progress, per-task timings and errors for the admin page
+  (render_warmup_admin)
+
+Configuration (environment):
+- CALYX_WARMUP: "0" turns pre-warming off (default on)
+- CALYX_WARMUP_INTERVAL_MIN: minutes between runs (default 30; 0 = only at
+  start-up and when triggered from the admin page)
+- CALYX_WARMUP_TASKS: comma-separated task keys to run (default all, see
+  WARMUP_TASKS)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_INTERVAL_MIN = 30
+
+
+# =============================================================================
+# WARM-UP TASKS
+# Imported lazily: section modules are heavy and may be missing in a
+# partial deploy (the app shows their import error instead)
+# =============================================================================
+
+def _warm_q2_snapshot() -> str:
+    from .q2_revenue_snapshot import load_all_data
+    load_all_data()
+    return ''
+
+
+def _warm_qbr() -> str:
+    from .yearly_planning_2026 import load_qbr_data
+    sales_orders_df, invoices_df, deals_df, line_items_df, _ = load_qbr_data()
+    return f"{len(invoices_df):,} invoices, {len(line_items_df):,} line items"
+
+
+def _warm_rosters() -> str:
+    """Account rosters for every rep, as the QBR rep picker builds them."""
+    from .yearly_planning_2026 import build_rep_company_roster, get_rep_list, load_qbr_data
+    sales_orders_df, invoices_df, deals_df, _, _ = load_qbr_data()
+    reps = get_rep_list(sales_orders_df, invoices_df)
+    for rep in reps:
+        build_rep_company_roster(rep, sales_orders_df, invoices_df, deals_df)
+    return f"{len(reps)} reps"
+
+
+def _warm_rev_ops() -> str:
+    """Processed and product-categorized invoice / order / deal line items."""
+    from .Rev_Ops_Playground import load_annual_tracker_data
+    load_annual_tracker_data()
+    return ''
+
+
+def _warm_quality() -> str:
+    from .data_loader import load_nc_data
+    df = load_nc_data()
+    return f"{len(df):,} NCs" if df is not None else ''
+
+
+def _warm_sop() -> str:
+    from .sop_data_loader import load_all_sop_data
+    frames = load_all_sop_data()
+    return f"{sum(1 for df in frames.values() if df is not None)} tabs"
+
+
+def _warm_default_forecast() -> str:
+    """Top-down item forecast pivot the Operations view opens with."""
+    from .operations_view import get_forecast_pivot_data
+    pivot_units, _ = get_forecast_pivot_data('All')
+    return f"{len(pivot_units):,} items" if pivot_units is not None else 'no forecast'
+
+
+# Key -> (label, task); run in this order (the default landing page first,
+# derived results after the data they are built from)
+WARMUP_TASKS: Dict[str, Tuple[str, Callable[[], str]]] = {
+    'q2': ('Q2 Revenue Snapshot', _warm_q2_snapshot),
+    'qbr': ('QBR data', _warm_qbr),
+    'rosters': ('QBR account rosters', _warm_rosters),
+    'revops': ('Rev Ops annual tracker', _warm_rev_ops),
+    'quality': ('Quality NC data', _warm_quality),
+    'sop': ('S&OP data', _warm_sop),
+    'forecast': ('Default item forecast', _warm_default_forecast),
+}
+
+
+# =============================================================================
+# WARMER
+# =============================================================================
+
+class CacheWarmer:
+    """
+    Runs the warm-up tasks in a background thread, now and every interval.
+
+    Status is kept per task (state, last duration, detail / error) so the
+    admin page can show what has been warmed and what it cost.
+    """
+
+    def __init__(self, tasks: Dict[str, Tuple[str, Callable[[], str]]], interval: float):
+        self.tasks = dict(tasks)
+        self.interval = float(interval)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._status = {
+            key: {'task': label, 'state': 'pending', 'seconds': None,
+                  'finished': None, 'runs': 0, 'detail': '', 'error': None}
+            for key, (label, _) in self.tasks.items()
+        }
+        self._runs = 0
+        self._running = False
+        self._run_started: Optional[float] = None
+        self._last_run: Optional[Dict[str, Any]] = None
+        self._next_run: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the background thread (once)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='cache-warmer', daemon=True)
+            self._thread.start()
+
+    def trigger(self) -> None:
+        """Start a run now instead of waiting for the schedule."""
+        self._wake.set()
+
+    def run_once(self) -> None:
+        """Run every task once, recording timings and failures."""
+        with self._lock:
+            self._running = True
+            self._run_started = time.time()
+            for status in self._status.values():
+                status['state'] = 'queued'
+        failed = 0
+        for key, (label, task) in self.tasks.items():
+            self._update(key, state='running')
+            start = time.perf_counter()
+            try:
+                detail = task() or ''
+                error = None
+                logger.info(f"Warmed {label} in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                logger.warning(f"Warm-up of {label} failed: {e}")
+                detail, error = '', str(e)
+                failed += 1
+            seconds = time.perf_counter() - start
+            with self._lock:
+                status = self._status[key]
+                status.update(state='failed' if error else 'done', seconds=seconds,
+                              finished=time.time(), detail=detail, error=error)
+                status['runs'] += 1
+        with self._lock:
+            self._runs += 1
+            self._running = False
+            self._last_run = {'started': self._run_started, 'seconds': time.time() - self._run_started,
+                              'failed': failed}
+
+    def _update(self, key: str, **fields) -> None:
+        with self._lock:
+            self._status[key].update(fields)
+
+    def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Cache warm-up run failed: {e}")
+            wait = self.interval if self.interval > 0 else None
+            with self._lock:
+                self._next_run = time.time() + wait if wait else None
+            self._wake.wait(wait)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """One row per task, in run order."""
+        with self._lock:
+            return [dict(status, key=key) for key, status in self._status.items()]
+
+    def summary(self) -> Dict[str, Any]:
+        """Run count, whether a run is in progress, progress, last / next run."""
+        with self._lock:
+            finished = sum(1 for s in self._status.values() if s['state'] in ('done', 'failed'))
+            return {
+                'runs': self._runs,
+                'running': self._running,
+                'progress': finished / len(self._status) if self._running and self._status else None,
+                'last_run': dict(self._last_run) if self._last_run else None,
+                'next_run': self._next_run if not self._running else None,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def _create_cache_warmer(interval: float, task_keys: Tuple[str, ...]) -> CacheWarmer:
+    logger.info(f"Cache warm-up every {interval / 60:g} min: {', '.join(task_keys)}")
+    warmer = CacheWarmer({key: WARMUP_TASKS[key] for key in task_keys}, interval)
+    warmer.start()
+    return warmer
+
+
+def get_cache_warmer() -> Optional[CacheWarmer]:
+    """Get (and on first call start) the process-wide warmer, or None when disabled."""
+    if os.environ.get('CALYX_WARMUP', '1') == '0':
+        return None
+    try:
+        interval_min = float(os.environ.get('CALYX_WARMUP_INTERVAL_MIN', DEFAULT_INTERVAL_MIN))
+    except ValueError:
+        interval_min = DEFAULT_INTERVAL_MIN
+    requested = os.environ.get('CALYX_WARMUP_TASKS')
+    if requested:
+        keys = [key.strip() for key in requested.split(',') if key.strip()]
+        unknown = [key for key in keys if key not in WARMUP_TASKS]
+        if unknown:
+            logger.warning(f"Unknown warm-up tasks ignored: {', '.join(unknown)}")
+        task_keys = tuple(key for key in keys if key in WARMUP_TASKS)
+    else:
+        task_keys = tuple(WARMUP_TASKS)
+    if not task_keys:
+        return None
+    return _create_cache_warmer(max(0.0, interval_min) * 60, task_keys)
+
+
+# =============================================================================
+# ADMIN VIEW
+# =============================================================================
+
+def _clock(timestamp: Optional[float]) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S') if timestamp else '–'
+
+
+def render_warmup_admin() -> None:
+    """Warm-up progress, per-task timings and a Warm now button."""
+    warmer = get_cache_warmer()
+    if warmer is None:
+        st.info("Cache warm-up is turned off (CALYX_WARMUP=0).")
+        return
+
+    summary = warmer.summary()
+    last_run = summary['last_run']
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Warm-up runs", summary['runs'],
+                "running" if summary['running'] else "idle", delta_color="off")
+    col2.metric("Last run", f"{last_run['seconds']:.1f}s" if last_run else "–",
+                f"started {_clock(last_run['started'])}" if last_run else None, delta_color="off")
+    col3.metric("Next run", _clock(summary['next_run']),
+                f"every {warmer.interval / 60:g} min" if warmer.interval else "on demand", delta_color="off")
+
+    if summary['running']:
+        st.progress(summary['progress'] or 0.0, text="Warming caches...")
+    elif last_run and last_run['failed']:
+        st.warning(f"{last_run['failed']} warm-up task(s) failed in the last run.")
+
+    if st.button("Warm now", key="cache_warmup_now", disabled=summary['running']):
+        warmer.trigger()
+        st.toast("Cache warm-up started")
+
+    tasks = pd.DataFrame(warmer.status())
+    tasks['seconds'] = pd.to_numeric(tasks['seconds']).round(2)
+    tasks['finished'] = tasks['finished'].map(_clock)
+    st.dataframe(tasks[['task', 'state', 'seconds', 'finished', 'runs', 'detail', 'error']],
+                 hide_index=True, use_container_width=True)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'DEFAULT_INTERVAL_MIN',
+    'WARMUP_TASKS',
+    'CacheWarmer',
+    'get_cache_warmer',
+    'render_warmup_admin',
+]
@@ -0,0 +1,576 @@
+"""
+Data Cache Module
+Change-aware caching for the Google Sheets loaders
+
+Features:
+- One Drive files.get metadata call per spreadsheet returns its version /
+  modifiedTime; probes are shared by all loaders for PROBE_INTERVAL seconds
+- @revision_cached: cached loaders keyed on the spreadsheet revision, so
+  tabs are re-pulled only when the workbook actually changed (replaces fixed
+  TTLs and hand-bumped CACHE_VERSION strings for data freshness)
+- Falls back to TTL-style time buckets when the Drive probe is unavailable
+- Stale-while-revalidate: serve the previous revision while one background
+  thread loads the new one; failed refreshes are retried with backoff
+- Single-flight: concurrent sessions share one in-flight load per key
+- Failed or empty loads are returned but never cached: a loader whose
+  fetches reported a failure (report_fetch_failure) or that came back empty
+  runs again on the next call
+- Content fingerprints for DataFrames (block-wise hashes of the column
+  buffers), stamped on loader results once at load and carried through
+  cached copies, so downstream caches key on the data instead of
+  re-hashing whole frames every rerun
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import pandas as pd
+import numpy as np
+import contextvars
+import functools
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from .sheets_client import get_drive_service
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# How long one revision probe answers for every loader (seconds)
+PROBE_INTERVAL = 30
+
+# Used when Drive can't be probed: behave like the old ttl=300
+DEFAULT_FALLBACK_TTL = 300
+
+# Rows hashed per block when fingerprinting numpy-backed columns
+FINGERPRINT_BLOCK_ROWS = 65536
+
+# Wait before retrying a failed background refresh (doubles per failure, seconds)
+REFRESH_BACKOFF = 30
+REFRESH_BACKOFF_MAX = 600
+
+
+# =============================================================================
+# REVISION PROBE
+# =============================================================================
+
+_probe_lock = threading.Lock()
+_probe_results: Dict[str, Tuple[float, Optional[str]]] = {}
+
+
+def probe_spreadsheet_revision(spreadsheet_id: str) -> Optional[str]:
+    """
+    Ask Drive for the spreadsheet's current revision.
+
+    Args:
+        spreadsheet_id: Spreadsheet (Drive file) ID
+
+    Returns:
+        "<version>@<modifiedTime>" or None if Drive can't be reached
+    """
+    try:
+        drive = get_drive_service()
+        if drive is None:
+            return None
+        meta = drive.files().get(
+            fileId=spreadsheet_id,
+            fields='version,modifiedTime',
+            supportsAllDrives=True
+        ).execute()
+        return f"{meta.get('version', '')}@{meta.get('modifiedTime', '')}"
+    except Exception as e:
+        logger.warning(f"Drive revision probe failed for {spreadsheet_id}: {e}")
+        return None
+
+
+def get_spreadsheet_revision(spreadsheet_id: str) -> Optional[str]:
+    """
+    Get the spreadsheet revision, probing Drive at most once per PROBE_INTERVAL.
+
+    Concurrent callers share one probe per spreadsheet; a slow probe only
+    holds up callers of that spreadsheet.
+
+    Returns:
+        Revision string or None if unknown
+    """
+    if not spreadsheet_id:
+        return None
+
+    def recent() -> Tuple[bool, Optional[str]]:
+        with _probe_lock:
+            checked_at, revision = _probe_results.get(spreadsheet_id, (None, None))
+        return checked_at is not None and time.monotonic() - checked_at < PROBE_INTERVAL, revision
+
+    def probe() -> Optional[str]:
+        # A probe that finished just before this one started already counts
+        fresh, revision = recent()
+        if fresh:
+            return revision
+        revision = probe_spreadsheet_revision(spreadsheet_id)
+        with _probe_lock:
+            _probe_results[spreadsheet_id] = (time.monotonic(), revision)
+        return revision
+
+    fresh, revision = recent()
+    if fresh:
+        return revision
+    return _flights.do(('revision probe', spreadsheet_id), probe)
+
+
+def cache_token(spreadsheet_id: str, fallback_ttl: int = DEFAULT_FALLBACK_TTL) -> str:
+    """
+    Cache key component for data read from a spreadsheet.
+
+    Changes exactly when the spreadsheet changes; without a revision it
+    changes every fallback_ttl seconds instead.
+    """
+    revision = get_spreadsheet_revision(spreadsheet_id)
+    if revision is not None:
+        return f"rev:{revision}"
+    return f"ttl:{int(time.time() // fallback_ttl)}"
+
+
+# =============================================================================
+# SINGLE-FLIGHT
+# =============================================================================
+
+class _Call:
+    """One in-flight computation that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution.
+
+    The first caller runs the function; callers arriving while it runs
+    block and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_flights = SingleFlight()
+
+
+def _args_key(args: tuple, kwargs: dict) -> Hashable:
+    """Hashable identity for a call's arguments."""
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return repr(key)
+
+
+# =============================================================================
+# FAILED FETCHES
+# =============================================================================
+
+# Failures reported while a cached loader runs (None outside a loader)
+_fetch_failures: contextvars.ContextVar = contextvars.ContextVar('fetch_failures', default=None)
+
+
+def report_fetch_failure(description: str) -> None:
+    """Mark the running cached loader's result as not cacheable (a fetch failed)."""
+    failures = _fetch_failures.get()
+    if failures is not None:
+        failures.append(description)
+
+
+def is_empty_result(value: Any) -> bool:
+    """None, an empty frame, or a dict / tuple / list of nothing but those."""
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, dict):
+        return all(is_empty_result(v) for v in value.values())
+    if isinstance(value, (tuple, list)) and value:
+        return all(is_empty_result(v) for v in value)
+    return False
+
+
+class _Uncacheable(Exception):
+    """Carries a loader result out of the cache without it being stored."""
+
+    def __init__(self, value: Any, reasons: List[str]):
+        super().__init__(', '.join(reasons))
+        self.value = value
+        self.reasons = reasons
+
+
+# =============================================================================
+# FRAME FINGERPRINTS
+# =============================================================================
+
+FINGERPRINT_ATTR = 'fingerprint'
+
+
+class _FingerprintTag:
+    """
+    df.attrs entry holding a frame's fingerprint.
+
+    Pickling keeps it (st.cache_data hands out unpickled copies of the frame
+    it was computed on); deepcopy drops it, and pandas deep-copies attrs
+    onto every derived frame (filters, .loc, .copy(), assign, concat), so a
+    filtered frame never inherits its parent's fingerprint.
+    """
+
+    __slots__ = ('digest', 'witness')
+
+    def __init__(self, digest: str, witness: Tuple):
+        self.digest = digest
+        self.witness = witness
+
+    def __deepcopy__(self, memo):
+        return None
+
+    def __repr__(self):
+        return f"<fingerprint {self.digest}>"
+
+
+def _witness(df: pd.DataFrame) -> Tuple:
+    """Cheap shape check so a frame edited in place (new / retyped columns) is re-hashed."""
+    return df.shape, tuple(map(str, df.columns)), tuple(map(str, df.dtypes))
+
+
+def _hash_values(h, values) -> None:
+    """Feed one column (or index) into the hash, block by block."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        array = np.asarray(values)
+        for start in range(0, len(array), FINGERPRINT_BLOCK_ROWS):
+            h.update(np.ascontiguousarray(array[start:start + FINGERPRINT_BLOCK_ROWS]).view(np.uint8))
+        return
+
+    # Arrow-backed strings (the pandas 3 default): hash the offset and data
+    # buffers directly instead of every Python string
+    arrow = getattr(getattr(values, 'array', values), '__arrow_array__', None)
+    if arrow is not None:
+        try:
+            import pyarrow as pa
+            chunks = arrow().chunks
+            if all(c.offset == 0 and (pa.types.is_string(c.type) or pa.types.is_large_string(c.type))
+                   for c in chunks):
+                for chunk in chunks:
+                    validity, offsets, data = chunk.buffers()
+                    width = 8 if pa.types.is_large_string(chunk.type) else 4
+                    bounds = np.frombuffer(offsets, dtype=np.int64 if width == 8 else np.int32,
+                                           count=len(chunk) + 1)
+                    h.update(bounds.view(np.uint8))
+                    if data is not None:
+                        h.update(memoryview(data)[:int(bounds[-1])])
+                    h.update(np.asarray(chunk.is_null()).view(np.uint8) if validity is not None else b'-')
+                return
+        except Exception:
+            pass
+
+    try:
+        hashed = pd.util.hash_pandas_object(pd.Series(values, copy=False), index=False)
+    except TypeError:
+        hashed = pd.util.hash_pandas_object(pd.Series(values, copy=False).astype(str), index=False)
+    h.update(hashed.to_numpy().view(np.uint8))
+
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(_witness(df)).encode())
+    if isinstance(df.index, pd.RangeIndex):
+        h.update(repr((df.index.start, df.index.stop, df.index.step)).encode())
+    else:
+        _hash_values(h, df.index)
+    for i in range(df.shape[1]):
+        _hash_values(h, df.iloc[:, i])
+    return h.hexdigest()
+
+
+def frame_fingerprint(df: Optional[pd.DataFrame]) -> str:
+    """
+    Content fingerprint of a DataFrame, for use as a cache key.
+
+    Computed once and stored on the frame (df.attrs); later calls on the
+    same frame, or on st.cache_data copies of it, return the stored value.
+    Frames derived from it (filtered, copied, with new columns) get their
+    own. Treat loader results as read-only: an in-place edit that keeps
+    columns and dtypes is not noticed.
+
+    Returns:
+        32-character hex digest ('none' for None)
+    """
+    if df is None:
+        return 'none'
+    witness = _witness(df)
+    tag = df.attrs.get(FINGERPRINT_ATTR)
+    if isinstance(tag, _FingerprintTag) and tag.witness == witness:
+        return tag.digest
+    digest = _hash_frame(df)
+    set_fingerprint(df, digest)
+    return digest
+
+
+def set_fingerprint(df: pd.DataFrame, digest: str) -> pd.DataFrame:
+    """Attach a known fingerprint (e.g. from derive_fingerprint) to a frame."""
+    df.attrs[FINGERPRINT_ATTR] = _FingerprintTag(digest, _witness(df))
+    return df
+
+
+def derive_fingerprint(base: str, *params: Any) -> str:
+    """
+    Fingerprint of a frame computed deterministically from another one.
+
+    Example:
+        key = derive_fingerprint(frame_fingerprint(lines), category, item)
+        filtered = lines[mask]   # mask built from category / item only
+    """
+    return hashlib.blake2b(repr((base,) + params).encode(), digest_size=16).hexdigest()
+
+
+def fingerprint_result(value: Any) -> Any:
+    """Stamp every DataFrame in a loader result (dicts / tuples / lists walked)."""
+    if isinstance(value, pd.DataFrame):
+        frame_fingerprint(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            fingerprint_result(item)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            fingerprint_result(item)
+    return value
+
+
+# =============================================================================
+# REVISION-KEYED CACHING
+# =============================================================================
+
+def revision_cached(spreadsheet_id: Union[str, Callable[[], str], None] = None,
+                    fallback_ttl: int = DEFAULT_FALLBACK_TTL,
+                    stale_while_revalidate: bool = False,
+                    cache_empty: bool = False,
+                    show_spinner: Union[bool, str] = True):
+    """
+    Decorator: a cache that is invalidated by spreadsheet changes.
+
+    Values live in the shared, memory-bounded LRU cache
+    (memory_cache.get_memory_cache) under the revision they were read at.
+    The wrapped function keeps its signature (callers and .clear() work as
+    before). Entries for older revisions are dropped when a new revision
+    is first seen, so memory holds one revision at a time.
+
+    With stale_while_revalidate, a caller that finds the spreadsheet has
+    changed gets the previous value immediately while one background thread
+    loads the new revision; the old entry is dropped once it lands. If the
+    previous value was already evicted, the caller loads the new revision
+    itself. After a failed refresh the next one waits REFRESH_BACKOFF
+    seconds, doubling per failure up to REFRESH_BACKOFF_MAX. In both
+    modes, concurrent callers needing the same uncached value share a single
+    load instead of each fetching it.
+
+    A load that reported a fetch failure, or whose result is empty (None,
+    empty frames), is handed back but not cached; with
+    stale_while_revalidate the previous value keeps being served instead.
+    Such a result also counts as a failed fetch for any cached loader that
+    called this one, so aggregates of partial results aren't cached.
+    DataFrames in a cached result are fingerprinted (frame_fingerprint)
+    before they are stored.
+
+    Args:
+        spreadsheet_id: Spreadsheet ID, or a callable returning it
+            (defaults to sheets_ingest.get_spreadsheet_id)
+        fallback_ttl: Seconds per cache generation if Drive can't be probed
+        stale_while_revalidate: Serve the last value while refreshing
+        cache_empty: Also cache empty results (for tabs that are legitimately empty)
+        show_spinner: Spinner text (or True for a default) while loading
+
+    Example:
+        @revision_cached()
+        def load_invoice_lines(): ...
+    """
+    def resolve_id() -> str:
+        try:
+            if spreadsheet_id is None:
+                from .sheets_ingest import get_spreadsheet_id
+                return get_spreadsheet_id()
+            if callable(spreadsheet_id):
+                return spreadsheet_id()
+            return spreadsheet_id
+        except Exception:
+            return ''
+
+    def decorator(func):
+        from .memory_cache import get_memory_cache, spinner
+
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
+        def run(args, kwargs):
+            failures = []
+            scope = _fetch_failures.set(failures)
+            try:
+                with spinner(show_spinner, func.__name__):
+                    value = func(*args, **kwargs)
+            finally:
+                _fetch_failures.reset(scope)
+            if failures or (not cache_empty and is_empty_result(value)):
+                raise _Uncacheable(value, failures or ['empty result'])
+            # Fingerprint once here; the tag rides along in every cached copy
+            return fingerprint_result(value)
+
+        def cached(token, key, args, kwargs):
+            # Revision tokens are the same in every process, so entries
+            # written to a shared backend are valid for all of them
+            return get_memory_cache().get_or_load(namespace, (token, key), lambda: run(args, kwargs))
+
+        def drop(token=None, key=None, shared=True):
+            if token is None:
+                get_memory_cache().clear(namespace, shared=shared)
+            else:
+                get_memory_cache().discard(namespace, (token, key))
+
+        state = {'token': None}
+        served: Dict[Hashable, str] = {}  # args -> token of the value callers get
+        refreshing = set()  # args with a background refresh running
+        backoff: Dict[Hashable, Tuple[int, float]] = {}  # args -> (failed refreshes, retry at)
+        state_lock = threading.Lock()
+
+        def load(token, key, args, kwargs):
+            value = _flights.do((namespace, key, token), lambda: cached(token, key, args, kwargs))
+            with state_lock:
+                served[key] = token
+            return value
+
+        def refresh(token, stale_token, key, args, kwargs):
+            try:
+                load(token, key, args, kwargs)
+                drop(stale_token, key)
+                with state_lock:
+                    backoff.pop(key, None)
+                logger.info(f"{func.__name__}: refreshed in background")
+            except Exception as e:
+                with state_lock:
+                    failures = backoff.get(key, (0, 0.0))[0] + 1
+                    delay = min(REFRESH_BACKOFF_MAX, REFRESH_BACKOFF * 2 ** (failures - 1))
+                    backoff[key] = (failures, time.monotonic() + delay)
+                logger.warning(f"{func.__name__}: background refresh failed ({e}), retrying in {delay:.0f}s")
+            finally:
+                with state_lock:
+                    refreshing.discard(key)
+
+        def load_or_uncached(token, key, args, kwargs):
+            try:
+                return load(token, key, args, kwargs)
+            except _Uncacheable as e:
+                logger.warning(f"{func.__name__}: not caching result ({e})")
+                # A cached loader calling this one must not cache its result either
+                for reason in e.reasons:
+                    report_fetch_failure(f"{func.__name__}: {reason}")
+                return e.value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = cache_token(resolve_id(), fallback_ttl)
+            key = _args_key(args, kwargs)
+
+            if not stale_while_revalidate:
+                with state_lock:
+                    if state['token'] is not None and state['token'] != token:
+                        logger.info(f"{func.__name__}: spreadsheet changed, dropping cached data")
+                        # Other processes may already be reading the new revision
+                        drop(shared=False)
+                    state['token'] = token
+                return load_or_uncached(token, key, args, kwargs)
+
+            with state_lock:
+                stale_token = served.get(key)
+            if stale_token is None or stale_token == token:
+                return load_or_uncached(token, key, args, kwargs)
+
+            hit, value = get_memory_cache().get(namespace, (stale_token, key))
+            if not hit:
+                # Previous value evicted: nothing to serve, so load the new revision here
+                return load_or_uncached(token, key, args, kwargs)
+
+            with state_lock:
+                start = key not in refreshing and time.monotonic() >= backoff.get(key, (0, 0.0))[1]
+                if start:
+                    refreshing.add(key)
+            if start:
+                threading.Thread(
+                    target=refresh,
+                    args=(token, stale_token, key, args, kwargs),
+                    name=f"refresh-{func.__name__}",
+                    daemon=True
+                ).start()
+            return value
+
+        def clear():
+            with state_lock:
+                served.clear()
+                backoff.clear()
+            drop()
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'PROBE_INTERVAL',
+    'REFRESH_BACKOFF',
+    'REFRESH_BACKOFF_MAX',
+    'probe_spreadsheet_revision',
+    'get_spreadsheet_revision',
+    'cache_token',
+    'SingleFlight',
+    'report_fetch_failure',
+    'is_empty_result',
+    'frame_fingerprint',
+    'set_fingerprint',
+    'derive_fingerprint',
+    'fingerprint_result',
+    'revision_cached',
+]
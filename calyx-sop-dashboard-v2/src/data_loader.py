@@ -13,7 +13,10 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 import logging
 import gspread
-from google.oauth2.service_account import Credentials
+
+from .sheets_client import get_gspread_client
+from .data_cache import revision_cached
+from .sheets_ingest import fetch_worksheet_values
 
 logger = logging.getLogger(__name__)
 
@@ -21,38 +24,9 @@ logger = logging.getLogger(__name__)
 # GOOGLE SHEETS CONNECTION
 # =============================================================================
 
-SCOPES = [
-    'https://www.googleapis.com/auth/spreadsheets.readonly',
-    'https://www.googleapis.com/auth/drive.readonly'
-]
-
-
-@st.cache_resource
 def get_google_sheets_client():
-    """Get authenticated Google Sheets client."""
-    try:
-        if 'service_account' in st.secrets:
-            creds_dict = dict(st.secrets['service_account'])
-        elif 'gcp_service_account' in st.secrets:
-            creds_dict = dict(st.secrets['gcp_service_account'])
-        else:
-            creds_dict = {
-                'type': st.secrets.get('type', 'service_account'),
-                'project_id': st.secrets.get('project_id'),
-                'private_key_id': st.secrets.get('private_key_id'),
-                'private_key': st.secrets.get('private_key'),
-                'client_email': st.secrets.get('client_email'),
-                'client_id': st.secrets.get('client_id'),
-                'auth_uri': st.secrets.get('auth_uri'),
-                'token_uri': st.secrets.get('token_uri'),
-            }
-        
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        logger.error(f"Failed to authenticate with Google Sheets: {e}")
-        return None
+    """Get authenticated Google Sheets client (pooled, shared across sessions)."""
+    return get_gspread_client()
 
 
 def get_spreadsheet_id():
@@ -64,7 +38,7 @@ def get_spreadsheet_id():
 # NC DATA LOADING
 # =============================================================================
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_nc_data() -> Optional[pd.DataFrame]:
     """
     Load Non-Conformance data from Google Sheets.
@@ -83,25 +57,21 @@ def load_nc_data() -> Optional[pd.DataFrame]:
             logger.warning("No spreadsheet ID configured, using sample data")
             return load_sample_data()
         
-        spreadsheet = client.open_by_key(spreadsheet_id)
-        
         # Try different sheet names for NC data
         sheet_names = ['Non-Conformance Details', 'NC Details', 'NC_Details', 'NCs', 'Non-Conformance']
-        worksheet = None
+        data = None
         
         for name in sheet_names:
             try:
-                worksheet = spreadsheet.worksheet(name)
+                data = fetch_worksheet_values(client, spreadsheet_id, name, on_refresh=load_nc_data.clear)
                 break
             except gspread.exceptions.WorksheetNotFound:
                 continue
         
-        if worksheet is None:
+        if data is None:
             logger.warning("NC sheet not found, using sample data")
             return load_sample_data()
         
-        data = worksheet.get_all_values()
-        
         if not data:
             return load_sample_data()
         
@@ -280,7 +250,7 @@ def load_sample_data() -> pd.DataFrame:
 
 def refresh_data() -> Optional[pd.DataFrame]:
     """Force refresh of NC data by clearing cache."""
-    st.cache_data.clear()
+    load_nc_data.clear()
     return load_nc_data()
 
 
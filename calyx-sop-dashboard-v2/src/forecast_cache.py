@@ -0,0 +1,378 @@
+"""
+Forecast Cache Module
+Persistent memoization of fitted forecasts
+
+Features:
+- cached_forecast: drop-in for forecasting_models.generate_forecast that
+  returns the stored ForecastResult when the same history (values and
+  dates) was already forecast with the same model, horizon and settings
+- Keys are a content hash of the series plus model name, horizon and
+  keyword arguments (and FORECAST_CACHE_VERSION and a hash of the
+  forecasting_models source), so a result can never be served for a
+  different input or by older model code; a refreshed sheet with new
+  history simply misses
+- Results are stored as plain arrays (forecast, intervals, metrics,
+  parameters, feature importance) in a SQLite file with a byte budget and
+  least-recently-used eviction (shared_cache.SQLiteBackend), so they
+  survive restarts and are reused by every session and process on the
+  host; while one process fits a series, the others wait for its result
+- Warm starts: the fitted parameters of the last ETS / ARIMA fit of each
+  series are kept too; when a series comes back with its history
+  extended by a few periods (a month closed), the refit starts from them
+  (ARIMA also keeps its searched orders, until ARIMA_ORDER_REUSE_PERIODS
+  new periods or a change in seasonality / d call for a new search)
+  instead of fitting from scratch
+- Hit / miss counters for the cache stats view
+
+Configuration (environment):
+- CALYX_FORECAST_CACHE: SQLite file (or directory) for stored forecasts;
+  "0" turns the cache off. Default: forecasts.sqlite next to
+  CALYX_SHARED_CACHE when set, else <app>/.cache/forecasts.sqlite
+- CALYX_FORECAST_CACHE_MB: byte budget (default 256)
+- CALYX_WARM_START_PERIODS: most new periods a warm-started refit accepts
+  (default 3; 0 = always fit from scratch)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from . import forecasting_models
+from .data_cache import frame_fingerprint
+from .forecasting_models import WARM_START_MODELS, ForecastResult, generate_forecast
+from .shared_cache import CacheBackend, SQLiteBackend
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_FORECAST_CACHE_MB = 256
+
+# Bump when a model's fitting or output changes, so stored results are not reused
+FORECAST_CACHE_VERSION = 1
+
+DEFAULT_WARM_START_PERIODS = 3
+
+# Unnamed series without a series_key are told apart by their first periods
+STATE_KEY_PERIODS = 12
+
+DEFAULT_FORECAST_CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'forecasts.sqlite'
+
+_NAMESPACE = 'forecast'
+_STATE_NAMESPACE = 'forecast_state'
+
+
+# =============================================================================
+# KEYS & STORED FORMAT
+# =============================================================================
+
+def _model_code_hash() -> str:
+    """Hash of the forecasting_models source (results of edited models are not reused)."""
+    try:
+        source = Path(forecasting_models.__file__).read_bytes()
+    except (OSError, TypeError) as e:
+        logger.warning(f"Cannot hash forecasting_models source ({e}), keying on FORECAST_CACHE_VERSION only")
+        return ''
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+MODEL_CODE_HASH = _model_code_hash()
+
+
+def series_fingerprint(series: pd.Series) -> str:
+    """Content hash of a series' values and index (its name is ignored)."""
+    return frame_fingerprint(series.to_frame(name='value'))
+
+
+def forecast_key(series: pd.Series, model: str, horizon: int, params: Dict[str, Any]) -> str:
+    """Cache key for one generate_forecast call."""
+    settings = repr((FORECAST_CACHE_VERSION, MODEL_CODE_HASH, model, int(horizon), sorted(params.items())))
+    return f"{series_fingerprint(series)}:{hashlib.blake2b(settings.encode(), digest_size=16).hexdigest()}"
+
+
+def series_state_key(series: pd.Series, model: str, params: Dict[str, Any],
+                     series_key: Optional[Hashable] = None) -> str:
+    """
+    Identity of a series across refreshes: its key (default: its name),
+    start date, model and settings, but not its values or length.
+
+    A series with neither key nor name is identified by a fingerprint of
+    its first STATE_KEY_PERIODS periods instead, which new periods at the
+    end don't change, so unnamed series don't share one warm-start slot.
+    """
+    if series_key is None:
+        series_key = series.name
+    if series_key is None:
+        series_key = ('history', series_fingerprint(series.iloc[:STATE_KEY_PERIODS]))
+    identity = repr((FORECAST_CACHE_VERSION, MODEL_CODE_HASH, model, sorted(params.items()),
+                     series_key, series.index[0] if len(series) else None))
+    return hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+
+
+def pack_result(result: ForecastResult) -> Dict[str, Any]:
+    """ForecastResult -> plain arrays and dicts (small to pickle, independent of the class)."""
+    missing = np.full(len(result.forecast), np.nan)
+    importance = result.feature_importance
+    return {
+        'model_name': result.model_name,
+        'index': result.forecast.index,
+        'values': np.vstack([
+            result.forecast.to_numpy(dtype=float),
+            result.confidence_lower.to_numpy(dtype=float) if result.confidence_lower is not None else missing,
+            result.confidence_upper.to_numpy(dtype=float) if result.confidence_upper is not None else missing,
+        ]),
+        'intervals': (result.confidence_lower is not None, result.confidence_upper is not None),
+        'metrics': {key: float(value) for key, value in result.metrics.items()},
+        'parameters': result.parameters,
+        'importance': (None if importance is None else
+                       (importance['Feature'].tolist(), importance['Importance'].to_numpy(dtype=float))),
+    }
+
+
+def unpack_result(packed: Dict[str, Any]) -> ForecastResult:
+    """Stored arrays -> ForecastResult."""
+    index = packed['index']
+    forecast, lower, upper = (pd.Series(row, index=index) for row in packed['values'])
+    has_lower, has_upper = packed['intervals']
+    importance = None
+    if packed['importance'] is not None:
+        features, values = packed['importance']
+        importance = pd.DataFrame({'Feature': features, 'Importance': values})
+    return ForecastResult(
+        forecast=forecast,
+        model_name=packed['model_name'],
+        confidence_lower=lower if has_lower else None,
+        confidence_upper=upper if has_upper else None,
+        metrics=dict(packed['metrics']),
+        feature_importance=importance,
+        parameters=packed['parameters']
+    )
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class ForecastCache:
+    """
+    Fitted forecasts in a CacheBackend, keyed by forecast_key.
+
+    Unreadable or unpicklable entries are treated as misses; a failing
+    fit is never stored.
+    """
+
+    def __init__(self, backend: CacheBackend, warm_start_periods: int = DEFAULT_WARM_START_PERIODS):
+        self.backend = backend
+        self.warm_start_periods = int(warm_start_periods)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stored': 0, 'warm_starts': 0}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _find(self, key: str) -> Optional[ForecastResult]:
+        try:
+            found = self.backend.get(_NAMESPACE, key)
+            return unpack_result(found[0]) if found is not None else None
+        except Exception as e:
+            logger.warning(f"Forecast cache read failed: {e}")
+            return None
+
+    def get(self, series: pd.Series, model: str, horizon: int,
+            params: Dict[str, Any]) -> Optional[ForecastResult]:
+        """The stored result, or None."""
+        result = self._find(forecast_key(series, model, horizon, params))
+        self._count('hits' if result is not None else 'misses')
+        return result
+
+    def put(self, series: pd.Series, model: str, horizon: int, params: Dict[str, Any],
+            result: ForecastResult) -> None:
+        """Store a result (failures to store are logged, not raised)."""
+        try:
+            self.backend.put(_NAMESPACE, forecast_key(series, model, horizon, params), pack_result(result))
+            self._count('stored')
+        except Exception as e:
+            logger.warning(f"Forecast cache write failed: {e}")
+
+    def warm_start(self, series: pd.Series, model: str, params: Dict[str, Any],
+                   series_key: Optional[Hashable] = None) -> Optional[Dict[str, Any]]:
+        """
+        Parameters of the last fit of this series (for the model's
+        warm_start argument), if its history was a prefix of series that is
+        at most warm_start_periods shorter; else None.
+        """
+        if model not in WARM_START_MODELS or self.warm_start_periods <= 0 or series.empty:
+            return None
+        try:
+            found = self.backend.get(_STATE_NAMESPACE, series_state_key(series, model, params, series_key))
+        except Exception as e:
+            logger.warning(f"Forecast cache read failed: {e}")
+            return None
+        if found is None:
+            return None
+        state = found[0]
+        known = len(state['index'])
+        if not known <= len(series) <= known + self.warm_start_periods:
+            return None
+        # Revised history (not just new periods): fit from scratch
+        if not (series.index[:known].equals(state['index']) and
+                np.array_equal(series.to_numpy(dtype=float)[:known], state['values'], equal_nan=True)):
+            return None
+        self._count('warm_starts')
+        return state['parameters']
+
+    def remember(self, series: pd.Series, model: str, params: Dict[str, Any], result: ForecastResult,
+                 series_key: Optional[Hashable] = None) -> None:
+        """Keep a fit's parameters as the warm start for this series' next refit."""
+        if model not in WARM_START_MODELS or series.empty:
+            return
+        state = {'index': series.index, 'values': series.to_numpy(dtype=float), 'parameters': result.parameters}
+        try:
+            self.backend.put(_STATE_NAMESPACE, series_state_key(series, model, params, series_key), state)
+        except Exception as e:
+            logger.warning(f"Forecast cache write failed: {e}")
+
+    def fit(self, series: pd.Series, model: str, horizon: int, params: Dict[str, Any],
+            series_key: Optional[Hashable] = None) -> ForecastResult:
+        """generate_forecast, warm-started from this series' last fit when possible."""
+        warm = self.warm_start(series, model, params, series_key)
+        extra = {'warm_start': warm} if warm is not None else {}
+        result = generate_forecast(series, model=model, horizon=horizon, **params, **extra)
+        self.remember(series, model, params, result, series_key)
+        return result
+
+    def get_or_fit(self, series: pd.Series, model: str, horizon: int, params: Dict[str, Any],
+                   fit: Optional[Callable[[], ForecastResult]] = None,
+                   series_key: Optional[Hashable] = None) -> ForecastResult:
+        """
+        Stored result, or a new fit stored under the key.
+
+        The fit is fit() when given, else self.fit (warm-started). Only one
+        process at a time fits a given key; the others wait and pick up its
+        result.
+        """
+        key = forecast_key(series, model, horizon, params)
+        result = self._find(key)
+        if result is not None:
+            self._count('hits')
+            return result
+        self._count('misses')
+        with self.backend.lease(_NAMESPACE, key):
+            result = self._find(key)
+            if result is not None:
+                return result
+            result = fit() if fit is not None else self.fit(series, model, horizon, params, series_key)
+            self.put(series, model, horizon, params, result)
+            return result
+
+    def clear(self) -> None:
+        """Drop every stored forecast and warm-start state."""
+        self.backend.clear(_NAMESPACE)
+        self.backend.clear(_STATE_NAMESPACE)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit / miss / stored counters of this process, plus the store's size."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {**self.backend.stats(), **counters}
+
+
+@st.cache_resource(show_spinner=False)
+def _create_forecast_cache(path: str, budget_bytes: int, warm_start_periods: int) -> ForecastCache:
+    logger.info(f"Using forecast cache at {path}")
+    return ForecastCache(SQLiteBackend(path, budget_bytes), warm_start_periods)
+
+
+def get_forecast_cache() -> Optional[ForecastCache]:
+    """The process-wide forecast cache, or None when turned off or unavailable."""
+    location = os.environ.get('CALYX_FORECAST_CACHE')
+    if location == '0':
+        return None
+    if not location:
+        shared = os.environ.get('CALYX_SHARED_CACHE')
+        if shared:
+            base = Path(shared)
+            if base.suffix and not base.is_dir():
+                base = base.parent
+            location = str(base / 'forecasts.sqlite')
+        else:
+            location = str(DEFAULT_FORECAST_CACHE_PATH)
+    path = Path(location)
+    if path.is_dir() or not path.suffix:
+        path = path / 'forecasts.sqlite'
+    try:
+        budget_mb = float(os.environ.get('CALYX_FORECAST_CACHE_MB', DEFAULT_FORECAST_CACHE_MB))
+    except ValueError:
+        budget_mb = DEFAULT_FORECAST_CACHE_MB
+    try:
+        warm_start_periods = int(os.environ.get('CALYX_WARM_START_PERIODS', DEFAULT_WARM_START_PERIODS))
+    except ValueError:
+        warm_start_periods = DEFAULT_WARM_START_PERIODS
+    try:
+        return _create_forecast_cache(str(path), int(budget_mb * 1024 * 1024), warm_start_periods)
+    except Exception as e:
+        logger.warning(f"Forecast cache unavailable: {e}")
+        return None
+
+
+def cached_forecast(
+    series: pd.Series,
+    model: str = 'exponential_smoothing',
+    horizon: int = 12,
+    series_key: Optional[Hashable] = None,
+    **kwargs
+) -> ForecastResult:
+    """
+    generate_forecast, reusing a stored result for the same history and
+    settings, and warm-starting the refit when the history only gained a
+    few periods since this series was last fit.
+
+    Args:
+        series: Historical time series
+        model: Model type (as for generate_forecast)
+        horizon: Forecast horizon
+        series_key: Identity of the series across refreshes (default: its
+            name, or its first periods when unnamed; see series_state_key)
+        **kwargs: Model-specific parameters (part of the key)
+
+    Returns:
+        ForecastResult object
+    """
+    cache = get_forecast_cache()
+    if cache is None:
+        return generate_forecast(series, model=model, horizon=horizon, **kwargs)
+    return cache.get_or_fit(series, model, horizon, kwargs, series_key=series_key)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'DEFAULT_FORECAST_CACHE_MB',
+    'FORECAST_CACHE_VERSION',
+    'DEFAULT_WARM_START_PERIODS',
+    'DEFAULT_FORECAST_CACHE_PATH',
+    'STATE_KEY_PERIODS',
+    'MODEL_CODE_HASH',
+    'series_fingerprint',
+    'forecast_key',
+    'series_state_key',
+    'pack_result',
+    'unpack_result',
+    'ForecastCache',
+    'get_forecast_cache',
+    'cached_forecast',
+]
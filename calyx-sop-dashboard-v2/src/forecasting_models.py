@@ -5,6 +5,20 @@ Implements three user-selectable forecasting approaches:
 2. ARIMA/SARIMA
 3. Machine Learning (Random Forest / Gradient Boosting)
 
+ARIMA orders are chosen by a stepwise (Hyndman-Khandakar style) search by
+default, with candidate fits run in a process pool and candidates that
+provably can't beat the best AIC skipped.
+
+forecast_batch forecasts every series of a long-format (series, period,
+value) frame in one call: seasonal naive and simple / damped-trend
+exponential smoothing are computed for all series at once with array
+arithmetic; the statsmodels / sklearn models run per series in the same
+process pool.
+
+Configuration (environment):
+- CALYX_FORECAST_WORKERS: processes for ARIMA order search and batch
+  forecasts (default up to 4; 1 = fit in the app process)
+
 Author: Xander @ Calyx Containers
 """
 
@@ -13,13 +27,20 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Tuple, Dict, Any, List
 from datetime import datetime, timedelta
+import atexit
 import logging
+import multiprocessing
+import os
+import threading
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Forecasting libraries
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from statsmodels.tsa.seasonal import seasonal_decompose
+from statsmodels.tsa.stattools import kpss
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import TimeSeriesSplit
@@ -126,10 +147,77 @@ def prepare_time_series(df: pd.DataFrame,
     return series
 
 
+# =============================================================================
+# WORKER POOL
+# =============================================================================
+
+def _default_workers() -> int:
+    try:
+        return max(1, int(os.environ.get('CALYX_FORECAST_WORKERS', min(4, os.cpu_count() or 1))))
+    except ValueError:
+        return 1
+
+
+_worker_pool: Optional[ProcessPoolExecutor] = None
+_worker_pool_lock = threading.Lock()
+
+
+def _get_worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for ARIMA candidate fits and batch forecasts, kept warm between calls."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None or _worker_pool._max_workers != workers:
+            if _worker_pool is not None:
+                _worker_pool.shutdown(wait=False)
+            # spawn: forking a process that runs server threads can deadlock
+            _worker_pool = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _worker_pool
+
+
+def _shutdown_worker_pool() -> None:
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            _worker_pool.shutdown(wait=False, cancel_futures=True)
+            _worker_pool = None
+
+
+atexit.register(_shutdown_worker_pool)
+
+
 # =============================================================================
 # EXPONENTIAL SMOOTHING (ETS)
 # =============================================================================
 
+def _ets_fitted_params(fitted) -> List[float]:
+    """Fitted values in statsmodels' parameter order: alpha, beta, gamma, l0, b0, phi, initial seasons."""
+    p = fitted.params
+    head = [p.get(key) for key in ('smoothing_level', 'smoothing_trend', 'smoothing_seasonal',
+                                   'initial_level', 'initial_trend', 'damping_trend')]
+    seasons = np.atleast_1d(p.get('initial_seasons')) if p.get('initial_seasons') is not None else []
+    return [float('nan') if v is None else float(v) for v in head] + [float(v) for v in seasons]
+
+
+def _ets_start_params(warm_start: Optional[Dict[str, Any]], trend, seasonal, seasonal_periods: int,
+                      damped_trend: bool, alpha, beta, gamma) -> Optional[np.ndarray]:
+    """start_params for ExponentialSmoothing.fit from an earlier fit with the same structure, or None."""
+    if not warm_start or warm_start.get('fitted_params') is None:
+        return None
+    structure = {'trend': trend, 'seasonal': seasonal, 'seasonal_periods': seasonal_periods,
+                 'damped_trend': damped_trend}
+    if any(warm_start.get(key) != value for key, value in structure.items()):
+        return None
+    previous = np.asarray(warm_start['fitted_params'], dtype=float)
+    # The free parameters, as ExponentialSmoothing selects them
+    free = np.array([alpha is None, bool(trend) and beta is None, bool(seasonal) and gamma is None,
+                     True, bool(trend), bool(trend) and damped_trend]
+                    + [bool(seasonal)] * (seasonal_periods if seasonal else 0))
+    if len(previous) != len(free) or np.isnan(previous[free]).any():
+        return None
+    return previous[free]
+
+
 def forecast_exponential_smoothing(
     series: pd.Series,
     horizon: int = 12,
@@ -140,7 +228,8 @@ def forecast_exponential_smoothing(
     alpha: float = None,
     beta: float = None,
     gamma: float = None,
-    confidence_level: float = 0.95
+    confidence_level: float = 0.95,
+    warm_start: Dict[str, Any] = None
 ) -> ForecastResult:
     """
     Generate forecast using Exponential Smoothing (Holt-Winters).
@@ -156,6 +245,9 @@ def forecast_exponential_smoothing(
         beta: Smoothing parameter for trend (auto if None)
         gamma: Smoothing parameter for seasonality (auto if None)
         confidence_level: Confidence level for intervals
+        warm_start: parameters of an earlier fit of this series (its history
+                    extended by a few periods); its estimates start the
+                    optimizer when the model structure is unchanged
         
     Returns:
         ForecastResult object
@@ -196,7 +288,21 @@ def forecast_exponential_smoothing(
         if gamma is not None and seasonal:
             fit_kwargs['smoothing_seasonal'] = gamma
         
-        fitted = model.fit(**fit_kwargs) if fit_kwargs else model.fit()
+        # Warm start from an earlier fit of this series, else a cold (brute-force started) fit
+        fitted = None
+        start_params = _ets_start_params(warm_start, trend, seasonal, seasonal_periods, damped_trend,
+                                         alpha, beta, gamma)
+        if start_params is not None:
+            try:
+                fitted = model.fit(start_params=start_params, **fit_kwargs)
+                if not getattr(fitted.mle_retvals, 'success', True):
+                    logger.info("ETS warm start did not converge, fitting from scratch")
+                    fitted = None
+            except Exception as e:
+                logger.info(f"ETS warm start failed, fitting from scratch: {e}")
+        warm_started = fitted is not None
+        if fitted is None:
+            fitted = model.fit(**fit_kwargs) if fit_kwargs else model.fit()
         
         # Generate forecast
         forecast = fitted.forecast(horizon)
@@ -236,7 +342,9 @@ def forecast_exponential_smoothing(
             'trend': trend,
             'seasonal': seasonal,
             'seasonal_periods': seasonal_periods,
-            'damped_trend': damped_trend
+            'damped_trend': damped_trend,
+            'fitted_params': _ets_fitted_params(fitted),
+            'warm_started': warm_started
         }
         
         return ForecastResult(
@@ -257,63 +365,249 @@ def forecast_exponential_smoothing(
 # ARIMA / SARIMA
 # =============================================================================
 
+# Candidate fits that failed (or went unfitted) are recorded as None
+_FitResult = Optional[Dict[str, Any]]
+
+
+def _arima_model(series: pd.Series, order: Tuple[int, int, int],
+                 seasonal_order: Tuple[int, int, int, int]) -> SARIMAX:
+    return SARIMAX(
+        series,
+        order=order,
+        seasonal_order=seasonal_order if seasonal_order[3] > 0 else (0, 0, 0, 0),
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+
+
+def _fit_arima_candidate(series: pd.Series, order: Tuple[int, int, int],
+                         seasonal_order: Tuple[int, int, int, int], maxiter: int,
+                         keep_fitted: bool = False) -> _FitResult:
+    """Fit one candidate order (in a search worker); AIC and parameters, or None if it failed."""
+    try:
+        fitted = _arima_model(series, order, seasonal_order).fit(disp=False, maxiter=maxiter)
+    except Exception:
+        return None
+    if not np.isfinite(fitted.aic):
+        return None
+    return {
+        'aic': float(fitted.aic),
+        'params': np.asarray(fitted.params),
+        'converged': bool(fitted.mle_retvals.get('converged', True)) if fitted.mle_retvals else True,
+        'fitted': fitted if keep_fitted else None
+    }
+
+
+def _fit_candidates(series: pd.Series, orders: List[Tuple[int, int, int]],
+                    seasonal_order: Tuple[int, int, int, int], maxiter: int,
+                    n_jobs: int) -> Dict[Tuple[int, int, int], _FitResult]:
+    """Fit a batch of candidate orders, in the process pool when there is more than one."""
+    if n_jobs > 1 and len(orders) > 1:
+        try:
+            pool = _get_worker_pool(n_jobs)
+            futures = {order: pool.submit(_fit_arima_candidate, series, order, seasonal_order, maxiter)
+                       for order in orders}
+            return {order: future.result() for order, future in futures.items()}
+        except BrokenProcessPool as e:
+            logger.warning(f"ARIMA search pool unavailable, fitting in process: {e}")
+            _shutdown_worker_pool()
+    return {order: _fit_arima_candidate(series, order, seasonal_order, maxiter, keep_fitted=True)
+            for order in orders}
+
+
+def _refit_arima(series: pd.Series, order: Tuple[int, int, int],
+                 seasonal_order: Tuple[int, int, int, int],
+                 start_params: np.ndarray) -> Tuple[Any, bool]:
+    """
+    Fit starting from earlier estimates; (fitted, True) if that converges.
+
+    Otherwise also fits from statsmodels' default start and keeps the
+    better of the two by AIC, so a poor starting point never makes the
+    result worse than a cold fit: (fitted, whether the warm fit won).
+    """
+    model = _arima_model(series, order, seasonal_order)
+    warm = None
+    try:
+        warm = model.fit(start_params=start_params, disp=False, maxiter=200)
+        if not warm.mle_retvals or warm.mle_retvals.get('converged', True):
+            return warm, True
+    except Exception as e:
+        logger.info(f"ARIMA warm start failed, fitting from scratch: {e}")
+    cold = model.fit(disp=False, maxiter=200)
+    if warm is not None and np.isfinite(warm.aic) and warm.aic < cold.aic:
+        return warm, True
+    return cold, False
+
+
+def _aic_lower_bound(order: Tuple[int, int, int],
+                     results: Dict[Tuple[int, int, int], _FitResult]) -> float:
+    """
+    Lowest AIC order can reach, given converged fits of models that nest it.
+
+    ARMA(p, q) is a special case of ARMA(p', q') for p' >= p, q' >= q (same
+    differencing), so at the MLE its log-likelihood is no higher and its
+    AIC is at least AIC' - 2 * (p' + q' - p - q).
+    """
+    p, d, q = order
+    bound = -np.inf
+    for (p2, d2, q2), result in results.items():
+        if result is None or not result['converged'] or d2 != d or p2 < p or q2 < q:
+            continue
+        if (p2, q2) != (p, q):
+            bound = max(bound, result['aic'] - 2 * (p2 + q2 - p - q))
+    return bound
+
+
+def _choose_d(series: pd.Series, max_d: int, seasonal_period: int = 0, alpha: float = 0.05) -> int:
+    """Differencing order from repeated KPSS tests (after the seasonal difference, if any)."""
+    y = series.astype(float)
+    if seasonal_period:
+        y = y.diff(seasonal_period).dropna()
+    d = 0
+    while d < max_d and len(y) > 3 and y.std() > 0:
+        try:
+            p_value = kpss(y, regression='c', nlags='auto')[1]
+        except Exception:
+            break
+        if p_value >= alpha:
+            break
+        y = y.diff().dropna()
+        d += 1
+    return d
+
+
 def auto_arima_params(series: pd.Series, 
                       seasonal: bool = True,
                       seasonal_period: int = 12,
                       max_p: int = 3,
                       max_q: int = 3,
-                      max_d: int = 2) -> Dict[str, Tuple]:
+                      max_d: int = 2,
+                      method: str = 'stepwise',
+                      n_jobs: int = None,
+                      return_model: bool = False,
+                      maxiter: int = 100,
+                      max_steps: int = 50) -> Dict[str, Any]:
     """
     Auto-select ARIMA parameters using AIC minimization.
     
+    'stepwise' (default) picks d with KPSS tests, starts from (2,d,2),
+    (0,d,0), (1,d,0) and (0,d,1), then fits the p/q neighbours of the best
+    model (each round in parallel) until none improves on it. 'grid' fits
+    every (p, d, q) as before, largest models first. Both skip candidates
+    whose AIC lower bound (_aic_lower_bound) is no better than the best
+    found so far. Seasonal models use seasonal order (1, 1, 1, s).
+    
     Args:
         series: Time series data
         seasonal: Whether to fit seasonal model
         seasonal_period: Seasonal period
         max_p, max_q, max_d: Maximum values to search
+        method: 'stepwise' or 'grid'
+        n_jobs: Worker processes for candidate fits (CALYX_FORECAST_WORKERS if None)
+        return_model: Also return the winning fitted model (key 'model')
+        maxiter: Optimizer iterations per candidate
+        max_steps: Stepwise rounds before giving up
         
     Returns:
-        Dictionary with optimal parameters
-    """
-    best_aic = np.inf
-    best_params = (1, 1, 1)
-    best_seasonal_params = (0, 0, 0, seasonal_period) if seasonal else (0, 0, 0, 0)
-    
-    # Grid search (simplified for performance)
-    for p in range(max_p + 1):
-        for d in range(max_d + 1):
-            for q in range(max_q + 1):
-                try:
-                    if seasonal and len(series) >= 2 * seasonal_period:
-                        model = SARIMAX(
-                            series,
-                            order=(p, d, q),
-                            seasonal_order=(1, 1, 1, seasonal_period),
-                            enforce_stationarity=False,
-                            enforce_invertibility=False
-                        )
-                    else:
-                        model = SARIMAX(
-                            series,
-                            order=(p, d, q),
-                            enforce_stationarity=False,
-                            enforce_invertibility=False
-                        )
-                    
-                    fitted = model.fit(disp=False, maxiter=100)
-                    
-                    if fitted.aic < best_aic:
-                        best_aic = fitted.aic
-                        best_params = (p, d, q)
-                        if seasonal and len(series) >= 2 * seasonal_period:
-                            best_seasonal_params = (1, 1, 1, seasonal_period)
-                            
-                except Exception:
-                    continue
+        Dictionary with optimal parameters ('order', 'seasonal_order'), the
+        winner's 'aic' and whether it 'converged', and 'fits' / 'pruned'
+        candidate counts
+    """
+    if method not in ('stepwise', 'grid'):
+        raise ValueError(f"Unknown ARIMA search method: {method}")
+    n_jobs = _default_workers() if n_jobs is None else max(1, n_jobs)
+    use_seasonal = seasonal and len(series) >= 2 * seasonal_period
+    seasonal_order = (1, 1, 1, seasonal_period) if use_seasonal else (0, 0, 0, 0)
+    
+    results: Dict[Tuple[int, int, int], _FitResult] = {}
+    pruned = set()
+    best = {'order': None, 'aic': np.inf}
+    
+    def evaluate(orders):
+        todo = []
+        for order in dict.fromkeys(orders):
+            if order in results or order in pruned:
+                continue
+            if _aic_lower_bound(order, results) >= best['aic']:
+                pruned.add(order)
+            else:
+                todo.append(order)
+        if not todo:
+            return
+        for order, result in _fit_candidates(series, todo, seasonal_order, maxiter, n_jobs).items():
+            results[order] = result
+            if result is not None and result['aic'] < best['aic']:
+                if best['order'] is not None and results[best['order']] is not None:
+                    results[best['order']]['fitted'] = None  # only the winner's model is kept
+                best.update(order=order, aic=result['aic'])
+            elif result is not None:
+                result['fitted'] = None
+    
+    if method == 'grid':
+        # Largest models first, so their fits bound the models they nest
+        orders = [(p, d, q) for p in range(max_p + 1) for d in range(max_d + 1) for q in range(max_q + 1)]
+        for size in range(max_p + max_q, -1, -1):
+            evaluate([order for order in orders if order[0] + order[2] == size])
+    else:
+        d = _choose_d(series, max_d, seasonal_period if use_seasonal else 0)
+        evaluate([(min(2, max_p), d, min(2, max_q)), (0, d, 0), (min(1, max_p), d, 0), (0, d, min(1, max_q))])
+        for _ in range(max_steps):
+            current = best['order']
+            if current is None:
+                break
+            p, _, q = current
+            evaluate([(p + dp, d, q + dq)
+                      for dp, dq in ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1))
+                      if 0 <= p + dp <= max_p and 0 <= q + dq <= max_q])
+            if best['order'] == current:
+                break
     
+    fitted_count = sum(1 for result in results.values() if result is not None)
+    logger.info(f"ARIMA {method} search: {fitted_count} fits, {len(pruned)} pruned, best {best['order']}")
+    
+    if best['order'] is None:
+        return {
+            'order': (1, 1, 1),
+            'seasonal_order': seasonal_order,
+            'aic': None,
+            'converged': False,
+            'fits': 0,
+            'pruned': len(pruned),
+            **({'model': None} if return_model else {})
+        }
+    
+    winner = results[best['order']]
+    params = {
+        'order': best['order'],
+        'seasonal_order': seasonal_order,
+        'aic': winner['aic'],
+        'converged': winner['converged'],
+        'fits': fitted_count,
+        'pruned': len(pruned)
+    }
+    if return_model:
+        fitted = winner['fitted']
+        if fitted is None:
+            # Fitted in a worker: rebuild the results from its parameters (no optimization)
+            fitted = _arima_model(series, best['order'], seasonal_order).smooth(winner['params'])
+        params['model'] = fitted
+    return params
+
+
+# A warm start keeps the orders found by a search for at most this many new
+# periods in total; after that (or sooner if the seasonality / d the search
+# was based on no longer holds) the search is run again
+ARIMA_ORDER_REUSE_PERIODS = 12
+
+
+def _order_search_basis(series: pd.Series) -> Dict[str, Any]:
+    """What auto_arima_params's stepwise search derives from the data: seasonality and d."""
+    has_seasonal, seasonal_period = detect_seasonality(series)
+    seasonal = bool(has_seasonal) and len(series) >= 2 * seasonal_period
     return {
-        'order': best_params,
-        'seasonal_order': best_seasonal_params
+        'seasonal': seasonal,
+        'seasonal_period': seasonal_period,
+        'd': _choose_d(series, 2, seasonal_period if seasonal else 0)
     }
 
 
@@ -323,7 +617,9 @@ def forecast_arima(
     order: Tuple[int, int, int] = None,
     seasonal_order: Tuple[int, int, int, int] = None,
     auto_params: bool = True,
-    confidence_level: float = 0.95
+    confidence_level: float = 0.95,
+    search_method: str = 'stepwise',
+    warm_start: Dict[str, Any] = None
 ) -> ForecastResult:
     """
     Generate forecast using ARIMA/SARIMA.
@@ -335,36 +631,64 @@ def forecast_arima(
         seasonal_order: Seasonal order (P, D, Q, s) - auto if None
         auto_params: Whether to auto-select parameters
         confidence_level: Confidence level for intervals
+        search_method: Order search for auto_params ('stepwise' or 'grid')
+        warm_start: parameters of an earlier fit of this series (its history
+                    extended by a few periods); its estimates start the
+                    optimizer, and its searched orders are kept (no search)
+                    for up to ARIMA_ORDER_REUSE_PERIODS new periods while
+                    the seasonality and d they were based on still hold
         
     Returns:
         ForecastResult object
     """
     try:
-        # Auto-select parameters if needed
-        if auto_params or order is None:
-            has_seasonal, seasonal_period = detect_seasonality(series)
+        fitted = None
+        search = auto_params or order is None
+        basis = _order_search_basis(series) if search else None
+        order_search = None  # length and basis of the search that chose the orders
+        
+        # Warm start: keep the earlier fit's orders (no search), start from its estimates
+        warm_started = False
+        if warm_start and warm_start.get('fitted_params') is not None:
+            warm_order = tuple(warm_start['order'])
+            warm_seasonal = tuple(warm_start['seasonal_order'])
+            if search:
+                previous = warm_start.get('order_search')
+                reuse = (previous is not None
+                         and 0 <= len(series) - previous['periods'] <= ARIMA_ORDER_REUSE_PERIODS
+                         and all(previous.get(k) == v for k, v in basis.items()))
+            else:
+                reuse = tuple(order) == warm_order and tuple(seasonal_order or (0, 0, 0, 0)) == warm_seasonal
+            if reuse:
+                order, seasonal_order = warm_order, warm_seasonal
+                order_search = warm_start.get('order_search')
+                fitted, warm_started = _refit_arima(series, order, seasonal_order,
+                                                    np.asarray(warm_start['fitted_params'], dtype=float))
+        
+        # Auto-select parameters if needed (the search's winning fit is reused)
+        if fitted is None and search:
             params = auto_arima_params(
                 series, 
-                seasonal=has_seasonal,
-                seasonal_period=seasonal_period
+                seasonal=basis['seasonal'],
+                seasonal_period=basis['seasonal_period'],
+                method=search_method,
+                return_model=True
             )
             order = params['order']
             seasonal_order = params['seasonal_order']
+            fitted = params['model']
+            order_search = {'periods': len(series), **basis}
+            if fitted is not None and not params['converged']:
+                # Finish the optimization from where the search stopped
+                fitted, _ = _refit_arima(series, order, seasonal_order, np.asarray(fitted.params))
         
         # Handle no seasonality
         if seasonal_order is None or seasonal_order[3] == 0:
             seasonal_order = (0, 0, 0, 0)
         
         # Build and fit model
-        model = SARIMAX(
-            series,
-            order=order,
-            seasonal_order=seasonal_order if seasonal_order[3] > 0 else None,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
-        
-        fitted = model.fit(disp=False, maxiter=200)
+        if fitted is None:
+            fitted = _arima_model(series, order, seasonal_order).fit(disp=False, maxiter=200)
         
         # Generate forecast with confidence intervals
         forecast_obj = fitted.get_forecast(horizon)
@@ -390,7 +714,10 @@ def forecast_arima(
         
         parameters = {
             'order': order,
-            'seasonal_order': seasonal_order
+            'seasonal_order': seasonal_order,
+            'fitted_params': [float(v) for v in np.asarray(fitted.params)],
+            'warm_started': warm_started,
+            'order_search': order_search
         }
         
         return ForecastResult(
@@ -456,6 +783,68 @@ def create_ml_features(series: pd.Series,
     return df
 
 
+class RecursiveFeatureState:
+    """
+    The last create_ml_features row of a series that grows one value at a time.
+
+    Keeps the most recent values in a ring buffer sized to the longest lag,
+    rolling window or year-over-year offset, so appending a forecast and
+    reading the next feature row costs the same at any history length
+    (instead of rebuilding every feature over the whole series each step).
+    Values match create_ml_features on the extended series, up to float
+    rounding in the rolling mean / std.
+    """
+
+    def __init__(self, series: pd.Series, lags: List[int], rolling_windows: List[int]):
+        self.lags = list(lags)
+        self.rolling_windows = list(rolling_windows)
+        self.capacity = max(self.lags + [w + 1 for w in self.rolling_windows] + [13])
+        self.buffer = np.full(self.capacity, np.nan)
+        recent = series.to_numpy(dtype=float)[-self.capacity:]
+        self.buffer[:len(recent)] = recent
+        self.end = len(recent) - 1
+        self.length = len(series)
+        self.last_date = series.index[-1]
+        self.dated = isinstance(series.index, pd.DatetimeIndex)
+
+    def append(self, value: float, date: pd.Timestamp) -> None:
+        """Extend the series by one period."""
+        self.end = (self.end + 1) % self.capacity
+        self.buffer[self.end] = value
+        self.length += 1
+        self.last_date = date
+
+    def _back(self, offsets: np.ndarray) -> np.ndarray:
+        """Values offsets periods before the last one (NaN before the start of the series)."""
+        values = self.buffer[(self.end - offsets) % self.capacity]
+        return np.where(offsets < self.length, values, np.nan)
+
+    def features(self, feature_cols: List[str]) -> np.ndarray:
+        """Feature row (1 x len(feature_cols)) for the last period."""
+        row = {}
+        for lag in self.lags:
+            row[f'lag_{lag}'] = self._back(np.array([lag]))[0]
+        for window in self.rolling_windows:
+            values = self._back(np.arange(1, window + 1))
+            complete = not np.isnan(values).any()
+            row[f'rolling_mean_{window}'] = values.mean() if complete else np.nan
+            row[f'rolling_std_{window}'] = values.std(ddof=1) if complete else np.nan
+            row[f'rolling_min_{window}'] = values.min() if complete else np.nan
+            row[f'rolling_max_{window}'] = values.max() if complete else np.nan
+        if self.dated:
+            month = np.array([self.last_date.month])
+            row['month'] = month[0]
+            row['quarter'] = self.last_date.quarter
+            row['year'] = self.last_date.year
+            row['month_sin'] = np.sin(2 * np.pi * month / 12)[0]
+            row['month_cos'] = np.cos(2 * np.pi * month / 12)[0]
+        row['trend'] = self.length - 1
+        current, year_ago = self._back(np.array([0, 12]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            row['yoy_change'] = current / year_ago - 1
+        return np.array([[row[col] for col in feature_cols]], dtype=float)
+
+
 def forecast_ml(
     series: pd.Series,
     horizon: int = 12,
@@ -464,7 +853,8 @@ def forecast_ml(
     max_depth: int = 10,
     confidence_level: float = 0.95,
     lags: List[int] = [1, 2, 3, 6, 12],
-    rolling_windows: List[int] = [3, 6, 12]
+    rolling_windows: List[int] = [3, 6, 12],
+    feature_mode: str = 'incremental'
 ) -> ForecastResult:
     """
     Generate forecast using Machine Learning (Random Forest or Gradient Boosting).
@@ -478,10 +868,16 @@ def forecast_ml(
         confidence_level: Confidence level for intervals
         lags: Lag periods for features
         rolling_windows: Rolling window sizes
+        feature_mode: How each recursive step gets its features: 'incremental'
+                      (RecursiveFeatureState) or 'rebuild' (create_ml_features
+                      on the whole extended series)
         
     Returns:
         ForecastResult object
     """
+    if feature_mode not in ('incremental', 'rebuild'):
+        raise ValueError(f"Unknown feature_mode: {feature_mode}")
+    
     try:
         # Create features
         df = create_ml_features(series, lags=lags, rolling_windows=rolling_windows)
@@ -542,11 +938,15 @@ def forecast_ml(
         # Iteratively predict future values
         forecast_values = []
         current_series = series.copy()
+        state = RecursiveFeatureState(series, lags, rolling_windows) if feature_mode == 'incremental' else None
         
         for i in range(horizon):
             # Create features for next period
-            temp_df = create_ml_features(current_series, lags=lags, rolling_windows=rolling_windows)
-            last_features = temp_df[feature_cols].iloc[-1:].values
+            if state is not None:
+                last_features = state.features(feature_cols)
+            else:
+                temp_df = create_ml_features(current_series, lags=lags, rolling_windows=rolling_windows)
+                last_features = temp_df[feature_cols].iloc[-1:].values
             
             # Handle any remaining NaN
             last_features = np.nan_to_num(last_features, nan=0)
@@ -559,10 +959,13 @@ def forecast_ml(
             forecast_values.append(pred)
             
             # Add prediction to series for next iteration
-            current_series = pd.concat([
-                current_series,
-                pd.Series([pred], index=[future_dates[i]])
-            ])
+            if state is not None:
+                state.append(pred, future_dates[i])
+            else:
+                current_series = pd.concat([
+                    current_series,
+                    pd.Series([pred], index=[future_dates[i]])
+                ])
         
         forecast = pd.Series(forecast_values, index=future_dates)
         
@@ -756,6 +1159,10 @@ def calculate_forecast_accuracy(
     return metrics
 
 
+# Models that accept warm_start (the parameters of an earlier fit of the same series)
+WARM_START_MODELS = ('exponential_smoothing', 'arima')
+
+
 def generate_forecast(
     series: pd.Series,
     model: str = 'exponential_smoothing',
@@ -767,14 +1174,17 @@ def generate_forecast(
     
     Args:
         series: Historical time series
-        model: Model type ('exponential_smoothing', 'arima', 'ml_random_forest', 'ml_gradient_boosting')
+        model: Model type ('exponential_smoothing', 'arima', 'ml_random_forest', 'ml_gradient_boosting',
+               or one of VECTORIZED_MODELS: 'seasonal_naive', 'ses', 'holt')
         horizon: Forecast horizon
         **kwargs: Model-specific parameters
         
     Returns:
         ForecastResult object
     """
-    if model == 'exponential_smoothing':
+    if model in VECTORIZED_MODELS:
+        return _forecast_vectorized_series(series, model, horizon=horizon, **kwargs)
+    elif model == 'exponential_smoothing':
         return forecast_exponential_smoothing(series, horizon=horizon, **kwargs)
     elif model == 'arima':
         return forecast_arima(series, horizon=horizon, **kwargs)
@@ -784,3 +1194,281 @@ def generate_forecast(
         return forecast_ml(series, horizon=horizon, model_type='gradient_boosting', **kwargs)
     else:
         raise ValueError(f"Unknown model type: {model}")
+
+
+# =============================================================================
+# BATCH FORECASTING
+# =============================================================================
+
+# Forecast for every series at once with array arithmetic
+VECTORIZED_MODELS = ('seasonal_naive', 'ses', 'holt')
+
+# Fitted per series through generate_forecast, in the worker pool
+POOLED_MODELS = ('exponential_smoothing', 'arima', 'ml_random_forest', 'ml_gradient_boosting')
+
+# Smoothing parameters searched by 'ses' / 'holt' (lowest in-sample SSE per series wins)
+_ALPHA_GRID = np.linspace(0.05, 0.95, 19)
+_BETA_GRID = np.linspace(0.05, 0.5, 10)
+_HOLT_DAMPING = 0.98
+
+_VECTORIZED_NAMES = {
+    'seasonal_naive': 'Seasonal Naive',
+    'ses': 'Simple Exponential Smoothing',
+    'holt': 'Damped Holt',
+}
+
+# Series per worker task for the pooled models
+BATCH_CHUNK_SIZE = 25
+
+
+def _to_wide(history: pd.DataFrame, id_col: str, period_col: str, value_col: str) -> pd.DataFrame:
+    """
+    Long (series, period, value) rows -> one column per series on a month-start grid.
+
+    Rows for the same series and month are summed. Months before a series'
+    first observation are NaN; missing months after it are 0 (no demand),
+    as in prepare_time_series.
+    """
+    periods = pd.to_datetime(history[period_col]).dt.to_period('M').dt.to_timestamp()
+    long = pd.DataFrame({
+        id_col: history[id_col].to_numpy(),
+        period_col: periods.to_numpy(),
+        value_col: pd.to_numeric(history[value_col], errors='coerce').to_numpy(),
+    })
+    wide = long.groupby([id_col, period_col], observed=True)[value_col].sum().unstack(id_col)
+    wide = wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq='MS'))
+    return wide.fillna(0).where(wide.notna().cummax())
+
+
+def _ets_fit(values: np.ndarray, alphas: np.ndarray, betas: Optional[np.ndarray] = None,
+             phi: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Additive-error simple (betas None) or damped-trend exponential smoothing
+    for every column of values (T x N) and every (alpha, beta) pair at once.
+
+    Each series starts from its first observation (level = that value,
+    trend = 0). Returns the final level, trend and residual RMS of the
+    best pair per series, and that pair.
+    """
+    alpha, beta = np.meshgrid(alphas, betas if betas is not None else [0.0], indexing='ij')
+    alpha, beta = alpha.reshape(-1, 1), beta.reshape(-1, 1)
+    n_series = values.shape[1]
+    level = np.full((len(alpha), n_series), np.nan)
+    trend = np.zeros_like(level)
+    sse = np.zeros_like(level)
+    steps = np.zeros(n_series)
+    for y in values:
+        observed = ~np.isnan(y)
+        started = ~np.isnan(level[0])
+        update = observed & started
+        predicted = level + phi * trend
+        error = np.where(update, y - predicted, 0.0)
+        sse += error ** 2
+        level = np.where(update, predicted + alpha * error, level)
+        trend = np.where(update, phi * trend + alpha * beta * error, trend)
+        first = observed & ~started
+        level[:, first] = y[first]
+        steps += update
+    best = sse.argmin(axis=0)
+    cols = np.arange(n_series)
+    rms = np.sqrt(sse[best, cols] / np.maximum(steps, 1))
+    return level[best, cols], trend[best, cols], rms, alpha.ravel()[best], beta.ravel()[best]
+
+
+def _seasonal_naive(values: np.ndarray, seasonal_periods: int,
+                    horizon: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Repeat the last season of every column of values (T x N); series with
+    less than a season of history repeat their last value (naive).
+
+    Returns the forecast (N x horizon), residual RMS and lag per series.
+    """
+    n_obs = (~np.isnan(values)).sum(axis=0)
+    lags = np.where(n_obs >= seasonal_periods, seasonal_periods, 1)
+    forecast = np.empty((values.shape[1], horizon))
+    rms = np.empty(values.shape[1])
+    for lag in np.unique(lags):
+        cols = lags == lag
+        block = values[:, cols]
+        forecast[cols] = block[len(block) - lag + np.arange(horizon) % lag].T
+        resid = block[lag:] - block[:-lag]
+        rms[cols] = np.sqrt(np.nanmean(resid ** 2, axis=0)) if len(resid) else np.nan
+    return forecast, np.nan_to_num(rms), lags
+
+
+def _forecast_vectorized(values: np.ndarray, model: str, horizon: int = 12,
+                         seasonal_periods: int = 12,
+                         confidence_level: float = 0.95) -> Dict[str, np.ndarray]:
+    """Forecast, intervals and chosen parameters of a vectorized model for every column of values."""
+    if model == 'seasonal_naive':
+        forecast, rms, lags = _seasonal_naive(values, seasonal_periods, horizon)
+        parameters = {'seasonal_lag': lags}
+    else:
+        phi = _HOLT_DAMPING if model == 'holt' else 1.0
+        level, trend, rms, alpha, beta = _ets_fit(values, _ALPHA_GRID,
+                                                  _BETA_GRID if model == 'holt' else None, phi)
+        forecast = level[:, None] + trend[:, None] * np.cumsum(phi ** np.arange(1, horizon + 1))
+        parameters = {'alpha': alpha, 'beta': beta} if model == 'holt' else {'alpha': alpha}
+
+    # Same interval construction as forecast_exponential_smoothing
+    z_score = stats.norm.ppf((1 + confidence_level) / 2)
+    margin = z_score * rms[:, None] * np.sqrt(np.arange(1, horizon + 1))
+    return {
+        'forecast': np.clip(forecast, 0, None),
+        'lower': np.clip(forecast - margin, 0, None),
+        'upper': forecast + margin,
+        'rms': rms,
+        'parameters': parameters,
+    }
+
+
+def _forecast_vectorized_series(series: pd.Series, model: str, horizon: int = 12,
+                                **kwargs) -> ForecastResult:
+    """One series through the vectorized models (generate_forecast entry point)."""
+    values = series.to_numpy(dtype=float).reshape(-1, 1)
+    result = _forecast_vectorized(values, model, horizon=horizon, **kwargs)
+    index = pd.date_range(series.index[-1], periods=horizon + 1, freq='MS')[1:]
+    return ForecastResult(
+        forecast=pd.Series(result['forecast'][0], index=index),
+        model_name=_VECTORIZED_NAMES[model],
+        confidence_lower=pd.Series(result['lower'][0], index=index),
+        confidence_upper=pd.Series(result['upper'][0], index=index),
+        metrics={'RMSE': float(result['rms'][0])},
+        parameters={key: value[0].item() for key, value in result['parameters'].items()}
+    )
+
+
+def _forecast_chunk(model: str, chunk: List[Tuple[Any, pd.Series, Optional[Dict[str, Any]]]], horizon: int,
+                    kwargs: Dict[str, Any], in_worker: bool = False) -> List[Tuple[Any, Any]]:
+    """Forecast a chunk of (series id, series, warm start): (series id, ForecastResult or error message) each."""
+    if in_worker:
+        # ARIMA order search inside a worker fits in that worker
+        os.environ['CALYX_FORECAST_WORKERS'] = '1'
+    results = []
+    for series_id, series, warm_start in chunk:
+        extra = {'warm_start': warm_start} if warm_start is not None else {}
+        try:
+            results.append((series_id, generate_forecast(series, model=model, horizon=horizon, **kwargs, **extra)))
+        except Exception as e:
+            results.append((series_id, str(e) or type(e).__name__))
+    return results
+
+
+def _run_chunks(model: str, chunks: List[List[Tuple[Any, pd.Series, Optional[Dict[str, Any]]]]], horizon: int,
+                kwargs: Dict[str, Any], n_jobs: int) -> List[Tuple[Any, Any]]:
+    """Chunks in the process pool when there is more than one, in order."""
+    if n_jobs > 1 and len(chunks) > 1:
+        try:
+            pool = _get_worker_pool(n_jobs)
+            futures = [pool.submit(_forecast_chunk, model, chunk, horizon, kwargs, True) for chunk in chunks]
+            return [item for future in futures for item in future.result()]
+        except BrokenProcessPool as e:
+            logger.warning(f"Forecast pool unavailable, forecasting in process: {e}")
+            _shutdown_worker_pool()
+    return [item for chunk in chunks for item in _forecast_chunk(model, chunk, horizon, kwargs)]
+
+
+def forecast_batch(
+    history: pd.DataFrame,
+    model: str = 'exponential_smoothing',
+    horizon: int = 12,
+    id_col: str = 'series_id',
+    period_col: str = 'period',
+    value_col: str = 'value',
+    n_jobs: int = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    use_cache: bool = True,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Forecast every series of a long-format history frame in one call.
+    
+    Args:
+        history: One row per series and period (monthly; several rows for
+                 the same series and month are summed)
+        model: Any generate_forecast model. VECTORIZED_MODELS are computed
+               for all series at once; POOLED_MODELS run per series in
+               worker processes
+        horizon: Forecast horizon
+        id_col: Series identifier column (category, SKU, ...)
+        period_col: Period column
+        value_col: Value column
+        n_jobs: Worker processes for pooled models (CALYX_FORECAST_WORKERS if None)
+        chunk_size: Series per worker task
+        use_cache: Reuse / store pooled-model results in the forecast cache
+                   (forecast_cache), so unchanged series are not refit and
+                   series with a few new periods are warm-started
+        **kwargs: Model-specific parameters, as for generate_forecast
+        
+    Returns:
+        Tidy DataFrame with id_col, period_col, forecast, lower, upper and
+        model columns, horizon rows per series, all series forecast from
+        the month after the latest period in history. Series whose model
+        failed are left out and listed in attrs['failed'] (id -> error).
+    """
+    if model not in VECTORIZED_MODELS and model not in POOLED_MODELS:
+        raise ValueError(f"Unknown model type: {model}")
+    columns = [id_col, period_col, 'forecast', 'lower', 'upper', 'model']
+    if history.empty:
+        return pd.DataFrame(columns=columns)
+
+    wide = _to_wide(history, id_col, period_col, value_col)
+    future = pd.date_range(wide.index[-1], periods=horizon + 1, freq='MS')[1:]
+    failed: Dict[Any, str] = {}
+
+    if model in VECTORIZED_MODELS:
+        result = _forecast_vectorized(wide.to_numpy(dtype=float), model, horizon=horizon, **kwargs)
+        ids = wide.columns
+        forecast, lower, upper = result['forecast'], result['lower'], result['upper']
+        names = _VECTORIZED_NAMES[model]
+    else:
+        # Each series from its first observation; slicing keeps the month-start freq
+        series = {series_id: wide[series_id].loc[wide[series_id].first_valid_index():]
+                  for series_id in wide.columns}
+        cache = None
+        if use_cache:
+            from .forecast_cache import get_forecast_cache  # imports this module
+            cache = get_forecast_cache()
+        fitted: Dict[Any, ForecastResult] = {}
+        if cache is not None:
+            for series_id, values in series.items():
+                hit = cache.get(values, model, horizon, kwargs)
+                if hit is not None:
+                    fitted[series_id] = hit
+        todo = [(series_id, values, cache.warm_start(values, model, kwargs) if cache is not None else None)
+                for series_id, values in series.items() if series_id not in fitted]
+        chunks = [todo[i:i + max(1, chunk_size)] for i in range(0, len(todo), max(1, chunk_size))]
+        n_jobs = _default_workers() if n_jobs is None else max(1, n_jobs)
+        for series_id, outcome in _run_chunks(model, chunks, horizon, kwargs, n_jobs):
+            if isinstance(outcome, ForecastResult):
+                fitted[series_id] = outcome
+                if cache is not None:
+                    cache.put(series[series_id], model, horizon, kwargs, outcome)
+                    cache.remember(series[series_id], model, kwargs, outcome)
+            else:
+                failed[series_id] = outcome
+        done = [(series_id, fitted[series_id]) for series_id in series if series_id in fitted]
+        if failed:
+            logger.warning(f"{model} failed for {len(failed)} of {wide.shape[1]} series")
+        if not done:
+            empty = pd.DataFrame(columns=columns)
+            empty.attrs['failed'] = failed
+            return empty
+        ids = pd.Index([series_id for series_id, _ in done], name=wide.columns.name)
+        forecast = np.vstack([r.forecast.to_numpy(dtype=float) for _, r in done])
+        lower = np.vstack([(r.confidence_lower if r.confidence_lower is not None else r.forecast)
+                           .to_numpy(dtype=float) for _, r in done])
+        upper = np.vstack([(r.confidence_upper if r.confidence_upper is not None else r.forecast)
+                           .to_numpy(dtype=float) for _, r in done])
+        names = np.repeat([r.model_name for _, r in done], horizon)
+
+    result = pd.DataFrame({
+        id_col: ids.repeat(horizon),
+        period_col: np.tile(future, len(ids)),
+        'forecast': forecast.ravel(),
+        'lower': lower.ravel(),
+        'upper': upper.ravel(),
+        'model': names,
+    })
+    result.attrs['failed'] = failed
+    return result
@@ -0,0 +1,442 @@
+"""
+Memory Cache Module
+One memory-bounded, LRU-evicting cache for every loader and computation
+
+Features:
+- MemoryCache: process-wide store with a byte budget; every entry's size
+  is measured when it is stored (DataFrames via memory_usage(deep=True))
+  and the least recently used entries are evicted once the budget is
+  exceeded, so the cache can't grow with every CACHE_VERSION bump, range
+  string or filter combination the way unbounded st.cache_data does
+- Optional per-entry TTL for computation caches
+- @memory_cached: drop-in for @st.cache_data on computations; arguments
+  whose names start with "_" are not part of the key (as with
+  st.cache_data) and DataFrame arguments are keyed by their content
+  fingerprint instead of being hashed on every call
+- Callers get shallow copies where pandas copy-on-write keeps their edits
+  off the cached value (deep copies on pandas 2 without it), not a pickle
+  round trip per hit
+- Hit / miss / eviction counters and per-entry sizes for the stats view
+  (render_cache_stats)
+- Optional second level shared by all processes (shared_cache), with
+  cross-process leases so only one replica computes each value
+
+Configuration (environment):
+- CALYX_CACHE_BUDGET_MB: memory budget for cached values (default 512)
+- CALYX_REGISTRY_BUDGET_MB: budget of the sheet grids, see sheet_registry
+- CALYX_SHARED_CACHE / CALYX_SHARED_CACHE_MB: see shared_cache
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import copy
+import functools
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    SCRIPT_CTX_AVAILABLE = True
+except ImportError:
+    SCRIPT_CTX_AVAILABLE = False
+
+from .data_cache import FINGERPRINT_ATTR, frame_fingerprint
+from .shared_cache import CacheBackend, get_shared_backend
+from .sheet_registry import _COPY_ON_WRITE
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_BUDGET_MB = 512
+
+# Values returned as-is (immutable)
+_IMMUTABLE = (str, bytes, int, float, bool, complex, type(None), np.generic, pd.Timestamp, pd.Timedelta)
+
+
+# =============================================================================
+# SIZES & COPIES
+# =============================================================================
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value, in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _detach(value: Any) -> Any:
+    """Copy of a cached value that callers can modify without touching the cache."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        # Shallow only under copy-on-write, otherwise in-place edits would
+        # reach the cached frame; pandas drops the fingerprint tag on
+        # copies, but the content is identical so it carries over
+        out = value.copy(deep=not _COPY_ON_WRITE)
+        tag = value.attrs.get(FINGERPRINT_ATTR)
+        if tag is not None:
+            out.attrs[FINGERPRINT_ATTR] = tag
+        return out
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    if isinstance(value, tuple) and not hasattr(value, '_fields'):
+        return tuple(_detach(v) for v in value)
+    if isinstance(value, _IMMUTABLE):
+        return value
+    return copy.deepcopy(value)
+
+
+# =============================================================================
+# MEMORY CACHE
+# =============================================================================
+
+class _Entry:
+    """One cached value and its accounting."""
+
+    __slots__ = ('value', 'nbytes', 'expires', 'created', 'last_used', 'hits')
+
+    def __init__(self, value: Any, nbytes: int, expires: Optional[float]):
+        self.value = value
+        self.nbytes = nbytes
+        self.expires = expires
+        self.created = self.last_used = time.monotonic()
+        self.hits = 0
+
+
+class MemoryCache:
+    """
+    Byte-budgeted LRU store shared by all cached functions.
+
+    Entries live under a namespace (one per cached function) and a key
+    within it. Storing past the budget evicts least recently used entries
+    first; a value larger than the whole budget is returned but not stored.
+
+    With a backend (shared_cache.CacheBackend), local misses are looked up
+    there and stored values are written through, so other processes on the
+    same volume reuse them.
+    """
+
+    def __init__(self, budget_bytes: int, backend: Optional[CacheBackend] = None):
+        self.budget_bytes = int(budget_bytes)
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, Hashable], _Entry]' = OrderedDict()
+        self._bytes = 0
+        self._counters = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'rejected': 0}
+        self._namespace_counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str) -> None:
+        self._counters[counter] += 1
+        counts = self._namespace_counters.setdefault(namespace, {'hits': 0, 'misses': 0})
+        if counter in counts:
+            counts[counter] += 1
+
+    def _drop(self, full_key: Tuple[str, Hashable]) -> None:
+        entry = self._entries.pop(full_key)
+        self._bytes -= entry.nbytes
+
+    def _store(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float]) -> bool:
+        """Keep value in this process (evicting LRU entries); False if it can't fit."""
+        nbytes = estimate_size(value)
+        full_key = (namespace, key)
+        with self._lock:
+            if full_key in self._entries:
+                self._drop(full_key)
+            if nbytes > self.budget_bytes:
+                self._counters['rejected'] += 1
+                logger.warning(f"{namespace}: {nbytes / 1e6:.1f} MB result exceeds the "
+                               f"{self.budget_bytes / 1e6:.0f} MB cache budget, not cached")
+                return False
+            expires = time.monotonic() + ttl if ttl else None
+            self._entries[full_key] = _Entry(value, nbytes, expires)
+            self._bytes += nbytes
+            while self._bytes > self.budget_bytes:
+                evicted, _ = next(iter(self._entries.items()))
+                self._drop(evicted)
+                self._counters['evictions'] += 1
+                logger.info(f"Evicted {evicted[0]} from the memory cache")
+        return True
+
+    def _find(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        """Look in this process, then the backend; counts hits only."""
+        full_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry.expires is not None and time.monotonic() >= entry.expires:
+                self._drop(full_key)
+                self._counters['expired'] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(full_key)
+                entry.hits += 1
+                entry.last_used = time.monotonic()
+                self._count(namespace, 'hits')
+                return True, _detach(entry.value)
+
+        if self.backend is None:
+            return False, None
+        try:
+            found = self.backend.get(namespace, key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            found = None
+        if found is None:
+            return False, None
+        value, ttl = found
+        self._store(namespace, key, value, ttl)
+        with self._lock:
+            self._count(namespace, 'hits')
+            self._counters['shared_hits'] += 1
+        return True, _detach(value)
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        """(True, copy of the value) on a hit, (False, None) on a miss."""
+        hit, value = self._find(namespace, key)
+        if not hit:
+            with self._lock:
+                self._count(namespace, 'misses')
+        return hit, value
+
+    def put(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> Any:
+        """Store value here and in the backend; returns a copy for the caller."""
+        if self._store(namespace, key, value, ttl) and self.backend is not None:
+            try:
+                self.backend.put(namespace, key, value, ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache write failed: {e}")
+        return _detach(value)
+
+    def get_or_load(self, namespace: str, key: Hashable, load: Callable[[], Any],
+                    ttl: Optional[float] = None) -> Any:
+        """
+        Cached value, or load() stored under key.
+
+        With a backend, only one process at a time runs load() for a key;
+        the others wait and pick up its result.
+        """
+        hit, value = self.get(namespace, key)
+        if hit:
+            return value
+        if self.backend is None:
+            return self.put(namespace, key, load(), ttl=ttl)
+        with self.backend.lease(namespace, key):
+            # Another process may have stored it while we waited
+            hit, value = self._find(namespace, key)
+            if hit:
+                return value
+            return self.put(namespace, key, load(), ttl=ttl)
+
+    def discard(self, namespace: str, key: Hashable) -> None:
+        """Drop one entry, if present (here and in the backend)."""
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._drop((namespace, key))
+        if self.backend is not None:
+            self.backend.delete(namespace, key)
+
+    def clear(self, namespace: Optional[str] = None, shared: bool = True) -> None:
+        """Drop every entry (of one namespace, when given); shared=False keeps the backend's."""
+        with self._lock:
+            for full_key in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                self._drop(full_key)
+        if shared and self.backend is not None:
+            self.backend.clear(namespace)
+
+    def stats(self) -> Dict[str, int]:
+        """Budget, bytes in use, entry count and hit / miss / eviction counters."""
+        with self._lock:
+            return {
+                'budget_bytes': self.budget_bytes,
+                'bytes': self._bytes,
+                'entries': len(self._entries),
+                **self._counters,
+            }
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """One row per entry, least recently used first."""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'namespace': namespace,
+                'key': str(key)[:80],
+                'bytes': entry.nbytes,
+                'hits': entry.hits,
+                'age_s': round(now - entry.created, 1),
+                'idle_s': round(now - entry.last_used, 1),
+            } for (namespace, key), entry in self._entries.items()]
+
+    def namespace_stats(self) -> Dict[str, Dict[str, int]]:
+        """Namespace -> hits / misses since start."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._namespace_counters.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def _create_memory_cache(budget_bytes: int) -> MemoryCache:
+    logger.info(f"Memory cache budget: {budget_bytes / 1e6:.0f} MB")
+    return MemoryCache(budget_bytes, backend=get_shared_backend())
+
+
+def get_memory_cache() -> MemoryCache:
+    """Get the process-wide memory cache (shared by all sessions)."""
+    try:
+        budget_mb = float(os.environ.get('CALYX_CACHE_BUDGET_MB', DEFAULT_BUDGET_MB))
+    except ValueError:
+        budget_mb = DEFAULT_BUDGET_MB
+    return _create_memory_cache(int(budget_mb * 1024 * 1024))
+
+
+def clear_all_caches() -> None:
+    """Drop the memory cache and any remaining st.cache_data entries (Refresh buttons)."""
+    get_memory_cache().clear()
+    st.cache_data.clear()
+
+
+# =============================================================================
+# DECORATOR
+# =============================================================================
+
+def _key_part(value: Any) -> Hashable:
+    """Hashable, content-based identity for one argument."""
+    if isinstance(value, pd.DataFrame):
+        return ('frame', frame_fingerprint(value))
+    if isinstance(value, pd.Series):
+        return ('series', frame_fingerprint(value.to_frame()))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+@contextmanager
+def spinner(show_spinner: Any, name: str):
+    """st.spinner while a cached function computes (not in background threads)."""
+    if not show_spinner or not SCRIPT_CTX_AVAILABLE or get_script_run_ctx() is None:
+        yield
+        return
+    text = show_spinner if isinstance(show_spinner, str) else f"Running {name}(...)."
+    with st.spinner(text):
+        yield
+
+
+def memory_cached(ttl: Optional[float] = None, show_spinner: Any = False):
+    """
+    Cache a function's results in the shared memory cache.
+
+    Like st.cache_data, parameters whose names start with "_" are left out
+    of the key (pass a fingerprint alongside them instead); DataFrame
+    arguments are keyed by frame_fingerprint.
+
+    Args:
+        ttl: Seconds an entry stays valid (None = until evicted or cleared)
+        show_spinner: Spinner text (or True for a default) while computing
+
+    Example:
+        @memory_cached(ttl=300)
+        def compute_history(data_key, _frame, freq): ...
+    """
+    def decorator(func):
+        namespace = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+        keyed = [name for name in signature.parameters if not name.startswith('_')]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple((name, _key_part(bound.arguments[name])) for name in keyed
+                        if name in bound.arguments)
+
+            def load():
+                with spinner(show_spinner, func.__name__):
+                    return func(*args, **kwargs)
+
+            return get_memory_cache().get_or_load(namespace, key, load, ttl=ttl)
+
+        wrapper.clear = lambda: get_memory_cache().clear(namespace)
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# STATS VIEW
+# =============================================================================
+
+def render_cache_stats() -> None:
+    """Cache budget, hit rate and per-entry sizes (memory cache, shared cache, forecasts, sheet registry)."""
+    from .forecast_cache import get_forecast_cache
+    from .sheet_registry import get_sheet_registry
+
+    memory = get_memory_cache()
+    stats = memory.stats()
+    lookups = stats['hits'] + stats['misses']
+    registry = get_sheet_registry().stats()
+
+    col1, col2 = st.columns(2)
+    col1.metric("Cached", f"{stats['bytes'] / 1e6:.1f} MB",
+                f"of {stats['budget_bytes'] / 1e6:.0f} MB", delta_color="off")
+    col2.metric("Hit rate", f"{stats['hits'] / lookups:.0%}" if lookups else "–",
+                f"{stats['hits']} hits / {stats['misses']} misses", delta_color="off")
+    col1, col2 = st.columns(2)
+    col1.metric("Evictions", stats['evictions'], f"{stats['expired']} expired", delta_color="off")
+    col2.metric("Sheet grids", f"{registry['bytes'] / 1e6:.1f} MB",
+                f"{registry['grids']} tabs of {registry['budget_bytes'] / 1e6:.0f} MB, "
+                f"{registry['evictions']} evicted", delta_color="off")
+    if memory.backend is not None:
+        shared = memory.backend.stats()
+        st.metric("Shared cache", f"{shared.get('bytes', 0) / 1e6:.1f} MB",
+                  f"{shared.get('entries', 0)} entries / {stats['shared_hits']} hits here", delta_color="off")
+
+    forecasts = get_forecast_cache()
+    if forecasts is not None:
+        stored = forecasts.stats()
+        st.metric("Forecast cache", f"{stored.get('bytes', 0) / 1e6:.1f} MB",
+                  f"{stored.get('entries', 0)} entries / {stored['hits']} hits, {stored['misses']} misses, "
+                  f"{stored['warm_starts']} warm starts here",
+                  delta_color="off")
+
+    entries = pd.DataFrame(memory.entries())
+    if entries.empty:
+        st.caption("Nothing cached yet.")
+        return
+    entries['MB'] = (entries.pop('bytes') / 1e6).round(2)
+    st.dataframe(entries.iloc[::-1], hide_index=True, use_container_width=True)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'DEFAULT_BUDGET_MB',
+    'estimate_size',
+    'MemoryCache',
+    'get_memory_cache',
+    'clear_all_caches',
+    'memory_cached',
+    'render_cache_stats',
+]
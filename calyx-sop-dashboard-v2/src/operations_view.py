@@ -19,6 +19,9 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import logging
 
+from .data_cache import derive_fingerprint, frame_fingerprint, set_fingerprint
+from .memory_cache import clear_all_caches, memory_cached
+
 logger = logging.getLogger(__name__)
 
 # Version info
@@ -27,11 +30,14 @@ LAST_UPDATED = "2026-01-05 17:30 MST"
 
 # =============================================================================
 # PERFORMANCE: Cache expensive computations
+# Frames are passed as leading-underscore arguments, which are not part of
+# the cache key; the *_key argument (data_cache.frame_fingerprint) identifies them
 # =============================================================================
 
-@st.cache_data(ttl=300)
-def get_category_items_map(_invoice_lines_hash, invoice_lines, item_col, product_type_col):
+@memory_cached(ttl=300)
+def get_category_items_map(invoice_lines_key, _invoice_lines, item_col, product_type_col):
     """Cache the mapping of categories to their items."""
+    invoice_lines = _invoice_lines
     if invoice_lines is None or item_col is None or product_type_col is None:
         return {}
     
@@ -41,19 +47,19 @@ def get_category_items_map(_invoice_lines_hash, invoice_lines, item_col, product
         item_series = get_column_as_series(invoice_lines, item_col)
         
         if cat_series is not None and item_series is not None:
-            df = pd.DataFrame({'Category': cat_series, 'Item': item_series})
-            for cat in df['Category'].dropna().unique():
-                items = df[df['Category'] == cat]['Item'].dropna().unique().tolist()
-                result[str(cat).strip()] = sorted([str(i) for i in items])[:200]
+            df = pd.DataFrame({'Category': cat_series, 'Item': item_series}).dropna(subset=['Category'])
+            for cat, items in df.groupby('Category', observed=True, sort=False)['Item']:
+                result[str(cat).strip()] = sorted([str(i) for i in items.dropna().unique()])[:200]
     except:
         pass
     
     return result
 
 
-@st.cache_data(ttl=300)
-def compute_demand_history_cached(data_hash, filtered_data, date_col, amount_col, freq):
+@memory_cached(ttl=300)
+def compute_demand_history_cached(data_key, _filtered_data, date_col, amount_col, freq):
     """Cache demand history computation."""
+    filtered_data = _filtered_data
     if filtered_data is None or filtered_data.empty:
         return pd.DataFrame()
     
@@ -81,8 +87,8 @@ def compute_demand_history_cached(data_hash, filtered_data, date_col, amount_col
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=300)
-def compute_pipeline_data_cached(deals_hash, deals, freq, items_hash, items, category_filter):
+@memory_cached(ttl=300)
+def compute_pipeline_data_cached(deals_key, _deals, freq, items_key, _items, category_filter):
     """
     Cache pipeline data computation.
     
@@ -94,6 +100,7 @@ def compute_pipeline_data_cached(deals_hash, deals, freq, items_hash, items, cat
     
     Excludes rows where SKU or date is blank.
     """
+    deals, items = _deals, _items
     if deals is None or deals.empty:
         return pd.DataFrame()
     
@@ -256,11 +263,12 @@ def init_settings():
 # =============================================================================
 
 def clean_dataframe(df):
-    """Remove duplicate columns from DataFrame."""
+    """Remove duplicate columns from DataFrame (keeping it fingerprinted)."""
     if df is None:
         return None
     if df.columns.duplicated().any():
-        df = df.loc[:, ~df.columns.duplicated()]
+        key = derive_fingerprint(frame_fingerprint(df), 'unique columns')
+        df = set_fingerprint(df.loc[:, ~df.columns.duplicated()], key)
     return df
 
 
@@ -287,13 +295,6 @@ def find_column(df, keywords, exclude=None):
     return None
 
 
-def get_df_hash(df):
-    """Get a simple hash for a dataframe for caching."""
-    if df is None:
-        return "none"
-    return f"{len(df)}_{df.columns.tolist()[:3]}"
-
-
 # =============================================================================
 # MAIN RENDER FUNCTION - OPTIMIZED
 # =============================================================================
@@ -353,8 +354,8 @@ def render_operations_view():
             category_options.extend(sorted([c for c in cats if c.strip() and c != 'Unknown']))
     
     # Get cached category-items map
-    invoice_hash = get_df_hash(invoice_lines)
-    category_items_map = get_category_items_map(invoice_hash, invoice_lines, item_col, product_type_col)
+    invoice_key = frame_fingerprint(invoice_lines)
+    category_items_map = get_category_items_map(invoice_key, invoice_lines, item_col, product_type_col)
     
     # ==========================================================================
     # FILTER UI
@@ -404,6 +405,8 @@ def render_operations_view():
             mask &= (item_series == selected_item)
     
     filtered = invoice_lines[mask].copy()
+    # filtered is a pure function of the invoice lines and the filters below
+    filtered_key = derive_fingerprint(invoice_key, selected_category, selected_item, amount_col, qty_col)
     
     # Convert numeric columns once
     if amount_col:
@@ -430,7 +433,8 @@ def render_operations_view():
     ])
     
     with tab1:
-        render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty_col, freq, horizon, selected_category)
+        render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty_col, freq, horizon, selected_category,
+                                   filtered_key=filtered_key)
     
     with tab2:
         render_coverage_tab(filtered, amount_col, product_type_col)
@@ -460,7 +464,8 @@ def render_operations_view():
 # DEMAND VS PIPELINE TAB
 # =============================================================================
 
-def render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty_col, freq, horizon, category):
+def render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty_col, freq, horizon, category,
+                               filtered_key=None):
     """Render Demand vs Pipeline overlay chart."""
     
     st.markdown("### 📈 Demand Forecast vs Pipeline Overlay")
@@ -480,9 +485,9 @@ def render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty
     except:
         revenue_forecast_by_period = pd.DataFrame()
     
-    # Compute demand history (cached based on filtered data hash)
-    filtered_hash = f"{len(filtered)}_{category}_{freq}"
-    demand_history = compute_demand_history_cached(filtered_hash, filtered, date_col, amount_col, freq)
+    # Compute demand history (cached on the filtered data's fingerprint)
+    filtered_key = filtered_key or frame_fingerprint(filtered)
+    demand_history = compute_demand_history_cached(filtered_key, filtered, date_col, amount_col, freq)
     
     if demand_history.empty:
         st.warning("Could not compute demand history.")
@@ -492,9 +497,8 @@ def render_demand_pipeline_tab(filtered, deals, items, date_col, amount_col, qty
     demand_forecast_df = generate_forecast(demand_history, horizon, freq)
     
     # Get pipeline data (cached) - now with items for SKU->Category mapping
-    deals_hash = get_df_hash(deals)
-    items_hash = get_df_hash(items)
-    pipeline_df = compute_pipeline_data_cached(deals_hash, deals, freq, items_hash, items, category)
+    pipeline_df = compute_pipeline_data_cached(frame_fingerprint(deals), deals, freq,
+                                               frame_fingerprint(items), items, category)
     
     # Create chart
     fig = create_overlay_chart(demand_history, demand_forecast_df, pipeline_df, revenue_forecast_by_period, category)
@@ -673,7 +677,7 @@ def create_overlay_chart(demand_df, forecast_df, pipeline_df, revenue_forecast_d
 # TOP-DOWN FORECAST TAB
 # =============================================================================
 
-@st.cache_data(ttl=300)
+@memory_cached(ttl=300)
 def get_forecast_pivot_data(category):
     """Cache the forecast pivot table computation."""
     try:
@@ -769,7 +773,7 @@ def render_settings_tab():
         for _, row in edited_case_df.iterrows():
             st.session_state.ops_case_quantities[row['Category']] = int(row['Units per Case'])
         st.success("Saved!")
-        st.cache_data.clear()
+        clear_all_caches()
     
     st.markdown("---")
     
@@ -792,14 +796,14 @@ def render_settings_tab():
             if child_sku and parent_sku:
                 st.session_state.ops_item_consolidation[child_sku.strip()] = parent_sku.strip()
                 st.success(f"Added: {child_sku} → {parent_sku}")
-                st.cache_data.clear()
+                clear_all_caches()
                 st.rerun()
     
     if consolidations:
         to_remove = st.selectbox("Remove consolidation:", list(consolidations.keys()), key="remove_select")
         if st.button("🗑️ Remove"):
             del st.session_state.ops_item_consolidation[to_remove]
-            st.cache_data.clear()
+            clear_all_caches()
             st.rerun()
 
 
@@ -825,7 +829,7 @@ def render_coverage_tab(filtered, amount_col, product_type_col):
     by_category = pd.DataFrame({
         'Category': cat_series,
         'Amount': pd.to_numeric(amt_series, errors='coerce').fillna(0)
-    }).groupby('Category')['Amount'].sum().reset_index()
+    }).groupby('Category', observed=True)['Amount'].sum().reset_index()
     
     by_category = by_category.sort_values('Amount', ascending=False)
     
@@ -915,7 +919,7 @@ def render_sku_deep_dive(filtered, item_col, amount_col, qty_col):
         if qty_series is not None:
             temp_df['Quantity'] = pd.to_numeric(qty_series, errors='coerce').fillna(0)
     
-    by_item = temp_df.groupby('Item').agg({
+    by_item = temp_df.groupby('Item', observed=True).agg({
         'Amount': 'sum',
         'Quantity': 'sum' if 'Quantity' in temp_df.columns else 'count'
     }).reset_index()
@@ -14,9 +14,9 @@ import numpy as np
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-import json
+
+from .sheets_ingest import fetch_sheet_batch, fetch_sheet_range
+from .sheet_schemas import coerce_numeric, compact_dimensions
 
 # ============================================================================
 # CONFIGURATION
@@ -53,82 +53,34 @@ Q1_REP_QUOTAS = {
 # DATA LOADING
 # ============================================================================
 
-def get_google_credentials():
-    """Get Google API credentials from Streamlit secrets"""
-    try:
-        creds_dict = st.secrets["service_account"]
-        if isinstance(creds_dict, str):
-            creds_dict = json.loads(creds_dict)
-        else:
-            creds_dict = dict(creds_dict)
-
-        credentials = Credentials.from_service_account_info(
-            creds_dict,
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-        )
-        return credentials
-    except Exception as e:
-        st.error(f"❌ Error loading credentials: {str(e)}")
-        return None
+# Tabs are cached per spreadsheet revision in the shared sheet registry
+# (one copy for every section), so these loaders need no cache of their own
 
-@st.cache_data(ttl=300, show_spinner=False)
 def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION):
-    """Load data from Google Sheets with caching"""
-    try:
-        credentials = get_google_credentials()
-        if not credentials:
-            return pd.DataFrame()
-
-        service = build('sheets', 'v4', credentials=credentials)
-
-        full_range = f"'{sheet_name}'!{range_name}"
-        result = service.spreadsheets().values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range=full_range
-        ).execute()
-
-        values = result.get('values', [])
-
-        if not values:
-            return pd.DataFrame()
+    """Load data from Google Sheets (previous revision served while refreshing)"""
+    return fetch_sheet_range(sheet_name, range_name, spreadsheet_id=SPREADSHEET_ID, fit_to_header=True,
+                             stale_while_revalidate=True)
 
-        headers = values[0]
-        data = values[1:] if len(values) > 1 else []
+def load_google_sheets_batch(ranges, version=CACHE_VERSION):
+    """Load several tabs in one batchGet round trip, keyed by (sheet_name, range_name)"""
+    return fetch_sheet_batch(ranges, spreadsheet_id=SPREADSHEET_ID, fit_to_header=True,
+                             stale_while_revalidate=True)
 
-        max_cols = len(headers)
-        normalized_data = []
-        for row in data:
-            if len(row) < max_cols:
-                row = row + [''] * (max_cols - len(row))
-            elif len(row) > max_cols:
-                row = row[:max_cols]
-            normalized_data.append(row)
-
-        df = pd.DataFrame(normalized_data, columns=headers)
-        return df
-
-    except Exception as e:
-        st.error(f"❌ Error loading {sheet_name}: {str(e)}")
-        return pd.DataFrame()
-
-def clean_numeric(value):
-    """Convert value to numeric, handling currency formatting"""
-    if pd.isna(value) or str(value).strip() == '':
-        return 0
-    cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-    try:
-        return float(cleaned)
-    except:
-        return 0
 
 def load_all_data():
     """Load all required data for Q1 2026 review"""
 
+    # Invoices and quotas come back in a single batchGet round trip
+    sheet_frames = load_google_sheets_batch(
+        [("_NS_Invoices_Data", "A:Y"), ("Dashboard Info", "A:C")],
+        version=CACHE_VERSION
+    )
+
     # Load invoice data - extended to column Y for Product Type
-    invoices_df = load_google_sheets_data("_NS_Invoices_Data", "A:Y", version=CACHE_VERSION)
+    invoices_df = sheet_frames[("_NS_Invoices_Data", "A:Y")]
 
     # Load dashboard info (rep quotas)
-    dashboard_df = load_google_sheets_data("Dashboard Info", "A:C", version=CACHE_VERSION)
+    dashboard_df = sheet_frames[("Dashboard Info", "A:C")]
 
     # Process invoices
     if not invoices_df.empty:
@@ -205,7 +157,7 @@ def process_invoices(df):
 
     # Clean amount
     if 'Amount' in df.columns:
-        df['Amount'] = df['Amount'].apply(clean_numeric)
+        df['Amount'] = coerce_numeric(df['Amount'], fill_value=0)
     else:
         df['Amount'] = 0
 
@@ -222,7 +174,8 @@ def process_invoices(df):
         invalid_reps = ['', 'nan', 'None', '#N/A', '#REF!']
         df = df[~df['Sales Rep'].isin(invalid_reps)]
 
-    return df
+    # Rep / customer / product / pipeline labels as categoricals
+    return compact_dimensions(df)
 
 def process_dashboard_info(df):
     """Process dashboard info for quota data"""
@@ -247,7 +200,7 @@ def process_dashboard_info(df):
         st.sidebar.warning(f"⚠️ Dashboard Info columns: {df.columns.tolist()}")
 
     if 'Quota' in df.columns:
-        df['Quota'] = df['Quota'].apply(clean_numeric)
+        df['Quota'] = coerce_numeric(df['Quota'], fill_value=0)
 
     return df
 
@@ -325,7 +278,7 @@ def display_dashboard(invoices_df, dashboard_df, rep_name=None):
     if not rep_name and 'Sales Rep' in invoices_df.columns:
         st.markdown("### 🥇 Sales Leaderboard")
 
-        rep_revenue = invoices_df.groupby('Sales Rep').agg({
+        rep_revenue = invoices_df.groupby('Sales Rep', observed=True).agg({
             'Amount': 'sum',
             'Invoice Number': 'count' if 'Invoice Number' in invoices_df.columns else 'size'
         }).reset_index()
@@ -436,7 +389,7 @@ def display_dashboard(invoices_df, dashboard_df, rep_name=None):
     st.markdown("### 🏢 Top Customers")
 
     if 'Customer' in invoices_df.columns:
-        customer_revenue = invoices_df.groupby('Customer').agg({
+        customer_revenue = invoices_df.groupby('Customer', observed=True).agg({
             'Amount': 'sum',
             'Invoice Number': 'count' if 'Invoice Number' in invoices_df.columns else 'size'
         }).reset_index()
@@ -486,7 +439,7 @@ def display_dashboard(invoices_df, dashboard_df, rep_name=None):
     st.markdown("### 📦 Revenue by Product Type")
 
     if 'Product Type' in invoices_df.columns:
-        product_revenue = invoices_df.groupby('Product Type').agg({
+        product_revenue = invoices_df.groupby('Product Type', observed=True).agg({
             'Amount': 'sum',
             'Invoice Number': 'count' if 'Invoice Number' in invoices_df.columns else 'size'
         }).reset_index()
@@ -533,7 +486,7 @@ def display_dashboard(invoices_df, dashboard_df, rep_name=None):
     st.markdown("### 🔀 Revenue by Pipeline")
 
     if 'Pipeline' in invoices_df.columns:
-        pipeline_revenue = invoices_df.groupby('Pipeline').agg({
+        pipeline_revenue = invoices_df.groupby('Pipeline', observed=True).agg({
             'Amount': 'sum',
             'Invoice Number': 'count' if 'Invoice Number' in invoices_df.columns else 'size'
         }).reset_index()
@@ -35,8 +35,6 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.io as pio
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import json
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -44,7 +42,8 @@ import time
 import base64
 import numpy as np
 
-
+from .sheets_ingest import fetch_sheet_batch, fetch_sheet_range, get_spreadsheet_id
+from .sheet_schemas import coerce_numeric
 
 
 
@@ -145,13 +144,14 @@ EXCLUDED_STAGES = [
     "shipped",
 ]
 
-# Cache version for manual refresh control
+# Cache version - identifies the processing code; tab data itself is cached
+# per spreadsheet revision in the shared sheet registry
 CACHE_VERSION = "v66_company_name_columns"
 
-@st.cache_data  # Removed TTL - cache persists until manually cleared
 def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION, silent=False):
     """
-    Load data from Google Sheets with caching and enhanced error handling
+    Load data from Google Sheets with enhanced error handling
+    (re-pulled only when the workbook changes, via the sheet registry)
     
     Args:
         sheet_name: Name of the sheet tab
@@ -159,81 +159,22 @@ def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION, silen
         version: Cache version string
         silent: If True, don't show error messages (for optional sheets)
     """
-    try:
-        # Get SPREADSHEET_ID from secrets or use default
-        spreadsheet_id = st.secrets.get("SPREADSHEET_ID", DEFAULT_SPREADSHEET_ID)
-        
-        # Check if secrets exist
-        if "service_account" not in st.secrets:
-            if not silent:
-                st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
-            return pd.DataFrame()
-        
-        # Load credentials from Streamlit secrets
-        creds_dict = dict(st.secrets["service_account"])
-        
-        # Create credentials
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        # Build service
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
-        
-        # Fetch data
-        result = sheet.values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!{range_name}"
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        if not values:
-            if not silent:
-                st.warning(f"⚠️ No data found in {sheet_name}!{range_name}")
-            return pd.DataFrame()
-        
-        # Handle mismatched column counts - pad shorter rows with empty strings
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(values[1:], columns=values[0])
-        
-        return df
-        
-    except Exception as e:
-        error_msg = str(e)
-        if not silent:
-            st.error(f"❌ Error loading data from {sheet_name}: {error_msg}")
-        
-        # Provide specific troubleshooting based on error type
-        if not silent:
-            if "403" in error_msg or "permission" in error_msg.lower():
-                st.warning("""
-                **Permission Error:**
-                - Make sure you've shared the Google Sheet with your service account email
-                - The service account email looks like: `your-service-account@project.iam.gserviceaccount.com`
-                - Share the sheet with 'Viewer' access
-                """)
-            elif "404" in error_msg or "not found" in error_msg.lower():
-                st.warning("""
-                **Sheet Not Found:**
-                - Check that the spreadsheet ID is correct
-                - Check that the sheet name matches exactly (case-sensitive)
-                """)
-            elif "401" in error_msg or "authentication" in error_msg.lower():
-                st.warning("""
-                **Authentication Error:**
-                - Your service account credentials may be invalid
-                - Try regenerating the service account key in Google Cloud Console
-                """)
-        
-        return pd.DataFrame()
+    return fetch_sheet_range(sheet_name, range_name, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent=silent)
+
+
+def load_google_sheets_batch(ranges, version=CACHE_VERSION, silent_sheets=()):
+    """
+    Load several tabs in one batchGet round trip
+    
+    Args:
+        ranges: List of (sheet_name, range_name) pairs
+        version: Cache version string
+        silent_sheets: Optional tabs that shouldn't show error messages
+    
+    Returns:
+        Dict keyed by (sheet_name, range_name) -> DataFrame
+    """
+    return fetch_sheet_batch(ranges, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent_sheets=silent_sheets)
 
 # ========== SPILLOVER COLUMN HELPER FUNCTIONS ==========
 # These functions handle both old ('Q2 2026 Spillover') and new ('Q3 2026 Spillover') column names
@@ -364,7 +305,21 @@ def load_all_data():
     #   - Close Date within quarter range
     #   - Exclude cancelled/closed/shipped stages
     #   - Record ID not blank, Deal Stage not blank
-    raw_deals_df = load_google_sheets_data(DEALS_SHEET_NAME, DEALS_RANGE, version=CACHE_VERSION)
+    # Every tab this section needs comes back in a single batchGet round trip
+    sheet_frames = load_google_sheets_batch(
+        [
+            (DEALS_SHEET_NAME, DEALS_RANGE),
+            ("Dashboard Info", "A:B"),
+            ("_NS_Invoices_Data", "A:Y"),
+            ("_NS_SalesOrders_Data", "A:AG"),
+            ("Production Schedule", "A:R"),
+            ("Amie Update", "A:J"),
+        ],
+        version=CACHE_VERSION,
+        silent_sheets=("Production Schedule", "Amie Update"),
+    )
+
+    raw_deals_df = sheet_frames[(DEALS_SHEET_NAME, DEALS_RANGE)]
 
     if not raw_deals_df.empty and len(raw_deals_df.columns) >= 6:
         # The Deals tab has raw columns: A=Record ID, B=Deal Name, C=Deal Stage,
@@ -435,19 +390,19 @@ def load_all_data():
         deals_df = raw_deals_df if not raw_deals_df.empty else pd.DataFrame()
     
     # Load dashboard info (rep quotas)
-    dashboard_df = load_google_sheets_data("Dashboard Info", "A:B", version=CACHE_VERSION)
+    dashboard_df = sheet_frames[("Dashboard Info", "A:B")]
     
     # Load invoice data from NetSuite - EXTEND to include Columns T:U (Corrected Customer Name, Rep Master)
-    invoices_df = load_google_sheets_data("_NS_Invoices_Data", "A:Y", version=CACHE_VERSION)
+    invoices_df = sheet_frames[("_NS_Invoices_Data", "A:Y")]
     
     # Load sales orders data from NetSuite - EXTEND to include Columns through AF (Calyx | External Order, Pending Approval Date, Corrected Customer Name, Rep Master)
-    sales_orders_df = load_google_sheets_data("_NS_SalesOrders_Data", "A:AG", version=CACHE_VERSION)
+    sales_orders_df = sheet_frames[("_NS_SalesOrders_Data", "A:AG")]
     
     # Q4 Push planning status removed for Q2 dashboard
     q4_push_df = pd.DataFrame()  # Empty placeholder for compatibility
 
     # Load Production Schedule data
-    production_schedule_df = load_google_sheets_data("Production Schedule", "A:R", version=CACHE_VERSION, silent=True)
+    production_schedule_df = sheet_frames[("Production Schedule", "A:R")]
     if not production_schedule_df.empty and len(production_schedule_df.columns) >= 18:
         production_schedule_df.columns = [
             'Number', 'SO #', 'Task', 'Equipment', 'Customer', 'General Description',
@@ -466,7 +421,7 @@ def load_all_data():
             production_schedule_df['SO #'] = production_schedule_df['SO #'].astype(str).str.strip()
 
     # Load Amie Update data
-    amie_update_df = load_google_sheets_data("Amie Update", "A:J", version=CACHE_VERSION, silent=True)
+    amie_update_df = sheet_frames[("Amie Update", "A:J")]
     if not amie_update_df.empty and len(amie_update_df.columns) >= 10:
         amie_update_df.columns = [
             'Internal ID', 'SO Number', 'Status', 'Customer', 'Customer External ID',
@@ -525,21 +480,12 @@ def load_all_data():
             deals_df['Deal Owner'] = deals_df['Deal Owner'].astype(str).str.strip()
         
         # Convert Amount to numeric
-        def clean_numeric(value):
-            if pd.isna(value) or str(value).strip() == '':
-                return 0
-            cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-            try:
-                return float(cleaned)
-            except:
-                return 0
-        
         if 'Amount' in deals_df.columns:
-            deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+            deals_df['Amount'] = coerce_numeric(deals_df['Amount'], fill_value=0)
         
         # Process Probability Rev column (Column U) - probability-weighted amount
         if 'Probability Rev' in deals_df.columns:
-            deals_df['Probability Rev'] = deals_df['Probability Rev'].apply(clean_numeric)
+            deals_df['Probability Rev'] = coerce_numeric(deals_df['Probability Rev'], fill_value=0)
         else:
             # If column doesn't exist, default to same as Amount
             deals_df['Probability Rev'] = deals_df['Amount'] if 'Amount' in deals_df.columns else 0
@@ -561,16 +507,7 @@ def load_all_data():
             dashboard_df = dashboard_df[~dashboard_df['Rep Name'].str.contains('Team Total', case=False, na=False)]
             
             # Clean and convert numeric columns
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
-            dashboard_df['Quota'] = dashboard_df['Quota'].apply(clean_numeric)
+            dashboard_df['Quota'] = coerce_numeric(dashboard_df['Quota'], fill_value=0)
     
     # Process invoice data
     if not invoices_df.empty:
@@ -644,26 +581,17 @@ def load_all_data():
                 # Drop the Corrected Customer Name column since we've copied it to Customer
                 invoices_df = invoices_df.drop(columns=['Corrected Customer Name'])
             
-            def clean_numeric(value):
-                if pd.isna(value) or str(value).strip() == '':
-                    return 0
-                cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-                try:
-                    return float(cleaned)
-                except:
-                    return 0
-            
-            invoices_df['Amount'] = invoices_df['Amount'].apply(clean_numeric)
+            invoices_df['Amount'] = coerce_numeric(invoices_df['Amount'], fill_value=0)
             invoices_df['Date'] = pd.to_datetime(invoices_df['Date'], errors='coerce')
             
             # NEW: Calculate Net_Amount (Amount without Shipping and Tax) for shipping toggle
             if 'Amount_Shipping' in invoices_df.columns:
-                invoices_df['Amount_Shipping'] = invoices_df['Amount_Shipping'].apply(clean_numeric)
+                invoices_df['Amount_Shipping'] = coerce_numeric(invoices_df['Amount_Shipping'], fill_value=0)
             else:
                 invoices_df['Amount_Shipping'] = 0
             
             if 'Amount_Tax' in invoices_df.columns:
-                invoices_df['Amount_Tax'] = invoices_df['Amount_Tax'].apply(clean_numeric)
+                invoices_df['Amount_Tax'] = coerce_numeric(invoices_df['Amount_Tax'], fill_value=0)
             else:
                 invoices_df['Amount_Tax'] = 0
             
@@ -844,27 +772,17 @@ def load_all_data():
             sales_orders_df = sales_orders_df.loc[:, ~sales_orders_df.columns.duplicated()]
         
         # Clean numeric values
-        def clean_numeric_so(value):
-            value_str = str(value).strip()
-            if value_str == '' or value_str == 'nan' or value_str == 'None':
-                return 0
-            cleaned = value_str.replace(',', '').replace('$', '').replace(' ', '')
-            try:
-                return float(cleaned)
-            except:
-                return 0
-        
         if 'Amount' in sales_orders_df.columns:
-            sales_orders_df['Amount'] = sales_orders_df['Amount'].apply(clean_numeric_so)
+            sales_orders_df['Amount'] = coerce_numeric(sales_orders_df['Amount'], fill_value=0)
         
         # NEW: Calculate Net_Amount (Amount without Shipping and Tax) for shipping toggle
         if 'Amount_Shipping' in sales_orders_df.columns:
-            sales_orders_df['Amount_Shipping'] = sales_orders_df['Amount_Shipping'].apply(clean_numeric_so)
+            sales_orders_df['Amount_Shipping'] = coerce_numeric(sales_orders_df['Amount_Shipping'], fill_value=0)
         else:
             sales_orders_df['Amount_Shipping'] = 0
         
         if 'Amount_Tax' in sales_orders_df.columns:
-            sales_orders_df['Amount_Tax'] = sales_orders_df['Amount_Tax'].apply(clean_numeric_so)
+            sales_orders_df['Amount_Tax'] = coerce_numeric(sales_orders_df['Amount_Tax'], fill_value=0)
         else:
             sales_orders_df['Amount_Tax'] = 0
         
@@ -930,6 +848,9 @@ def load_all_data():
         st.warning("Could not find required columns in _NS_SalesOrders_Data")
         sales_orders_df = pd.DataFrame()
     
+    # Rep / customer labels stay plain strings here (no compact_dimensions):
+    # both frames are already cut to one quarter, and they feed
+    # st.data_editor, which turns categorical columns into selectboxes
     return deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df, production_schedule_df, amie_update_df
 
 def store_snapshot(deals_df, dashboard_df, invoices_df, sales_orders_df, q4_push_df=None):
@@ -0,0 +1,230 @@
+"""
+Request Scheduler Module
+Quota-aware pacing and retries for every Google API request in the process
+
+Features:
+- Token bucket per API sized to the per-minute read quota, shared by all
+  sessions and threads, so a burst of page loads waits for quota instead
+  of collecting 429s
+- Retries 408 / 429 / 5xx responses and dropped connections with full-jitter
+  exponential backoff (Retry-After is honoured when the API sends it)
+- A 429 drains the bucket so every other caller backs off as well
+- Works for googleapiclient requests (sheets_client.ScheduledHttpRequest)
+  and gspread (sheets_client.ScheduledHTTPClient)
+
+Configuration (environment):
+- CALYX_SHEETS_READS_PER_MINUTE: Sheets read quota per minute (default 60,
+  the per-user limit for the service account)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Requests per minute allowed per API
+QUOTA_PER_MINUTE: Dict[str, int] = {
+    'sheets': int(os.environ.get('CALYX_SHEETS_READS_PER_MINUTE', '60')),
+    'drive': 1000,
+}
+
+# Status codes worth retrying: timeouts, rate limits, transient server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0   # seconds, doubled per attempt
+BACKOFF_MAX = 32.0   # seconds, cap on a single wait
+
+
+# =============================================================================
+# TOKEN BUCKET
+# =============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Holds up to `capacity` tokens and refills at rate_per_minute / 60 per
+    second; acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting for it if necessary.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def drain(self) -> None:
+        """Empty the bucket (the API just told us we are over quota)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+# =============================================================================
+# ERROR CLASSIFICATION
+# =============================================================================
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError / gspread APIError, if any."""
+    resp = getattr(error, 'resp', None)
+    if resp is not None and getattr(resp, 'status', None) is not None:
+        return int(resp.status)
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    if isinstance(code, int):
+        return code
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limits, transient server errors and dropped connections."""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After response header, if present."""
+    headers = getattr(error, 'resp', None)
+    if headers is None:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class RequestScheduler:
+    """
+    Runs API calls under a shared quota with retries on transient errors.
+
+    Example:
+        scheduler = get_request_scheduler('sheets')
+        values = scheduler.call(request.execute)
+    """
+
+    def __init__(self, name: str, rate_per_minute: float,
+                 max_retries: int = MAX_RETRIES,
+                 base_delay: float = BACKOFF_BASE,
+                 max_delay: float = BACKOFF_MAX,
+                 sleep: Callable[[float], None] = time.sleep,
+                 jitter: Callable[[], float] = random.random,
+                 bucket: Optional[TokenBucket] = None):
+        self.name = name
+        self.bucket = bucket or TokenBucket(rate_per_minute, sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'throttled_seconds': 0.0}
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Full-jitter delay before retry number `attempt` (0-based)."""
+        delay = self._jitter() * min(self.max_delay, self.base_delay * 2 ** attempt)
+        hinted = retry_after(error) if error is not None else None
+        return max(delay, hinted) if hinted is not None else delay
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn once quota allows, retrying retryable errors.
+
+        Raises:
+            The last error once retries are exhausted, or any
+            non-retryable error immediately
+        """
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['throttled_seconds'] += waited
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    with self._lock:
+                        self._stats['failures'] += 1
+                    raise
+                if error_status(e) == 429:
+                    self.bucket.drain()
+                delay = self.backoff(attempt, e)
+                logger.warning(f"{self.name} request failed ({error_status(e) or type(e).__name__}), "
+                               f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                with self._lock:
+                    self._stats['retries'] += 1
+                self._sleep(delay)
+
+    def stats(self) -> Dict[str, float]:
+        """Counts of requests, retries and failures, and time spent waiting for quota."""
+        with self._lock:
+            return dict(self._stats)
+
+
+@st.cache_resource(show_spinner=False)
+def get_request_scheduler(api: str = 'sheets') -> RequestScheduler:
+    """Get the process-wide scheduler for an API ('sheets', 'drive')."""
+    return RequestScheduler(api, QUOTA_PER_MINUTE.get(api, 60))
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'QUOTA_PER_MINUTE',
+    'RETRYABLE_STATUSES',
+    'TokenBucket',
+    'error_status',
+    'is_retryable',
+    'retry_after',
+    'RequestScheduler',
+    'get_request_scheduler',
+]
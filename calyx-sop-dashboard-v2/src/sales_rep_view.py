@@ -245,7 +245,7 @@ def render_sales_rep_view():
                     'Product Type': type_series,
                     'Amount': amt_series
                 })
-                by_type = temp_df.groupby('Product Type')['Amount'].sum().sort_values(ascending=False)
+                by_type = temp_df.groupby('Product Type', observed=True)['Amount'].sum().sort_values(ascending=False)
                 by_type = by_type[by_type > 0].head(15)
                 
                 if not by_type.empty:
@@ -301,10 +301,10 @@ def render_sales_rep_view():
                     
                     # Aggregate
                     if 'Product Type' in temp_df.columns:
-                        demand = temp_df.groupby(['Item', 'Product Type'])['Revenue'].sum().reset_index()
+                        demand = temp_df.groupby(['Item', 'Product Type'], observed=True)['Revenue'].sum().reset_index()
                         demand = demand.sort_values(['Product Type', 'Revenue'], ascending=[True, False])
                     else:
-                        demand = temp_df.groupby('Item')['Revenue'].sum().reset_index()
+                        demand = temp_df.groupby('Item', observed=True)['Revenue'].sum().reset_index()
                         demand = demand.sort_values('Revenue', ascending=False)
                     
                     demand = demand.head(25)
@@ -26,7 +26,8 @@ import logging
 from .sop_data_loader import (
     load_invoice_lines, load_deals, prepare_demand_history
 )
-from .forecasting_models import generate_forecast, blend_forecasts, ForecastResult
+from .forecasting_models import blend_forecasts, ForecastResult
+from .forecast_cache import cached_forecast
 
 logger = logging.getLogger(__name__)
 
@@ -340,8 +341,9 @@ def generate_scenario_forecast(
 ) -> ForecastResult:
     """Generate a scenario forecast with all adjustments applied."""
     
-    # Generate base demand forecast
-    base_forecast = generate_forecast(monthly_demand, model=model, horizon=horizon)
+    # Generate base demand forecast (reused when history and model are unchanged)
+    base_forecast = cached_forecast(monthly_demand, model=model, horizon=horizon,
+                                    series_key='scenario_monthly_demand')
     
     # Apply adjustments
     adjusted_values = base_forecast.forecast.copy()
@@ -0,0 +1,294 @@
+"""
+Shared Cache Module
+Cache backend shared by every app process on one host / volume
+
+Features:
+- CacheBackend: the interface a second-level store behind the in-process
+  memory cache implements (get / put / delete / clear / lease / stats)
+- SQLiteBackend: values pickled into one SQLite file (WAL mode) on a
+  local or shared volume, so processed DataFrames, QBR sections and
+  forecasts loaded by one Streamlit replica are reused by the others
+- Same invalidation as the in-process cache: entries are keyed by the
+  spreadsheet revision (or TTL bucket) the value was computed under, and
+  per-entry expiry is stored as wall-clock time so every process agrees
+- Byte budget with least-recently-used eviction across all processes
+- Cross-process leases: while one replica computes a value, the others
+  wait for it instead of downloading and parsing the same tabs
+
+Configuration (environment):
+- CALYX_SHARED_CACHE: SQLite file (or directory for cache.sqlite) to share;
+  unset = every process keeps its own cache, as before
+- CALYX_SHARED_CACHE_MB: byte budget of the shared store (default 2048)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_SHARED_BUDGET_MB = 2048
+
+# Longest one process may hold a compute lease before others give up waiting
+LEASE_SECONDS = 300
+
+# How often a waiting process checks whether the lease holder has finished
+LEASE_POLL_SECONDS = 0.2
+
+# last_used is only rewritten when older than this (keeps hits read-only)
+TOUCH_INTERVAL = 60
+
+
+def storage_key(namespace: str, key: Hashable) -> str:
+    """Process-independent identity for a cache entry."""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# =============================================================================
+# BACKEND INTERFACE
+# =============================================================================
+
+class CacheBackend(ABC):
+    """
+    Second-level store shared between processes.
+
+    Values are keyed by storage_key(namespace, key). Implementations must
+    be safe to call from several threads and processes at once.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        """(value, seconds until it expires or None) if stored and not expired, else None."""
+
+    @abstractmethod
+    def put(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value (expiring after ttl seconds, if given)."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: Hashable) -> None:
+        """Drop one entry, if present."""
+
+    @abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry (of one namespace, when given)."""
+
+    @contextmanager
+    def lease(self, namespace: str, key: Hashable) -> Iterator[None]:
+        """Hold the right to compute an entry; blocks while another process holds it."""
+        yield
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and bytes stored."""
+        return {}
+
+
+# =============================================================================
+# SQLITE BACKEND
+# =============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    expires REAL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Pickled values in a SQLite file that several processes open at once.
+
+    Pickles keep everything the in-process cache holds (DataFrames with
+    their attrs and fingerprints, dicts of frames, forecast tuples); values
+    that can't be pickled simply stay process-local.
+    """
+
+    def __init__(self, path: str, budget_bytes: int):
+        self.path = str(path)
+        self.budget_bytes = int(budget_bytes)
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        skey = storage_key(namespace, key)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, expires, last_used FROM entries WHERE key = ?', (skey,)
+            ).fetchone()
+            if row is None:
+                return None
+            blob, expires, last_used = row
+            if expires is not None and now >= expires:
+                self._db.execute('DELETE FROM entries WHERE key = ?', (skey,))
+                return None
+            if now - last_used > TOUCH_INTERVAL:
+                self._db.execute('UPDATE entries SET last_used = ? WHERE key = ?', (now, skey))
+        try:
+            value = pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable shared cache entry {skey}: {e}")
+            self.delete(namespace, key)
+            return None
+        return value, (expires - now if expires is not None else None)
+
+    def put(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.info(f"{namespace}: result can't be shared between processes ({e})")
+            return
+        if len(blob) > self.budget_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO entries (key, namespace, value, nbytes, expires, last_used) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (storage_key(namespace, key), namespace, blob, len(blob),
+                     now + ttl if ttl else None, now)
+                )
+                self._evict()
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones past the budget."""
+        self._db.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        total = self._db.execute('SELECT COALESCE(SUM(nbytes), 0) FROM entries').fetchone()[0]
+        if total <= self.budget_bytes:
+            return
+        doomed = []
+        for skey, nbytes in self._db.execute('SELECT key, nbytes FROM entries ORDER BY last_used'):
+            if total <= self.budget_bytes:
+                break
+            doomed.append((skey,))
+            total -= nbytes
+        self._db.executemany('DELETE FROM entries WHERE key = ?', doomed)
+        logger.info(f"Evicted {len(doomed)} entries from the shared cache")
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        with self._lock:
+            self._db.execute('DELETE FROM entries WHERE key = ?', (storage_key(namespace, key),))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._db.execute('DELETE FROM entries')
+            else:
+                self._db.execute('DELETE FROM entries WHERE namespace = ?', (namespace,))
+
+    def _try_lease(self, skey: str) -> bool:
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute('SELECT owner, expires FROM leases WHERE key = ?', (skey,)).fetchone()
+                held = row is not None and row[0] != self._owner and row[1] > now
+                if not held:
+                    self._db.execute('INSERT OR REPLACE INTO leases (key, owner, expires) VALUES (?, ?, ?)',
+                                     (skey, self._owner, now + LEASE_SECONDS))
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+        return not held
+
+    @contextmanager
+    def lease(self, namespace: str, key: Hashable) -> Iterator[None]:
+        skey = storage_key(namespace, key)
+        deadline = time.monotonic() + LEASE_SECONDS
+        while not self._try_lease(skey):
+            if time.monotonic() >= deadline:
+                logger.warning(f"{namespace}: gave up waiting for another process's load")
+                break
+            time.sleep(LEASE_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._db.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (skey, self._owner))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, nbytes = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries'
+            ).fetchone()
+        return {'entries': entries, 'bytes': nbytes, 'budget_bytes': self.budget_bytes}
+
+
+@st.cache_resource(show_spinner=False)
+def _create_sqlite_backend(path: str, budget_bytes: int) -> SQLiteBackend:
+    logger.info(f"Using shared cache at {path}")
+    return SQLiteBackend(path, budget_bytes)
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """The configured cross-process backend, or None when caches are per process."""
+    location = os.environ.get('CALYX_SHARED_CACHE')
+    if not location:
+        return None
+    path = Path(location)
+    if path.is_dir() or not path.suffix:
+        path = path / 'cache.sqlite'
+    try:
+        budget_mb = float(os.environ.get('CALYX_SHARED_CACHE_MB', DEFAULT_SHARED_BUDGET_MB))
+    except ValueError:
+        budget_mb = DEFAULT_SHARED_BUDGET_MB
+    try:
+        return _create_sqlite_backend(str(path), int(budget_mb * 1024 * 1024))
+    except Exception as e:
+        logger.warning(f"Shared cache unavailable: {e}")
+        return None
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'DEFAULT_SHARED_BUDGET_MB',
+    'LEASE_SECONDS',
+    'storage_key',
+    'CacheBackend',
+    'SQLiteBackend',
+    'get_shared_backend',
+]
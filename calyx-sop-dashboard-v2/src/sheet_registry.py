@@ -0,0 +1,348 @@
+"""
+Sheet Registry Module
+One shared, revision-tagged copy of every fetched tab per process
+
+Features:
+- CANONICAL_RANGES: the widest range any section needs for tabs that are
+  read by several sections (e.g. _NS_Invoices_Data is A:U for QBR / Rev Ops
+  and A:Y for the quarterly snapshots); narrower requests are served from
+  the wide fetch
+- project_frame: cuts a requested range out of a stored grid with the same
+  shape a direct fetch of that range would have had
+- SheetRegistry: process-wide store of raw grids keyed by (spreadsheet,
+  tab, fetched range), tagged with the revision token they were read under
+- In-flight claims so concurrent sessions share one download per tab
+- Listeners (callers' cache .clear hooks) fired when a grid is invalidated
+- Per-revision tab layout (grid sizes) used to request exact ranges
+- Byte budget with least-recently-used eviction of grids (its own budget,
+  next to memory_cache's, since grids are shared by every cached loader)
+
+Grids are stored exactly as values_to_dataframe(values) builds them (every
+row padded to the widest row). Sections get shallow copies; pandas
+copy-on-write keeps their edits off the shared grid.
+
+Configuration (environment):
+- CALYX_REGISTRY_BUDGET_MB: memory budget for stored grids (default 1024);
+  the grid stored last is always kept, even on its own over budget
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Widest range any section reads, for tabs shared between sections
+CANONICAL_RANGES: Dict[str, str] = {
+    '_NS_Invoices_Data': 'A:Y',
+    '_NS_SalesOrders_Data': 'A:AG',
+    'All Reps All Pipelines': 'A:Z',
+    'Invoice Line Item': 'A:Z',
+    'Sales Order Line Item': 'A:Z',
+    'Non-Conformance Details': 'A:W',
+    'Dashboard Info': 'A:C',
+}
+
+DEFAULT_REGISTRY_BUDGET_MB = 1024
+
+# A (spreadsheet id, sheet name, fetched A1 range) triple
+GridKey = Tuple[str, str, str]
+
+# Whole-column ranges anchored at column A, e.g. "A:Y"
+_COLUMN_RANGE = re.compile(r'^A:([A-Z]+)$')
+
+# pandas < 3 only copies on write when the option is switched on
+_COPY_ON_WRITE = (
+    int(pd.__version__.split('.')[0]) >= 3
+    or pd.get_option('mode.copy_on_write') is True
+)
+
+
+# =============================================================================
+# RANGES & PROJECTION
+# =============================================================================
+
+def column_number(letters: str) -> int:
+    """1-based column number for column letters ("A" -> 1, "AG" -> 33)."""
+    number = 0
+    for char in letters:
+        number = number * 26 + (ord(char) - ord('A') + 1)
+    return number
+
+
+def column_letters(number: int) -> str:
+    """Column letters for a 1-based column number (33 -> "AG")."""
+    letters = ''
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def column_count(range_name: str) -> Optional[int]:
+    """
+    Number of columns in a whole-column range anchored at A.
+
+    Returns:
+        25 for "A:Y", None for anything else ("A2:O", "A1:S80", ...)
+    """
+    match = _COLUMN_RANGE.match(range_name)
+    if match is None:
+        return None
+    return column_number(match.group(1))
+
+
+def fetch_range(sheet_name: str, range_name: str) -> str:
+    """
+    Range to actually download for a requested range.
+
+    Registered tabs are widened to their canonical range when the request
+    is a column prefix of it; everything else is fetched as asked.
+    """
+    canonical = CANONICAL_RANGES.get(sheet_name)
+    if canonical is None or canonical == range_name:
+        return range_name
+    wanted, widest = column_count(range_name), column_count(canonical)
+    if wanted is None or widest is None or wanted > widest:
+        return range_name
+    return canonical
+
+
+def _detach(df: pd.DataFrame) -> pd.DataFrame:
+    """New frame object callers may freely modify."""
+    return df.copy(deep=not _COPY_ON_WRITE)
+
+
+def project_frame(grid: pd.DataFrame, range_name: str, fetched_range: str,
+                  fit_to_header: bool = False) -> pd.DataFrame:
+    """
+    Cut a requested range out of a stored grid.
+
+    The result matches what values_to_dataframe would have built from a
+    direct fetch of range_name: the API trims trailing empty cells and
+    rows, so columns past the last non-empty cell are dropped as well.
+
+    Args:
+        grid: Stored frame for fetched_range (header as columns)
+        range_name: Range the caller asked for
+        fetched_range: Range the grid was downloaded with
+        fit_to_header: Same meaning as in values_to_dataframe
+
+    Returns:
+        New DataFrame (shares data with the grid until modified)
+    """
+    if grid is None or len(grid.columns) == 0:
+        return pd.DataFrame()
+
+    headers = [str(h) for h in grid.columns]
+    narrowed = range_name != fetched_range
+    view = grid
+
+    if narrowed:
+        view = grid.iloc[:, :column_count(range_name)]
+        headers = headers[:len(view.columns)]
+
+    if fit_to_header:
+        width = max((i + 1 for i, h in enumerate(headers) if h != ''), default=0)
+    elif narrowed:
+        filled = (view != '').any(axis=0).to_numpy() | [h != '' for h in headers]
+        width = max((i + 1 for i, f in enumerate(filled) if f), default=0)
+    else:
+        width = len(headers)
+
+    if width == 0:
+        return pd.DataFrame()
+    view = view.iloc[:, :width]
+
+    if narrowed and len(view):
+        # Rows that are blank inside the narrower range would not have come back
+        nonblank = (view != '').any(axis=1).to_numpy()
+        last = nonblank.nonzero()[0]
+        view = view.iloc[:last[-1] + 1 if len(last) else 0]
+
+    return _detach(view)
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+class SheetRegistry:
+    """
+    Process-wide store of raw tab grids.
+
+    Each grid is kept once, for the newest revision token it was read
+    under; storing a newer revision replaces the old grid. With a budget,
+    least recently read grids are evicted once the stored grids exceed it.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        """
+        Args:
+            budget_bytes: Memory budget for grids (None = unbounded)
+        """
+        self.budget_bytes = None if budget_bytes is None else int(budget_bytes)
+        self._lock = threading.Lock()
+        self._grids: 'OrderedDict[GridKey, Tuple[str, pd.DataFrame, int]]' = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._loading: Dict[GridKey, Tuple[str, threading.Event]] = {}
+        self._listeners: Dict[GridKey, Set[Callable[[], None]]] = {}
+        self._layouts: Dict[str, Tuple[str, Dict[str, Tuple[int, int]]]] = {}
+
+    def get(self, key: GridKey, token: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Grid for key (only if read under token, when one is given)."""
+        with self._lock:
+            entry = self._grids.get(key)
+            if entry is not None:
+                self._grids.move_to_end(key)
+        if entry is None or (token is not None and entry[0] != token):
+            return None
+        return entry[1]
+
+    def claim(self, keys: Iterable[GridKey], token: str
+              ) -> Tuple[List[GridKey], Dict[GridKey, threading.Event]]:
+        """
+        Split keys into ones this caller must load and ones already loading.
+
+        Returns:
+            (keys now claimed by this caller, key -> event of another
+            caller's in-flight load of the same revision)
+        """
+        mine, theirs = [], {}
+        with self._lock:
+            for key in keys:
+                loading = self._loading.get(key)
+                if loading is not None and loading[0] == token:
+                    theirs[key] = loading[1]
+                else:
+                    self._loading[key] = (token, threading.Event())
+                    mine.append(key)
+        return mine, theirs
+
+    def put(self, key: GridKey, token: str, grid: Optional[pd.DataFrame]) -> None:
+        """Store a loaded grid (if any) and release the claim on it."""
+        with self._lock:
+            if grid is not None:
+                self._drop(key)
+                nbytes = int(grid.memory_usage(deep=True).sum())
+                self._grids[key] = (token, grid, nbytes)
+                self._bytes += nbytes
+                self._evict(keep=key)
+            loading = self._loading.get(key)
+            if loading is not None and loading[0] == token:
+                del self._loading[key]
+        if loading is not None:
+            loading[1].set()
+
+    def _drop(self, key: GridKey) -> None:
+        entry = self._grids.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self, keep: GridKey) -> None:
+        """Evict least recently used grids (never keep) until within budget; lock held."""
+        if self.budget_bytes is None:
+            return
+        while self._bytes > self.budget_bytes and len(self._grids) > 1:
+            evicted = next(key for key in self._grids if key != keep)
+            self._drop(evicted)
+            self._evictions += 1
+            logger.info(f"Evicted {evicted[1]} ({evicted[2]}) from the sheet registry")
+        if self._bytes > self.budget_bytes:
+            logger.warning(f"{keep[1]}: {self._bytes / 1e6:.1f} MB grid exceeds the "
+                           f"{self.budget_bytes / 1e6:.0f} MB registry budget")
+
+    def get_layout(self, spreadsheet_id: str, token: str) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Tab sizes recorded for this revision, or None."""
+        with self._lock:
+            entry = self._layouts.get(spreadsheet_id)
+        if entry is None or entry[0] != token:
+            return None
+        return entry[1]
+
+    def put_layout(self, spreadsheet_id: str, token: str,
+                   layout: Dict[str, Tuple[int, int]]) -> None:
+        """Record tab title -> (row count, column count) for a revision."""
+        with self._lock:
+            self._layouts[spreadsheet_id] = (token, layout)
+
+    def add_listener(self, key: GridKey, callback: Callable[[], None]) -> None:
+        """Call callback whenever the grid for key is invalidated."""
+        with self._lock:
+            self._listeners.setdefault(key, set()).add(callback)
+
+    def invalidate(self, keys: Iterable[GridKey]) -> None:
+        """Drop grids (e.g. after a warm-start snapshot proved stale) and notify listeners."""
+        callbacks = set()
+        with self._lock:
+            for key in keys:
+                self._drop(key)
+                callbacks.update(self._listeners.get(key, ()))
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Sheet registry listener failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every grid."""
+        with self._lock:
+            self._grids.clear()
+            self._bytes = 0
+            self._layouts.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored grids, their approximate size in bytes, budget and evictions."""
+        with self._lock:
+            return {
+                'grids': len(self._grids),
+                'bytes': self._bytes,
+                'budget_bytes': self.budget_bytes,
+                'evictions': self._evictions,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def _create_sheet_registry(budget_bytes: int) -> SheetRegistry:
+    logger.info(f"Sheet registry budget: {budget_bytes / 1e6:.0f} MB")
+    return SheetRegistry(budget_bytes)
+
+
+def get_sheet_registry() -> SheetRegistry:
+    """Get the process-wide sheet registry (shared by all sessions)."""
+    try:
+        budget_mb = float(os.environ.get('CALYX_REGISTRY_BUDGET_MB', DEFAULT_REGISTRY_BUDGET_MB))
+    except ValueError:
+        budget_mb = DEFAULT_REGISTRY_BUDGET_MB
+    return _create_sheet_registry(int(budget_mb * 1024 * 1024))
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'CANONICAL_RANGES',
+    'DEFAULT_REGISTRY_BUDGET_MB',
+    'GridKey',
+    'column_number',
+    'column_letters',
+    'column_count',
+    'fetch_range',
+    'project_frame',
+    'SheetRegistry',
+    'get_sheet_registry',
+]
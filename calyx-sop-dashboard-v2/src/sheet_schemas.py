@@ -0,0 +1,447 @@
+"""
+Sheet Schemas Module
+Declarative column types for the known Google Sheets tabs and a single
+vectorized pass that turns raw sheet strings into typed DataFrames
+
+Features:
+- SHEET_SCHEMAS registry: per tab, exact header -> type plus ordered
+  header patterns (NetSuite / HubSpot exports rename columns over time)
+- Column types: text, number, currency, percent, date, category
+- Currency parsing handles $, commas, spaces, parentheses negatives and
+  sheet errors (#N/A, #REF!, ...) without per-cell Python calls (pyarrow
+  compute kernels when available, pandas string methods otherwise)
+- ID-like columns (document numbers, SKUs, zip codes) are pinned to text so
+  they are never turned into floats
+- Unknown tabs / undeclared columns fall back to the legacy ">50% numeric"
+  inference, vectorized
+- compact_dimensions: repeated text columns (reps, customers, statuses,
+  pipelines, stages, items, product types) stored as categoricals, or
+  Arrow-backed strings when too many values are distinct
+  (S&OP loaders, the QBR invoice / sales order frames and the Q1 / Q4
+  snapshots; the Q2 snapshot keeps strings for its editable tables)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import pandas as pd
+import numpy as np
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# =============================================================================
+# COLUMN TYPES
+# =============================================================================
+
+TEXT = 'text'
+NUMBER = 'number'
+CURRENCY = 'currency'
+PERCENT = 'percent'
+DATE = 'date'
+CATEGORY = 'category'
+
+COLUMN_TYPES = (TEXT, NUMBER, CURRENCY, PERCENT, DATE, CATEGORY)
+
+# Characters stripped before numeric parsing ("$1,234.50", "( 12 )", "1 000")
+_NUMERIC_JUNK = re.compile(r'[$,\s()]')
+_JUNK_CHARS = ('$', ',', '(', ')', ' ')
+_NUMBER_FORMAT = r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$'
+
+# Arrow-backed strings with NaN for missing values (pandas 3's default str;
+# plain object columns on pandas without it)
+def _string_dtype():
+    if not ARROW_AVAILABLE:
+        return object
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype('pyarrow_numpy')
+    except (TypeError, ValueError):
+        return object
+
+
+STRING_DTYPE = _string_dtype()
+
+# Low-cardinality text columns filtered / grouped on throughout the app
+# (sheet headers plus the names the S&OP loaders rename them to)
+DIMENSION_COLUMNS = (
+    'Rep Master', 'Sales Rep', 'Rep',
+    'Corrected Customer', 'Corrected Customer Name', 'Customer',
+    'Status', 'Updated Status',
+    'Pipeline', 'Deal Stage', 'Stage',
+    'Item',
+    'Product Type', 'Calyx || Product Type', 'Calyx Product Type',
+)
+
+# Above this share of distinct values a column stays a plain string column
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+# =============================================================================
+# VECTORIZED PARSERS
+# =============================================================================
+
+def coerce_numeric(values, fill_value: float = np.nan) -> pd.Series:
+    """
+    Parse a column of sheet strings to floats in one vectorized pass.
+
+    Handles $, thousands separators, spaces, accounting-style negatives
+    "(1,234.00)", blanks and sheet errors (#N/A, #REF!, #VALUE!, ...).
+
+    Args:
+        values: Series (or array-like) of raw values
+        fill_value: Value for blanks / unparseable cells (NaN by default;
+            pass 0 to match the old clean_numeric helpers)
+
+    Returns:
+        float64 Series aligned with the input
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64').fillna(fill_value)
+
+    if ARROW_AVAILABLE:
+        numbers = _arrow_to_float(series)
+    else:
+        text = series.astype('string').str.strip()
+        negative = (text.str.startswith('(') & text.str.endswith(')')).fillna(False).to_numpy(dtype=bool)
+        numbers = pd.to_numeric(text.str.replace(_NUMERIC_JUNK, '', regex=True), errors='coerce')
+        numbers = numbers.astype('float64').to_numpy()
+        numbers = np.where(negative, -numbers, numbers)
+    return pd.Series(numbers, index=series.index, name=series.name).fillna(fill_value)
+
+
+def _arrow_to_float(series: pd.Series) -> np.ndarray:
+    """
+    pyarrow kernel for coerce_numeric.
+
+    Each junk character costs one pass only if it occurs in the column, and
+    the number-format regex only runs when a straight cast fails, so clean
+    columns are a trim plus a cast.
+    """
+    text = pc.utf8_trim_whitespace(pa.array(series.astype('string'), type=pa.string(), from_pandas=True))
+
+    negative = None
+    if pc.any(pc.starts_with(text, '(')).as_py():
+        negative = pc.and_(pc.starts_with(text, '('), pc.ends_with(text, ')'))
+
+    for char in _JUNK_CHARS:
+        if pc.any(pc.match_substring(text, char)).as_py():
+            text = pc.replace_substring(text, char, '')
+
+    try:
+        numbers = pc.cast(text, pa.float64())
+    except pa.ArrowInvalid:
+        valid = pc.match_substring_regex(text, _NUMBER_FORMAT)
+        numbers = pc.cast(pc.if_else(valid, text, None), pa.float64())
+
+    if negative is not None:
+        numbers = pc.if_else(negative, pc.negate(numbers), numbers)
+    return numbers.to_numpy(zero_copy_only=False)
+
+
+def clean_numeric(value) -> float:
+    """
+    Scalar form of coerce_numeric for one-off cells (blank / unparseable -> 0).
+
+    Use coerce_numeric for whole columns.
+    """
+    if pd.isna(value):
+        return 0.0
+    text = str(value).strip()
+    negative = text.startswith('(') and text.endswith(')')
+    try:
+        number = float(_NUMERIC_JUNK.sub('', text))
+    except ValueError:
+        return 0.0
+    if np.isnan(number):
+        return 0.0
+    return -number if negative else number
+
+
+def coerce_percent(values, fill_value: float = np.nan) -> pd.Series:
+    """
+    Parse percentages to fractions: "45%" -> 0.45.
+
+    Cells without a % sign are taken as already fractional (0.45).
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64').fillna(fill_value)
+
+    text = series.astype('string').str.strip()
+    has_pct = text.str.endswith('%').fillna(False).to_numpy(dtype=bool)
+    numbers = coerce_numeric(text.str.rstrip('%')).to_numpy()
+    numbers = np.where(has_pct, numbers / 100.0, numbers)
+    return pd.Series(numbers, index=series.index, name=series.name).fillna(fill_value)
+
+
+def coerce_date(values, date_format: Optional[str] = None) -> pd.Series:
+    """Parse dates (blank / invalid -> NaT); date_format skips format inference."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    text = series.astype('string').str.strip().replace('', pd.NA)
+    return pd.to_datetime(text, format=date_format, errors='coerce')
+
+
+def coerce_text(values) -> pd.Series:
+    """Normalize to stripped strings (blanks stay '')."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    return series.fillna('').astype(str).str.strip()
+
+
+def coerce_category(values) -> pd.Series:
+    """Stripped strings stored as a pandas categorical."""
+    return coerce_text(values).astype(STRING_DTYPE).astype('category')
+
+
+def _is_text(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_object_dtype(series):
+        return pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+    return pd.api.types.is_string_dtype(series)
+
+
+def compact_dimensions(df: pd.DataFrame, columns=DIMENSION_COLUMNS,
+                       max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    """
+    Store repeated text columns compactly.
+
+    Each listed text column present in df becomes a categorical (string
+    categories) when at most max_unique_ratio of its values are distinct,
+    otherwise an Arrow-backed string column. Values are not changed;
+    numeric, date and already-categorical columns are left alone.
+
+    Consumers must treat these columns as read-only labels: assigning a new
+    label into part of a categorical column (or fillna / replace / map +
+    fillna with one) raises, and groupby needs observed=True on pandas 2.
+
+    Returns:
+        New DataFrame (unchanged columns are shared, not copied)
+    """
+    if df is None or df.empty:
+        return df
+
+    wanted = set(columns)
+    converted = {}
+    # By position, so duplicate headers (Customer, Customer) are compacted too
+    for i, col in enumerate(df.columns):
+        if col not in wanted:
+            continue
+        series = df.iloc[:, i]
+        if not _is_text(series):
+            continue
+        text = series.astype(STRING_DTYPE)
+        if text.nunique(dropna=True) <= max(1, len(text) * max_unique_ratio):
+            converted[i] = text.astype('category')
+        elif text.dtype != series.dtype:
+            converted[i] = text
+
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, values in converted.items():
+        df.isetitem(i, values)
+    return df
+
+
+# =============================================================================
+# SCHEMA REGISTRY
+# =============================================================================
+
+# Ordered (regex, type) rules shared by the NetSuite / HubSpot exports.
+# ID-like rules come first so "Document Number" never becomes a float;
+# SO / PO only count on their own ("PO", "SO #"), not in "PO Date".
+_ID_PATTERNS: List[Tuple[str, str]] = [
+    (r'(number|#|\bid\b|sku|^item$|zip|postal|phone|reference|^(so|po)( ?#| number)?$)', TEXT),
+]
+_DATE_PATTERNS: List[Tuple[str, str]] = [
+    (r'date', DATE),
+]
+_MONEY_PATTERNS: List[Tuple[str, str]] = [
+    (r'probability|percent|%', PERCENT),
+    (r'amount|price|\brate\b|cost|revenue|total|value|quota', CURRENCY),
+]
+_QTY_PATTERNS: List[Tuple[str, str]] = [
+    (r'qty|quantity|on hand|available|committed|backordered|on order|units', NUMBER),
+    (r'lead ?time', NUMBER),
+]
+_TRANSACTION_PATTERNS = _ID_PATTERNS + _DATE_PATTERNS + _MONEY_PATTERNS + _QTY_PATTERNS
+
+# Per-tab schemas. 'columns' pins exact headers, 'patterns' types headers by
+# regex (case-insensitive, first match wins), 'infer' controls whether
+# remaining columns go through legacy numeric inference.
+SHEET_SCHEMAS: Dict[str, dict] = {
+    'Invoice Line Item': {
+        'columns': {'Calyx || Product Type': TEXT, 'Product Type': TEXT},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    'Sales Order Line Item': {
+        'columns': {'Calyx || Product Type': TEXT, 'Product Type': TEXT},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    '_NS_Invoices_Data': {
+        'columns': {'Status': TEXT},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    '_NS_SalesOrders_Data': {
+        'columns': {'Status': TEXT, 'Updated Status': TEXT},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    'Deals': {
+        'columns': {'Probability Rev': CURRENCY},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    'All Reps All Pipelines': {
+        'columns': {'Probability Rev': CURRENCY},
+        'patterns': _TRANSACTION_PATTERNS,
+        'infer': True,
+    },
+    'Raw_Items': {
+        'columns': {'Stock Item': TEXT, 'Calyx || Product Type': TEXT},
+        'patterns': _ID_PATTERNS + _MONEY_PATTERNS + _QTY_PATTERNS,
+        'infer': True,
+    },
+    'Raw_Inventory': {
+        'columns': {},
+        'patterns': _ID_PATTERNS + _QTY_PATTERNS + _MONEY_PATTERNS,
+        'infer': True,
+    },
+    'Raw_Vendors': {
+        'columns': {},
+        'patterns': _ID_PATTERNS,
+        'infer': True,
+    },
+    '_NS_Customer_List': {
+        'columns': {},
+        'patterns': _ID_PATTERNS + _DATE_PATTERNS,
+        'infer': True,
+    },
+    'Non-Conformance Details': {
+        'columns': {'Total Quantity Affected': NUMBER, 'Cost of Rework': CURRENCY, 'Cost Avoided': CURRENCY},
+        'patterns': _ID_PATTERNS + _DATE_PATTERNS,
+        'infer': True,
+    },
+}
+
+
+def get_schema(sheet_name: str) -> Optional[dict]:
+    """Schema for a tab, or None if the tab isn't registered."""
+    return SHEET_SCHEMAS.get(sheet_name)
+
+
+def resolve_column_types(columns, schema: Optional[dict]) -> Dict[str, Optional[str]]:
+    """
+    Decide the type of each column from the schema.
+
+    Returns:
+        Column -> type, or None for columns left to inference
+    """
+    types = {}
+    exact = (schema or {}).get('columns', {})
+    patterns = [(re.compile(p, re.IGNORECASE), t) for p, t in (schema or {}).get('patterns', [])]
+
+    for col in columns:
+        if col in exact:
+            types[col] = exact[col]
+            continue
+        types[col] = next((t for regex, t in patterns if regex.search(str(col))), None)
+    return types
+
+
+def _infer_numeric(series: pd.Series) -> pd.Series:
+    """Legacy rule: keep the numeric parse if more than half the rows parse."""
+    numbers = pd.to_numeric(series, errors='coerce')
+    if numbers.notna().sum() > len(series) * 0.5:
+        return numbers
+    return series
+
+
+_PARSERS = {
+    NUMBER: coerce_numeric,
+    CURRENCY: coerce_numeric,
+    PERCENT: coerce_percent,
+    DATE: coerce_date,
+    TEXT: coerce_text,
+    CATEGORY: coerce_category,
+}
+
+
+def apply_schema(df: pd.DataFrame, sheet_name: str = None,
+                 schema: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Type every column of a raw sheet frame in one pass.
+
+    Args:
+        df: Frame of raw sheet strings (unique column names)
+        sheet_name: Tab name to look up in SHEET_SCHEMAS
+        schema: Explicit schema (overrides the registry lookup)
+
+    Returns:
+        New DataFrame with typed columns
+    """
+    if df is None or df.empty:
+        return df
+
+    schema = schema if schema is not None else get_schema(sheet_name)
+    infer = schema is None or schema.get('infer', True)
+    types = resolve_column_types(df.columns, schema)
+
+    typed = []
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        col_type = types.get(col)
+        if col_type is not None:
+            typed.append(_PARSERS[col_type](series))
+        elif infer:
+            typed.append(_infer_numeric(series))
+        else:
+            typed.append(series)
+
+    # Positional concat keeps duplicate headers intact
+    result = pd.concat(typed, axis=1, ignore_index=True)
+    result.columns = df.columns
+    return result
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'TEXT', 'NUMBER', 'CURRENCY', 'PERCENT', 'DATE', 'CATEGORY',
+    'COLUMN_TYPES',
+    'ARROW_AVAILABLE',
+    'SHEET_SCHEMAS',
+    'coerce_numeric',
+    'clean_numeric',
+    'coerce_percent',
+    'coerce_date',
+    'coerce_text',
+    'coerce_category',
+    'STRING_DTYPE',
+    'DIMENSION_COLUMNS',
+    'compact_dimensions',
+    'get_schema',
+    'resolve_column_types',
+    'apply_schema',
+]
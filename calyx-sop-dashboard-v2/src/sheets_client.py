@@ -0,0 +1,265 @@
+"""
+Sheets Client Module
+Process-wide pool of authenticated Google API clients shared by every module
+
+Features:
+- Service account credentials parsed once per process
+- Access token refreshed once under a lock and reused by every thread
+- Sheets discovery document parsed once (one service object per API)
+- Per-thread keep-alive HTTP connections (httplib2.Http is not thread-safe)
+- gspread client for data_loader / sop_data_loader on the same credentials
+- Drive v3 service for cheap spreadsheet revision probes
+- Every request (googleapiclient and gspread) runs through the quota-aware
+  request scheduler: paced to the per-minute quota, retried on 429 / 5xx
+- Record / replay modes (see sheets_replay): CALYX_SHEETS_REPLAY serves
+  every client from recorded cassettes, no credentials needed;
+  CALYX_SHEETS_RECORD captures live responses into them
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import functools
+import json
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import gspread
+import httplib2
+import google_auth_httplib2
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+from gspread.http_client import HTTPClient
+
+from .request_scheduler import RequestScheduler, get_request_scheduler
+from .sheets_replay import get_recorder, get_replay_session
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    'https://www.googleapis.com/auth/drive.readonly'
+]
+
+# Socket timeout (seconds) for each pooled connection
+HTTP_TIMEOUT = 60
+
+
+# =============================================================================
+# CREDENTIALS
+# =============================================================================
+
+def get_service_account_info() -> Optional[dict]:
+    """
+    Read service account info from Streamlit secrets.
+
+    Supports the [service_account] / [gcp_service_account] tables, a JSON
+    string stored under either key, and top-level secrets.
+
+    Returns:
+        Credentials dict or None if no service account is configured
+    """
+    try:
+        if 'service_account' in st.secrets:
+            info = st.secrets['service_account']
+        elif 'gcp_service_account' in st.secrets:
+            info = st.secrets['gcp_service_account']
+        elif 'private_key' in st.secrets:
+            info = {
+                'type': st.secrets.get('type', 'service_account'),
+                'project_id': st.secrets.get('project_id'),
+                'private_key_id': st.secrets.get('private_key_id'),
+                'private_key': st.secrets.get('private_key'),
+                'client_email': st.secrets.get('client_email'),
+                'client_id': st.secrets.get('client_id'),
+                'auth_uri': st.secrets.get('auth_uri'),
+                'token_uri': st.secrets.get('token_uri'),
+            }
+        else:
+            return None
+    except Exception:
+        return None
+
+    if isinstance(info, str):
+        return json.loads(info)
+    return dict(info)
+
+
+# =============================================================================
+# SCHEDULED REQUESTS
+# =============================================================================
+
+class ScheduledHttpRequest(HttpRequest):
+    """googleapiclient request whose execute() waits for quota and retries transient errors."""
+
+    def __init__(self, scheduler: RequestScheduler, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+
+    def execute(self, http=None, num_retries=0):
+        # Retries are the scheduler's job (shared backoff and quota)
+        return self.scheduler.call(super().execute, http=http, num_retries=0)
+
+
+class ScheduledHTTPClient(HTTPClient):
+    """gspread HTTP client routed through the Sheets request scheduler."""
+
+    def request(self, *args, **kwargs):
+        return get_request_scheduler('sheets').call(super().request, *args, **kwargs)
+
+
+# =============================================================================
+# CLIENT POOL
+# =============================================================================
+
+class GoogleClientPool:
+    """
+    Thread-safe pool of Google API clients sharing one set of credentials.
+
+    googleapiclient service objects are cheap to share, but the httplib2
+    connection underneath is not, so each thread gets its own keep-alive
+    AuthorizedHttp and every request is routed through it.
+    """
+
+    def __init__(self, credentials, timeout: int = HTTP_TIMEOUT):
+        self.credentials = credentials
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._services: Dict[Tuple[str, str], object] = {}
+
+    def _thread_http(self):
+        """Get (or create) this thread's keep-alive authorized connection."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=self.timeout)
+            )
+            self._local.http = http
+        return http
+
+    def ensure_token(self) -> None:
+        """Refresh the shared access token once when it expires."""
+        if self.credentials.valid:
+            return
+        with self._refresh_lock:
+            if not self.credentials.valid:
+                self.credentials.refresh(Request())
+                logger.info("Refreshed Google API access token")
+
+    def _build_request(self, scheduler, http, *args, **kwargs):
+        """requestBuilder hook: run every request on the calling thread's connection."""
+        self.ensure_token()
+        return ScheduledHttpRequest(scheduler, self._thread_http(), *args, **kwargs)
+
+    def service(self, name: str = 'sheets', version: str = 'v4'):
+        """Get the shared service object for an API, building it on first use."""
+        key = (name, version)
+        with self._lock:
+            if key not in self._services:
+                self._services[key] = build(
+                    name, version,
+                    http=self._thread_http(),
+                    requestBuilder=functools.partial(self._build_request, get_request_scheduler(name)),
+                    cache_discovery=False
+                )
+            return self._services[key]
+
+
+@st.cache_resource(show_spinner=False)
+def _create_client_pool() -> GoogleClientPool:
+    info = get_service_account_info()
+    if info is None:
+        raise RuntimeError("Missing Google Cloud credentials in Streamlit secrets")
+
+    credentials = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
+    logger.info("Created pooled Google API client")
+    return GoogleClientPool(credentials)
+
+
+def get_client_pool() -> Optional[GoogleClientPool]:
+    """
+    Get the process-wide client pool.
+
+    Failures are not cached, so fixing secrets takes effect on the next call.
+
+    Returns:
+        GoogleClientPool or None if credentials are unavailable
+    """
+    try:
+        return _create_client_pool()
+    except Exception as e:
+        logger.error(f"Failed to authenticate with Google APIs: {e}")
+        return None
+
+
+def get_sheets_service():
+    """Get the pooled Sheets v4 service, or None without credentials."""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.sheets_service()
+    pool = get_client_pool()
+    if pool is None:
+        return None
+    service = pool.service('sheets', 'v4')
+    recorder = get_recorder()
+    return recorder.wrap_sheets(service) if recorder is not None else service
+
+
+def get_drive_service():
+    """Get the pooled Drive v3 service (file metadata probes), or None."""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.drive_service()
+    pool = get_client_pool()
+    if pool is None:
+        return None
+    return pool.service('drive', 'v3')
+
+
+@st.cache_resource(show_spinner=False)
+def _create_gspread_client():
+    pool = get_client_pool()
+    if pool is None:
+        raise RuntimeError("Missing Google Cloud credentials in Streamlit secrets")
+    return gspread.authorize(pool.credentials, http_client=ScheduledHTTPClient)
+
+
+def get_gspread_client():
+    """Get a gspread client on the pooled credentials, or None."""
+    replay = get_replay_session()
+    if replay is not None:
+        return replay.gspread_client()
+    try:
+        client = _create_gspread_client()
+        recorder = get_recorder()
+        return recorder.wrap_gspread(client) if recorder is not None else client
+    except Exception as e:
+        logger.error(f"Failed to authenticate with Google Sheets: {e}")
+        return None
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'SCOPES',
+    'get_service_account_info',
+    'ScheduledHttpRequest',
+    'ScheduledHTTPClient',
+    'GoogleClientPool',
+    'get_client_pool',
+    'get_sheets_service',
+    'get_drive_service',
+    'get_gspread_client',
+]
@@ -0,0 +1,918 @@
+"""
+Sheets Ingestion Module
+Shared Google Sheets fetch layer for the Revenue, QBR and Rev Ops sections
+
+Features:
+- Collects every (sheet, range) pair a section needs and pulls them with a
+  single spreadsheets.values.batchGet round trip
+- Splits the batch response back into one DataFrame per tab
+- Reads every tab's grid size once per revision and requests exact,
+  bounded ranges; tabs that don't exist are skipped before the batch
+- Falls back to range-by-range fetching when one range breaks the batch
+- Shared tabs are downloaded once per revision at their widest range and
+  projected per section (see sheet_registry)
+- Persists every fetched tab to the on-disk snapshot store for warm starts
+- Optional bounded-concurrency mode (one request per tab, parsed on arrival)
+- Very large tabs are paged in row blocks so the raw API rows are never
+  held all at once; iter_sheet_blocks / BlockAggregator stream a tab into
+  running totals without materializing it
+- Failed fetches are reported to data_cache and never stored in the
+  registry, so an outage is not cached as an empty tab
+- Delta sync for the append-mostly NetSuite exports: only the header, the
+  recent tail and any new rows are read and merged into the snapshot;
+  structural changes fall back to a full reload
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import contextvars
+import hashlib
+import logging
+import re
+import threading
+import gspread
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    SCRIPT_CTX_AVAILABLE = True
+except ImportError:
+    SCRIPT_CTX_AVAILABLE = False
+
+from .sheets_client import get_sheets_service
+from .snapshot_store import get_snapshot_store, load_with_snapshots
+from .sheet_registry import (
+    GridKey, SheetRegistry, column_letters, column_number, fetch_range, get_sheet_registry, project_frame
+)
+from .data_cache import cache_token, report_fetch_failure
+from .sheet_schemas import apply_schema, coerce_date, coerce_numeric
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_SPREADSHEET_ID = "15JhBZ_7aHHZA1W1qsoC2163borL6RYjk0xTDWPmWPfA"
+
+# A (sheet name, A1 range) pair, e.g. ("_NS_Invoices_Data", "A:Y")
+SheetRange = Tuple[str, str]
+
+# Two-corner A1 ranges: "A:Z", "A2:AB", "A1:S80"
+_A1_RANGE = re.compile(r'^([A-Z]+)(\d*):([A-Z]+)(\d*)$')
+
+# Tabs with more grid rows than this are read in blocks of STREAM_BLOCK_ROWS
+# rather than one response, so the raw rows never sit in memory all at once
+STREAM_MIN_ROWS = 20000
+STREAM_BLOCK_ROWS = 5000
+
+# Append-mostly exports synced incrementally: tab -> key column. Each sync
+# re-reads the last DELTA_TAIL_ROWS rows (where NetSuite edits land) plus
+# anything appended; a full reload still happens every DELTA_FULL_SYNC_HOURS
+# to pick up edits further up the tab.
+DELTA_SYNC_SHEETS: Dict[str, str] = {
+    '_NS_Invoices_Data': 'Document Number',
+    '_NS_SalesOrders_Data': 'Document Number',
+}
+DELTA_TAIL_ROWS = 200
+DELTA_FULL_SYNC_HOURS = 24
+
+# Upper bound on simultaneous Sheets requests from one aggregate load
+# (keeps bursts well under the per-user read quota)
+MAX_CONCURRENT_FETCHES = 4
+
+
+# =============================================================================
+# SPREADSHEET
+# =============================================================================
+
+def get_spreadsheet_id(default: str = DEFAULT_SPREADSHEET_ID) -> str:
+    """Get spreadsheet ID from secrets, falling back to the default workbook."""
+    try:
+        return st.secrets.get('SPREADSHEET_ID', st.secrets.get('spreadsheet_id', default))
+    except Exception:
+        return default
+
+
+# =============================================================================
+# RANGE HELPERS
+# =============================================================================
+
+def a1_range(sheet_name: str, range_name: str) -> str:
+    """Build a quoted A1 range, e.g. 'Invoice Line Item'!A:Z."""
+    return "'{}'!{}".format(sheet_name.replace("'", "''"), range_name)
+
+
+def values_to_dataframe(values: List[List[str]], fit_to_header: bool = False) -> pd.DataFrame:
+    """
+    Convert a Sheets `values` list-of-lists into a DataFrame.
+
+    The API trims trailing empty cells, so rows come back ragged.
+
+    Args:
+        values: Rows as returned by the API (first row is the header)
+        fit_to_header: If True, pad/truncate every row to the header width.
+            Otherwise pad every row (header included) to the widest row.
+
+    Returns:
+        DataFrame (empty if there are no values)
+    """
+    if not values:
+        return pd.DataFrame()
+
+    if fit_to_header:
+        headers = list(values[0])
+        width = len(headers)
+    else:
+        width = max(len(row) for row in values)
+        headers = list(values[0]) + [''] * (width - len(values[0]))
+
+    rows = [
+        row[:width] if len(row) >= width else row + [''] * (width - len(row))
+        for row in values[1:]
+    ]
+    return pd.DataFrame(rows, columns=headers)
+
+
+def exact_range(range_name: str, row_count: int, column_count: int) -> Optional[str]:
+    """
+    Bound an A1 range to a tab's grid, e.g. "A:AG" on a 5000 x 20 tab -> "A1:T5000".
+
+    Args:
+        range_name: Range as requested ("A:Z", "A2:AB", "A1:S80")
+        row_count: Tab grid rows (gridProperties.rowCount)
+        column_count: Tab grid columns (gridProperties.columnCount)
+
+    Returns:
+        Bounded range, the input unchanged if it isn't a two-corner range,
+        or None if the range lies entirely outside the grid
+    """
+    match = _A1_RANGE.match(range_name)
+    if match is None:
+        return range_name
+
+    first_col, first_row, last_col, last_row = match.groups()
+    first_col, last_col = column_number(first_col), min(column_number(last_col), column_count)
+    first_row = int(first_row or 1)
+    last_row = min(int(last_row) if last_row else row_count, row_count)
+    if first_col > last_col or first_row > last_row:
+        return None
+    return f"{column_letters(first_col)}{first_row}:{column_letters(last_col)}{last_row}"
+
+
+def show_fetch_error(sheet_name: str, error: Exception) -> None:
+    """Show a fetch error with troubleshooting hints based on the error type."""
+    error_msg = str(error)
+    st.error(f"❌ Error loading data from {sheet_name}: {error_msg}")
+
+    if "403" in error_msg or "permission" in error_msg.lower():
+        st.warning("""
+        **Permission Error:**
+        - Make sure you've shared the Google Sheet with your service account email
+        - The service account email looks like: `your-service-account@project.iam.gserviceaccount.com`
+        - Share the sheet with 'Viewer' access
+        """)
+    elif "404" in error_msg or "not found" in error_msg.lower():
+        st.warning("""
+        **Sheet Not Found:**
+        - Check that the spreadsheet ID is correct
+        - Check that the sheet name matches exactly (case-sensitive)
+        """)
+    elif "401" in error_msg or "authentication" in error_msg.lower():
+        st.warning("""
+        **Authentication Error:**
+        - Your service account credentials may be invalid
+        - Try regenerating the service account key in Google Cloud Console
+        """)
+
+
+# =============================================================================
+# SHEET LAYOUT
+# =============================================================================
+
+def get_sheet_layout(service, spreadsheet_id: str) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    Grid size of every tab, read once per spreadsheet revision.
+
+    One spreadsheets.get call restricted to sheet titles and gridProperties
+    (no cell data), kept in the sheet registry until the revision changes.
+
+    Returns:
+        Tab title -> (row count, column count), or None if unavailable
+    """
+    registry = get_sheet_registry()
+    token = cache_token(spreadsheet_id)
+    layout = registry.get_layout(spreadsheet_id, token)
+    if layout is not None:
+        return layout
+
+    try:
+        response = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets.properties(title,gridProperties(rowCount,columnCount))'
+        ).execute()
+    except Exception as e:
+        logger.warning(f"Could not read sheet layout for {spreadsheet_id}: {e}")
+        return None
+
+    layout = {}
+    for sheet in response.get('sheets', []):
+        properties = sheet.get('properties', {})
+        grid = properties.get('gridProperties', {})
+        layout[properties.get('title')] = (grid.get('rowCount', 0), grid.get('columnCount', 0))
+    registry.put_layout(spreadsheet_id, token, layout)
+    return layout
+
+
+# =============================================================================
+# BATCHED FETCHING
+# =============================================================================
+
+def batch_get_values(service, spreadsheet_id: str,
+                     ranges: Sequence[SheetRange]) -> List[List[List[str]]]:
+    """
+    Fetch several ranges with one spreadsheets.values.batchGet call.
+
+    Args:
+        service: Sheets v4 service
+        spreadsheet_id: Spreadsheet to read
+        ranges: (sheet name, range) pairs
+
+    Returns:
+        One `values` list per requested range, in request order
+    """
+    response = service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=[a1_range(sheet_name, range_name) for sheet_name, range_name in ranges]
+    ).execute()
+
+    value_ranges = response.get('valueRanges', [])
+    return [value_range.get('values', []) for value_range in value_ranges]
+
+
+# =============================================================================
+# STREAMED FETCHING
+# =============================================================================
+
+def _iter_value_blocks(service, spreadsheet_id: str, sheet_name: str, bounded: str,
+                       block_rows: Optional[int] = None, stop_at_empty: bool = False
+                       ) -> Iterator[Tuple[List[str], List[List[str]]]]:
+    """
+    Page through a bounded range block_rows rows at a time.
+
+    Yields (header, rows) per block; the header is the range's first row.
+    The API trims trailing empty rows from each block, so blank rows that
+    end a block (or fill it) are held back and put in front of the next
+    block with data; blanks after the last data row are dropped, the same
+    as one full fetch. Paging runs to the end of the bounded range, or with
+    stop_at_empty (grid size unknown) to the first block with no data.
+    """
+    block_rows = block_rows or STREAM_BLOCK_ROWS
+    match = _A1_RANGE.match(bounded)
+    first_col, first_row, last_col, last_row = match.groups()
+    first_row, last_row = int(first_row or 1), int(last_row)
+
+    header, pending = None, 0
+    for start in range(first_row, last_row + 1, block_rows):
+        end = min(start + block_rows - 1, last_row)
+        block = f"{first_col}{start}:{last_col}{end}"
+        values = batch_get_values(service, spreadsheet_id, [(sheet_name, block)])[0]
+        requested = end - start + 1
+        first = header is None
+        if first:
+            if not values:
+                return
+            header, values, requested = list(values[0]), values[1:], requested - 1
+
+        if values or first:
+            yield header, [[] for _ in range(pending)] + values
+            pending = requested - len(values)
+        elif stop_at_empty:
+            return
+        else:
+            pending += requested
+
+
+def _block_frame(block: pd.DataFrame, width: int) -> pd.DataFrame:
+    """Pad / truncate a positional block frame to width ('' for missing cells)."""
+    if block.shape[1] != width:
+        block = block.reindex(columns=range(width))
+    return block.fillna('')
+
+
+def _fetch_blocks(service, spreadsheet_id: str, sheet_name: str, bounded: str,
+                  fit_to_header: bool = False,
+                  block_rows: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Load a large range block by block into one frame.
+
+    Same result as values_to_dataframe on the whole range, but only one
+    block of raw API rows is alive at a time.
+
+    Returns:
+        DataFrame, or None if the range has no values
+    """
+    header, blocks = None, []
+    for header, rows in _iter_value_blocks(service, spreadsheet_id, sheet_name, bounded, block_rows):
+        blocks.append(pd.DataFrame(rows))
+    if header is None:
+        return None
+
+    widest = max((block.shape[1] for block in blocks), default=0)
+    width = len(header) if fit_to_header else max(len(header), widest)
+    body = pd.concat([_block_frame(block, width) for block in blocks], ignore_index=True)
+    body.columns = header[:width] + [''] * (width - len(header))
+    return body
+
+
+def iter_sheet_blocks(sheet_name: str, range_name: str,
+                      spreadsheet_id: str = None,
+                      block_rows: Optional[int] = None,
+                      typed: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Stream a tab as a sequence of row blocks with the tab's header.
+
+    Nothing is cached or kept: each block is fetched, converted (typed via
+    the tab's schema when typed=True) and handed to the caller, so memory
+    is bounded by one block. Use with BlockAggregator for running totals
+    over tabs too large to hold.
+
+    Args:
+        sheet_name: Tab to read
+        range_name: Range to read ("A:Z"); the first row is the header
+        spreadsheet_id: Spreadsheet (defaults to secrets / default workbook)
+        block_rows: Rows per request (default STREAM_BLOCK_ROWS)
+        typed: Apply sheet_schemas.apply_schema to each block
+
+    Yields:
+        DataFrame per block (columns fitted to the header)
+    """
+    spreadsheet_id = spreadsheet_id or get_spreadsheet_id()
+    service = get_sheets_service()
+    if service is None:
+        return
+
+    layout = get_sheet_layout(service, spreadsheet_id)
+    if layout is not None and sheet_name not in layout:
+        logger.warning(f"Sheet '{sheet_name}' not found in spreadsheet")
+        return
+    # Without a layout, bound the range generously; paging stops at the data's end
+    rows, columns = layout[sheet_name] if layout is not None else (10 ** 7, 18278)
+    bounded = exact_range(range_name, rows, columns)
+    if bounded is None:
+        return
+
+    for header, values in _iter_value_blocks(service, spreadsheet_id, sheet_name, bounded, block_rows,
+                                             stop_at_empty=layout is None):
+        block = _block_frame(pd.DataFrame(values), len(header))
+        block.columns = header
+        yield apply_schema(block, sheet_name) if typed else block
+
+
+class BlockAggregator:
+    """
+    Running group-by sums fed one block at a time.
+
+    Only the per-group totals are kept, so totals over a tab can be built
+    without ever holding the tab.
+
+    Example:
+        agg = BlockAggregator(['Rep'], 'Amount', date_column='Date', freq='M')
+        for block in iter_sheet_blocks('Invoice Line Item', 'A:Z'):
+            agg.add(block)
+        monthly = agg.result()
+    """
+
+    def __init__(self, by: Sequence[str], value: str,
+                 date_column: Optional[str] = None, freq: str = 'M'):
+        """
+        Args:
+            by: Grouping columns
+            value: Column to sum (coerced to numbers, blanks -> 0)
+            date_column: If set, also group by this column's period
+            freq: Period frequency for date_column ('M' = month)
+        """
+        self.by = list(by)
+        self.value = value
+        self.date_column = date_column
+        self.freq = freq
+        self.rows = 0
+        self._totals: Optional[pd.Series] = None
+
+    @property
+    def keys(self) -> List[str]:
+        return (['Period'] if self.date_column else []) + self.by
+
+    def add(self, block: pd.DataFrame) -> None:
+        """Fold one block into the running totals."""
+        if block is None or block.empty:
+            return
+        frame = block[self.by].copy()
+        frame[self.value] = coerce_numeric(block[self.value], fill_value=0)
+        if self.date_column:
+            dates = coerce_date(block[self.date_column])
+            frame['Period'] = dates.dt.to_period(self.freq)
+            frame = frame[dates.notna()]
+
+        totals = frame.groupby(self.keys, dropna=False)[self.value].sum()
+        self._totals = totals if self._totals is None else self._totals.add(totals, fill_value=0)
+        self.rows += len(block)
+
+    def result(self) -> pd.DataFrame:
+        """Totals so far as a flat frame (keys + value column)."""
+        if self._totals is None:
+            return pd.DataFrame(columns=self.keys + [self.value])
+        return self._totals.reset_index()
+
+
+# =============================================================================
+# DELTA SYNC
+# =============================================================================
+
+def _tail_checksum(grid: pd.DataFrame, key_column: str, rows: int) -> str:
+    """Checksum of the key column over the last `rows` rows of a grid."""
+    headers = [str(h) for h in grid.columns]
+    position = headers.index(key_column) if key_column in headers else 0
+    keys = grid.iloc[len(grid) - rows:, position].astype(str)
+    return hashlib.sha1('\x1f'.join(keys).encode('utf-8')).hexdigest()
+
+
+def _stamp_sync(grid: pd.DataFrame, key_column: str, full_sync_at: str,
+                last_row: int) -> pd.DataFrame:
+    """
+    Record the delta-sync state on a grid (persisted with its snapshot).
+
+    last_row is the sheet row number of the grid's last row, so the next
+    sync addresses the tail by sheet row rather than by grid position.
+    """
+    tail = min(DELTA_TAIL_ROWS, len(grid))
+    grid.attrs['sync'] = {
+        'rows': len(grid),
+        'last_row': last_row,
+        'tail_rows': tail,
+        'tail_checksum': _tail_checksum(grid, key_column, tail),
+        'full_sync_at': full_sync_at,
+    }
+    return grid
+
+
+def _delta_sync(service, spreadsheet_id: str, sheet_name: str, range_name: str,
+                bounded: str) -> Optional[pd.DataFrame]:
+    """
+    Bring a tab's snapshot up to date by reading only its tail and new rows.
+
+    The snapshot's last DELTA_TAIL_ROWS rows are re-read together with
+    everything below them, in one batchGet with the header row. The tail's
+    key column must still match the snapshot's checksum, i.e. no rows were
+    inserted, deleted or re-sorted above it.
+
+    Returns:
+        Merged grid, or None when a full reload is needed (no usable
+        snapshot, full sync due, header / width / row structure changed)
+    """
+    store = get_snapshot_store()
+    snapshot = store.read((spreadsheet_id, sheet_name, range_name)) if store is not None else None
+    if snapshot is None:
+        return None
+    grid, sync = snapshot.data, snapshot.data.attrs.get('sync')
+    if not sync or sync['rows'] != len(grid) or sync['tail_rows'] == 0 or 'last_row' not in sync:
+        return None
+    if datetime.now() - datetime.fromisoformat(sync['full_sync_at']) > timedelta(hours=DELTA_FULL_SYNC_HOURS):
+        return None
+
+    match = _A1_RANGE.match(bounded)
+    if match is None or int(match.group(2) or 1) != 1 or not match.group(4):
+        return None
+    first_col, _, last_col, last_row = match.groups()
+    tail = sync['tail_rows']
+    start = sync['last_row'] - tail + 1  # sheet row of the first tail row
+    if int(last_row) < sync['last_row']:
+        return None
+
+    header, rows = batch_get_values(service, spreadsheet_id, [
+        (sheet_name, f"{first_col}1:{last_col}1"),
+        (sheet_name, f"{first_col}{start}:{last_col}{last_row}"),
+    ])
+    width = len(grid.columns)
+    header = header[0] if header else []
+    if len(header) > width or header + [''] * (width - len(header)) != [str(c) for c in grid.columns]:
+        logger.info(f"Header of {sheet_name} changed, full reload")
+        return None
+    if len(rows) < tail or any(len(row) > width for row in rows):
+        logger.info(f"Rows removed or columns added in {sheet_name}, full reload")
+        return None
+
+    fresh = _block_frame(pd.DataFrame(rows), width)
+    fresh.columns = grid.columns
+    key_column = DELTA_SYNC_SHEETS[sheet_name]
+    if _tail_checksum(fresh.iloc[:tail], key_column, tail) != sync['tail_checksum']:
+        logger.info(f"Tail of {sheet_name} shifted, full reload")
+        return None
+
+    merged = pd.concat([grid.iloc[:len(grid) - tail], fresh], ignore_index=True)
+    logger.info(f"Delta sync of {sheet_name}: {len(rows) - tail} new row(s), {tail} re-read")
+    return _stamp_sync(merged, key_column, sync['full_sync_at'], start + len(rows) - 1)
+
+
+# =============================================================================
+# LIVE FETCHING
+# =============================================================================
+
+def _fetch_batch_live(ranges: List[SheetRange],
+                      spreadsheet_id: str,
+                      silent: bool,
+                      silent_sheets: Iterable[str],
+                      fit_to_header: bool,
+                      concurrency: int = 1,
+                      delta_sync: bool = False) -> Dict[SheetRange, pd.DataFrame]:
+    """
+    Fetch ranges from the Sheets API, see fetch_sheet_batch.
+
+    With delta_sync, DELTA_SYNC_SHEETS tabs are merged into their stored
+    snapshot (ranges must be snapshot ranges) instead of re-read in full.
+    """
+    silent_sheets = set(silent_sheets)
+    frames = {key: pd.DataFrame() for key in ranges}
+
+    if not ranges:
+        return frames
+
+    try:
+        service = get_sheets_service()
+    except Exception as e:
+        logger.error(f"Failed to get Sheets service: {e}")
+        report_fetch_failure(f"Sheets service: {e}")
+        if not silent:
+            st.error(f"❌ Error loading credentials: {str(e)}")
+        return frames
+
+    if service is None:
+        report_fetch_failure("Sheets service: missing credentials")
+        if not silent:
+            st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
+        return frames
+
+    errors = {}
+    parsed = {}
+    results = {key: [] for key in ranges}
+
+    # Turn open ranges into exact grid ranges and drop tabs that don't exist,
+    # so one missing optional tab no longer fails (and re-sends) the batch
+    layout = get_sheet_layout(service, spreadsheet_id)
+    exact = {}
+    for key in ranges:
+        sheet_name, range_name = key
+        if layout is None:
+            exact[key] = range_name
+        elif sheet_name not in layout:
+            errors[key] = Exception(f"Sheet '{sheet_name}' not found in spreadsheet")
+        else:
+            bounded = exact_range(range_name, *layout[sheet_name])
+            if bounded is not None:
+                exact[key] = bounded
+    requested = [key for key in ranges if key in exact]
+
+    synced = set()
+    if delta_sync and layout is not None:
+        for key in requested:
+            if key[0] not in DELTA_SYNC_SHEETS:
+                continue
+            try:
+                merged = _delta_sync(service, spreadsheet_id, key[0], key[1], exact[key])
+            except Exception as e:
+                logger.warning(f"Delta sync of {key[0]} failed ({e}), reloading in full")
+                merged = None
+            if merged is not None:
+                parsed[key] = merged
+                synced.add(key)
+    requested = [key for key in requested if key not in synced]
+
+    # Very large tabs are paged in row blocks instead of riding in the batch
+    streamed = {key for key in requested
+                if layout is not None and layout[key[0]][0] > STREAM_MIN_ROWS}
+    batched = [key for key in requested if key not in streamed]
+
+    def request(key):
+        return (key[0], exact[key])
+
+    def fetch_one(key):
+        if key in streamed:
+            return [], _fetch_blocks(service, spreadsheet_id, key[0], exact[key], fit_to_header)
+        values = batch_get_values(service, spreadsheet_id, [request(key)])[0]
+        # Parse in the worker so each tab is ready as soon as it arrives
+        return values, values_to_dataframe(values, fit_to_header=fit_to_header) if values else None
+
+    if concurrency > 1 and len(requested) > 1:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(requested))) as pool:
+            futures = {pool.submit(fetch_one, key): key for key in requested}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key], parsed[key] = future.result()
+                except Exception as range_error:
+                    errors[key] = range_error
+        mode = f"{concurrency} parallel requests"
+    else:
+        mode = "one batch"
+        if batched:
+            try:
+                results.update(zip(batched, batch_get_values(service, spreadsheet_id,
+                                                             [request(key) for key in batched])))
+            except Exception as e:
+                # batchGet fails as a whole if any single range is invalid, so retry
+                # range-by-range to keep the good tabs and isolate the bad one.
+                logger.warning(f"Batch fetch of {len(batched)} ranges failed ({e}), retrying individually")
+                for key in batched:
+                    try:
+                        results[key] = batch_get_values(service, spreadsheet_id, [request(key)])[0]
+                    except Exception as range_error:
+                        errors[key] = range_error
+        for key in streamed:
+            try:
+                results[key], parsed[key] = fetch_one(key)
+            except Exception as range_error:
+                errors[key] = range_error
+    if streamed:
+        mode += f", {len(streamed)} tab(s) in {STREAM_BLOCK_ROWS}-row blocks"
+    if synced:
+        mode += f", {len(synced)} tab(s) delta-synced"
+
+    # Full reads of delta-synced tabs start a new sync baseline
+    if delta_sync:
+        full_sync_at = datetime.now().isoformat()
+        for key in requested:
+            if key[0] in DELTA_SYNC_SHEETS and key not in errors:
+                if parsed.get(key) is None and results[key]:
+                    parsed[key] = values_to_dataframe(results[key], fit_to_header=fit_to_header)
+                if parsed.get(key) is not None:
+                    # Body rows follow the header row; interior blank rows are kept
+                    bounds = _A1_RANGE.match(exact[key])
+                    header_row = int(bounds.group(2) or 1) if bounds else 1
+                    _stamp_sync(parsed[key], DELTA_SYNC_SHEETS[key[0]], full_sync_at,
+                                header_row + len(parsed[key]))
+
+    for key, values in results.items():
+        sheet_name, range_name = key
+        quiet = silent or sheet_name in silent_sheets
+
+        if key in errors:
+            logger.error(f"Error loading {sheet_name}!{range_name}: {errors[key]}")
+            if key in requested:
+                report_fetch_failure(f"{sheet_name}!{range_name}: {errors[key]}")
+            if not quiet:
+                show_fetch_error(sheet_name, errors[key])
+        elif parsed.get(key) is not None:
+            frames[key] = parsed[key]
+        elif not values:
+            if not quiet:
+                st.warning(f"⚠️ No data found in {sheet_name}!{range_name}")
+        else:
+            frames[key] = values_to_dataframe(values, fit_to_header=fit_to_header)
+
+    logger.info(f"Fetched {len(requested) + len(synced)} of {len(ranges)} ranges from {spreadsheet_id} in {mode}")
+    return frames
+
+
+def _storable(grid: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Grid to keep in the registry: failed / empty loads are never stored."""
+    return grid if grid is not None and len(grid.columns) else None
+
+
+def _load_grids(grid_keys: List[GridKey],
+                spreadsheet_id: str,
+                silent: bool,
+                silent_sheets: Iterable[str],
+                concurrency: int,
+                on_refresh: Optional[Callable[[], None]]) -> Dict[GridKey, pd.DataFrame]:
+    """Download raw grids through the snapshot store (see fetch_sheet_batch)."""
+    def fetch(snapshot_keys, quiet=silent):
+        wanted = [(sheet_name, range_name) for _, sheet_name, range_name in snapshot_keys]
+        frames = _fetch_batch_live(wanted, spreadsheet_id, quiet, silent_sheets, False, concurrency,
+                                   delta_sync=True)
+        return {key: frames[(key[1], key[2])] for key in snapshot_keys}
+
+    return load_with_snapshots(
+        grid_keys, fetch,
+        on_refresh=on_refresh,
+        background_fetch=lambda snapshot_keys: fetch(snapshot_keys, quiet=True)
+    )
+
+
+def _refresh_grids(registry: SheetRegistry, grid_keys: List[GridKey], token: str,
+                   spreadsheet_id: str, concurrency: int) -> None:
+    """Background job: load a new revision of grids that were served stale."""
+    try:
+        frames = _load_grids(grid_keys, spreadsheet_id, True, (), concurrency, None)
+    except Exception as e:
+        logger.warning(f"Background refresh of {len(grid_keys)} tab(s) failed: {e}")
+        frames = {}
+    for key in grid_keys:
+        registry.put(key, token, _storable(frames.get(key)))
+    logger.info(f"Refreshed {len(grid_keys)} tab(s) in background")
+
+
+def fetch_sheet_batch(ranges: Iterable[SheetRange],
+                      spreadsheet_id: str = None,
+                      silent: bool = False,
+                      silent_sheets: Iterable[str] = (),
+                      fit_to_header: bool = False,
+                      on_refresh: Optional[Callable[[], None]] = None,
+                      concurrency: int = 1,
+                      stale_while_revalidate: bool = False) -> Dict[SheetRange, pd.DataFrame]:
+    """
+    Load several tabs in a single round trip and split them into DataFrames.
+
+    Tabs are read through the process-wide sheet registry: each tab is
+    downloaded once per spreadsheet revision, at its canonical (widest)
+    range when several sections share it, and every caller gets a
+    projection of that one copy. Only tabs the registry doesn't hold for
+    the current revision are fetched, together, in one batch.
+
+    Every download is saved to the snapshot store. After a restart, the
+    first request for a tab is answered from its snapshot while the tab is
+    re-fetched in the background (see snapshot_store.load_with_snapshots).
+    DELTA_SYNC_SHEETS tabs are re-fetched by reading only their tail and new
+    rows into that snapshot, with a full reload on structural changes.
+
+    Args:
+        ranges: (sheet name, range) pairs a section needs
+        spreadsheet_id: Spreadsheet to read (defaults to secrets / default workbook)
+        silent: If True, don't show any error messages
+        silent_sheets: Optional tabs whose errors should not be shown
+        fit_to_header: Normalize rows to the header width (see values_to_dataframe)
+        on_refresh: Called when a tab this section read is invalidated (a
+            served snapshot turned out stale), e.g. the caller's cache .clear
+        concurrency: 1 = a single batchGet; >1 = one request per range over
+            a pool of this many threads, so wall time tracks the slowest tab
+            rather than the whole payload (see MAX_CONCURRENT_FETCHES)
+        stale_while_revalidate: When the spreadsheet changed, return the
+            previous revision's tabs and load the new ones in the background
+
+    Returns:
+        Dict keyed by (sheet name, range); failed or empty ranges map to an
+        empty DataFrame
+    """
+    ranges = list(dict.fromkeys(tuple(r) for r in ranges))
+    spreadsheet_id = spreadsheet_id or get_spreadsheet_id()
+    registry = get_sheet_registry()
+    token = cache_token(spreadsheet_id)
+
+    plan = {(sheet_name, range_name): (spreadsheet_id, sheet_name, fetch_range(sheet_name, range_name))
+            for sheet_name, range_name in ranges}
+    grid_keys = list(dict.fromkeys(plan.values()))
+    if on_refresh is not None:
+        for key in grid_keys:
+            registry.add_listener(key, on_refresh)
+
+    grids = {key: registry.get(key, token) for key in grid_keys}
+    missing = [key for key in grid_keys if grids[key] is None]
+
+    if stale_while_revalidate and missing:
+        stale = [key for key in missing if registry.get(key) is not None]
+        refresh, _ = registry.claim(stale, token)
+        if refresh:
+            threading.Thread(
+                target=_refresh_grids,
+                args=(registry, refresh, token, spreadsheet_id, concurrency),
+                name='sheet-refresh',
+                daemon=True
+            ).start()
+        for key in stale:
+            grids[key] = registry.get(key)
+        missing = [key for key in missing if key not in stale]
+
+    mine, theirs = registry.claim(missing, token)
+    if mine:
+        frames = {}
+        try:
+            frames = _load_grids(mine, spreadsheet_id, silent, silent_sheets, concurrency,
+                                 on_refresh=lambda: registry.invalidate(mine))
+        finally:
+            for key in mine:
+                registry.put(key, token, _storable(frames.get(key)))
+        grids.update(frames)
+    for key, loaded in theirs.items():
+        loaded.wait()
+        grids[key] = registry.get(key)
+
+    return {
+        request: project_frame(grids.get(grid_key), request[1], grid_key[2], fit_to_header)
+        for request, grid_key in plan.items()
+    }
+
+
+def fetch_sheet_range(sheet_name: str, range_name: str,
+                      spreadsheet_id: str = None,
+                      silent: bool = False,
+                      fit_to_header: bool = False,
+                      on_refresh: Optional[Callable[[], None]] = None,
+                      stale_while_revalidate: bool = False) -> pd.DataFrame:
+    """Load a single tab range into a DataFrame (empty on failure)."""
+    frames = fetch_sheet_batch(
+        [(sheet_name, range_name)],
+        spreadsheet_id=spreadsheet_id,
+        silent=silent,
+        fit_to_header=fit_to_header,
+        on_refresh=on_refresh,
+        stale_while_revalidate=stale_while_revalidate
+    )
+    return frames[(sheet_name, range_name)]
+
+
+# =============================================================================
+# CONCURRENT LOADING
+# =============================================================================
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]],
+                     max_workers: int = MAX_CONCURRENT_FETCHES) -> Dict[str, Any]:
+    """
+    Run independent loaders on a bounded thread pool.
+
+    Worker threads inherit the caller's Streamlit script context so cached
+    loaders can still show spinners and warnings, and its context variables
+    so fetch failures are reported to the calling cached loader.
+
+    Args:
+        tasks: Name -> zero-argument loader
+        max_workers: Concurrency limit
+
+    Returns:
+        Name -> loader result, in the order of `tasks`
+    """
+    ctx = get_script_run_ctx() if SCRIPT_CTX_AVAILABLE else None
+
+    def run(fn):
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as pool:
+        futures = {name: pool.submit(contextvars.copy_context().run, run, fn) for name, fn in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+# =============================================================================
+# GSPREAD WORKSHEETS
+# =============================================================================
+
+def fetch_worksheet_values(client, spreadsheet_id: str, sheet_name: str,
+                           on_refresh: Optional[Callable[[], None]] = None) -> List[List[str]]:
+    """
+    gspread worksheet.get_all_values() routed through the snapshot store.
+
+    Args:
+        client: gspread client
+        spreadsheet_id: Spreadsheet to read
+        sheet_name: Worksheet title
+        on_refresh: Called when a warm-start snapshot turns out to be stale
+
+    Returns:
+        Rows including the header row ([] for an empty sheet)
+
+    Raises:
+        gspread.exceptions.WorksheetNotFound if the tab does not exist
+    """
+    key = (spreadsheet_id, sheet_name, '')
+
+    def fetch(keys):
+        spreadsheet = client.open_by_key(spreadsheet_id)
+        return {k: values_to_dataframe(spreadsheet.worksheet(k[1]).get_all_values()) for k in keys}
+
+    try:
+        grid = load_with_snapshots([key], fetch, on_refresh=on_refresh)[key]
+    except gspread.exceptions.WorksheetNotFound:
+        raise
+    except Exception as e:
+        report_fetch_failure(f"{sheet_name}: {e}")
+        raise
+    if len(grid.columns) == 0:
+        return []
+    return [list(grid.columns)] + grid.values.tolist()
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'SheetRange',
+    'MAX_CONCURRENT_FETCHES',
+    'get_spreadsheet_id',
+    'a1_range',
+    'exact_range',
+    'get_sheet_layout',
+    'values_to_dataframe',
+    'show_fetch_error',
+    'batch_get_values',
+    'fetch_sheet_batch',
+    'fetch_sheet_range',
+    'run_concurrently',
+    'iter_sheet_blocks',
+    'BlockAggregator',
+    'fetch_worksheet_values',
+]
@@ -0,0 +1,576 @@
+"""
+Sheets Replay Module
+Record real Google Sheets responses once, replay them offline
+
+Features:
+- Recording mode: wraps the real Sheets service and gspread client and
+  saves every values().get / batchGet / get_all_values response into a
+  per-spreadsheet cassette (gzipped JSON of tab grids)
+- Replay mode: stand-in Sheets, Drive and gspread clients served from the
+  cassettes, with the API's range semantics (bounded / open ranges, trimmed
+  trailing cells and rows, grid layout metadata, missing-tab errors)
+- Configurable latency per request and per row returned, and row-count
+  scaling (data rows repeated or cut to N x the recorded volume) for
+  benchmarking section loads without network or credentials
+
+Configuration (environment):
+- CALYX_SHEETS_RECORD=<dir>: record responses into <dir>
+- CALYX_SHEETS_REPLAY=<dir>: serve every Google client from <dir>
+- CALYX_REPLAY_LATENCY_MS: added per request (default 0)
+- CALYX_REPLAY_ROW_LATENCY_US: added per row returned (default 0)
+- CALYX_REPLAY_SCALE: row-count multiplier (default 1.0)
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import gspread
+import httplib2
+from googleapiclient.errors import HttpError
+
+from .sheet_registry import column_number
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CASSETTE_SUFFIX = '.json.gz'
+
+# "A:Y", "A2:O", "A1:S80", "B5"
+_CELLS = re.compile(r'^([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$')
+
+
+def split_a1(a1: str) -> Tuple[str, Optional[str]]:
+    """Split "'Sheet Name'!A1:B2" into ("Sheet Name", "A1:B2") (cells None for a bare tab)."""
+    sheet_name, bang, cells = a1.rpartition('!')
+    if not bang:
+        sheet_name, cells = a1, None
+    if sheet_name.startswith("'") and sheet_name.endswith("'"):
+        sheet_name = sheet_name[1:-1].replace("''", "'")
+    return sheet_name, cells
+
+
+def parse_cells(cells: Optional[str]) -> Tuple[int, int, Optional[int], Optional[int]]:
+    """
+    0-based bounds of an A1 cell range.
+
+    Returns:
+        (first row, first column, end row, end column); ends are exclusive
+        and None when the range is open in that direction
+    """
+    match = _CELLS.match(cells or '')
+    if match is None:
+        return 0, 0, None, None
+    first_col, first_row, last_col, last_row = match.groups()
+    if last_col is None:
+        last_col, last_row = first_col, first_row
+    return (
+        int(first_row or 1) - 1,
+        column_number(first_col) - 1,
+        int(last_row) if last_row else None,
+        column_number(last_col),
+    )
+
+
+def _http_error(status: int, message: str) -> HttpError:
+    """An HttpError shaped like the real API's."""
+    content = json.dumps({'error': {'code': status, 'message': message}}).encode('utf-8')
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+# =============================================================================
+# CASSETTE
+# =============================================================================
+
+class SheetsCassette:
+    """
+    Recorded tab grids of one spreadsheet.
+
+    Grids are stored cell for cell from the top-left corner; `header_rows`
+    remembers how many leading rows of a tab are headers (tabs read from
+    "A2:..." have a title row above the header), which row scaling keeps.
+    """
+
+    def __init__(self, spreadsheet_id: str, tabs: Optional[Dict[str, List[List[str]]]] = None,
+                 header_rows: Optional[Dict[str, int]] = None,
+                 revision: Optional[str] = None):
+        self.spreadsheet_id = spreadsheet_id
+        self.tabs = tabs or {}
+        self.header_rows = header_rows or {}
+        self.revision = revision or datetime.now().isoformat()
+        self._lock = threading.Lock()
+        self._scaled: Dict[Tuple[str, float], List[List[str]]] = {}
+
+    @classmethod
+    def load(cls, path) -> 'SheetsCassette':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['spreadsheet_id'], data['tabs'], data.get('header_rows'), data.get('revision'))
+
+    def save(self, path) -> None:
+        """Write atomically (tmp file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with self._lock:
+            data = {
+                'spreadsheet_id': self.spreadsheet_id,
+                'revision': self.revision,
+                'header_rows': self.header_rows,
+                'tabs': self.tabs,
+            }
+            # One write at level 6: json.dump's many small writes at the
+            # default level 9 are several times slower on large cassettes
+            with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(json.dumps(data))
+        os.replace(tmp, path)
+
+    def record(self, sheet_name: str, cells: Optional[str], values: List[List[str]]) -> None:
+        """Merge a response's values into the tab grid at the range's position."""
+        first_row, first_col, _, end_col = parse_cells(cells)
+        with self._lock:
+            grid = self.tabs.setdefault(sheet_name, [])
+            self.header_rows.setdefault(sheet_name, first_row + 1)
+            while len(grid) < first_row + len(values):
+                grid.append([])
+            for offset, row in enumerate(values):
+                target = grid[first_row + offset]
+                if len(target) < first_col:
+                    target.extend([''] * (first_col - len(target)))
+                width = max(len(row), (end_col - first_col) if end_col is not None else 0)
+                target[first_col:first_col + width] = list(row) + [''] * (width - len(row))
+            self.revision = datetime.now().isoformat()
+            self._scaled.clear()
+
+    def grid(self, sheet_name: str, scale: float = 1.0) -> List[List[str]]:
+        """
+        Tab grid with its data rows repeated / cut to `scale` x the recorded count.
+
+        Repeated rows are exact copies (IDs included); enough for load and
+        memory benchmarks, not for anything that joins on unique keys.
+        """
+        if sheet_name not in self.tabs:
+            raise KeyError(sheet_name)
+        rows = self.tabs[sheet_name]
+        if scale == 1.0:
+            return rows
+        key = (sheet_name, scale)
+        with self._lock:
+            if key not in self._scaled:
+                header = self.header_rows.get(sheet_name, 1)
+                head, body = rows[:header], rows[header:]
+                wanted = int(math.ceil(len(body) * scale))
+                repeats = -(-wanted // len(body)) if body else 0
+                self._scaled[key] = head + (body * repeats)[:wanted]
+            return self._scaled[key]
+
+    def values(self, sheet_name: str, cells: Optional[str] = None,
+               scale: float = 1.0) -> List[List[str]]:
+        """What values().get would return for a range: trailing empties trimmed."""
+        first_row, first_col, end_row, end_col = parse_cells(cells)
+        rows = self.grid(sheet_name, scale)[first_row:end_row]
+        values = []
+        for row in rows:
+            row = row[first_col:end_col]
+            last = len(row)
+            while last and row[last - 1] == '':
+                last -= 1
+            values.append(row[:last])
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def layout(self, scale: float = 1.0) -> dict:
+        """spreadsheets().get response (titles and grid sizes only)."""
+        sheets = []
+        for title in self.tabs:
+            rows = self.grid(title, scale)
+            sheets.append({'properties': {'title': title, 'gridProperties': {
+                'rowCount': max(len(rows), 1),
+                'columnCount': max((len(row) for row in rows), default=1),
+            }}})
+        return {'sheets': sheets}
+
+
+# =============================================================================
+# REPLAY CLIENTS
+# =============================================================================
+
+class _Request:
+    """Lazy request like googleapiclient's: nothing happens until execute()."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, **kwargs):
+        return self._fn()
+
+
+class ReplaySession:
+    """
+    Cassette directory plus the simulated network behaviour.
+
+    Args:
+        root: Directory of <spreadsheet id>.json.gz cassettes
+        latency: Seconds added to every request
+        row_latency: Seconds added per row returned
+        scale: Row-count multiplier for every tab
+    """
+
+    def __init__(self, root, latency: float = 0.0, row_latency: float = 0.0, scale: float = 1.0):
+        self.root = Path(root)
+        self.latency = latency
+        self.row_latency = row_latency
+        self.scale = scale
+        self._lock = threading.Lock()
+        self._cassettes: Dict[str, SheetsCassette] = {}
+        self.requests = 0
+
+    def cassette(self, spreadsheet_id: str) -> SheetsCassette:
+        with self._lock:
+            if spreadsheet_id not in self._cassettes:
+                path = self.root / f"{spreadsheet_id}{CASSETTE_SUFFIX}"
+                if not path.exists():
+                    raise _http_error(404, f"Requested entity was not found: {spreadsheet_id}")
+                self._cassettes[spreadsheet_id] = SheetsCassette.load(path)
+            return self._cassettes[spreadsheet_id]
+
+    def spreadsheet_ids(self) -> List[str]:
+        """Spreadsheets with a cassette in the directory."""
+        return sorted(p.name[:-len(CASSETTE_SUFFIX)] for p in self.root.glob(f"*{CASSETTE_SUFFIX}"))
+
+    def wait(self, rows: int = 0) -> None:
+        """Simulate the network: per-request plus per-row latency."""
+        with self._lock:
+            self.requests += 1
+        delay = self.latency + rows * self.row_latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def read_range(self, spreadsheet_id: str, a1: str) -> dict:
+        """One ValueRange, or the API's 400 for a tab that doesn't exist."""
+        sheet_name, cells = split_a1(a1)
+        try:
+            values = self.cassette(spreadsheet_id).values(sheet_name, cells, self.scale)
+        except KeyError:
+            raise _http_error(400, f"Unable to parse range: {a1}")
+        return {'range': a1, 'majorDimension': 'ROWS', 'values': values}
+
+    def sheets_service(self) -> 'ReplaySheetsService':
+        return ReplaySheetsService(self)
+
+    def drive_service(self) -> 'ReplayDriveService':
+        return ReplayDriveService(self)
+
+    def gspread_client(self) -> 'ReplayGspreadClient':
+        return ReplayGspreadClient(self)
+
+
+class ReplaySheetsService:
+    """Stand-in for build('sheets', 'v4')."""
+
+    def __init__(self, session: ReplaySession):
+        self.session = session
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _ReplayValues(self.session)
+
+    def get(self, spreadsheetId, **kwargs):
+        """spreadsheets().get: tab titles and grid sizes."""
+        def run():
+            self.session.wait()
+            return self.session.cassette(spreadsheetId).layout(self.session.scale)
+        return _Request(run)
+
+
+class _ReplayValues:
+    """spreadsheets().values() resource."""
+
+    def __init__(self, session: ReplaySession):
+        self.session = session
+
+    def get(self, spreadsheetId, range, **kwargs):
+        def run():
+            value_range = self.session.read_range(spreadsheetId, range)
+            self.session.wait(len(value_range['values']))
+            return value_range
+        return _Request(run)
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        def run():
+            value_ranges = [self.session.read_range(spreadsheetId, a1) for a1 in ranges]
+            self.session.wait(sum(len(v['values']) for v in value_ranges))
+            return {'spreadsheetId': spreadsheetId, 'valueRanges': value_ranges}
+        return _Request(run)
+
+
+class ReplayDriveService:
+    """Stand-in for build('drive', 'v3'): files().get revision probes only."""
+
+    def __init__(self, session: ReplaySession):
+        self.session = session
+
+    def files(self):
+        return self
+
+    def get(self, fileId, **kwargs):
+        def run():
+            self.session.wait()
+            revision = self.session.cassette(fileId).revision
+            return {'version': revision, 'modifiedTime': revision}
+        return _Request(run)
+
+
+class ReplayGspreadClient:
+    """Stand-in for a gspread Client (open_by_key / worksheet / get_all_values)."""
+
+    def __init__(self, session: ReplaySession):
+        self.session = session
+
+    def open_by_key(self, key: str) -> '_ReplaySpreadsheet':
+        self.session.wait()
+        return _ReplaySpreadsheet(self.session, self.session.cassette(key))
+
+
+class _ReplaySpreadsheet:
+    def __init__(self, session: ReplaySession, cassette: SheetsCassette):
+        self.session = session
+        self.cassette = cassette
+        self.id = cassette.spreadsheet_id
+
+    def worksheet(self, title: str) -> '_ReplayWorksheet':
+        if title not in self.cassette.tabs:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return _ReplayWorksheet(self.session, self.cassette, title)
+
+    def worksheets(self) -> List['_ReplayWorksheet']:
+        return [_ReplayWorksheet(self.session, self.cassette, title) for title in self.cassette.tabs]
+
+
+class _ReplayWorksheet:
+    def __init__(self, session: ReplaySession, cassette: SheetsCassette, title: str):
+        self.session = session
+        self.cassette = cassette
+        self.title = title
+
+    def get_all_values(self) -> List[List[str]]:
+        """Every row padded to the widest one, like gspread."""
+        values = self.cassette.values(self.title, scale=self.session.scale)
+        self.session.wait(len(values))
+        width = max((len(row) for row in values), default=0)
+        return [row + [''] * (width - len(row)) for row in values]
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+class Recorder:
+    """Collects responses into cassettes under root, saving after each one."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._cassettes: Dict[str, SheetsCassette] = {}
+
+    def cassette(self, spreadsheet_id: str) -> SheetsCassette:
+        with self._lock:
+            if spreadsheet_id not in self._cassettes:
+                path = self.root / f"{spreadsheet_id}{CASSETTE_SUFFIX}"
+                self._cassettes[spreadsheet_id] = (
+                    SheetsCassette.load(path) if path.exists() else SheetsCassette(spreadsheet_id)
+                )
+            return self._cassettes[spreadsheet_id]
+
+    def record(self, spreadsheet_id: str, a1: str, values: List[List[str]]) -> None:
+        sheet_name, cells = split_a1(a1)
+        cassette = self.cassette(spreadsheet_id)
+        cassette.record(sheet_name, cells, values)
+        try:
+            cassette.save(self.root / f"{spreadsheet_id}{CASSETTE_SUFFIX}")
+        except Exception as e:
+            logger.warning(f"Could not save recording for {spreadsheet_id}: {e}")
+
+    def wrap_sheets(self, service) -> '_RecordingSheets':
+        return _RecordingSheets(self, service)
+
+    def wrap_gspread(self, client) -> '_RecordingGspreadClient':
+        return _RecordingGspreadClient(self, client)
+
+
+class _RecordedRequest:
+    """Real request whose response is handed to a callback before returning."""
+
+    def __init__(self, request, on_response):
+        self._request = request
+        self._on_response = on_response
+
+    def execute(self, **kwargs):
+        response = self._request.execute(**kwargs)
+        try:
+            self._on_response(response)
+        except Exception as e:
+            logger.warning(f"Recording failed: {e}")
+        return response
+
+
+class _RecordingSheets:
+    """Sheets service proxy recording values().get / batchGet responses."""
+
+    def __init__(self, recorder: Recorder, service):
+        self._recorder = recorder
+        self._service = service
+
+    def spreadsheets(self):
+        return _RecordingSpreadsheets(self._recorder, self._service.spreadsheets())
+
+
+class _RecordingSpreadsheets:
+    def __init__(self, recorder: Recorder, resource):
+        self._recorder = recorder
+        self._resource = resource
+
+    def values(self):
+        return _RecordingValues(self._recorder, self._resource.values())
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+
+class _RecordingValues:
+    def __init__(self, recorder: Recorder, resource):
+        self._recorder = recorder
+        self._resource = resource
+
+    def get(self, spreadsheetId, range, **kwargs):
+        # The response's range is the one actually returned (bounded to the grid)
+        return _RecordedRequest(
+            self._resource.get(spreadsheetId=spreadsheetId, range=range, **kwargs),
+            lambda r: self._recorder.record(spreadsheetId, r.get('range', range), r.get('values', []))
+        )
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        def record(response):
+            for asked, value_range in zip(ranges, response.get('valueRanges', [])):
+                self._recorder.record(spreadsheetId, value_range.get('range', asked),
+                                      value_range.get('values', []))
+        return _RecordedRequest(
+            self._resource.batchGet(spreadsheetId=spreadsheetId, ranges=ranges, **kwargs), record
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+
+class _RecordingGspreadClient:
+    def __init__(self, recorder: Recorder, client):
+        self._recorder = recorder
+        self._client = client
+
+    def open_by_key(self, key: str):
+        return _RecordingSpreadsheet(self._recorder, self._client.open_by_key(key), key)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _RecordingSpreadsheet:
+    def __init__(self, recorder: Recorder, spreadsheet, key: str):
+        self._recorder = recorder
+        self._spreadsheet = spreadsheet
+        self._key = key
+
+    def worksheet(self, title: str):
+        return _RecordingWorksheet(self._recorder, self._spreadsheet.worksheet(title), self._key)
+
+    def __getattr__(self, name):
+        return getattr(self._spreadsheet, name)
+
+
+class _RecordingWorksheet:
+    def __init__(self, recorder: Recorder, worksheet, key: str):
+        self._recorder = recorder
+        self._worksheet = worksheet
+        self._key = key
+
+    def get_all_values(self, *args, **kwargs):
+        values = self._worksheet.get_all_values(*args, **kwargs)
+        if not args and not kwargs:
+            self._recorder.record(self._key, f"'{self._worksheet.title}'!A1", values)
+        return values
+
+    def __getattr__(self, name):
+        return getattr(self._worksheet, name)
+
+
+# =============================================================================
+# MODE SELECTION
+# =============================================================================
+
+@st.cache_resource(show_spinner=False)
+def _create_replay_session(root: str, latency: float, row_latency: float, scale: float) -> ReplaySession:
+    logger.info(f"Replaying Google Sheets from {root} (latency {latency * 1000:.0f} ms, scale {scale}x)")
+    return ReplaySession(root, latency, row_latency, scale)
+
+
+def get_replay_session() -> Optional[ReplaySession]:
+    """The replay session configured by CALYX_SHEETS_REPLAY, or None."""
+    root = os.environ.get('CALYX_SHEETS_REPLAY')
+    if not root:
+        return None
+    return _create_replay_session(
+        root,
+        float(os.environ.get('CALYX_REPLAY_LATENCY_MS', '0')) / 1000.0,
+        float(os.environ.get('CALYX_REPLAY_ROW_LATENCY_US', '0')) / 1e6,
+        float(os.environ.get('CALYX_REPLAY_SCALE', '1')),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _create_recorder(root: str) -> Recorder:
+    logger.info(f"Recording Google Sheets responses to {root}")
+    return Recorder(root)
+
+
+def get_recorder() -> Optional[Recorder]:
+    """The recorder configured by CALYX_SHEETS_RECORD, or None."""
+    root = os.environ.get('CALYX_SHEETS_RECORD')
+    if not root:
+        return None
+    return _create_recorder(root)
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'SheetsCassette',
+    'ReplaySession',
+    'ReplaySheetsService',
+    'ReplayDriveService',
+    'ReplayGspreadClient',
+    'Recorder',
+    'get_replay_session',
+    'get_recorder',
+    'split_a1',
+    'parse_cells',
+]
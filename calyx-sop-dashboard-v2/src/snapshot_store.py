@@ -0,0 +1,278 @@
+"""
+Snapshot Store Module
+Persistent on-disk snapshots of every fetched Google Sheets tab
+
+Features:
+- Writes each fetched tab as a columnar Parquet file plus a small JSON
+  sidecar (original headers, row count, fetch timestamp, DataFrame.attrs
+  such as the delta-sync state)
+- Snapshots are raw grids (every cell the string Sheets returned), not
+  typed frames: one grid is projected into several sections' ranges
+  (sheet_registry) and delta sync compares its raw tail rows, so typing
+  (sheet_schemas.apply_schema and each section's own cleaning) still runs
+  after a warm start
+- Warm start: the first request for a tab after a deploy/restart is served
+  straight from disk while a background thread revalidates it against Sheets
+- Callers get an on_refresh hook to drop their in-memory cache once the
+  revalidated data differs from what was served
+- Falls back to pickle files when pyarrow is not installed
+
+Configuration (environment):
+- CALYX_SNAPSHOT_DIR: snapshot directory (default: <app>/.cache/snapshots)
+- CALYX_SNAPSHOTS=0: disable snapshots entirely
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import streamlit as st
+import pandas as pd
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'snapshots'
+
+# A (spreadsheet id, sheet name, A1 range) triple
+SnapshotKey = Tuple[str, str, str]
+
+
+class Snapshot(NamedTuple):
+    """A tab as last fetched from Sheets."""
+    data: pd.DataFrame
+    fetched_at: datetime
+
+
+# =============================================================================
+# SNAPSHOT STORE
+# =============================================================================
+
+class SnapshotStore:
+    """
+    Directory of per-tab snapshot files.
+
+    Files hold the raw grid as fetched (string cells); callers type it.
+    Sheets headers are often duplicated or blank, which Parquet does not
+    allow, so columns are stored positionally and the real headers are kept
+    in the sidecar.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.extension = '.parquet' if PARQUET_AVAILABLE else '.pkl'
+        self._lock = threading.Lock()
+        self._warmed = set()
+
+    def _base_path(self, key: SnapshotKey) -> Path:
+        spreadsheet_id, sheet_name, range_name = key
+        digest = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:12]
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', sheet_name).strip('_') or 'sheet'
+        return self.root / f"{slug}_{digest}"
+
+    def read(self, key: SnapshotKey) -> Optional[Snapshot]:
+        """Read a snapshot, or None if missing or unreadable."""
+        base = self._base_path(key)
+        meta_path = base.with_suffix('.json')
+        data_path = base.with_suffix(self.extension)
+        if not meta_path.exists() or not data_path.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text())
+            if PARQUET_AVAILABLE:
+                df = pd.read_parquet(data_path)
+            else:
+                df = pd.read_pickle(data_path)
+            df.columns = meta['columns']
+            df.attrs = meta.get('attrs', {})
+            return Snapshot(df, datetime.fromisoformat(meta['fetched_at']))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot for {key[1]}!{key[2]}: {e}")
+            return None
+
+    def write(self, key: SnapshotKey, df: pd.DataFrame,
+              fetched_at: Optional[datetime] = None) -> None:
+        """Atomically write a snapshot (data file first, sidecar last)."""
+        base = self._base_path(key)
+        data_path = base.with_suffix(self.extension)
+        meta_path = base.with_suffix('.json')
+        fetched_at = fetched_at or datetime.now()
+
+        positional = df.copy()
+        positional.columns = [f"c{i}" for i in range(len(df.columns))]
+        meta = {
+            'spreadsheet_id': key[0],
+            'sheet_name': key[1],
+            'range_name': key[2],
+            'columns': [str(c) for c in df.columns],
+            'rows': len(df),
+            'fetched_at': fetched_at.isoformat(),
+            'attrs': df.attrs,
+        }
+
+        with self._lock:
+            tmp_data = data_path.with_suffix(data_path.suffix + '.tmp')
+            tmp_meta = meta_path.with_suffix('.json.tmp')
+            if PARQUET_AVAILABLE:
+                positional.to_parquet(tmp_data, index=False)
+            else:
+                positional.to_pickle(tmp_data)
+            tmp_meta.write_text(json.dumps(meta))
+            os.replace(tmp_data, data_path)
+            os.replace(tmp_meta, meta_path)
+
+    def claim_warm_start(self, keys: Sequence[SnapshotKey]) -> List[SnapshotKey]:
+        """Return the keys not yet warm-started in this process and mark them."""
+        with self._lock:
+            fresh = [key for key in keys if key not in self._warmed]
+            self._warmed.update(fresh)
+        return fresh
+
+    def clear(self) -> None:
+        """Delete every snapshot file."""
+        with self._lock:
+            for path in self.root.iterdir():
+                if path.is_file():
+                    path.unlink()
+            self._warmed.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def _create_snapshot_store(root: str) -> SnapshotStore:
+    logger.info(f"Using snapshot store at {root}")
+    return SnapshotStore(root)
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Get the process-wide snapshot store, or None if disabled/unwritable."""
+    if os.environ.get('CALYX_SNAPSHOTS', '1') == '0':
+        return None
+    try:
+        return _create_snapshot_store(os.environ.get('CALYX_SNAPSHOT_DIR', str(DEFAULT_SNAPSHOT_DIR)))
+    except Exception as e:
+        logger.warning(f"Snapshot store unavailable: {e}")
+        return None
+
+
+# =============================================================================
+# WARM START
+# =============================================================================
+
+FetchFn = Callable[[List[SnapshotKey]], Dict[SnapshotKey, pd.DataFrame]]
+
+
+def _revalidate(store: SnapshotStore, served: Dict[SnapshotKey, pd.DataFrame],
+                fetch: FetchFn, on_refresh: Optional[Callable[[], None]]) -> None:
+    """Background job: re-fetch snapshot-served tabs and persist the result."""
+    try:
+        fresh = fetch(list(served))
+    except Exception as e:
+        logger.warning(f"Background revalidation failed: {e}")
+        return
+
+    changed = False
+    for key, df in fresh.items():
+        if df is None or df.empty:
+            continue
+        try:
+            store.write(key, df)
+        except Exception as e:
+            logger.warning(f"Failed to write snapshot for {key[1]}!{key[2]}: {e}")
+        if not df.equals(served[key]):
+            changed = True
+
+    logger.info(f"Revalidated {len(fresh)} snapshot(s), changed={changed}")
+    if changed and on_refresh is not None:
+        try:
+            on_refresh()
+        except Exception as e:
+            logger.warning(f"Snapshot on_refresh hook failed: {e}")
+
+
+def load_with_snapshots(keys: Sequence[SnapshotKey], fetch: FetchFn,
+                        on_refresh: Optional[Callable[[], None]] = None,
+                        background_fetch: Optional[FetchFn] = None
+                        ) -> Dict[SnapshotKey, pd.DataFrame]:
+    """
+    Load tabs through the snapshot store.
+
+    The first time this process asks for a tab that has a snapshot on disk,
+    the snapshot is returned immediately and the tab is re-fetched in a
+    background thread. Every other tab is fetched live and its snapshot
+    rewritten. Failed or empty fetches never overwrite a snapshot.
+
+    Args:
+        keys: Tabs to load
+        fetch: Fetches a list of keys live, returning a frame per key
+        on_refresh: Called (from the background thread) when revalidation
+            found newer data, e.g. a cached function's .clear
+        background_fetch: Fetch variant for the background thread (e.g.
+            one that doesn't write to the page); defaults to fetch
+
+    Returns:
+        Dict keyed by SnapshotKey
+    """
+    keys = list(dict.fromkeys(keys))
+    store = get_snapshot_store()
+    if store is None:
+        return fetch(keys)
+
+    served = {}
+    for key in store.claim_warm_start(keys):
+        snapshot = store.read(key)
+        if snapshot is not None:
+            served[key] = snapshot.data
+            logger.info(f"Serving {key[1]}!{key[2]} from snapshot fetched {snapshot.fetched_at:%Y-%m-%d %H:%M}")
+
+    live = [key for key in keys if key not in served]
+    frames = fetch(live) if live else {}
+    for key in live:
+        df = frames.get(key)
+        if df is not None and not df.empty:
+            try:
+                store.write(key, df)
+            except Exception as e:
+                logger.warning(f"Failed to write snapshot for {key[1]}!{key[2]}: {e}")
+
+    if served:
+        threading.Thread(
+            target=_revalidate,
+            args=(store, served, background_fetch or fetch, on_refresh),
+            name='snapshot-revalidate',
+            daemon=True
+        ).start()
+
+    return {key: served[key] if key in served else frames.get(key) for key in keys}
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'PARQUET_AVAILABLE',
+    'SnapshotKey',
+    'Snapshot',
+    'SnapshotStore',
+    'get_snapshot_store',
+    'load_with_snapshots',
+]
@@ -20,8 +20,11 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
 import logging
-import gspread
-from google.oauth2.service_account import Credentials
+
+from .sheets_client import get_gspread_client
+from .data_cache import revision_cached
+from .sheets_ingest import fetch_worksheet_values, run_concurrently
+from .sheet_schemas import apply_schema, compact_dimensions
 
 logger = logging.getLogger(__name__)
 
@@ -33,39 +36,9 @@ LAST_UPDATED = "2026-01-05 17:30 MST"
 # GOOGLE SHEETS CONNECTION
 # =============================================================================
 
-SCOPES = [
-    'https://www.googleapis.com/auth/spreadsheets.readonly',
-    'https://www.googleapis.com/auth/drive.readonly'
-]
-
-@st.cache_resource
 def get_google_sheets_client():
-    """Get authenticated Google Sheets client."""
-    try:
-        # Try different secret formats
-        if 'service_account' in st.secrets:
-            creds_dict = dict(st.secrets['service_account'])
-        elif 'gcp_service_account' in st.secrets:
-            creds_dict = dict(st.secrets['gcp_service_account'])
-        else:
-            # Try top-level secrets
-            creds_dict = {
-                'type': st.secrets.get('type', 'service_account'),
-                'project_id': st.secrets.get('project_id'),
-                'private_key_id': st.secrets.get('private_key_id'),
-                'private_key': st.secrets.get('private_key'),
-                'client_email': st.secrets.get('client_email'),
-                'client_id': st.secrets.get('client_id'),
-                'auth_uri': st.secrets.get('auth_uri'),
-                'token_uri': st.secrets.get('token_uri'),
-            }
-        
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        logger.error(f"Failed to authenticate with Google Sheets: {e}")
-        return None
+    """Get authenticated Google Sheets client (pooled, shared across sessions)."""
+    return get_gspread_client()
 
 
 def get_spreadsheet_id():
@@ -100,9 +73,7 @@ def load_sheet_to_dataframe(sheet_name: str, handle_duplicates: bool = True) ->
             return None
         
         logger.info(f"Opening spreadsheet {spreadsheet_id} for sheet '{sheet_name}'")
-        spreadsheet = client.open_by_key(spreadsheet_id)
-        worksheet = spreadsheet.worksheet(sheet_name)
-        data = worksheet.get_all_values()
+        data = fetch_worksheet_values(client, spreadsheet_id, sheet_name, on_refresh=_clear_sop_caches)
         
         if not data:
             logger.info(f"Sheet '{sheet_name}' has no data")
@@ -126,15 +97,8 @@ def load_sheet_to_dataframe(sheet_name: str, handle_duplicates: bool = True) ->
         
         df = pd.DataFrame(data[1:], columns=headers)
         
-        # Convert numeric columns
-        for col in df.columns:
-            # Try to convert to numeric
-            try:
-                numeric_vals = pd.to_numeric(df[col], errors='coerce')
-                if numeric_vals.notna().sum() > len(df) * 0.5:  # More than 50% numeric
-                    df[col] = numeric_vals
-            except:
-                pass
+        # Type columns from the tab's schema (IDs stay text, currency/dates parsed)
+        df = apply_schema(df, sheet_name)
         
         logger.info(f"Successfully created DataFrame with {len(df)} rows and {len(df.columns)} columns")
         return df
@@ -144,11 +108,19 @@ def load_sheet_to_dataframe(sheet_name: str, handle_duplicates: bool = True) ->
         return None
 
 
+def _clear_sop_caches():
+    """Drop cached S&OP frames once a warm-start snapshot has been revalidated."""
+    for loader in (load_invoice_lines, load_sales_orders, load_items, load_stock_items,
+                   load_customers, load_deals, load_inventory, load_vendors, load_invoices,
+                   load_so_lines, load_revenue_forecast):
+        loader.clear()
+
+
 # =============================================================================
 # DATA LOADING FUNCTIONS
 # =============================================================================
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_invoice_lines() -> Optional[pd.DataFrame]:
     """Load Invoice Line Item data."""
     df = load_sheet_to_dataframe('Invoice Line Item')
@@ -186,10 +158,10 @@ def load_invoice_lines() -> Optional[pd.DataFrame]:
     if 'Product Type' in df.columns:
         df['Product Type'] = df['Product Type'].fillna('Unknown').replace('', 'Unknown')
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_sales_orders() -> Optional[pd.DataFrame]:
     """Load Sales Orders Main data."""
     df = load_sheet_to_dataframe('_NS_SalesOrders_Data')
@@ -223,10 +195,10 @@ def load_sales_orders() -> Optional[pd.DataFrame]:
     
     df = df.rename(columns=col_mapping)
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_items() -> Optional[pd.DataFrame]:
     """
     Load Raw_Items data with 'Calyx || Product Type' column.
@@ -272,10 +244,10 @@ def load_items() -> Optional[pd.DataFrame]:
     
     df = df.rename(columns=col_mapping)
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_stock_items() -> Optional[pd.DataFrame]:
     """
     Load Raw_Items data filtered to only include Stock Items.
@@ -301,7 +273,7 @@ def load_stock_items() -> Optional[pd.DataFrame]:
     return df
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_customers() -> Optional[pd.DataFrame]:
     """Load Customer List data."""
     df = load_sheet_to_dataframe('_NS_Customer_List')
@@ -322,10 +294,10 @@ def load_customers() -> Optional[pd.DataFrame]:
     
     df = df.rename(columns=col_mapping)
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_deals() -> Optional[pd.DataFrame]:
     """
     Load HubSpot Deals/Pipeline data.
@@ -393,10 +365,10 @@ def load_deals() -> Optional[pd.DataFrame]:
     # Log the actual column names for debugging
     logger.info(f"Deals columns after processing: {list(df.columns)[:10]}...")
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_inventory() -> Optional[pd.DataFrame]:
     """Load Raw_Inventory data."""
     df = load_sheet_to_dataframe('Raw_Inventory')
@@ -404,10 +376,10 @@ def load_inventory() -> Optional[pd.DataFrame]:
     if df is None or df.empty:
         return None
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_vendors() -> Optional[pd.DataFrame]:
     """Load Raw_Vendors data."""
     df = load_sheet_to_dataframe('Raw_Vendors')
@@ -418,7 +390,7 @@ def load_vendors() -> Optional[pd.DataFrame]:
     return df
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_invoices() -> Optional[pd.DataFrame]:
     """Load Invoices Main data."""
     df = load_sheet_to_dataframe('_NS_Invoices_Data')
@@ -426,10 +398,10 @@ def load_invoices() -> Optional[pd.DataFrame]:
     if df is None or df.empty:
         return None
     
-    return df
+    return compact_dimensions(df)
 
 
-@st.cache_data(ttl=300)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_so_lines() -> Optional[pd.DataFrame]:
     """Load Sales Order Line Items."""
     df = load_sheet_to_dataframe('Sales Order Line Item')
@@ -437,25 +409,29 @@ def load_so_lines() -> Optional[pd.DataFrame]:
     if df is None or df.empty:
         return None
     
-    return df
+    return compact_dimensions(df)
 
 
 # =============================================================================
 # AGGREGATE LOADING
 # =============================================================================
 
-@st.cache_data(ttl=300)
 def load_all_sop_data() -> Dict[str, pd.DataFrame]:
-    """Load all S&OP data at once."""
-    return {
-        'invoice_lines': load_invoice_lines(),
-        'sales_orders': load_sales_orders(),
-        'items': load_items(),
-        'customers': load_customers(),
-        'deals': load_deals(),
-        'inventory': load_inventory(),
-        'vendors': load_vendors()
-    }
+    """
+    Load all S&OP data at once (tabs download concurrently).
+
+    Not cached itself: every loader here is already cached per revision,
+    so a second copy of each frame would only take up cache budget.
+    """
+    return run_concurrently({
+        'invoice_lines': load_invoice_lines,
+        'sales_orders': load_sales_orders,
+        'items': load_items,
+        'customers': load_customers,
+        'deals': load_deals,
+        'inventory': load_inventory,
+        'vendors': load_vendors
+    })
 
 
 # =============================================================================
@@ -771,7 +747,7 @@ def prepare_revenue_history(invoice_lines: pd.DataFrame = None,
     if group_by and group_by in df.columns:
         group_cols.append(group_by)
     
-    grouped = df.groupby(group_cols)['Amount'].sum().reset_index()
+    grouped = df.groupby(group_cols, observed=True)['Amount'].sum().reset_index()
     grouped.columns = group_cols + ['Revenue']
     grouped['Month'] = grouped['Month'].astype(str)
     return grouped
@@ -800,7 +776,7 @@ def get_all_worksheet_names() -> list:
         return []
 
 
-@st.cache_data(ttl=60)
+@revision_cached(spreadsheet_id=get_spreadsheet_id, stale_while_revalidate=True)
 def load_revenue_forecast() -> Optional[pd.DataFrame]:
     """
     Load Revenue Forecast data from Google Sheet.
@@ -1398,11 +1374,11 @@ def calculate_item_unit_mix_from_invoices() -> pd.DataFrame:
         return pd.DataFrame()
     
     # Calculate units by category and item
-    by_cat_item = temp_df.groupby(['Category', 'Item'])['Quantity'].sum().reset_index()
+    by_cat_item = temp_df.groupby(['Category', 'Item'], observed=True)['Quantity'].sum().reset_index()
     by_cat_item.columns = ['Category', 'Item', 'Total_Units']
     
     # Calculate category totals
-    cat_totals = temp_df.groupby('Category')['Quantity'].sum().reset_index()
+    cat_totals = temp_df.groupby('Category', observed=True)['Quantity'].sum().reset_index()
     cat_totals.columns = ['Category', 'Category_Total_Units']
     
     # Merge and calculate percentage
@@ -1515,7 +1491,7 @@ def calculate_item_asp_rolling12(invoice_lines: pd.DataFrame = None) -> pd.DataF
         return pd.DataFrame()
     
     # Aggregate by item
-    by_item = temp_df.groupby('Item').agg({
+    by_item = temp_df.groupby('Item', observed=True).agg({
         'Amount': 'sum',
         'Quantity': 'sum'
     }).reset_index()
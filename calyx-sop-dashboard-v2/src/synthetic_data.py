@@ -0,0 +1,1111 @@
+"""
+Synthetic Data Module
+Production-shaped, referentially consistent fake data for every Google Sheets
+tab the dashboard reads
+
+Features:
+- One generator per tab with the production column layout: positional
+  columns land where the loaders index them (_NS_Invoices_Data col K =
+  Amount, _NS_SalesOrders_Data col AG = Updated Status, NC col F = Sales
+  Order, ...), header names match what the loaders look up elsewhere
+- Shared entity pools so joins behave like production: every invoice comes
+  from a sales order (Created From "Sales Order #SO..."), invoice / SO
+  lines carry real document numbers and SKUs from Raw_Items, won deals
+  point at their sales order, inventory commitments add up to the open SO
+  lines, NC records reference shipped orders and their customers
+- Scale knob: row counts grow linearly from BASE_ROWS (scale 1.0 is about
+  today's production volumes), so 10x / 100x inputs are one argument away
+- Deterministic for a given (seed, scale, as_of); every entity draws from
+  its own random stream, so tabs don't change with generation order
+- Output as raw sheet grids (strings, header rows first, exactly what the
+  Sheets API returns), DataFrames, or a sheets_replay cassette that section
+  loaders and benchmarks/bench_section_loads.py can run against
+
+Usage:
+    python -m src.synthetic_data --scale 10 --out /tmp/cassettes
+    python benchmarks/bench_section_loads.py --cassettes /tmp/cassettes
+
+Author: Xander @ Calyx Containers
+Version: 1.0.0
+"""
+
+import argparse
+import logging
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sheets_replay import CASSETTE_SUFFIX, SheetsCassette
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_SPREADSHEET_ID = "15JhBZ_7aHHZA1W1qsoC2163borL6RYjk0xTDWPmWPfA"
+
+# Entity counts at scale 1.0 (roughly the production tabs today). Line items
+# follow from LINES_PER_ORDER / LINES_PER_DEAL, invoices from billed orders.
+BASE_ROWS: Dict[str, int] = {
+    'customers': 1200,
+    'items': 1800,
+    'vendors': 90,
+    'sales_orders': 6000,
+    'deals': 4500,
+    'nc_records': 900,
+}
+
+LINES_PER_ORDER = 3.0   # mean SO / invoice lines per order (shipping excluded)
+LINES_PER_DEAL = 2.0    # mean HubSpot line items per deal
+HISTORY_DAYS = 730      # sales orders go back this far from as_of
+
+REPS = [
+    'Alex Morgan', 'Brian Foster', 'Carla Reyes', 'Dana Whitfield',
+    'Eli Navarro', 'Fiona Grant', 'Grant Holloway', 'Hannah Cole',
+    'Ivan Petrov', 'Julia Banks', 'Kevin Osei', 'Lena Park',
+]
+HOUSE_REP = 'House'
+CSMS = ['Maya Lin', 'Noah Becker', 'Priya Shah']
+
+# Calyx || Product Type -> (SKU prefix, forecast category, unit price range, weight)
+PRODUCT_TYPES = {
+    'Plastic Bases': ('DRM-B', 'Drams', (0.08, 0.40), 0.22),
+    'Plastic Lids': ('DRM-L', 'Drams', (0.05, 0.30), 0.18),
+    'Flex Pack': ('FLX', 'Flexpack', (0.10, 0.65), 0.14),
+    'Calyx Cure': ('CURE', 'Cure', (0.50, 4.00), 0.06),
+    'Glass Bases': ('GLS', 'Glass', (0.30, 1.40), 0.08),
+    'Container': ('CNT', 'Glass', (0.40, 1.80), 0.04),
+    'Labels': ('LBL', 'Labels', (0.02, 0.15), 0.10),
+    'Application': ('APP', 'Application', (0.03, 0.12), 0.06),
+    'Tray Inserts': ('TRY', 'Other', (0.15, 0.90), 0.03),
+    'Shrink Bands': ('SHB', 'Other', (0.01, 0.05), 0.03),
+    'Tubes': ('TUB', 'Other', (0.06, 0.30), 0.03),
+    'Boxes': ('BOX', 'Other', (0.40, 2.50), 0.02),
+    'Design': ('DSN', 'Other', (150.0, 900.0), 0.01),
+}
+
+# Forecast category -> Order Type on the sales order
+ORDER_TYPES = {
+    'Drams': 'Drams', 'Flexpack': 'Flexpack', 'Cure': 'Calyx Cure',
+    'Glass': 'Glass', 'Labels': 'Labels', 'Application': 'Application', 'Other': 'Other',
+}
+
+# HubSpot pipeline -> share of deals / orders
+PIPELINES = {
+    'Retention (Existing Product)': 0.45,
+    'Growth Pipeline (Upsell/Cross-sell)': 0.20,
+    'Acquisition (New Customer)': 0.20,
+    'Calyx Distribution': 0.08,
+    'Ecom': 0.07,
+}
+
+OPEN_STAGES = ['Discovery', 'Quote Sent', 'Proof Approval', 'Pending Approval', 'Verbal Commit']
+CLOSE_STATUS_PROBABILITY = {'Commit': 0.9, 'Expect': 0.75, 'Best Case': 0.5, 'Opportunity': 0.25}
+
+LOCATIONS = ['DEN - Warehouse', 'LV - Warehouse']
+NC_ISSUE_TYPES = ['Quality Defect', 'Packaging Error', 'Labeling Issue', 'Shipping Damage',
+                  'Documentation Error', 'Customer Complaint', 'Process Deviation']
+
+STANDARD_REORDER_COLUMNS = [
+    'Date entered "Standard Reorder - Confirmed by Customer (Acquisition (New Customer))"',
+    'Date entered "Standard Reorder - Confirmed by Customer (Calyx Distribution)"',
+    'Date entered "Standard Reorder - Confirmed by Customer (Growth Pipeline (Upsell/Cross-sell))"',
+    'Date entered "Standard Reorder - Confirmed by Customer- (Retention (Existing Product))"',
+    'Date entered "Standard Reorder - Pending Customer Confirmation (Acquisition (New Customer))"',
+    'Date entered "Standard Reorder - Pending Customer Confirmation (Calyx Distribution)"',
+    'Date entered "Standard Reorder - Pending Customer Confirmation (Growth Pipeline (Upsell/Cross-sell))"',
+    'Date entered "Standard Reorder - Pending Customer Confirmation (Retention (Existing Product))"',
+]
+
+FORECAST_PIPELINES = ['Retention', 'Growth', 'Acquisition', 'Distributors', 'Ecom']
+FORECAST_CATEGORIES = ['Drams', 'Flexpack', 'Cure', 'Cube', 'Glass', 'Labels',
+                       'Application', 'Shipping', 'Other']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+_CUSTOMER_WORDS = (
+    ['Green', 'Golden', 'High', 'North', 'Pacific', 'Summit', 'Blue', 'Silver', 'Mile',
+     'Rocky', 'Coastal', 'Prairie', 'Desert', 'Emerald', 'Cedar', 'Iron'],
+    ['Leaf', 'Valley', 'Peak', 'Harvest', 'River', 'Bloom', 'Canyon', 'Grove',
+     'Ridge', 'Meadow', 'Pine', 'Sun'],
+    ['Farms', 'Labs', 'Collective', 'Wellness', 'Brands', 'Extracts', 'Gardens', 'Co'],
+)
+_VENDOR_WORDS = (
+    ['Apex', 'Allied', 'Premier', 'United', 'Precision', 'Western', 'Summit', 'Keystone'],
+    ['Plastics', 'Packaging', 'Printing', 'Glass', 'Molding', 'Supply', 'Labels', 'Films'],
+)
+_STATES = ['CA', 'CO', 'MI', 'OK', 'OR', 'WA', 'MA', 'IL', 'NV', 'AZ', 'MO', 'NY']
+
+
+# =============================================================================
+# FORMATTING HELPERS
+# =============================================================================
+
+def _fmt_dates(values) -> np.ndarray:
+    """datetime64 values -> "MM/DD/YYYY" strings, '' for NaT."""
+    # A few hundred distinct days cover millions of rows; format each once
+    days, inverse = np.unique(np.asarray(values, dtype='datetime64[D]'), return_inverse=True)
+    labels = np.asarray(pd.DatetimeIndex(days).strftime('%m/%d/%Y'), dtype=object)
+    labels[np.isnat(days)] = ''
+    return labels[inverse.ravel()]
+
+
+def _fmt_money(values, symbol: bool = True) -> np.ndarray:
+    """Floats -> "$1,234.56" (or "1234.56"), '' for NaN."""
+    pattern = '${:,.2f}' if symbol else '{:.2f}'
+    return np.array(['' if v != v else pattern.format(v) for v in np.asarray(values, dtype=float).tolist()],
+                    dtype=object)
+
+
+def _fmt_int(values) -> np.ndarray:
+    return np.asarray(np.asarray(values, dtype=np.int64).astype(str), dtype=object)
+
+
+def _unique_names(count: int, words: Sequence[Sequence[str]], rng: np.random.Generator) -> np.ndarray:
+    """
+    `count` distinct names built from one word per list, numbered past the
+    number of combinations ("Green Leaf Farms 2").
+    """
+    sizes = [len(w) for w in words]
+    capacity = int(np.prod(sizes))
+    names = []
+    for i in range(count):
+        j, parts = i % capacity, []
+        for options, size in zip(words, sizes):
+            j, k = divmod(j, size)
+            parts.append(options[k])
+        name = ' '.join(parts)
+        names.append(name if i < capacity else f"{name} {i // capacity + 1}")
+    names = np.array(names, dtype=object)
+    rng.shuffle(names)
+    return names
+
+
+def _to_grid(columns: Dict[str, object], n: int) -> List[List[str]]:
+    """Header row plus n data rows; scalar column values are repeated."""
+    header = list(columns)
+    if n == 0:
+        return [header]
+    stacked = [np.full(n, v, dtype=object) if isinstance(v, str) else np.asarray(v, dtype=object)
+               for v in columns.values()]
+    return [header] + np.column_stack(stacked).tolist()
+
+
+def _title_row(title: str, width: int) -> List[str]:
+    return [title] + [''] * (width - 1)
+
+
+# =============================================================================
+# GENERATOR
+# =============================================================================
+
+class SyntheticWorkbook:
+    """
+    Synthetic copy of the operations spreadsheet.
+
+    Entities (customers, items, orders, ...) are generated on first use and
+    shared by every tab that references them.
+
+    Args:
+        scale: Row-count multiplier over BASE_ROWS (1, 10, 100, or anything)
+        seed: Random seed; same (seed, scale, as_of) -> same workbook
+        as_of: "Today" for the data (dates run back HISTORY_DAYS from it)
+
+    Example:
+        workbook = SyntheticWorkbook(scale=10)
+        invoices = workbook.frame('_NS_Invoices_Data')
+        workbook.write_cassette('/tmp/cassettes')
+    """
+
+    def __init__(self, scale: float = 1.0, seed: int = 42, as_of=None):
+        self.scale = scale
+        self.seed = seed
+        self.as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.today()).normalize()
+        self._today = np.datetime64(self.as_of.date(), 'D')
+        self._entities: Dict[str, pd.DataFrame] = {}
+
+    # -------------------------------------------------------------------------
+    # Plumbing
+    # -------------------------------------------------------------------------
+
+    def count(self, entity: str) -> int:
+        """Rows of a base entity at this scale."""
+        return max(1, int(round(BASE_ROWS[entity] * self.scale)))
+
+    def _rng(self, stream: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(stream.encode())])
+
+    def _entity(self, name: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        if name not in self._entities:
+            self._entities[name] = build()
+        return self._entities[name]
+
+    def _days_ago(self, days) -> np.ndarray:
+        return self._today - np.asarray(days, dtype='timedelta64[D]')
+
+    # -------------------------------------------------------------------------
+    # Entities
+    # -------------------------------------------------------------------------
+
+    def customers(self) -> pd.DataFrame:
+        """Customer master: id, name, owning rep, state, order weight."""
+        def build():
+            rng = self._rng('customers')
+            n = self.count('customers')
+            return pd.DataFrame({
+                'id': np.arange(n),
+                'internal_id': 20000 + np.arange(n),
+                'number': [f"C{10000 + i}" for i in range(n)],
+                'name': _unique_names(n, _CUSTOMER_WORDS, rng),
+                'rep': rng.choice(REPS, n),
+                'state': rng.choice(_STATES, n),
+                'created': self._days_ago(rng.integers(0, HISTORY_DAYS * 2, n)),
+                # A few large accounts place most of the orders
+                'weight': rng.pareto(1.2, n) + 1,
+            })
+        return self._entity('customers', build)
+
+    def vendors(self) -> pd.DataFrame:
+        def build():
+            rng = self._rng('vendors')
+            n = self.count('vendors')
+            return pd.DataFrame({
+                'internal_id': 5000 + np.arange(n),
+                'name': _unique_names(n, _VENDOR_WORDS, rng),
+                'lead_time': rng.choice([14, 21, 30, 45, 60, 90], n),
+                'terms': rng.choice(['Net 30', 'Net 45', 'Net 60', 'Prepaid'], n, p=[0.5, 0.2, 0.2, 0.1]),
+            })
+        return self._entity('vendors', build)
+
+    def items(self) -> pd.DataFrame:
+        """Item master; the last row is the Shipping item used on invoices."""
+        def build():
+            rng = self._rng('items')
+            n = self.count('items')
+            types = list(PRODUCT_TYPES)
+            weights = np.array([PRODUCT_TYPES[t][3] for t in types])
+            product_type = rng.choice(types, n, p=weights / weights.sum())
+            low = np.array([PRODUCT_TYPES[t][2][0] for t in product_type])
+            high = np.array([PRODUCT_TYPES[t][2][1] for t in product_type])
+            sizes = rng.choice(['15D', '25D', '45D', '145D', '4ML', '7ML', '1/8oz', '1oz', 'Std'], n)
+            vendors = self.vendors()
+            vendor = rng.integers(0, len(vendors), n)
+            items = pd.DataFrame({
+                'internal_id': 300000 + np.arange(n),
+                'sku': [f"{PRODUCT_TYPES[t][0]}-{i:06d}" for i, t in enumerate(product_type)],
+                'display_name': [f"{t} {s}" for t, s in zip(product_type, sizes)],
+                'product_type': product_type,
+                'category': [PRODUCT_TYPES[t][1] for t in product_type],
+                'item_type': np.where(product_type == 'Design', 'Service', 'Inventory Item'),
+                'stock': np.where((product_type != 'Design') & (rng.random(n) < 0.7), 'Yes', 'No'),
+                'price': np.round(rng.uniform(low, high), 4),
+                'vendor': vendors['name'].to_numpy()[vendor],
+                'lead_time': vendors['lead_time'].to_numpy()[vendor],
+                'weight': rng.pareto(1.5, n) + 1,
+            })
+            items['cost'] = np.round(items['price'] * rng.uniform(0.45, 0.7, n), 4)
+            shipping = {'internal_id': 300000 + n, 'sku': 'Shipping', 'display_name': 'Shipping',
+                        'product_type': '', 'category': 'Shipping', 'item_type': 'Shipping',
+                        'stock': 'No', 'price': 0.0, 'vendor': '', 'lead_time': 0, 'weight': 0.0, 'cost': 0.0}
+            return pd.concat([items, pd.DataFrame([shipping])], ignore_index=True)
+        return self._entity('items', build)
+
+    def sales_orders(self) -> pd.DataFrame:
+        """Sales order headers; amounts are the sums of their lines."""
+        def build():
+            rng = self._rng('sales_orders')
+            n = self.count('sales_orders')
+            customers = self.customers()
+            weights = customers['weight'].to_numpy()
+            cust = rng.choice(len(customers), n, p=weights / weights.sum())
+
+            # Document numbers increase with the order date
+            age = np.sort(rng.integers(0, HISTORY_DAYS, n))[::-1]
+            order_date = self._days_ago(age)
+
+            recent = age <= 45
+            status = np.where(
+                recent,
+                rng.choice(['Pending Approval', 'Pending Fulfillment', 'Partially Fulfilled',
+                            'Pending Billing', 'Billed'], n, p=[0.2, 0.45, 0.1, 0.05, 0.2]),
+                rng.choice(['Billed', 'Closed', 'Pending Billing'], n, p=[0.85, 0.1, 0.05]),
+            )
+            shipped = np.isin(status, ['Billed', 'Closed', 'Pending Billing', 'Partially Fulfilled'])
+            ship_lag = np.minimum(rng.integers(7, 45, n), age)
+            actual_ship = np.where(shipped, order_date + ship_lag.astype('timedelta64[D]'),
+                                   np.datetime64('NaT'))
+
+            pending_fulfillment = status == 'Pending Fulfillment'
+            promise = np.where(pending_fulfillment & (rng.random(n) < 0.6),
+                               order_date + rng.integers(14, 60, n).astype('timedelta64[D]'),
+                               np.datetime64('NaT'))
+            projected = np.where(pending_fulfillment & np.isnat(promise) & (rng.random(n) < 0.5),
+                                 order_date + rng.integers(10, 50, n).astype('timedelta64[D]'),
+                                 np.datetime64('NaT'))
+            pending_approval = status == 'Pending Approval'
+            approval_date = np.where(pending_approval & (rng.random(n) < 0.7),
+                                     order_date + rng.integers(0, 4, n).astype('timedelta64[D]'),
+                                     np.datetime64('NaT'))
+
+            updated = np.full(n, '', dtype=object)
+            updated[pending_approval & (age > 14)] = 'PA Old (>2 Weeks)'
+            updated[pending_approval & (age <= 14) & ~np.isnat(approval_date)] = 'PA with Date'
+            updated[pending_approval & (age <= 14) & np.isnat(approval_date)] = 'PA No Date'
+            external = rng.random(n) < 0.6
+            updated[pending_fulfillment & ~np.isnat(promise)] = 'PF with Date (Ext)'
+            updated[pending_fulfillment & ~np.isnat(projected)] = 'PF with Date (Int)'
+            no_date = pending_fulfillment & np.isnat(promise) & np.isnat(projected)
+            updated[no_date & external] = 'PF No Date (Ext)'
+            updated[no_date & ~external] = 'PF No Date (Int)'
+
+            pipelines = list(PIPELINES)
+            pipeline = rng.choice(pipelines, n, p=list(PIPELINES.values()))
+            rep = customers['rep'].to_numpy()[cust]
+            location = rng.choice(LOCATIONS, n, p=[0.75, 0.25])
+
+            return pd.DataFrame({
+                'internal_id': 1000000 + np.arange(n) * 3,
+                'number': [f"SO{20000 + i}" for i in range(n)],
+                'customer': cust,
+                'rep': rep,
+                'sales_rep': np.where(pipeline == 'Ecom', HOUSE_REP, rep),
+                'csm': rng.choice(CSMS, n),
+                'order_date': order_date,
+                'age': age,
+                'status': status,
+                'updated_status': updated,
+                'actual_ship': actual_ship,
+                'promise': promise,
+                'projected': projected,
+                'approval_date': approval_date,
+                'pipeline': pipeline,
+                'location': location,
+                'taxable': rng.random(n) < 0.15,
+            })
+
+        def with_totals():
+            orders = build()
+            lines = self._order_lines(orders)
+            rng = self._rng('sales_order_totals')
+            subtotal = np.bincount(lines['order'], weights=lines['amount'], minlength=len(orders))
+            orders['subtotal'] = np.round(subtotal, 2)
+            orders['shipping'] = np.round(subtotal * rng.uniform(0.01, 0.05, len(orders)), 2)
+            orders['tax'] = np.round(np.where(orders['taxable'], subtotal * 0.08, 0.0), 2)
+            orders['amount'] = orders['subtotal'] + orders['shipping'] + orders['tax']
+            # Order type follows the order's first (largest) line
+            first = lines.groupby('order', sort=True)['category'].first()
+            orders['order_type'] = first.reindex(range(len(orders))).map(ORDER_TYPES).fillna('Other').to_numpy()
+            orders['product_type'] = (lines.groupby('order', sort=True)['product_type'].first()
+                                      .reindex(range(len(orders))).fillna('').to_numpy())
+            return orders
+
+        return self._entity('sales_orders', with_totals)
+
+    def _order_lines(self, orders: pd.DataFrame) -> pd.DataFrame:
+        """Product lines for every sales order (sorted largest first per order)."""
+        def build():
+            rng = self._rng('sales_order_lines')
+            items = self.items().iloc[:-1]
+            per_order = rng.poisson(LINES_PER_ORDER - 1, len(orders)) + 1
+            order = np.repeat(np.arange(len(orders)), per_order)
+            n = len(order)
+            weights = items['weight'].to_numpy()
+            item = rng.choice(len(items), n, p=weights / weights.sum())
+            quantity = rng.choice([250, 500, 1000, 2500, 5000, 10000, 25000, 50000], n,
+                                  p=[0.08, 0.14, 0.22, 0.2, 0.16, 0.11, 0.06, 0.03])
+            design = items['product_type'].to_numpy()[item] == 'Design'
+            quantity = np.where(design, 1, quantity)
+            rate = np.round(items['price'].to_numpy()[item] * rng.uniform(0.9, 1.1, n), 4)
+            lines = pd.DataFrame({
+                'order': order,
+                'item': item,
+                'sku': items['sku'].to_numpy()[item],
+                'description': items['display_name'].to_numpy()[item],
+                'product_type': items['product_type'].to_numpy()[item],
+                'category': items['category'].to_numpy()[item],
+                'item_type': items['item_type'].to_numpy()[item],
+                'quantity': quantity,
+                'rate': rate,
+                'amount': np.round(quantity * rate, 2),
+            })
+            lines = lines.sort_values(['order', 'amount'], ascending=[True, False], kind='stable')
+            return lines.reset_index(drop=True)
+        return self._entity('sales_order_lines', build)
+
+    def sales_order_lines(self) -> pd.DataFrame:
+        return self._order_lines(self.sales_orders())
+
+    def invoices(self) -> pd.DataFrame:
+        """One invoice per billed / closed sales order, dated on ship."""
+        def build():
+            rng = self._rng('invoices')
+            orders = self.sales_orders()
+            billed = orders[orders['status'].isin(['Billed', 'Closed'])].copy()
+            billed = billed.sort_values('actual_ship', kind='stable').reset_index()
+            n = len(billed)
+            date = billed['actual_ship'].to_numpy().astype('datetime64[D]')
+            terms = rng.choice([0, 15, 30, 45], n, p=[0.1, 0.15, 0.6, 0.15])
+            due = date + terms.astype('timedelta64[D]')
+            overdue_days = (self._today - due).astype(int)
+            paid = (overdue_days > 10) | (rng.random(n) < 0.3)
+            return pd.DataFrame({
+                'order': billed['index'].to_numpy(),
+                'number': [f"INV{300000 + i}" for i in range(n)],
+                'internal_id': 5000000 + np.arange(n) * 3,
+                'date': date,
+                'due': due,
+                'terms': np.where(terms == 0, 'Due on receipt', [f"Net {t}" for t in terms]),
+                'status': np.where(paid, 'Paid In Full', 'Open'),
+                'amount': billed['amount'].to_numpy(),
+                'remaining': np.where(paid, 0.0, billed['amount'].to_numpy()),
+            })
+        return self._entity('invoices', build)
+
+    def deals(self) -> pd.DataFrame:
+        """HubSpot deals; won deals are tied to the sales order they became."""
+        def build():
+            rng = self._rng('deals')
+            n = self.count('deals')
+            customers = self.customers()
+            orders = self.sales_orders()
+            weights = customers['weight'].to_numpy()
+            cust = rng.choice(len(customers), n, p=weights / weights.sum())
+
+            create_age = rng.integers(0, int(HISTORY_DAYS * 0.75), n)
+            close = self._days_ago(create_age) + rng.integers(10, 150, n).astype('timedelta64[D]')
+            closed = close < self._today
+            stage = np.where(
+                closed,
+                rng.choice(['Closed Won', 'Sales Order Created in NS', 'Closed Lost', 'Cancelled',
+                            'Checkout Abandoned'], n, p=[0.45, 0.2, 0.25, 0.06, 0.04]),
+                rng.choice(OPEN_STAGES, n),
+            )
+            close_status = np.where(
+                np.isin(stage, ['Closed Won', 'Sales Order Created in NS']), 'Closed Won',
+                np.where(closed, 'Closed Lost', rng.choice(list(CLOSE_STATUS_PROBABILITY), n)),
+            )
+
+            # Won deals take the customer, amount and date of a real order
+            won = np.flatnonzero(close_status == 'Closed Won')
+            so = np.full(n, -1)
+            picks = rng.choice(len(orders), len(won), replace=len(won) > len(orders))
+            so[won] = picks
+            cust[won] = orders['customer'].to_numpy()[picks]
+            close[won] = orders['order_date'].to_numpy()[picks]
+            amount = np.round(rng.lognormal(9.3, 1.0, n), 2)
+            amount[won] = orders['subtotal'].to_numpy()[picks]
+
+            probability = np.array([CLOSE_STATUS_PROBABILITY.get(s, 1.0 if s == 'Closed Won' else 0.0)
+                                    for s in close_status])
+            pipelines = list(PIPELINES)
+            approval = np.where(stage == 'Pending Approval',
+                                close - rng.integers(0, 10, n).astype('timedelta64[D]'),
+                                np.datetime64('NaT'))
+            close_ts = pd.DatetimeIndex(close)
+            sku = self.items()['sku'].to_numpy()[rng.integers(0, len(self.items()) - 1, n)]
+            return pd.DataFrame({
+                'record_id': 9000000000 + np.arange(n) * 17,
+                'customer': cust,
+                'owner': customers['rep'].to_numpy()[cust],
+                'stage': stage,
+                'close_status': close_status,
+                'close': close,
+                'create': np.minimum(self._days_ago(create_age), close),
+                'approval_date': approval,
+                'amount': amount,
+                'probability': probability,
+                'pipeline': rng.choice(pipelines, n, p=list(PIPELINES.values())),
+                'deal_type': rng.choice(['New Business', 'Existing Business', 'Reorder'], n, p=[0.3, 0.4, 0.3]),
+                'order': so,
+                'quarter': [f"Q{q} {y}" for q, y in zip(close_ts.quarter, close_ts.year)],
+                'lead_time': rng.choice([21, 28, 35, 42, 56], n),
+                'sku': sku,
+                'new_design_sku': np.where(rng.random(n) < 0.05, sku, ''),
+            })
+        return self._entity('deals', build)
+
+    def deal_lines(self) -> pd.DataFrame:
+        """HubSpot line items; quantities x effective price sum to the deal amount."""
+        def build():
+            rng = self._rng('deal_lines')
+            deals = self.deals()
+            items = self.items().iloc[:-1]
+            per_deal = rng.poisson(LINES_PER_DEAL - 1, len(deals)) + 1
+            deal = np.repeat(np.arange(len(deals)), per_deal)
+            n = len(deal)
+            weights = items['weight'].to_numpy()
+            item = rng.choice(len(items), n, p=weights / weights.sum())
+            share = rng.random(n) + 0.1
+            share = share / np.bincount(deal, weights=share)[deal]
+            line_amount = deals['amount'].to_numpy()[deal] * share
+            unit = items['price'].to_numpy()[item]
+            quantity = np.maximum(1, np.round(line_amount / np.maximum(unit, 0.01)))
+            effective = np.round(line_amount / quantity, 4)
+            reorder = rng.random(len(deals)) < 0.1
+            return pd.DataFrame({
+                'deal': deal,
+                'line_id': 40000000000 + np.arange(n) * 7,
+                'item': item,
+                'quantity': quantity,
+                'unit_price': unit,
+                'effective': effective,
+                'amount': np.round(quantity * effective, 2),
+                'reorder_column': np.where(reorder, rng.integers(0, len(STANDARD_REORDER_COLUMNS), len(deals)),
+                                           -1)[deal],
+            })
+        return self._entity('deal_lines', build)
+
+    def inventory(self) -> pd.DataFrame:
+        """Stock items by location; Committed is the open SO quantity."""
+        def build():
+            rng = self._rng('inventory')
+            items = self.items()
+            stock = np.flatnonzero(items['stock'].to_numpy() == 'Yes')
+            # Every stock item sits in the main warehouse, some also in the second
+            second = stock[rng.random(len(stock)) < 0.35]
+            item = np.concatenate([stock, second])
+            location = np.array([LOCATIONS[0]] * len(stock) + [LOCATIONS[1]] * len(second), dtype=object)
+
+            orders = self.sales_orders()
+            lines = self.sales_order_lines()
+            open_orders = orders['status'].isin(['Pending Approval', 'Pending Fulfillment',
+                                                 'Partially Fulfilled']).to_numpy()
+            open_lines = lines[open_orders[lines['order'].to_numpy()]]
+            committed_by_item = np.bincount(open_lines['item'], weights=open_lines['quantity'],
+                                            minlength=len(items))
+            committed = np.where(location == LOCATIONS[0], committed_by_item[item], 0)
+            on_hand = np.round(committed * rng.uniform(0.5, 3.0, len(item)) + rng.integers(0, 50000, len(item)))
+            on_order = np.where(rng.random(len(item)) < 0.3, rng.integers(5000, 100000, len(item)), 0)
+            return pd.DataFrame({
+                'item': item,
+                'location': location,
+                'on_hand': on_hand,
+                'available': np.maximum(on_hand - committed, 0),
+                'committed': committed,
+                'on_order': on_order,
+                'backordered': np.maximum(committed - on_hand, 0),
+            }).sort_values(['item', 'location'], kind='stable').reset_index(drop=True)
+        return self._entity('inventory', build)
+
+    def nc_records(self) -> pd.DataFrame:
+        """Non-conformances raised against shipped orders."""
+        def build():
+            rng = self._rng('nc_records')
+            n = self.count('nc_records')
+            orders = self.sales_orders()
+            lines = self.sales_order_lines()
+            shipped = np.flatnonzero(~np.isnat(orders['actual_ship'].to_numpy()))
+            order = np.sort(rng.choice(shipped, n, replace=n > len(shipped)))
+            ship = orders['actual_ship'].to_numpy().astype('datetime64[D]')[order]
+            lag = np.minimum(rng.integers(1, 30, n), (self._today - ship).astype(int))
+            submitted = ship + lag.astype('timedelta64[D]')
+            age = (self._today - submitted).astype(int)
+            status = np.where(
+                age > 60,
+                rng.choice(['Closed', 'On Hold'], n, p=[0.95, 0.05]),
+                rng.choice(['Open', 'In Progress', 'Pending Review', 'Closed', 'On Hold'], n,
+                           p=[0.25, 0.2, 0.15, 0.3, 0.1]),
+            )
+            closed_after = np.minimum(rng.integers(1, 45, n), age)
+            closed = np.where(status == 'Closed', submitted + closed_after.astype('timedelta64[D]'),
+                              np.datetime64('NaT'))
+            first_line = lines.groupby('order', sort=True).head(1).set_index('order')
+            quantity = first_line['quantity'].reindex(order).to_numpy()
+            affected = np.maximum(1, np.round(quantity * rng.uniform(0.01, 0.5, n)))
+            return pd.DataFrame({
+                'number': [f"NC{50000 + i}" for i in range(n)],
+                'order': order,
+                'item': first_line['item'].reindex(order).to_numpy(),
+                'submitted': submitted,
+                'closed': closed,
+                'status': status,
+                'priority': rng.choice(['High', 'Medium', 'Low'], n, p=[0.2, 0.5, 0.3]),
+                'external': rng.choice(['External', 'Internal'], n, p=[0.4, 0.6]),
+                'issue_type': rng.choice(NC_ISSUE_TYPES, n),
+                'department': rng.choice(['Production', 'QA', 'Shipping', 'Receiving', 'Packaging'], n),
+                'owner': rng.choice(CSMS + REPS[:3], n),
+                'affected': affected,
+                'rework': np.round(affected * first_line['rate'].reindex(order).to_numpy()
+                                   * rng.uniform(0.3, 1.2, n), 2),
+                'avoided': np.round(np.where(rng.random(n) < 0.4, rng.exponential(400, n), 0.0), 2),
+            })
+        return self._entity('nc_records', build)
+
+    # -------------------------------------------------------------------------
+    # Tabs
+    # -------------------------------------------------------------------------
+
+    def _customer_columns(self, customer_idx) -> Dict[str, np.ndarray]:
+        customers = self.customers()
+        names = customers['name'].to_numpy()[customer_idx]
+        numbers = customers['number'].to_numpy()[customer_idx]
+        return {'raw': np.array([f"{c} {n}" for c, n in zip(numbers, names)], dtype=object), 'name': names}
+
+    def deals_tab(self, open_only: bool = False) -> List[List[str]]:
+        """Deals (A:X); open_only gives the 'All Reps All Pipelines' view."""
+        deals = self.deals()
+        if open_only:
+            deals = deals[~deals['close_status'].isin(['Closed Won', 'Closed Lost'])]
+        orders = self.sales_orders()
+        n = len(deals)
+        first, last = zip(*(o.split(' ', 1) for o in deals['owner'])) if n else ((), ())
+        company = self._customer_columns(deals['customer'].to_numpy())['name']
+        order = deals['order'].to_numpy()
+        linked = order >= 0
+        so_number = np.where(linked, orders['number'].to_numpy()[np.maximum(order, 0)], '')
+        so_link = np.where(linked, [f"https://system.netsuite.com/app/accounting/transactions/salesord.nl?id={i}"
+                                    for i in orders['internal_id'].to_numpy()[np.maximum(order, 0)]], '')
+        amount = deals['amount'].to_numpy()
+        return _to_grid({
+            'Record ID': _fmt_int(deals['record_id']),
+            'Deal Name': [f"{c} - {t}" for c, t in zip(company, deals['deal_type'])],
+            'Deal Stage': deals['stage'].to_numpy(),
+            'Close Date': _fmt_dates(deals['close']),
+            'Deal Owner First Name': np.array(first, dtype=object),
+            'Deal Owner Last Name': np.array(last, dtype=object),
+            'Amount': _fmt_money(amount),
+            'Close Status': deals['close_status'].to_numpy(),
+            'Pipeline': deals['pipeline'].to_numpy(),
+            'Create Date': _fmt_dates(deals['create']),
+            'Deal Type': deals['deal_type'].to_numpy(),
+            'Netsuite SO#': so_number,
+            'Netsuite SO Link': so_link,
+            'New Design SKU': deals['new_design_sku'].to_numpy(),
+            'SKU': deals['sku'].to_numpy(),
+            'Netsuite Sales Order Number': so_number,
+            'Primary Associated Company': company,
+            'Average Leadtime': _fmt_int(deals['lead_time']),
+            'Pending Approval Date': _fmt_dates(deals['approval_date']),
+            'Quarter': deals['quarter'].to_numpy(),
+            'Deal Stage & Close Status': [f"{s} - {c}" for s, c in zip(deals['stage'], deals['close_status'])],
+            'Probability': [f"{p:.0%}" for p in deals['probability']],
+            'Probability Rev': _fmt_money(amount * deals['probability'].to_numpy()),
+            'Company Name': company,
+        }, n)
+
+    def dashboard_info_tab(self) -> List[List[str]]:
+        """Rep quotas, sized off each rep's trailing-year invoicing."""
+        invoices = self.invoices()
+        orders = self.sales_orders()
+        recent = invoices[invoices['date'] >= self._today - np.timedelta64(365, 'D')]
+        billed = pd.Series(recent['amount'].to_numpy(), index=orders['rep'].to_numpy()[recent['order']])
+        by_rep = billed.groupby(level=0).sum().reindex(REPS).fillna(0.0)
+        quota = np.round(by_rep.to_numpy() * 1.15, -3)
+        grid = _to_grid({'Rep Name': np.array(REPS, dtype=object), 'Quota': _fmt_money(quota)}, len(REPS))
+        return grid + [['Team Total', _fmt_money([quota.sum()])[0]]]
+
+    def customer_list_tab(self) -> List[List[str]]:
+        customers = self.customers()
+        return _to_grid({
+            'Internal ID': _fmt_int(customers['internal_id']),
+            'Company Name': customers['name'].to_numpy(),
+            'Sales Rep': customers['rep'].to_numpy(),
+            'State': customers['state'].to_numpy(),
+            'Date Created': _fmt_dates(customers['created']),
+        }, len(customers))
+
+    def invoices_tab(self) -> List[List[str]]:
+        """_NS_Invoices_Data (A:Y), positional layout used by the snapshots."""
+        invoices = self.invoices()
+        orders = self.sales_orders().iloc[invoices['order'].to_numpy()]
+        customer = self._customer_columns(orders['customer'].to_numpy())
+        n = len(invoices)
+        return _to_grid({
+            'Document Number': invoices['number'].to_numpy(),                    # A
+            'Status': invoices['status'].to_numpy(),                              # B
+            'Date': _fmt_dates(invoices['date']),                                 # C
+            'Due Date': _fmt_dates(invoices['due']),                              # D
+            'Created From': [f"Sales Order #{s}" for s in orders['number']],      # E
+            'Terms': invoices['terms'].to_numpy(),                                # F
+            'Customer': customer['raw'],                                          # G
+            'Internal ID': _fmt_int(invoices['internal_id']),                     # H
+            'PO/Check Number': [f"PO-{i % 97000 + 1000}" for i in range(n)],      # I
+            'Currency': 'USD',                                                    # J
+            'Amount (Transaction Total)': _fmt_money(invoices['amount']),         # K
+            'Amount Remaining': _fmt_money(invoices['remaining']),                # L
+            'Location': orders['location'].to_numpy(),                            # M
+            'HubSpot Pipeline': orders['pipeline'].to_numpy(),                    # N
+            'Sales Rep': orders['sales_rep'].to_numpy(),                          # O
+            'PI || CSM': orders['csm'].to_numpy(),                                # P
+            'Amount (Shipping)': _fmt_money(orders['shipping']),                  # Q
+            'Amount (Transaction Tax Total)': _fmt_money(orders['tax']),          # R
+            'Ship Date': _fmt_dates(orders['actual_ship']),                       # S
+            'Corrected Customer Name': customer['name'],                          # T
+            'Rep Master': orders['rep'].to_numpy(),                               # U
+            'Order Type': orders['order_type'].to_numpy(),                        # V
+            'Memo': '',                                                           # W
+            'Class': 'Wholesale',                                                 # X
+            'Product Type': orders['product_type'].to_numpy(),                    # Y
+        }, n)
+
+    def sales_orders_tab(self) -> List[List[str]]:
+        """_NS_SalesOrders_Data (A:AG), positional layout used by the snapshots."""
+        orders = self.sales_orders()
+        customer = self._customer_columns(orders['customer'].to_numpy())
+        return _to_grid({
+            'Internal ID': _fmt_int(orders['internal_id']),                       # A
+            'Document Number': orders['number'].to_numpy(),                       # B
+            'Status': orders['status'].to_numpy(),                                # C
+            'Amount (Transaction Total)': _fmt_money(orders['amount']),           # D
+            'Sales Rep': orders['sales_rep'].to_numpy(),                          # E
+            'Customer': customer['raw'],                                          # F
+            'Order Type': orders['order_type'].to_numpy(),                        # G
+            'Date': _fmt_dates(orders['order_date']),                             # H
+            'Order Start Date': _fmt_dates(orders['order_date']),                 # I
+            'Actual Ship Date': _fmt_dates(orders['actual_ship']),                # J
+            'Terms': 'Net 30',                                                    # K
+            'Customer Promise Date': _fmt_dates(orders['promise']),               # L
+            'Projected Date': _fmt_dates(orders['projected']),                    # M
+            'Amount (Shipping)': _fmt_money(orders['shipping']),                  # N
+            'Amount (Transaction Tax Total)': _fmt_money(orders['tax']),          # O
+            'PI || CSM': orders['csm'].to_numpy(),                                # P
+            'HubSpot Pipeline': orders['pipeline'].to_numpy(),                    # Q
+            'Memo': '',                                                           # R
+            'Ship To State': self.customers()['state'].to_numpy()[orders['customer'].to_numpy()],  # S
+            'Ship Via': 'Freight',                                                # T
+            'Days Open': _fmt_int(orders['age']),                                 # U
+            'Subsidiary': 'Calyx Containers',                                     # V
+            'Billing Status': np.where(orders['status'].isin(['Billed', 'Closed']), 'Billed', 'Unbilled'),  # W
+            'Class': 'Wholesale',                                                 # X
+            'Department': 'Sales',                                                # Y
+            'Channel': np.where(orders['pipeline'] == 'Ecom', 'Shopify', 'Direct'),  # Z
+            'Location (hierarchy)': [f"Calyx : {loc}" for loc in orders['location']],  # AA
+            'Priority': 'Standard',                                               # AB
+            'Location (no hierarchy)': orders['location'].to_numpy(),             # AC
+            'Pending Approval Date': _fmt_dates(orders['approval_date']),         # AD
+            'Corrected Customer Name': customer['name'],                          # AE
+            'Rep Master': orders['rep'].to_numpy(),                               # AF
+            'Updated Status': orders['updated_status'].to_numpy(),                # AG
+        }, len(orders))
+
+    def _line_item_tab(self, lines: pd.DataFrame, header: Dict[str, object]) -> List[List[str]]:
+        """Shared Invoice / Sales Order Line Item layout (A:X, W = item type, X = product type)."""
+        orders = self.sales_orders().iloc[lines['order'].to_numpy()]
+        customer = self._customer_columns(orders['customer'].to_numpy())
+        columns = dict(header)
+        columns.update({
+            'Customer': customer['raw'],
+            'Correct Customer': customer['name'],
+            'Sales Rep': orders['sales_rep'].to_numpy(),
+            'Rep Master': orders['rep'].to_numpy(),
+            'Item': lines['sku'].to_numpy(),
+            'Item Description': lines['description'].to_numpy(),
+            'Quantity': _fmt_int(lines['quantity']),
+            'Rate': _fmt_money(lines['rate'], symbol=False),
+            'Amount': _fmt_money(lines['amount']),
+            'HubSpot Pipeline': orders['pipeline'].to_numpy(),
+            'Location': orders['location'].to_numpy(),
+            'Class': 'Wholesale',
+            'Memo': '',
+            'Line ID': _fmt_int(np.arange(len(lines)) % 50 + 1),
+            'Order Type': orders['order_type'].to_numpy(),
+            'Terms': 'Net 30',
+            'Department': 'Sales',
+            'Calyx | Item Type': lines['item_type'].to_numpy(),
+            'Calyx || Product Type': lines['product_type'].to_numpy(),
+        })
+        return _to_grid(columns, len(lines))
+
+    def invoice_lines(self) -> pd.DataFrame:
+        """SO lines of every invoiced order plus one Shipping line per invoice."""
+        def build():
+            invoices = self.invoices()
+            lines = self.sales_order_lines()
+            orders = self.sales_orders()
+            invoice_of_order = pd.Series(np.arange(len(invoices)), index=invoices['order'].to_numpy())
+            product = lines[lines['order'].isin(invoice_of_order.index)].copy()
+            items = self.items()
+            shipping = pd.DataFrame({
+                'order': invoices['order'].to_numpy(),
+                'item': len(items) - 1,
+                'sku': 'Shipping', 'description': 'Shipping', 'product_type': '',
+                'category': 'Shipping', 'item_type': 'Shipping', 'quantity': 1,
+                'rate': orders['shipping'].to_numpy()[invoices['order'].to_numpy()],
+                'amount': orders['shipping'].to_numpy()[invoices['order'].to_numpy()],
+            })
+            combined = pd.concat([product, shipping], ignore_index=True)
+            combined['invoice'] = invoice_of_order.reindex(combined['order']).to_numpy()
+            return combined.sort_values('invoice', kind='stable').reset_index(drop=True)
+        return self._entity('invoice_lines', build)
+
+    def invoice_lines_tab(self) -> List[List[str]]:
+        lines = self.invoice_lines()
+        invoices = self.invoices().iloc[lines['invoice'].to_numpy()]
+        orders = self.sales_orders().iloc[lines['order'].to_numpy()]
+        return self._line_item_tab(lines, {
+            'Document Number': invoices['number'].to_numpy(),
+            'Date': _fmt_dates(invoices['date']),
+            'Due Date': _fmt_dates(invoices['due']),
+            'Status': invoices['status'].to_numpy(),
+            'Created From': [f"Sales Order #{s}" for s in orders['number']],
+        })
+
+    def so_lines_tab(self) -> List[List[str]]:
+        lines = self.sales_order_lines()
+        orders = self.sales_orders().iloc[lines['order'].to_numpy()]
+        return self._line_item_tab(lines, {
+            'Document Number': orders['number'].to_numpy(),
+            'Date': _fmt_dates(orders['order_date']),
+            'Due Date': '',
+            'Status': orders['status'].to_numpy(),
+            'Created From': '',
+        })
+
+    def deal_lines_tab(self, copy_layout: bool = False) -> List[List[str]]:
+        """
+        Deals Line Item (title row, headers on row 2, A:V) or, with
+        copy_layout, 'Copy of Deals Line Item' (A:AB, Standard Reorder
+        date columns in R:Y).
+        """
+        lines = self.deal_lines()
+        deals = self.deals().iloc[lines['deal'].to_numpy()]
+        items = self.items().iloc[lines['item'].to_numpy()]
+        company = self._customer_columns(deals['customer'].to_numpy())['name']
+        columns = {
+            'Record ID': _fmt_int(deals['record_id']),
+            'Deal Name': [f"{c} - {t}" for c, t in zip(company, deals['deal_type'])],
+            'Deal Stage': deals['stage'].to_numpy(),
+            'Close Date': _fmt_dates(deals['close']),
+            'Create Date': _fmt_dates(deals['create']),
+            'Deal Owner': deals['owner'].to_numpy(),
+            'Pipeline': deals['pipeline'].to_numpy(),
+            'Deal Type': deals['deal_type'].to_numpy(),
+            'Company Name': company,
+            'Close Status': deals['close_status'].to_numpy(),
+            'Line Item ID': _fmt_int(lines['line_id']),
+            'Name': items['display_name'].to_numpy(),
+            'SKU': items['sku'].to_numpy(),
+            'Quantity': _fmt_int(lines['quantity']),
+            'Unit price': _fmt_money(lines['unit_price']),
+            'Effective unit price': _fmt_money(lines['effective']),
+            'Amount': _fmt_money(lines['amount']),
+        }
+        if copy_layout:
+            dates = _fmt_dates(deals['create'])
+            reorder = lines['reorder_column'].to_numpy()
+            for i, name in enumerate(STANDARD_REORDER_COLUMNS):
+                columns[name] = np.where(reorder == i, dates, '')
+            columns.update({
+                'Calyx || Product Type': items['product_type'].to_numpy(),
+                'Quarter': deals['quarter'].to_numpy(),
+                'Pending Approval Date': _fmt_dates(deals['approval_date']),
+            })
+        else:
+            columns.update({
+                'Discount': '',
+                'Calyx || Product Type': items['product_type'].to_numpy(),
+                'Quarter': deals['quarter'].to_numpy(),
+                'Probability': [f"{p:.0%}" for p in deals['probability']],
+                'Pending Approval Date': _fmt_dates(deals['approval_date']),
+            })
+        grid = _to_grid(columns, len(lines))
+        title = 'Copy of Deals Line Item' if copy_layout else 'Deals Line Item'
+        return [_title_row(f"{title} (HubSpot export)", len(columns))] + grid
+
+    def items_tab(self) -> List[List[str]]:
+        items = self.items()
+        return _to_grid({
+            'Internal ID': _fmt_int(items['internal_id']),
+            'Item': items['sku'].to_numpy(),
+            'Display Name': items['display_name'].to_numpy(),
+            'Description': [f"{d} - {t or 'Service'}" for d, t in zip(items['display_name'], items['product_type'])],
+            'Stock Item': items['stock'].to_numpy(),
+            'Calyx || Product Type': items['product_type'].to_numpy(),
+            'Calyx | Item Type': items['item_type'].to_numpy(),
+            'Preferred Vendor': items['vendor'].to_numpy(),
+            'Purchase Price': _fmt_money(items['cost']),
+            'Base Price': _fmt_money(items['price']),
+            'Lead Time': _fmt_int(items['lead_time']),
+        }, len(items))
+
+    def inventory_tab(self) -> List[List[str]]:
+        inventory = self.inventory()
+        items = self.items().iloc[inventory['item'].to_numpy()]
+        return _to_grid({
+            'Item': items['sku'].to_numpy(),
+            'Description': items['display_name'].to_numpy(),
+            'Location': inventory['location'].to_numpy(),
+            'Quantity On Hand': _fmt_int(inventory['on_hand']),
+            'Quantity Available': _fmt_int(inventory['available']),
+            'Quantity Committed': _fmt_int(inventory['committed']),
+            'Quantity On Order': _fmt_int(inventory['on_order']),
+            'Quantity Backordered': _fmt_int(inventory['backordered']),
+            'Average Cost': _fmt_money(items['cost']),
+        }, len(inventory))
+
+    def vendors_tab(self) -> List[List[str]]:
+        vendors = self.vendors()
+        return _to_grid({
+            'Internal ID': _fmt_int(vendors['internal_id']),
+            'Vendor': vendors['name'].to_numpy(),
+            'Category': 'Supplier',
+            'Lead Time (Days)': _fmt_int(vendors['lead_time']),
+            'Terms': vendors['terms'].to_numpy(),
+        }, len(vendors))
+
+    def nc_tab(self) -> List[List[str]]:
+        """Non-Conformance Details (A:W): F = Sales Order, I = Issue Type,
+        P = Total Quantity Affected, V = Corrected Customer Name."""
+        ncs = self.nc_records()
+        orders = self.sales_orders().iloc[ncs['order'].to_numpy()]
+        items = self.items().iloc[ncs['item'].to_numpy()]
+        customer = self._customer_columns(orders['customer'].to_numpy())
+        return _to_grid({
+            'NC Number': ncs['number'].to_numpy(),                                # A
+            'Date Submitted': _fmt_dates(ncs['submitted']),                       # B
+            'Status': ncs['status'].to_numpy(),                                   # C
+            'Priority': ncs['priority'].to_numpy(),                               # D
+            'External Or Internal': ncs['external'].to_numpy(),                   # E
+            'Sales Order': orders['number'].to_numpy(),                           # F
+            'Customer': customer['raw'],                                          # G
+            'Item': items['sku'].to_numpy(),                                      # H
+            'Issue Type': ncs['issue_type'].to_numpy(),                           # I
+            'Defect Summary': [f"{t} on {s}" for t, s in zip(ncs['issue_type'], items['sku'])],  # J
+            'Department': ncs['department'].to_numpy(),                           # K
+            'Assigned To': ncs['owner'].to_numpy(),                               # L
+            'Root Cause': '',                                                     # M
+            'Corrective Action': '',                                              # N
+            'Disposition': np.where(ncs['status'] == 'Closed', 'Reworked', ''),   # O
+            'Total Quantity Affected': _fmt_int(ncs['affected']),                 # P
+            'Cost of Rework': _fmt_money(ncs['rework']),                          # Q
+            'Cost Avoided': _fmt_money(ncs['avoided']),                           # R
+            'On Time Ship Date': _fmt_dates(orders['actual_ship']),               # S
+            'Close Date': _fmt_dates(ncs['closed']),                              # T
+            'Product Type': items['product_type'].to_numpy(),                     # U
+            'Corrected Customer Name': customer['name'],                          # V
+            'Rep Master': orders['rep'].to_numpy(),                               # W
+        }, len(ncs))
+
+    def forecast_tab(self) -> List[List[str]]:
+        """
+        2026 Forecast (A1:S80): one block per pipeline (header row with the
+        pipeline in A and 'Category' in B, one row per category, a Total
+        row), months in C:E, G:I, K:M, O:Q, quarters in F/J/N/R, year in S.
+        """
+        rng = self._rng('forecast')
+        header = ['Category'] + [m for q in range(4) for m in MONTHS[q * 3:q * 3 + 3] + [f"Q{q + 1}"]] + ['Total']
+        season = 1 + 0.15 * np.sin(np.linspace(0, 2 * np.pi, 12, endpoint=False))
+        share = dict(zip(PIPELINES, [0.5, 0.2, 0.15, 0.1, 0.05]))
+        annual_base = 12_000_000 * self.scale
+
+        def row(label, months):
+            cells = []
+            for q in range(4):
+                quarter = months[q * 3:q * 3 + 3]
+                cells += _fmt_money(quarter).tolist() + _fmt_money([quarter.sum()]).tolist()
+            return [label] + cells + _fmt_money([months.sum()]).tolist()
+
+        rows = [_title_row('2026 Forecast', len(header) + 1)]
+        grand = np.zeros((len(FORECAST_CATEGORIES), 12))
+        blocks = []
+        for pipeline, weight in zip(FORECAST_PIPELINES, share.values()):
+            mix = rng.dirichlet(np.ones(len(FORECAST_CATEGORIES)) * 2)
+            values = np.round(annual_base * weight * mix[:, None] * season[None, :] / 12
+                              * rng.uniform(0.9, 1.1, (len(FORECAST_CATEGORIES), 12)), 0)
+            grand += values
+            blocks.append((pipeline, values))
+        blocks.append(('Total', grand))
+        for pipeline, values in blocks:
+            rows.append([pipeline] + header)
+            for category, months in zip(FORECAST_CATEGORIES, values):
+                rows.append([''] + row(category, months))
+            rows.append([''] + row('Total', values.sum(axis=0)))
+            rows.append([''] * (len(header) + 1))
+        return rows
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def grid(self, tab: str) -> List[List[str]]:
+        """Raw grid of a tab, header row(s) first, as the Sheets API returns it."""
+        if tab not in SYNTHETIC_TABS:
+            raise KeyError(f"No synthetic data for tab '{tab}'")
+        return SYNTHETIC_TABS[tab][0](self)
+
+    def frame(self, tab: str) -> pd.DataFrame:
+        """A tab as a DataFrame of strings, the way values_to_dataframe builds it."""
+        header_rows = SYNTHETIC_TABS[tab][1]
+        grid = self.grid(tab)
+        header = grid[header_rows - 1]
+        return pd.DataFrame(grid[header_rows:], columns=header)
+
+    def grids(self, tabs: Optional[Sequence[str]] = None) -> Dict[str, List[List[str]]]:
+        return {tab: self.grid(tab) for tab in (tabs or SYNTHETIC_TABS)}
+
+    def cassette(self, spreadsheet_id: str = DEFAULT_SPREADSHEET_ID,
+                 tabs: Optional[Sequence[str]] = None) -> SheetsCassette:
+        """The workbook as a sheets_replay cassette."""
+        grids = self.grids(tabs)
+        header_rows = {tab: SYNTHETIC_TABS[tab][1] for tab in grids}
+        return SheetsCassette(spreadsheet_id, grids, header_rows, revision=self.as_of.isoformat())
+
+    def write_cassette(self, root, spreadsheet_id: str = DEFAULT_SPREADSHEET_ID,
+                       tabs: Optional[Sequence[str]] = None) -> Path:
+        """Save the workbook as <root>/<spreadsheet id>.json.gz for CALYX_SHEETS_REPLAY."""
+        path = Path(root) / f"{spreadsheet_id}{CASSETTE_SUFFIX}"
+        self.cassette(spreadsheet_id, tabs).save(path)
+        logger.info(f"Wrote synthetic workbook (scale {self.scale:g}) to {path}")
+        return path
+
+
+# Tab -> (grid builder, header rows)
+SYNTHETIC_TABS: Dict[str, tuple] = {
+    'Deals': (SyntheticWorkbook.deals_tab, 1),
+    'All Reps All Pipelines': (lambda wb: wb.deals_tab(open_only=True), 1),
+    'Dashboard Info': (SyntheticWorkbook.dashboard_info_tab, 1),
+    '_NS_Customer_List': (SyntheticWorkbook.customer_list_tab, 1),
+    '_NS_Invoices_Data': (SyntheticWorkbook.invoices_tab, 1),
+    'Invoice Line Item': (SyntheticWorkbook.invoice_lines_tab, 1),
+    '_NS_SalesOrders_Data': (SyntheticWorkbook.sales_orders_tab, 1),
+    'Sales Order Line Item': (SyntheticWorkbook.so_lines_tab, 1),
+    'Deals Line Item': (SyntheticWorkbook.deal_lines_tab, 2),
+    'Copy of Deals Line Item': (lambda wb: wb.deal_lines_tab(copy_layout=True), 2),
+    'Raw_Items': (SyntheticWorkbook.items_tab, 1),
+    'Raw_Inventory': (SyntheticWorkbook.inventory_tab, 1),
+    'Raw_Vendors': (SyntheticWorkbook.vendors_tab, 1),
+    'Non-Conformance Details': (SyntheticWorkbook.nc_tab, 1),
+    '2026 Forecast': (SyntheticWorkbook.forecast_tab, 1),
+}
+
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'BASE_ROWS',
+    'SYNTHETIC_TABS',
+    'SyntheticWorkbook',
+]
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Write a synthetic workbook cassette for sheets_replay')
+    parser.add_argument('--scale', type=float, default=1.0, help='Row-count multiplier (1, 10, 100, ...)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--as-of', default=None, help='"Today" for the data (default: today)')
+    parser.add_argument('--out', required=True, help='Cassette directory')
+    parser.add_argument('--spreadsheet-id', default=DEFAULT_SPREADSHEET_ID)
+    args = parser.parse_args(argv)
+
+    workbook = SyntheticWorkbook(scale=args.scale, seed=args.seed, as_of=args.as_of)
+    cassette = workbook.cassette(args.spreadsheet_id)
+    for tab, grid in cassette.tabs.items():
+        print(f"{tab:<28}{len(grid) - cassette.header_rows[tab]:>10} rows")
+    path = Path(args.out) / f"{args.spreadsheet_id}{CASSETTE_SUFFIX}"
+    cassette.save(path)
+    print(f"\nwrote {path}")
+
+
+if __name__ == '__main__':
+    main()
+
@@ -14,13 +14,16 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import base64
 import io
 import re
 import uuid
 
+from .data_cache import revision_cached
+from .memory_cache import memory_cached
+from .sheets_ingest import MAX_CONCURRENT_FETCHES, fetch_sheet_batch, fetch_sheet_range, get_spreadsheet_id
+from .sheet_schemas import coerce_numeric, compact_dimensions
+
 # ========== CONFIGURATION ==========
 DEFAULT_SPREADSHEET_ID = "15JhBZ_7aHHZA1W1qsoC2163borL6RYjk0xTDWPmWPfA"
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
@@ -3572,66 +3575,32 @@ def generate_combined_summary_html(customers_data, rep_name, date_label="All Tim
 
 
 # ========== DATA LOADING ==========
-@st.cache_data
-@st.cache_data(ttl=3600, show_spinner=False)
+# Tab data is cached per spreadsheet revision in the shared sheet registry
+# (failed fetches are never stored there), so no cache of its own
 def load_google_sheets_data(sheet_name, range_name, version=CACHE_VERSION, silent=False):
     """Load data from Google Sheets with caching"""
-    try:
-        spreadsheet_id = st.secrets.get("SPREADSHEET_ID", DEFAULT_SPREADSHEET_ID)
-        
-        if "service_account" not in st.secrets:
-            if not silent:
-                st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
-            return pd.DataFrame()
-        
-        creds_dict = dict(st.secrets["service_account"])
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
-        
-        result = sheet.values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!{range_name}"
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        if not values:
-            if not silent:
-                st.warning(f"⚠️ No data found in {sheet_name}!{range_name}")
-            return pd.DataFrame()
-        
-        # Handle mismatched column counts
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        df = pd.DataFrame(values[1:], columns=values[0])
-        return df
-        
-    except Exception as e:
-        if not silent:
-            st.error(f"❌ Error loading data from {sheet_name}: {str(e)}")
-        return pd.DataFrame()
+    return fetch_sheet_range(sheet_name, range_name, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent=silent,
+                             on_refresh=_clear_sheet_caches)
 
 
-def clean_numeric(value):
-    """Clean and convert a value to numeric"""
-    if pd.isna(value) or str(value).strip() == '':
-        return 0
-    cleaned = str(value).replace(',', '').replace('$', '').replace(' ', '').strip()
-    try:
-        return float(cleaned)
-    except:
-        return 0
+# Cached per spreadsheet revision in the shared sheet registry (one copy of
+# each tab for every section), so no cache of its own
+def load_google_sheets_batch(ranges, version=CACHE_VERSION, silent_sheets=(), concurrency=1):
+    """Load several tabs in one batchGet round trip (or `concurrency` parallel requests), keyed by (sheet_name, range_name)"""
+    return fetch_sheet_batch(ranges, spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), silent_sheets=silent_sheets,
+                             on_refresh=_clear_sheet_caches, concurrency=concurrency)
+
+
+def _clear_sheet_caches():
+    """Drop cached sheet data once a warm-start snapshot has been revalidated"""
+    load_qbr_data.clear()
+    load_sku_display_names.clear()
+    load_raw_inventory.clear()
+
 
 
-@st.cache_data
+
+@revision_cached(spreadsheet_id=lambda: get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), fallback_ttl=3600)
 def load_sku_display_names(version=CACHE_VERSION):
     """
     Load SKU → Description mapping from Raw_Items sheet.
@@ -3664,7 +3633,7 @@ def load_sku_display_names(version=CACHE_VERSION):
     return sku_lookup
 
 
-@st.cache_data
+@revision_cached(spreadsheet_id=lambda: get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), fallback_ttl=3600)
 def load_raw_inventory(version=CACHE_VERSION):
     """
     Load inventory data from Raw_Inventory sheet.
@@ -3680,7 +3649,7 @@ def load_raw_inventory(version=CACHE_VERSION):
     numeric_cols = ['Quantity Available', 'Quantity On Hand', 'Quantity Committed', 'Quantity On Order']
     for col in numeric_cols:
         if col in raw_inventory_df.columns:
-            raw_inventory_df[col] = raw_inventory_df[col].apply(clean_numeric)
+            raw_inventory_df[col] = coerce_numeric(raw_inventory_df[col], fill_value=0)
     
     # Normalize Item/SKU column
     item_col = None
@@ -3786,18 +3755,34 @@ def qbr_loading(message="Loading data..."):
         placeholder.empty()
 
 
-@st.cache_data(ttl=3600, show_spinner="Loading QBR data...")
+@revision_cached(spreadsheet_id=lambda: get_spreadsheet_id(DEFAULT_SPREADSHEET_ID), fallback_ttl=3600, show_spinner="Loading QBR data...")
 def load_qbr_data():
     """Load all data needed for QBR generation"""
     
+    # Every tab the QBR needs is fetched in parallel (bounded pool), so wall
+    # time tracks the slowest tab instead of the sum of all of them
+    sheet_frames = load_google_sheets_batch(
+        [
+            ("_NS_SalesOrders_Data", "A:AG"),
+            ("_NS_Invoices_Data", "A:U"),
+            ("All Reps All Pipelines", "A:Z"),
+            ("Invoice Line Item", "A:Z"),
+            ("Non-Conformance Details", "A:W"),
+            ("HB NCR", "A2:O"),
+        ],
+        version=CACHE_VERSION,
+        silent_sheets=("Invoice Line Item", "Non-Conformance Details", "HB NCR"),
+        concurrency=MAX_CONCURRENT_FETCHES,
+    )
+    
     # Load Sales Orders (A:AG to include all columns through Updated Status)
-    sales_orders_df = load_google_sheets_data("_NS_SalesOrders_Data", "A:AG", version=CACHE_VERSION)
+    sales_orders_df = sheet_frames[("_NS_SalesOrders_Data", "A:AG")]
     
     # Load Invoices (A:U to include Rep Master)
-    invoices_df = load_google_sheets_data("_NS_Invoices_Data", "A:U", version=CACHE_VERSION)
+    invoices_df = sheet_frames[("_NS_Invoices_Data", "A:U")]
     
     # Load HubSpot Deals - load wider range to ensure we get Company Name
-    deals_df = load_google_sheets_data("All Reps All Pipelines", "A:Z", version=CACHE_VERSION)
+    deals_df = sheet_frames[("All Reps All Pipelines", "A:Z")]
     
     # =========================================================================
     # PROCESS SALES ORDERS - use column names directly from sheet
@@ -3813,7 +3798,7 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in sales_orders_df.columns:
-            sales_orders_df['Amount'] = sales_orders_df['Amount'].apply(clean_numeric)
+            sales_orders_df['Amount'] = coerce_numeric(sales_orders_df['Amount'], fill_value=0)
         
         # Clean date data
         if 'Order Start Date' in sales_orders_df.columns:
@@ -3830,6 +3815,9 @@ def load_qbr_data():
         for col in ['Corrected Customer Name', 'Rep Master', 'Updated Status', 'Order Type', 'Status']:
             if col in sales_orders_df.columns:
                 sales_orders_df[col] = sales_orders_df[col].astype(str).str.strip()
+        # Rep / customer / status labels as categoricals (read-only from here on)
+        sales_orders_df = compact_dimensions(
+            sales_orders_df, columns=('Corrected Customer Name', 'Rep Master', 'Updated Status', 'Status'))
     
     # =========================================================================
     # PROCESS INVOICES - use column names directly from sheet
@@ -3845,9 +3833,9 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in invoices_df.columns:
-            invoices_df['Amount'] = invoices_df['Amount'].apply(clean_numeric)
+            invoices_df['Amount'] = coerce_numeric(invoices_df['Amount'], fill_value=0)
         if 'Amount Remaining' in invoices_df.columns:
-            invoices_df['Amount Remaining'] = invoices_df['Amount Remaining'].apply(clean_numeric)
+            invoices_df['Amount Remaining'] = coerce_numeric(invoices_df['Amount Remaining'], fill_value=0)
         
         # Clean date data
         if 'Date' in invoices_df.columns:
@@ -3859,6 +3847,7 @@ def load_qbr_data():
         for col in ['Corrected Customer', 'Rep Master', 'Status']:
             if col in invoices_df.columns:
                 invoices_df[col] = invoices_df[col].astype(str).str.strip()
+        invoices_df = compact_dimensions(invoices_df, columns=('Corrected Customer', 'Rep Master', 'Status'))
         
         # Extract SO Number from Created From
         if 'Created From' in invoices_df.columns:
@@ -3924,9 +3913,9 @@ def load_qbr_data():
         
         # Clean numeric data
         if 'Amount' in deals_df.columns:
-            deals_df['Amount'] = deals_df['Amount'].apply(clean_numeric)
+            deals_df['Amount'] = coerce_numeric(deals_df['Amount'], fill_value=0)
         if 'Probability Rev' in deals_df.columns:
-            deals_df['Probability Rev'] = deals_df['Probability Rev'].apply(clean_numeric)
+            deals_df['Probability Rev'] = coerce_numeric(deals_df['Probability Rev'], fill_value=0)
         else:
             deals_df['Probability Rev'] = deals_df.get('Amount', 0)
         
@@ -3949,7 +3938,7 @@ def load_qbr_data():
     # LOAD AND PROCESS INVOICE LINE ITEMS
     # This is the drill-down layer explaining realized revenue composition
     # =========================================================================
-    invoice_line_items_df = load_google_sheets_data("Invoice Line Item", "A:Z", version=CACHE_VERSION, silent=True)
+    invoice_line_items_df = sheet_frames[("Invoice Line Item", "A:Z")]
     
     if not invoice_line_items_df.empty:
         # Remove duplicate columns
@@ -3958,11 +3947,11 @@ def load_qbr_data():
         
         # Clean numeric data - Amount is line-level revenue
         if 'Amount' in invoice_line_items_df.columns:
-            invoice_line_items_df['Amount'] = invoice_line_items_df['Amount'].apply(clean_numeric)
+            invoice_line_items_df['Amount'] = coerce_numeric(invoice_line_items_df['Amount'], fill_value=0)
         
         # Quantity is unit-level volume
         if 'Quantity' in invoice_line_items_df.columns:
-            invoice_line_items_df['Quantity'] = invoice_line_items_df['Quantity'].apply(clean_numeric)
+            invoice_line_items_df['Quantity'] = coerce_numeric(invoice_line_items_df['Quantity'], fill_value=0)
         
         # Clean date data
         if 'Date' in invoice_line_items_df.columns:
@@ -3987,7 +3976,7 @@ def load_qbr_data():
     
     # --- NetSuite NCR Data (Nov 2024+) ---
     ncr_df = pd.DataFrame()  # Initialize as empty
-    ncr_raw = load_google_sheets_data("Non-Conformance Details", "A:W", version=CACHE_VERSION, silent=True)
+    ncr_raw = sheet_frames[("Non-Conformance Details", "A:W")]
     
     if not ncr_raw.empty:
         ncr_df = ncr_raw.copy()
@@ -4006,13 +3995,13 @@ def load_qbr_data():
         
         # Clean numeric data - Total Quantity Affected
         if 'Total Quantity Affected' in ncr_df.columns:
-            ncr_df['Total Quantity Affected'] = ncr_df['Total Quantity Affected'].apply(clean_numeric)
+            ncr_df['Total Quantity Affected'] = coerce_numeric(ncr_df['Total Quantity Affected'], fill_value=0)
         
         # Clean Cost fields if present
         if 'Cost of Rework' in ncr_df.columns:
-            ncr_df['Cost of Rework'] = ncr_df['Cost of Rework'].apply(clean_numeric)
+            ncr_df['Cost of Rework'] = coerce_numeric(ncr_df['Cost of Rework'], fill_value=0)
         if 'Cost Avoided' in ncr_df.columns:
-            ncr_df['Cost Avoided'] = ncr_df['Cost Avoided'].apply(clean_numeric)
+            ncr_df['Cost Avoided'] = coerce_numeric(ncr_df['Cost Avoided'], fill_value=0)
         
         # Clean date data
         if 'Date Submitted' in ncr_df.columns:
@@ -4028,7 +4017,7 @@ def load_qbr_data():
     
     # --- HubSpot NCR Data (Historical, pre-Nov 2024) ---
     hb_ncr_df = pd.DataFrame()  # Initialize as empty
-    hb_ncr_raw = load_google_sheets_data("HB NCR", "A2:O", version=CACHE_VERSION, silent=True)
+    hb_ncr_raw = sheet_frames[("HB NCR", "A2:O")]
     
     if not hb_ncr_raw.empty:
         hb_ncr_df = hb_ncr_raw.copy()
@@ -4490,7 +4479,7 @@ def render_pending_orders_section(customer_orders):
     
     # Breakdown by Updated Status
     st.markdown("**Breakdown by Status:**")
-    status_summary = pending_orders.groupby('Updated Status').agg({
+    status_summary = pending_orders.groupby('Updated Status', observed=True).agg({
         'Amount': ['sum', 'count']
     }).round(0)
     status_summary.columns = ['Total Value', 'Count']
@@ -6743,7 +6732,7 @@ def render_ncr_section(customer_ncrs, customer_orders, customer_name):
 # CRM-STYLE CUSTOMER DRILL-DOWN HELPERS
 # =============================================================================
 
-@st.cache_data(ttl=1800, show_spinner=False)
+@memory_cached(ttl=1800)
 def build_rep_company_roster(rep_name, sales_orders_df, invoices_df, deals_df):
     """Build a roster of companies for a rep with key metrics per company.
 
@@ -7439,9 +7428,9 @@ def render_sku_order_history_tool():
     if 'Date' in invoice_line_items_df.columns:
         invoice_line_items_df['Date'] = pd.to_datetime(invoice_line_items_df['Date'], errors='coerce')
     if 'Quantity' in invoice_line_items_df.columns:
-        invoice_line_items_df['Quantity'] = invoice_line_items_df['Quantity'].apply(clean_numeric)
+        invoice_line_items_df['Quantity'] = coerce_numeric(invoice_line_items_df['Quantity'], fill_value=0)
     if 'Amount' in invoice_line_items_df.columns:
-        invoice_line_items_df['Amount'] = invoice_line_items_df['Amount'].apply(clean_numeric)
+        invoice_line_items_df['Amount'] = coerce_numeric(invoice_line_items_df['Amount'], fill_value=0)
     
     # Get customer column
     customer_col = 'Correct Customer' if 'Correct Customer' in invoice_line_items_df.columns else 'Customer'
@@ -9733,50 +9722,16 @@ def render_qbr_generator_content():
 
 # ========== PRODUCT FORECASTING TOOL ==========
 
-@st.cache_data(ttl=3600, show_spinner="Loading deals line items...")
+# Cached per spreadsheet revision in the shared sheet registry (failed
+# fetches are not kept, so a 503 no longer sticks for an hour)
 def load_deals_line_items():
     """Load Deals Line Item data from Google Sheets - headers in Row 2"""
-    try:
-        spreadsheet_id = st.secrets.get("SPREADSHEET_ID", DEFAULT_SPREADSHEET_ID)
-        
-        if "service_account" not in st.secrets:
-            st.error("❌ Missing Google Cloud credentials in Streamlit secrets")
-            return pd.DataFrame()
-        
-        creds_dict = dict(st.secrets["service_account"])
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES
-        )
-        
-        service = build('sheets', 'v4', credentials=creds)
-        sheet = service.spreadsheets()
-        
-        # Load from Row 2 onwards (A2:S means start at row 2)
-        result = sheet.values().get(
-            spreadsheetId=spreadsheet_id,
-            range="Deals Line Item!A2:S"
-        ).execute()
-        
-        values = result.get('values', [])
-        
-        if not values:
-            st.warning("⚠️ No data found in Deals Line Item tab")
-            return pd.DataFrame()
-        
-        # Handle mismatched column counts
-        if len(values) > 1:
-            max_cols = max(len(row) for row in values)
-            for row in values:
-                while len(row) < max_cols:
-                    row.append('')
-        
-        # First row is headers (which was Row 2 in original sheet)
-        df = pd.DataFrame(values[1:], columns=values[0])
-        return df
-        
-    except Exception as e:
-        st.error(f"❌ Error loading Deals Line Item data: {str(e)}")
-        return pd.DataFrame()
+    # Load from Row 2 onwards (A2:S means start at row 2)
+    # First row returned is headers (which was Row 2 in original sheet)
+    return fetch_sheet_range(
+        "Deals Line Item", "A2:S",
+        spreadsheet_id=get_spreadsheet_id(DEFAULT_SPREADSHEET_ID)
+    )
 
 
 def process_deals_line_items(df):
@@ -9790,9 +9745,9 @@ def process_deals_line_items(df):
     
     # Clean numeric data
     if 'Amount' in df.columns:
-        df['Amount'] = df['Amount'].apply(clean_numeric)
+        df['Amount'] = coerce_numeric(df['Amount'], fill_value=0)
     if 'Quantity' in df.columns:
-        df['Quantity'] = df['Quantity'].apply(clean_numeric)
+        df['Quantity'] = coerce_numeric(df['Quantity'], fill_value=0)
     
     # Clean date data
     if 'Create Date' in df.columns:
@@ -12391,9 +12346,9 @@ def render_period_comparison_tool():
     if 'Date' in invoice_line_items_df.columns:
         invoice_line_items_df['Date'] = pd.to_datetime(invoice_line_items_df['Date'], errors='coerce')
     if 'Amount' in invoice_line_items_df.columns:
-        invoice_line_items_df['Amount'] = invoice_line_items_df['Amount'].apply(clean_numeric)
+        invoice_line_items_df['Amount'] = coerce_numeric(invoice_line_items_df['Amount'], fill_value=0)
     if 'Quantity' in invoice_line_items_df.columns:
-        invoice_line_items_df['Quantity'] = invoice_line_items_df['Quantity'].apply(clean_numeric)
+        invoice_line_items_df['Quantity'] = coerce_numeric(invoice_line_items_df['Quantity'], fill_value=0)
     
     # Get customer column
     customer_col = 'Correct Customer' if 'Correct Customer' in invoice_line_items_df.columns else 'Customer'
@@ -12854,13 +12809,13 @@ def render_product_forecasting_tool():
             
             # Clean numeric columns
             if 'Amount' in sales_order_line_items_df.columns:
-                sales_order_line_items_df['Amount'] = sales_order_line_items_df['Amount'].apply(clean_numeric)
+                sales_order_line_items_df['Amount'] = coerce_numeric(sales_order_line_items_df['Amount'], fill_value=0)
             if 'Item Rate' in sales_order_line_items_df.columns:
-                sales_order_line_items_df['Item Rate'] = sales_order_line_items_df['Item Rate'].apply(clean_numeric)
+                sales_order_line_items_df['Item Rate'] = coerce_numeric(sales_order_line_items_df['Item Rate'], fill_value=0)
             if 'Quantity Ordered' in sales_order_line_items_df.columns:
-                sales_order_line_items_df['Quantity Ordered'] = sales_order_line_items_df['Quantity Ordered'].apply(clean_numeric)
+                sales_order_line_items_df['Quantity Ordered'] = coerce_numeric(sales_order_line_items_df['Quantity Ordered'], fill_value=0)
             if 'Quantity Fulfilled' in sales_order_line_items_df.columns:
-                sales_order_line_items_df['Quantity Fulfilled'] = sales_order_line_items_df['Quantity Fulfilled'].apply(clean_numeric)
+                sales_order_line_items_df['Quantity Fulfilled'] = coerce_numeric(sales_order_line_items_df['Quantity Fulfilled'], fill_value=0)
             
             # Calculate quantity remaining
             if 'Quantity Ordered' in sales_order_line_items_df.columns and 'Quantity Fulfilled' in sales_order_line_items_df.columns:
@@ -12904,11 +12859,11 @@ def render_product_forecasting_tool():
             
             # Clean numeric data - Amount is line-level revenue
             if 'Amount' in invoice_line_items_df.columns:
-                invoice_line_items_df['Amount'] = invoice_line_items_df['Amount'].apply(clean_numeric)
+                invoice_line_items_df['Amount'] = coerce_numeric(invoice_line_items_df['Amount'], fill_value=0)
             
             # Quantity is unit-level volume
             if 'Quantity' in invoice_line_items_df.columns:
-                invoice_line_items_df['Quantity'] = invoice_line_items_df['Quantity'].apply(clean_numeric)
+                invoice_line_items_df['Quantity'] = coerce_numeric(invoice_line_items_df['Quantity'], fill_value=0)
             
             # Clean date data
             if 'Date' in invoice_line_items_df.columns:
@@ -0,0 +1,1450 @@
+"""
+Unit Tests for the shared Google Sheets data layer
+Uses an in-memory fake of the Sheets v4 service, no network or credentials
+
+Author: Xander @ Calyx Containers
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import re
+import threading
+import time
+
+from src import data_cache, sheets_ingest
+from src.cache_warmer import CacheWarmer
+from src import memory_cache as memory_cache_module
+from src.memory_cache import MemoryCache, estimate_size, get_memory_cache, memory_cached
+from src.shared_cache import CacheBackend, SQLiteBackend
+from src.sheets_client import GoogleClientPool
+from src.request_scheduler import RequestScheduler, TokenBucket
+from src.sheets_replay import Recorder, ReplaySession, SheetsCassette
+from src.synthetic_data import SYNTHETIC_TABS, SyntheticWorkbook
+from src.snapshot_store import SnapshotStore, get_snapshot_store
+from src.sheet_registry import SheetRegistry, column_count, column_number, fetch_range, project_frame
+from src.sheets_ingest import (
+    a1_range,
+    exact_range,
+    values_to_dataframe,
+    fetch_sheet_batch,
+    fetch_sheet_range,
+    run_concurrently,
+    iter_sheet_blocks,
+    BlockAggregator
+)
+from src import sheet_schemas
+from src.sheet_schemas import (
+    apply_schema, clean_numeric, coerce_numeric, coerce_percent, compact_dimensions, get_schema, resolve_column_types
+)
+
+
+# ============================================================================
+# Fake Sheets Service
+# ============================================================================
+
+class FakeRequest:
+    """Mimics a googleapiclient HttpRequest."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, **kwargs):
+        return self._fn()
+
+
+class FakeSheetsService:
+    """Minimal stand-in for build('sheets', 'v4') backed by a dict of tabs."""
+
+    def __init__(self, tabs, latency=0.0):
+        self.tabs = tabs
+        self.latency = latency
+        self.calls = []
+        self.layout_calls = 0
+        self.failures = []  # exceptions raised by the next value requests
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _lookup(self, a1):
+        time.sleep(self.latency)
+        sheet_name, _, cells = a1.rpartition('!')
+        sheet_name = sheet_name.strip("'").replace("''", "'")
+        if sheet_name not in self.tabs:
+            raise Exception(f"Unable to parse range: {a1}")
+
+        if self.failures:
+            raise self.failures.pop(0)
+
+        rows = [list(row) for row in self.tabs[sheet_name]]
+        bounds = re.match(r'^([A-Z]+)(\d*):([A-Z]+)(\d*)$', cells)
+        if bounds:
+            first_col, first_row, last_col, last_row = bounds.groups()
+            rows = [row[column_number(first_col) - 1:column_number(last_col)]
+                    for row in rows[int(first_row or 1) - 1:int(last_row) if last_row else None]]
+        # Like the API: trailing empty cells and rows are omitted
+        rows = [row[:max((i + 1 for i, v in enumerate(row) if v != ''), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return {'range': a1, 'values': rows}
+
+    def _layout(self):
+        self.layout_calls += 1
+        return {'sheets': [
+            {'properties': {'title': title, 'gridProperties': {
+                'rowCount': len(rows) + 100,
+                'columnCount': max(len(row) for row in rows) + 2,
+            }}}
+            for title, rows in self.tabs.items()
+        ]}
+
+    def get(self, spreadsheetId, range=None, **kwargs):
+        if range is None:
+            # spreadsheets().get: tab metadata only
+            return FakeRequest(self._layout)
+        self.calls.append(('get', [range]))
+        return FakeRequest(lambda: self._lookup(range))
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        self.calls.append(('batchGet', list(ranges)))
+        return FakeRequest(lambda: {'valueRanges': [self._lookup(r) for r in ranges]})
+
+
+@pytest.fixture
+def sheet_tabs():
+    """Ragged tabs the way the Sheets API returns them (trailing blanks trimmed)."""
+    return {
+        '_NS_Invoices_Data': [
+            ['Document Number', 'Status', 'Amount'],
+            ['INV-1', 'Paid', '$1,200.00'],
+            ['INV-2', 'Open'],
+        ],
+        'Dashboard Info': [
+            ['Rep Name', 'Quota'],
+            ['Jake Lynch', '100'],
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(monkeypatch, tmp_path):
+    """Keep snapshots out of the app directory."""
+    monkeypatch.setenv('CALYX_SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    return tmp_path / 'snapshots'
+
+
+@pytest.fixture(autouse=True)
+def sheet_registry(monkeypatch):
+    """Fresh in-process registry per test."""
+    registry = SheetRegistry()
+    monkeypatch.setattr(sheets_ingest, 'get_sheet_registry', lambda: registry)
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def memory_cache():
+    """Start every test with an empty memory cache."""
+    get_memory_cache().clear()
+    yield get_memory_cache()
+    get_memory_cache().clear()
+
+
+@pytest.fixture
+def fake_service(monkeypatch, sheet_tabs):
+    service = FakeSheetsService(sheet_tabs)
+    monkeypatch.setattr(sheets_ingest, 'get_sheets_service', lambda: service)
+    return service
+
+
+# ============================================================================
+# Sheets Ingestion Tests
+# ============================================================================
+
+class TestSheetsIngest:
+    """Tests for sheets_ingest module."""
+
+    def test_a1_range_quotes_sheet_name(self):
+        assert a1_range('Invoice Line Item', 'A:Z') == "'Invoice Line Item'!A:Z"
+        assert a1_range("Rep's Tab", 'A1:B2') == "'Rep''s Tab'!A1:B2"
+
+    def test_values_to_dataframe_pads_ragged_rows(self):
+        df = values_to_dataframe([['A', 'B'], ['1', '2', '3'], ['4']])
+
+        assert df.shape == (2, 3)
+        assert df.iloc[1].tolist() == ['4', '', '']
+
+    def test_values_to_dataframe_fit_to_header(self):
+        df = values_to_dataframe([['A', 'B'], ['1', '2', '3'], ['4']], fit_to_header=True)
+
+        assert df.columns.tolist() == ['A', 'B']
+        assert df.iloc[0].tolist() == ['1', '2']
+        assert df.iloc[1].tolist() == ['4', '']
+
+    def test_values_to_dataframe_empty(self):
+        assert values_to_dataframe([]).empty
+
+    def test_fetch_sheet_batch_single_round_trip(self, fake_service):
+        frames = fetch_sheet_batch(
+            [('_NS_Invoices_Data', 'A:Y'), ('Dashboard Info', 'A:B')],
+            spreadsheet_id='test'
+        )
+
+        assert len(fake_service.calls) == 1
+        assert fake_service.calls[0][0] == 'batchGet'
+        assert len(frames[('_NS_Invoices_Data', 'A:Y')]) == 2
+        assert frames[('Dashboard Info', 'A:B')]['Rep Name'].tolist() == ['Jake Lynch']
+
+    def test_fetch_sheet_batch_isolates_bad_range(self, fake_service):
+        frames = fetch_sheet_batch(
+            [('_NS_Invoices_Data', 'A:Y'), ('Missing Tab', 'A:B')],
+            spreadsheet_id='test',
+            silent_sheets=('Missing Tab',)
+        )
+
+        assert not frames[('_NS_Invoices_Data', 'A:Y')].empty
+        assert frames[('Missing Tab', 'A:B')].empty
+
+    def test_fetch_sheet_batch_concurrent_tracks_slowest_tab(self, fake_service, sheet_tabs):
+        for i in range(4):
+            sheet_tabs[f'Tab {i}'] = [['A'], [str(i)]]
+        fake_service.latency = 0.2
+
+        start = time.perf_counter()
+        frames = fetch_sheet_batch(
+            [(f'Tab {i}', 'A:A') for i in range(4)],
+            spreadsheet_id='test',
+            concurrency=4
+        )
+        elapsed = time.perf_counter() - start
+
+        assert [frames[(f'Tab {i}', 'A:A')]['A'].tolist() for i in range(4)] == [['0'], ['1'], ['2'], ['3']]
+        assert len(fake_service.calls) == 4
+        assert elapsed < 0.6
+
+    def test_exact_range(self):
+        assert exact_range('A:AG', 5000, 20) == 'A1:T5000'
+        assert exact_range('A2:AB', 100, 40) == 'A2:AB100'
+        assert exact_range('A1:S80', 50, 10) == 'A1:J50'
+        assert exact_range('C:D', 10, 2) is None
+        assert exact_range('Sheet1', 10, 2) == 'Sheet1'
+
+    def test_requests_exact_ranges_from_layout(self, fake_service):
+        fetch_sheet_batch([('_NS_Invoices_Data', 'A:Y')], spreadsheet_id='test')
+        fetch_sheet_batch([('Dashboard Info', 'A:B')], spreadsheet_id='test')
+
+        assert fake_service.calls[0] == ('batchGet', ["'_NS_Invoices_Data'!A1:E103"])
+        assert fake_service.calls[1] == ('batchGet', ["'Dashboard Info'!A1:C102"])
+        assert fake_service.layout_calls == 1
+
+    def test_missing_tab_skipped_before_batch(self, fake_service):
+        frames = fetch_sheet_batch(
+            [('_NS_Invoices_Data', 'A:Y'), ('Missing Tab', 'A:B')],
+            spreadsheet_id='test',
+            silent_sheets=('Missing Tab',)
+        )
+
+        assert fake_service.calls == [('batchGet', ["'_NS_Invoices_Data'!A1:E103"])]
+        assert frames[('Missing Tab', 'A:B')].empty
+
+    def test_run_concurrently_keeps_task_order(self):
+        results = run_concurrently({
+            'slow': lambda: time.sleep(0.1) or 'slow',
+            'fast': lambda: 'fast',
+        })
+
+        assert list(results.items()) == [('slow', 'slow'), ('fast', 'fast')]
+
+
+# ============================================================================
+# Streaming Tests
+# ============================================================================
+
+class TestStreaming:
+    """Tests for block-paged loading of large tabs."""
+
+    @pytest.fixture
+    def big_tab(self, sheet_tabs, monkeypatch):
+        monkeypatch.setattr(sheets_ingest, 'STREAM_MIN_ROWS', 5)
+        monkeypatch.setattr(sheets_ingest, 'STREAM_BLOCK_ROWS', 4)
+        rows = [['Date', 'Rep', 'Amount', '']]
+        for i in range(13):
+            row = [f"2026-0{1 + i % 3}-15", ['Jake', 'Dave'][i % 2], f"${i},000.00"]
+            rows.append(row + ['note'] if i == 6 else row)
+        sheet_tabs['Invoice Line Item'] = rows
+        return rows
+
+    def test_blocks_match_single_fetch(self, fake_service, big_tab):
+        key = ('Invoice Line Item', 'A:Z')
+        frame = fetch_sheet_batch([key], spreadsheet_id='test')[key]
+        expected = values_to_dataframe(big_tab)
+
+        assert frame.columns.tolist() == expected.columns.tolist()
+        assert frame.values.tolist() == expected.values.tolist()
+        assert len(fake_service.calls) == 29  # 4-row blocks up to the grid's 114 rows
+
+    def test_blank_rows_between_blocks_are_kept(self, fake_service, big_tab, monkeypatch):
+        # Rows 7-8 end a block blank, rows 9-12 are a fully blank block
+        for i in range(6, 12):
+            big_tab[i] = ['', '', '', '']
+        key = ('Invoice Line Item', 'A:Z')
+        streamed = sheets_ingest._fetch_batch_live([key], 'test', True, (), False)[key]
+        monkeypatch.setattr(sheets_ingest, 'STREAM_MIN_ROWS', 10 ** 6)
+        single = sheets_ingest._fetch_batch_live([key], 'test', True, (), False)[key]
+
+        assert streamed.shape == single.shape == (13, 3)
+        assert streamed.columns.tolist() == single.columns.tolist()
+        assert streamed.values.tolist() == single.values.tolist()
+        assert streamed.iloc[5:11].eq('').all().all()
+
+    def test_iter_blocks_are_typed_and_bounded(self, fake_service, big_tab):
+        blocks = list(iter_sheet_blocks('Invoice Line Item', 'A:C', spreadsheet_id='test'))
+
+        assert [len(block) for block in blocks] == [3, 4, 4, 2]
+        assert blocks[0]['Amount'].tolist() == [0.0, 1000.0, 2000.0]
+
+    def test_block_aggregator_monthly_totals(self, fake_service, big_tab):
+        agg = BlockAggregator(['Rep'], 'Amount', date_column='Date')
+        for block in iter_sheet_blocks('Invoice Line Item', 'A:C', spreadsheet_id='test', typed=False):
+            agg.add(block)
+
+        result = agg.result()
+        jan = result[(result['Period'] == pd.Period('2026-01', 'M')) & (result['Rep'] == 'Jake')]
+        assert agg.rows == 13
+        assert jan['Amount'].iloc[0] == sum(i * 1000 for i in range(13) if i % 3 == 0 and i % 2 == 0)
+        assert result['Amount'].sum() == sum(i * 1000 for i in range(13))
+
+
+# ============================================================================
+# Delta Sync Tests
+# ============================================================================
+
+class TestDeltaSync:
+    """Tests for incremental sync of the NetSuite export tabs."""
+
+    KEY = ('_NS_Invoices_Data', 'A:Y')
+
+    @pytest.fixture
+    def synced(self, fake_service, sheet_registry, monkeypatch):
+        """Initial full load, then a fresh registry so the next load hits the API."""
+        monkeypatch.setattr(sheets_ingest, 'DELTA_TAIL_ROWS', 1)
+        fetch_sheet_batch([self.KEY], spreadsheet_id='test')
+        sheet_registry.clear()
+        fake_service.calls.clear()
+        return fake_service
+
+    def reload(self):
+        return fetch_sheet_batch([self.KEY], spreadsheet_id='test')[self.KEY]
+
+    def test_reads_only_tail_and_new_rows(self, synced, sheet_tabs):
+        sheet_tabs['_NS_Invoices_Data'][2] = ['INV-2', 'Paid', '$40.00']
+        sheet_tabs['_NS_Invoices_Data'].append(['INV-3', 'Open', '$5.00'])
+
+        frame = self.reload()
+
+        assert synced.calls == [('batchGet', ["'_NS_Invoices_Data'!A1:E1", "'_NS_Invoices_Data'!A3:E104"])]
+        assert frame.values.tolist() == values_to_dataframe(sheet_tabs['_NS_Invoices_Data']).values.tolist()
+        assert frame.attrs['sync']['rows'] == 3
+
+    def test_blank_interior_row_keeps_sheet_rows(self, fake_service, sheet_registry, sheet_tabs, monkeypatch):
+        rows = sheet_tabs['_NS_Invoices_Data']
+        rows.insert(2, [])
+        monkeypatch.setattr(sheets_ingest, 'DELTA_TAIL_ROWS', 2)
+        assert fetch_sheet_batch([self.KEY], spreadsheet_id='test')[self.KEY].attrs['sync']['last_row'] == 4
+        sheet_registry.clear()
+        fake_service.calls.clear()
+
+        rows.append(['INV-3', 'Open', '$5.00'])
+        frame = self.reload()
+
+        assert fake_service.calls == [('batchGet', ["'_NS_Invoices_Data'!A1:E1", "'_NS_Invoices_Data'!A3:E105"])]
+        assert frame.values.tolist() == values_to_dataframe(rows).values.tolist()
+        assert frame.attrs['sync']['last_row'] == 5
+
+    @pytest.mark.parametrize('change', ['insert_above_tail', 'header', 'full_sync_due'])
+    def test_structural_change_reloads_in_full(self, synced, sheet_tabs, monkeypatch, change):
+        rows = sheet_tabs['_NS_Invoices_Data']
+        if change == 'insert_above_tail':
+            rows.insert(1, ['INV-0', 'Open', '$1.00'])
+        elif change == 'header':
+            rows[0] = ['Document Number', 'Status', 'Amount (Net)']
+        else:
+            monkeypatch.setattr(sheets_ingest, 'DELTA_FULL_SYNC_HOURS', 0)
+
+        frame = self.reload()
+
+        assert synced.calls[-1] == ('batchGet', [f"'_NS_Invoices_Data'!A1:E{len(rows) + 100}"])
+        assert frame.columns.tolist() == rows[0]
+        assert frame.values.tolist() == values_to_dataframe(rows).values.tolist()
+
+
+# ============================================================================
+# Snapshot Store Tests
+# ============================================================================
+
+class TestSnapshotStore:
+    """Tests for snapshot_store module."""
+
+    def test_round_trip_keeps_duplicate_headers(self, tmp_path):
+        store = SnapshotStore(tmp_path)
+        key = ('sheet-id', 'Deals', 'A:X')
+        df = pd.DataFrame([['1', '', 'x']], columns=['Amount', '', 'Amount'])
+
+        store.write(key, df)
+        snapshot = store.read(key)
+
+        assert snapshot.data.columns.tolist() == ['Amount', '', 'Amount']
+        assert snapshot.data.values.tolist() == [['1', '', 'x']]
+        assert store.read(('sheet-id', 'Deals', 'A:Z')) is None
+
+    def test_warm_start_serves_snapshot_then_revalidates(self, fake_service, sheet_tabs, sheet_registry):
+        key = ('_NS_Invoices_Data', 'A:Y')
+        fetch_sheet_batch([key], spreadsheet_id='test')
+
+        # Simulate a restart: new rows upstream, fresh in-process state
+        get_snapshot_store()._warmed.clear()
+        sheet_registry.clear()
+        sheet_tabs['_NS_Invoices_Data'].append(['INV-3', 'Open', '$5.00'])
+        refreshed = threading.Event()
+
+        frames = fetch_sheet_batch([key], spreadsheet_id='test', on_refresh=refreshed.set)
+
+        assert len(frames[key]) == 2
+        assert refreshed.wait(timeout=5)
+        assert len(fetch_sheet_batch([key], spreadsheet_id='test')[key]) == 3
+
+
+# ============================================================================
+# Sheet Registry Tests
+# ============================================================================
+
+def api_values(values, columns):
+    """What the Sheets API returns for the first `columns` columns of a grid."""
+    rows = []
+    for row in values:
+        row = list(row[:columns])
+        while row and row[-1] == '':
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class TestSheetRegistry:
+    """Tests for sheet_registry and registry-backed fetching."""
+
+    GRID = [
+        ['Doc', 'Status', '', 'Amount', 'Extra'],
+        ['INV-1', 'Paid', '', '$5.00'],
+        ['INV-2', '', '', '', 'x'],
+        ['INV-3'],
+        ['', '', '', '', 'y'],
+    ]
+
+    def test_column_count(self):
+        assert column_count('A:Y') == 25
+        assert column_count('A:AG') == 33
+        assert column_count('A2:O') is None
+
+    def test_fetch_range_widens_shared_tabs_only(self):
+        assert fetch_range('_NS_Invoices_Data', 'A:U') == 'A:Y'
+        assert fetch_range('_NS_Invoices_Data', 'A:Y') == 'A:Y'
+        assert fetch_range('HB NCR', 'A2:O') == 'A2:O'
+        assert fetch_range('Some Tab', 'A:C') == 'A:C'
+
+    @pytest.mark.parametrize('columns', [1, 2, 3, 4])
+    @pytest.mark.parametrize('fit', [False, True])
+    def test_projection_matches_direct_fetch(self, columns, fit):
+        grid = values_to_dataframe(api_values(self.GRID, 5))
+        range_name = f"A:{chr(ord('A') + columns - 1)}"
+
+        projected = project_frame(grid, range_name, 'A:E', fit_to_header=fit)
+        direct = values_to_dataframe(api_values(self.GRID, columns), fit_to_header=fit)
+
+        assert projected.columns.tolist() == direct.columns.tolist()
+        assert projected.values.tolist() == direct.values.tolist()
+
+    def test_budget_evicts_least_recently_read(self):
+        grid = pd.DataFrame({'Doc': [f'INV-{i}' for i in range(100)]})
+        size = int(grid.memory_usage(deep=True).sum())
+        registry = SheetRegistry(budget_bytes=2 * size)
+        keys = [('test', tab, 'A:Z') for tab in ('Deals', 'Orders', 'Lines')]
+
+        registry.put(keys[0], 't1', grid.copy())
+        registry.put(keys[1], 't1', grid.copy())
+        registry.get(keys[0])
+        registry.put(keys[2], 't1', grid.copy())
+
+        assert registry.get(keys[1]) is None
+        assert registry.get(keys[0]) is not None and registry.get(keys[2]) is not None
+        assert registry.stats() == {'grids': 2, 'bytes': 2 * size, 'budget_bytes': 2 * size, 'evictions': 1}
+
+        # A grid bigger than the whole budget is still kept (alone)
+        registry.put(keys[1], 't1', pd.concat([grid] * 3, ignore_index=True))
+        assert registry.stats()['grids'] == 1 and registry.get(keys[1]) is not None
+
+    def test_sections_share_one_download(self, fake_service):
+        narrow = fetch_sheet_batch([('_NS_Invoices_Data', 'A:U')], spreadsheet_id='test')
+        wide = fetch_sheet_batch([('_NS_Invoices_Data', 'A:Y')], spreadsheet_id='test', fit_to_header=True)
+
+        assert fake_service.calls == [('batchGet', ["'_NS_Invoices_Data'!A1:E103"])]
+        assert narrow[('_NS_Invoices_Data', 'A:U')].shape == (2, 3)
+        assert wide[('_NS_Invoices_Data', 'A:Y')].shape == (2, 3)
+
+    def test_caller_edits_do_not_leak(self, fake_service):
+        key = ('_NS_Invoices_Data', 'A:Y')
+        first = fetch_sheet_batch([key], spreadsheet_id='test')[key]
+        first['Amount'] = 0
+        first.columns = ['a', 'b', 'c']
+
+        again = fetch_sheet_batch([key], spreadsheet_id='test')[key]
+        assert again.columns.tolist() == ['Document Number', 'Status', 'Amount']
+        assert again['Amount'].tolist() == ['$1,200.00', '']
+
+    def test_concurrent_sections_share_in_flight_load(self, fake_service):
+        fake_service.latency = 0.2
+        results = run_concurrently({
+            'q2': lambda: fetch_sheet_batch([('_NS_Invoices_Data', 'A:Y')], spreadsheet_id='test'),
+            'qbr': lambda: fetch_sheet_batch([('_NS_Invoices_Data', 'A:U')], spreadsheet_id='test'),
+        })
+
+        assert len(fake_service.calls) == 1
+        assert len(results['qbr'][('_NS_Invoices_Data', 'A:U')]) == 2
+
+
+# ============================================================================
+# Revision Cache Tests
+# ============================================================================
+
+class TestRevisionCache:
+    """Tests for data_cache.revision_cached."""
+
+    @pytest.fixture
+    def revision(self, monkeypatch):
+        state = {'revision': '1@2026-01-05T00:00:00Z'}
+        monkeypatch.setattr(data_cache, 'PROBE_INTERVAL', 0)
+        monkeypatch.setattr(data_cache, 'probe_spreadsheet_revision', lambda sid: state['revision'])
+        return state
+
+    def test_slow_probe_only_blocks_its_spreadsheet(self, monkeypatch):
+        monkeypatch.setattr(data_cache, 'PROBE_INTERVAL', 30)
+        release = threading.Event()
+        probes = []
+
+        def probe(sid):
+            probes.append(sid)
+            if sid == 'probe-slow':
+                release.wait(5)
+            return f'1@{sid}'
+
+        monkeypatch.setattr(data_cache, 'probe_spreadsheet_revision', probe)
+        slow = [threading.Thread(target=data_cache.get_spreadsheet_revision, args=('probe-slow',))
+                for _ in range(3)]
+        for thread in slow:
+            thread.start()
+        assert data_cache.get_spreadsheet_revision('probe-fast') == '1@probe-fast'
+        release.set()
+        for thread in slow:
+            thread.join()
+
+        assert probes.count('probe-slow') == 1
+        assert data_cache.get_spreadsheet_revision('probe-slow') == '1@probe-slow'
+
+    def test_failing_inner_loader_keeps_outer_uncached(self, revision):
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-h')
+        def load_good():
+            return pd.DataFrame({'a': [1]})
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-h')
+        def load_bad():
+            data_cache.report_fetch_failure('Deals: HTTP 500')
+            return None
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-h')
+        def load_all():
+            calls.append(1)
+            return run_concurrently({'good': load_good, 'bad': load_bad})
+
+        assert load_all()['bad'] is None
+        load_all()
+        assert len(calls) == 2
+
+    def test_reloads_only_when_spreadsheet_changes(self, revision):
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-a')
+        def load_tab(name):
+            calls.append(name)
+            return pd.DataFrame({'tab': [name]})
+
+        load_tab('Deals')
+        load_tab('Deals')
+        assert calls == ['Deals']
+
+        revision['revision'] = '2@2026-01-05T00:05:00Z'
+        load_tab('Deals')
+        assert calls == ['Deals', 'Deals']
+
+    def test_stale_while_revalidate_serves_previous_value(self, revision):
+        release = threading.Event()
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-b', stale_while_revalidate=True)
+        def load_orders():
+            calls.append(revision['revision'])
+            if len(calls) > 1:
+                release.wait(timeout=5)
+            return pd.DataFrame({'rev': [revision['revision']]})
+
+        first = load_orders()
+        revision['revision'] = '2@2026-01-05T00:05:00Z'
+
+        # Old value comes back immediately while the refresh is blocked
+        assert load_orders()['rev'].tolist() == first['rev'].tolist()
+        release.set()
+
+        for _ in range(50):
+            if load_orders()['rev'].tolist() == ['2@2026-01-05T00:05:00Z']:
+                break
+            threading.Event().wait(0.1)
+        assert load_orders()['rev'].tolist() == ['2@2026-01-05T00:05:00Z']
+        assert len(calls) == 2
+
+    def test_evicted_stale_value_loads_in_caller(self, revision, memory_cache):
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-f', stale_while_revalidate=True)
+        def load_orders():
+            calls.append(revision['revision'])
+            return pd.DataFrame({'rev': [revision['revision']]})
+
+        load_orders()
+        memory_cache.clear()
+        revision['revision'] = '2@2026-01-05T00:05:00Z'
+
+        assert load_orders()['rev'].tolist() == ['2@2026-01-05T00:05:00Z']
+        assert load_orders()['rev'].tolist() == ['2@2026-01-05T00:05:00Z']
+        assert calls == ['1@2026-01-05T00:00:00Z', '2@2026-01-05T00:05:00Z']
+
+    def test_failed_refresh_backs_off(self, revision, monkeypatch):
+        monkeypatch.setattr(data_cache, 'REFRESH_BACKOFF', 0.5)
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-g', stale_while_revalidate=True)
+        def load_orders():
+            calls.append(revision['revision'])
+            # Every load of the new revision comes back empty (not cached)
+            return pd.DataFrame({'rev': [revision['revision']]}) if len(calls) == 1 else pd.DataFrame()
+
+        def settle():
+            for _ in range(50):
+                if not any(t.name == 'refresh-load_orders' for t in threading.enumerate()):
+                    return
+                threading.Event().wait(0.05)
+
+        first = load_orders()
+        revision['revision'] = '2@2026-01-05T00:05:00Z'
+        load_orders()
+        settle()
+        for _ in range(5):
+            assert load_orders()['rev'].tolist() == first['rev'].tolist()
+        settle()
+        assert len(calls) == 2
+
+        threading.Event().wait(0.6)
+        load_orders()
+        settle()
+        assert len(calls) == 3
+
+    def test_single_flight_shares_one_call(self):
+        flight = data_cache.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return 'frame'
+
+        leader = threading.Thread(target=lambda: results.append(flight.do('deals', slow)))
+        leader.start()
+        started.wait(timeout=5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do('deals', slow)))
+                     for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        threading.Event().wait(0.2)  # let followers reach do()
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert calls == [1]
+        assert results == ['frame'] * 5
+
+    def test_failed_fetch_is_not_cached(self, revision, fake_service):
+        # Fails the batch and the range-by-range retry
+        fake_service.failures += [Exception("503 Service Unavailable")] * 2
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-c')
+        def load_info():
+            return fetch_sheet_range('Dashboard Info', 'A:C', spreadsheet_id='test', silent=True)
+
+        assert load_info().empty
+        assert load_info()['Rep Name'].tolist() == ['Jake Lynch']
+        assert len(fake_service.calls) == 3
+
+    def test_empty_result_is_not_cached(self, revision):
+        calls = []
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-d')
+        def load_nothing():
+            calls.append(1)
+            return {'deals': pd.DataFrame(), 'items': None}
+
+        load_nothing()
+        load_nothing()
+        assert len(calls) == 2
+
+    def test_falls_back_to_time_buckets(self, revision):
+        revision['revision'] = None
+
+        assert data_cache.cache_token('sheet-a', fallback_ttl=300).startswith('ttl:')
+
+    def test_results_carry_fingerprints(self, revision):
+        @data_cache.revision_cached(spreadsheet_id='sheet-e')
+        def load_tabs():
+            return {'deals': pd.DataFrame({'Amount': [1.0, 2.0]})}
+
+        assert data_cache.FINGERPRINT_ATTR in load_tabs()['deals'].attrs
+
+
+# ============================================================================
+# Frame Fingerprint Tests
+# ============================================================================
+
+class TestFrameFingerprint:
+    """Tests for content fingerprints used as cache keys."""
+
+    @staticmethod
+    def lines(amounts=(100.0, 250.5, 75.25), items=('SKU-1', 'SKU-2', 'SKU-3')):
+        return pd.DataFrame({
+            'Date': pd.to_datetime(['2026-01-05', '2026-02-10', '2026-03-15']),
+            'Item': list(items),
+            'Amount': list(amounts),
+        })
+
+    def test_same_content_same_fingerprint(self):
+        assert data_cache.frame_fingerprint(self.lines()) == data_cache.frame_fingerprint(self.lines())
+
+    def test_value_change_at_same_shape_changes_fingerprint(self):
+        base = data_cache.frame_fingerprint(self.lines())
+        assert data_cache.frame_fingerprint(self.lines(amounts=(100.0, 250.5, 75.5))) != base
+        assert data_cache.frame_fingerprint(self.lines(items=('SKU-1', 'SKU-2', 'SKU-4'))) != base
+
+    def test_fingerprint_survives_pickle(self):
+        import pickle
+        df = self.lines()
+        key = data_cache.frame_fingerprint(df)
+        copy = pickle.loads(pickle.dumps(df))
+        assert copy.attrs[data_cache.FINGERPRINT_ATTR].digest == key
+
+    def test_derived_frames_are_rehashed(self):
+        df = self.lines()
+        data_cache.frame_fingerprint(df)
+        subset = df[df['Amount'] > 80]
+        assert subset.attrs.get(data_cache.FINGERPRINT_ATTR) is None
+        assert data_cache.frame_fingerprint(subset) == data_cache.frame_fingerprint(subset.copy())
+        assert data_cache.frame_fingerprint(subset) != data_cache.frame_fingerprint(df)
+
+    def test_derived_keys(self):
+        base = data_cache.frame_fingerprint(self.lines())
+        assert data_cache.derive_fingerprint(base, 'Boxes', 'All') == \
+            data_cache.derive_fingerprint(base, 'Boxes', 'All')
+        assert data_cache.derive_fingerprint(base, 'Boxes', 'All') != \
+            data_cache.derive_fingerprint(base, 'Boxes', 'SKU-1')
+        assert data_cache.frame_fingerprint(None) == 'none'
+
+
+# ============================================================================
+# Memory Cache Tests
+# ============================================================================
+
+class TestMemoryCache:
+    """Tests for the memory-bounded LRU cache tier."""
+
+    @staticmethod
+    def frame(rows):
+        return pd.DataFrame({'Amount': np.arange(rows, dtype=float)})
+
+    def test_evicts_least_recently_used_past_budget(self):
+        size = estimate_size(self.frame(1000))
+        cache = MemoryCache(budget_bytes=int(size * 2.5))
+        cache.put('loader', 'a', self.frame(1000))
+        cache.put('loader', 'b', self.frame(1000))
+        assert cache.get('loader', 'a')[0]  # a is now most recently used
+        cache.put('loader', 'c', self.frame(1000))
+
+        assert cache.get('loader', 'b') == (False, None)
+        assert cache.get('loader', 'a')[0] and cache.get('loader', 'c')[0]
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 2 and stats['bytes'] <= stats['budget_bytes']
+
+    def test_oversized_value_is_returned_but_not_stored(self):
+        cache = MemoryCache(budget_bytes=1000)
+        assert len(cache.put('loader', 'big', self.frame(10000))) == 10000
+        assert cache.stats()['entries'] == 0 and cache.stats()['rejected'] == 1
+
+    def test_ttl_expires_entries(self, monkeypatch):
+        cache = MemoryCache(budget_bytes=10 ** 6)
+        now = [100.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        cache.put('compute', 'k', 'value', ttl=300)
+        assert cache.get('compute', 'k') == (True, 'value')
+        now[0] += 301
+        assert cache.get('compute', 'k') == (False, None)
+
+    def test_callers_get_copies(self):
+        cache = MemoryCache(budget_bytes=10 ** 6)
+        cache.put('loader', 'k', {'deals': self.frame(3), 'reps': ['Jake Lynch']})
+        _, first = cache.get('loader', 'k')
+        first['deals']['Amount'] = 0.0
+        first['reps'].append('Someone Else')
+
+        _, second = cache.get('loader', 'k')
+        assert second['deals']['Amount'].tolist() == [0.0, 1.0, 2.0]
+        assert second['reps'] == ['Jake Lynch']
+
+    @pytest.mark.parametrize('copy_on_write', [True, False])
+    def test_in_place_edits_stay_off_the_cache(self, monkeypatch, copy_on_write):
+        # pandas 2 without copy-on-write needs deep copies
+        monkeypatch.setattr(memory_cache_module, '_COPY_ON_WRITE', copy_on_write)
+        cache = MemoryCache(budget_bytes=10 ** 6)
+        cache.put('loader', 'k', self.frame(3))
+        _, first = cache.get('loader', 'k')
+        first.loc[first['Amount'] > 0, 'Amount'] = -1.0
+        first.iloc[0, 0] = 99.0
+        first.rename(columns={'Amount': 'Total'}, inplace=True)
+
+        _, second = cache.get('loader', 'k')
+        assert second.columns.tolist() == ['Amount']
+        assert second['Amount'].tolist() == [0.0, 1.0, 2.0]
+
+    def test_memory_cached_keys_frames_by_content(self, memory_cache):
+        calls = []
+        hits = memory_cache.stats()['hits']
+
+        @memory_cached(ttl=300)
+        def total(df, _note=None):
+            calls.append(1)
+            return df['Amount'].sum()
+
+        assert total(self.frame(5), _note='ignored') == 10.0
+        assert total(self.frame(5), _note='different') == 10.0
+        assert len(calls) == 1
+        assert total(self.frame(6)) == 15.0
+        assert len(calls) == 2
+
+        total.clear()
+        total(self.frame(5))
+        assert len(calls) == 3
+        assert memory_cache.stats()['hits'] == hits + 1
+
+    def test_revision_cached_loaders_share_the_budget(self, monkeypatch, memory_cache):
+        monkeypatch.setattr(data_cache, 'PROBE_INTERVAL', 0)
+        monkeypatch.setattr(data_cache, 'probe_spreadsheet_revision', lambda sid: '1@2026-01-05T00:00:00Z')
+
+        @data_cache.revision_cached(spreadsheet_id='sheet-m')
+        def load_tab(name):
+            return self.frame(100)
+
+        load_tab('Deals')
+        load_tab('Deals')
+        entries = memory_cache.entries()
+        assert len(entries) == 1 and entries[0]['hits'] == 1
+        assert entries[0]['namespace'].endswith('load_tab')
+
+
+# ============================================================================
+# Shared Cache Tests
+# ============================================================================
+
+class TestSharedCache:
+    """Tests for the cross-process SQLite cache backend."""
+
+    def test_incomplete_backend_fails_on_creation(self):
+        class NoDelete(CacheBackend):
+            def get(self, namespace, key):
+                return None
+
+            def put(self, namespace, key, value, ttl=None):
+                pass
+
+            def clear(self, namespace=None):
+                pass
+
+        with pytest.raises(TypeError):
+            NoDelete()
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / 'shared' / 'cache.sqlite')
+
+    def replica(self, db_path, budget=10 ** 8):
+        """A MemoryCache as one app process would have it."""
+        return MemoryCache(10 ** 8, backend=SQLiteBackend(db_path, budget))
+
+    def test_round_trip_keeps_frames_and_fingerprints(self, db_path):
+        backend = SQLiteBackend(db_path, 10 ** 8)
+        df = pd.DataFrame({'Rep': ['Jake Lynch'], 'Amount': [1200.0]})
+        key = data_cache.frame_fingerprint(df)
+        backend.put('loader', ('rev:1', ()), {'deals': df})
+
+        value, ttl = backend.get('loader', ('rev:1', ()))
+        assert ttl is None
+        pd.testing.assert_frame_equal(value['deals'], df)
+        assert data_cache.frame_fingerprint(value['deals']) == key
+        assert backend.get('loader', ('rev:2', ())) is None
+
+    def test_expiry_uses_wall_clock(self, db_path, monkeypatch):
+        backend = SQLiteBackend(db_path, 10 ** 8)
+        now = [1_800_000_000.0]
+        monkeypatch.setattr(time, 'time', lambda: now[0])
+        backend.put('compute', 'k', 'value', ttl=300)
+        assert backend.get('compute', 'k') == ('value', 300)
+        now[0] += 301
+        assert backend.get('compute', 'k') is None
+
+    def test_budget_evicts_least_recently_used(self, db_path):
+        blob = 'x' * 10000
+        backend = SQLiteBackend(db_path, 25000)
+        for key in 'abc':
+            backend.put('loader', key, blob)
+        stats = backend.stats()
+        assert stats['entries'] == 2 and stats['bytes'] <= 25000
+        assert backend.get('loader', 'a') is None
+
+    def test_second_replica_reuses_first_replicas_result(self, db_path):
+        first, second = self.replica(db_path), self.replica(db_path)
+        calls = []
+
+        def load():
+            calls.append(1)
+            return pd.DataFrame({'Amount': [1.0, 2.0]})
+
+        first.get_or_load('section', 'qbr', load)
+        value = second.get_or_load('section', 'qbr', load)
+        assert value['Amount'].tolist() == [1.0, 2.0]
+        assert len(calls) == 1
+        assert second.stats()['shared_hits'] == 1
+
+    def test_concurrent_replicas_compute_once(self, db_path):
+        first, second = self.replica(db_path), self.replica(db_path)
+        started = threading.Event()
+        calls = []
+        results = []
+
+        def slow_load():
+            calls.append(1)
+            started.set()
+            threading.Event().wait(0.5)
+            return 'forecast'
+
+        leader = threading.Thread(target=lambda: results.append(first.get_or_load('forecast', 'k', slow_load)))
+        leader.start()
+        started.wait(timeout=5)
+        results.append(second.get_or_load('forecast', 'k', slow_load))
+        leader.join()
+
+        assert calls == [1]
+        assert results == ['forecast', 'forecast']
+
+    def test_clear_reaches_other_replicas(self, db_path):
+        first, second = self.replica(db_path), self.replica(db_path)
+        first.put('loader', 'k', 'value')
+        first.clear()
+        assert second.get('loader', 'k') == (False, None)
+
+
+# ============================================================================
+# Sheet Schema Tests
+# ============================================================================
+
+class TestSheetSchemas:
+    """Tests for schema-driven column typing."""
+
+    def test_coerce_numeric_sheet_formats(self):
+        values = pd.Series(['$1,200.50', '(300.00)', '#N/A', '', ' 42 '])
+        result = coerce_numeric(values)
+
+        assert result.iloc[0] == 1200.5
+        assert result.iloc[1] == -300.0
+        assert pd.isna(result.iloc[2]) and pd.isna(result.iloc[3])
+        assert result.iloc[4] == 42.0
+        assert coerce_numeric(values, fill_value=0).iloc[2] == 0
+
+    def test_coerce_numeric_without_arrow(self, monkeypatch):
+        monkeypatch.setattr(sheet_schemas, 'ARROW_AVAILABLE', False)
+        values = pd.Series(['$1,200.50', '(300.00)', '#REF!', None])
+        assert coerce_numeric(values, fill_value=0).tolist() == [1200.5, -300.0, 0.0, 0.0]
+
+    def test_coerce_numeric_mixed_objects(self):
+        values = pd.Series([1200.5, '$3.00', None], dtype=object)
+        assert coerce_numeric(values, fill_value=0).tolist() == [1200.5, 3.0, 0.0]
+
+    def test_clean_numeric_scalar(self):
+        assert clean_numeric('$1,234.50') == 1234.5
+        assert clean_numeric('(12)') == -12.0
+        assert clean_numeric('#N/A') == 0.0
+        assert clean_numeric(None) == 0.0
+
+    def test_coerce_percent(self):
+        result = coerce_percent(pd.Series(['45%', '0.2', '']))
+        assert result.tolist()[:2] == [0.45, 0.2]
+
+    def test_registered_tab_types(self):
+        df = pd.DataFrame({
+            'Document Number': ['1001', '1002'],
+            'Amount': ['$1,000.00', '(50.00)'],
+            'Date': ['1/5/2026', ''],
+            'Customer': ['Acme', 'Beta'],
+        })
+        result = apply_schema(df, 'Invoice Line Item')
+
+        assert result['Document Number'].tolist() == ['1001', '1002']
+        assert result['Amount'].tolist() == [1000.0, -50.0]
+        assert pd.api.types.is_datetime64_any_dtype(result['Date'])
+        assert pd.isna(result['Date'].iloc[1])
+        assert result['Customer'].tolist() == ['Acme', 'Beta']
+
+    def test_unknown_tab_falls_back_to_inference(self):
+        df = pd.DataFrame({'A': ['1', '2', 'x'], 'B': ['x', 'y', '3']})
+        result = apply_schema(df, 'Some Other Tab')
+
+        assert pd.api.types.is_numeric_dtype(result['A'])
+        assert not pd.api.types.is_numeric_dtype(result['B'])
+
+    def test_so_po_only_pin_identifiers(self):
+        types = resolve_column_types(['PO Date', 'SO Date', 'Quantity on PO', 'SO #', 'PO', 'SO Number'],
+                                     get_schema('_NS_SalesOrders_Data'))
+        assert types == {'PO Date': 'date', 'SO Date': 'date', 'Quantity on PO': 'number',
+                         'SO #': 'text', 'PO': 'text', 'SO Number': 'text'}
+
+    def test_duplicate_headers_kept(self):
+        df = pd.DataFrame([['1', '2']], columns=['Qty', 'Qty'])
+        result = apply_schema(df, 'Invoice Line Item')
+        assert list(result.columns) == ['Qty', 'Qty']
+        assert result.iloc[0].tolist() == [1.0, 2.0]
+
+    def test_compact_dimensions(self):
+        df = pd.DataFrame({
+            'Rep': ['Ann', 'Bob', 'Ann', None] * 25,
+            'Item': [f'SKU-{i}' for i in range(100)],
+            'Amount': np.arange(100.0),
+            'Memo': ['x'] * 100,
+        })
+        result = compact_dimensions(df)
+
+        assert isinstance(result['Rep'].dtype, pd.CategoricalDtype)
+        assert result['Rep'].tolist()[:3] == ['Ann', 'Bob', 'Ann']
+        assert pd.isna(result['Rep'].iloc[3])
+        assert not isinstance(result['Item'].dtype, pd.CategoricalDtype)
+        assert result['Item'].tolist() == df['Item'].tolist()
+        assert result['Amount'].dtype == np.float64
+        assert result['Memo'].dtype == df['Memo'].dtype
+        assert not isinstance(df['Rep'].dtype, pd.CategoricalDtype)  # input untouched
+
+    def test_compact_dimensions_duplicate_headers(self):
+        df = pd.DataFrame([['Acme', 'Acme Corp', 5.0]] * 4, columns=['Customer', 'Customer', 'Amount'])
+        result = compact_dimensions(df)
+
+        assert list(result.columns) == ['Customer', 'Customer', 'Amount']
+        assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in result.dtypes.iloc[:2])
+        assert result.iloc[0].tolist() == ['Acme', 'Acme Corp', 5.0]
+
+    def test_compact_dimensions_groupby(self):
+        df = compact_dimensions(pd.DataFrame({
+            'Item': ['A', 'B', 'A', 'B'] * 5,
+            'Product Type': ['Jar', 'Jar', 'Lid', 'Lid'] * 5,
+            'Amount': [1.0] * 20,
+        }))
+        filtered = df[df['Item'] == 'A']
+        grouped = filtered.groupby(['Item', 'Product Type'], observed=True)['Amount'].sum()
+        assert grouped.to_dict() == {('A', 'Jar'): 5.0, ('A', 'Lid'): 5.0}
+
+
+# ============================================================================
+# Request Scheduler Tests
+# ============================================================================
+
+class FakeResponse(dict):
+    """httplib2.Response: a dict of lower-cased headers with a status."""
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient's HttpError (status on .resp)."""
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.resp = FakeResponse(headers or {})
+        self.resp.status = status
+
+
+class FakeClock:
+    """Monotonic clock advanced by the code under test's sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRequestScheduler:
+    """Tests for request_scheduler."""
+
+    def make_scheduler(self, clock, rate=60, capacity=10):
+        bucket = TokenBucket(rate, capacity=capacity, clock=clock, sleep=clock.sleep)
+        return RequestScheduler('sheets', rate, sleep=clock.sleep, jitter=lambda: 0.5, bucket=bucket)
+
+    def test_bucket_paces_bursts_to_quota(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        # Two from the burst, then one per second
+        assert clock.now == pytest.approx(3.0)
+
+    def test_retries_rate_limits_with_backoff(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock)
+        errors = [FakeHttpError(429), FakeHttpError(503)]
+
+        def flaky():
+            if errors:
+                raise errors.pop(0)
+            return 'values'
+
+        assert scheduler.call(flaky) == 'values'
+        stats = scheduler.stats()
+        assert (stats['requests'], stats['retries'], stats['failures']) == (3, 2, 0)
+        # Backoff of half 1s then half 2s (fixed jitter); the 429 drained the
+        # bucket, so the first retry also waits out the rest of a token
+        assert clock.sleeps == [0.5, pytest.approx(0.5), 1.0]
+
+    def test_honours_retry_after(self):
+        scheduler = self.make_scheduler(FakeClock())
+        assert scheduler.backoff(0, FakeHttpError(429, {'retry-after': '7'})) == 7.0
+
+    def test_non_retryable_errors_raise_immediately(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock)
+        calls = []
+
+        def forbidden():
+            calls.append(1)
+            raise FakeHttpError(403)
+
+        with pytest.raises(FakeHttpError):
+            scheduler.call(forbidden)
+        assert calls == [1] and clock.sleeps == []
+
+    def test_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        scheduler = self.make_scheduler(clock)
+        scheduler.max_retries = 2
+
+        with pytest.raises(FakeHttpError):
+            scheduler.call(lambda: (_ for _ in ()).throw(FakeHttpError(500)))
+        assert scheduler.stats()['requests'] == 3
+
+    def test_failed_tab_is_not_kept_in_registry(self, fake_service):
+        # Fails the batch and the range-by-range retry
+        fake_service.failures += [Exception("503 Service Unavailable")] * 2
+        key = ('Dashboard Info', 'A:C')
+
+        assert fetch_sheet_batch([key], spreadsheet_id='test', silent=True)[key].empty
+        assert len(fetch_sheet_batch([key], spreadsheet_id='test')[key]) == 1
+
+
+# ============================================================================
+# Record / Replay Tests
+# ============================================================================
+
+class TestSheetsReplay:
+    """Tests for sheets_replay cassettes and stand-in clients."""
+
+    @pytest.fixture
+    def cassette_dir(self, tmp_path, fake_service, sheet_tabs):
+        """Record a live (fake) session into a cassette directory."""
+        root = tmp_path / 'cassettes'
+        recorder = Recorder(root)
+        service = recorder.wrap_sheets(fake_service)
+        service.spreadsheets().values().batchGet(
+            spreadsheetId='test', ranges=["'_NS_Invoices_Data'!A1:E103", "'Dashboard Info'!A:C"]
+        ).execute()
+        return root
+
+    def test_replay_matches_live_responses(self, cassette_dir, fake_service):
+        replay = ReplaySession(cassette_dir).sheets_service()
+
+        for a1 in ["'_NS_Invoices_Data'!A:C", "'_NS_Invoices_Data'!B2:B", "'Dashboard Info'!A1:A1"]:
+            live = fake_service.values().get(spreadsheetId='test', range=a1).execute()['values']
+            assert replay.values().get(spreadsheetId='test', range=a1).execute()['values'] == live
+
+    def test_section_load_runs_on_replay(self, cassette_dir, monkeypatch):
+        session = ReplaySession(cassette_dir)
+        monkeypatch.setattr(sheets_ingest, 'get_sheets_service', session.sheets_service)
+        key = ('_NS_Invoices_Data', 'A:Y')
+
+        frame = fetch_sheet_batch([key], spreadsheet_id='test')[key]
+
+        assert frame['Document Number'].tolist() == ['INV-1', 'INV-2']
+        assert frame.columns.tolist() == ['Document Number', 'Status', 'Amount']
+
+    def test_scaling_repeats_data_rows_only(self, cassette_dir):
+        session = ReplaySession(cassette_dir, scale=2.5)
+        values = session.read_range('test', "'_NS_Invoices_Data'!A:A")['values']
+
+        assert values[0] == ['Document Number']
+        assert [row[0] for row in values[1:]] == ['INV-1', 'INV-2', 'INV-1', 'INV-2', 'INV-1']
+        layout = session.sheets_service().get(spreadsheetId='test').execute()
+        assert layout['sheets'][0]['properties']['gridProperties']['rowCount'] == 6
+
+    def test_gspread_and_missing_tabs(self, cassette_dir):
+        session = ReplaySession(cassette_dir)
+        spreadsheet = session.gspread_client().open_by_key('test')
+
+        assert spreadsheet.worksheet('Dashboard Info').get_all_values() == [
+            ['Rep Name', 'Quota'], ['Jake Lynch', '100']
+        ]
+        with pytest.raises(sheets_ingest.gspread.exceptions.WorksheetNotFound):
+            spreadsheet.worksheet('Nope')
+        with pytest.raises(Exception, match='Unable to parse range'):
+            session.read_range('test', "'Nope'!A:Z")
+
+    def test_cassette_round_trip(self, tmp_path):
+        cassette = SheetsCassette('sheet-id')
+        cassette.record('HB NCR', 'A2:C3', [['NCR', 'Qty'], ['1', '', '5']])
+        cassette.save(tmp_path / 'c.json.gz')
+
+        loaded = SheetsCassette.load(tmp_path / 'c.json.gz')
+        assert loaded.values('HB NCR', 'A2:O') == [['NCR', 'Qty'], ['1', '', '5']]
+        assert loaded.header_rows == {'HB NCR': 2}
+
+
+# ============================================================================
+# Synthetic Data Tests
+# ============================================================================
+
+class TestSyntheticData:
+    """Tests for the synthetic_data workbook generator."""
+
+    @pytest.fixture
+    def workbook(self):
+        return SyntheticWorkbook(scale=0.05, seed=7, as_of='2026-06-30')
+
+    def test_every_tab_is_rectangular(self, workbook):
+        for tab, (_, header_rows) in SYNTHETIC_TABS.items():
+            grid = workbook.grid(tab)
+            assert len(grid) > header_rows, tab
+            assert len({len(row) for row in grid}) == 1, tab
+
+    def test_references_resolve(self, workbook):
+        orders = set(workbook.frame('_NS_SalesOrders_Data')['Document Number'])
+        invoices = workbook.frame('_NS_Invoices_Data')
+        skus = set(workbook.frame('Raw_Items')['Item'])
+
+        assert set(invoices['Created From'].str.replace('Sales Order #', '')) <= orders
+        assert set(workbook.frame('Invoice Line Item')['Document Number']) == set(invoices['Document Number'])
+        assert set(workbook.frame('Sales Order Line Item')['Document Number']) == orders
+        assert set(workbook.frame('Invoice Line Item')['Item']) <= skus
+        assert set(workbook.frame('Raw_Inventory')['Item']) <= skus
+        assert set(workbook.frame('Non-Conformance Details')['Sales Order']) <= orders
+        assert set(workbook.frame('Deals')['Netsuite SO#']) - {''} <= orders
+        assert set(workbook.frame('Deals Line Item')['Record ID']) <= set(workbook.frame('Deals')['Record ID'])
+
+    def test_invoice_totals_match_lines(self, workbook):
+        invoices = workbook.frame('_NS_Invoices_Data')
+        lines = workbook.frame('Invoice Line Item')
+        line_totals = coerce_numeric(lines['Amount']).groupby(lines['Document Number']).sum()
+        totals = coerce_numeric(invoices['Amount (Transaction Total)']) - coerce_numeric(
+            invoices['Amount (Transaction Tax Total)'])
+
+        assert np.allclose(line_totals.reindex(invoices['Document Number']).to_numpy(), totals.to_numpy())
+
+    def test_positional_layouts(self, workbook):
+        invoices = workbook.frame('_NS_Invoices_Data').columns
+        orders = workbook.frame('_NS_SalesOrders_Data').columns
+        ncs = workbook.frame('Non-Conformance Details').columns
+
+        assert [invoices[i] for i in (0, 4, 10, 19, 20, 24)] == [
+            'Document Number', 'Created From', 'Amount (Transaction Total)',
+            'Corrected Customer Name', 'Rep Master', 'Product Type']
+        assert [orders[i] for i in (8, 11, 12, 28, 32)] == [
+            'Order Start Date', 'Customer Promise Date', 'Projected Date',
+            'Location (no hierarchy)', 'Updated Status']
+        assert [ncs[i] for i in (5, 8, 15, 21)] == [
+            'Sales Order', 'Issue Type', 'Total Quantity Affected', 'Corrected Customer Name']
+
+    def test_forecast_parses(self, workbook):
+        from src.Rev_Ops_Playground import parse_forecast_sheet
+        grid = workbook.grid('2026 Forecast')
+
+        parsed = parse_forecast_sheet(pd.DataFrame(grid[1:], columns=grid[0]))
+
+        assert len(parsed) == 6 * 10
+        total = parsed[(parsed['Pipeline'] == 'Total') & (parsed['Category'] == 'Total')]['Annual_Total'].iloc[0]
+        categories = parsed[(parsed['Pipeline'] != 'Total') & (parsed['Category'] != 'Total')]
+        assert total == pytest.approx(categories['Annual_Total'].sum())
+
+    def test_snapshot_invoices_use_categoricals(self, workbook):
+        from src.q1_revenue_snapshot import process_invoices
+        invoices = process_invoices(workbook.frame('_NS_Invoices_Data'))
+        rep = invoices['Sales Rep'].iloc[0]
+
+        assert isinstance(invoices['Rep Master'].dtype, pd.CategoricalDtype)
+        assert isinstance(invoices['Sales Rep'].dtype, pd.CategoricalDtype)
+        rep_invoices = invoices[invoices['Sales Rep'] == rep]
+        by_customer = rep_invoices.groupby('Customer', observed=True)['Amount'].sum()
+        assert len(by_customer) == rep_invoices['Customer'].nunique()
+        assert by_customer.sum() == pytest.approx(rep_invoices['Amount'].sum())
+
+    def test_scales_and_is_deterministic(self, workbook):
+        larger = SyntheticWorkbook(scale=0.1, seed=7, as_of='2026-06-30')
+
+        assert len(larger.grid('_NS_SalesOrders_Data')) - 1 == 2 * (len(workbook.grid('_NS_SalesOrders_Data')) - 1)
+        assert SyntheticWorkbook(scale=0.05, seed=7, as_of='2026-06-30').grid('Deals') == workbook.grid('Deals')
+
+    def test_cassette_serves_loaders(self, workbook, tmp_path, monkeypatch):
+        workbook.write_cassette(tmp_path, spreadsheet_id='test', tabs=['_NS_Invoices_Data', 'Deals Line Item'])
+        monkeypatch.setattr(sheets_ingest, 'get_sheets_service', ReplaySession(tmp_path).sheets_service)
+        keys = [('_NS_Invoices_Data', 'A:U'), ('Deals Line Item', 'A2:V')]
+
+        frames = fetch_sheet_batch(keys, spreadsheet_id='test')
+
+        assert len(frames[keys[0]]) == len(workbook.frame('_NS_Invoices_Data'))
+        assert frames[keys[1]].columns[0] == 'Record ID'
+        assert frames[keys[1]].columns[-1] == 'Pending Approval Date'
+
+
+# ============================================================================
+# Client Pool Tests
+# ============================================================================
+
+class FakeCredentials:
+    """Credentials that count refreshes instead of calling Google."""
+
+    def __init__(self):
+        self.valid = False
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.valid = True
+
+    def before_request(self, request, method, url, headers):
+        pass
+
+
+class TestClientPool:
+    """Tests for sheets_client.GoogleClientPool."""
+
+    def test_one_connection_per_thread(self):
+        pool = GoogleClientPool(FakeCredentials())
+        main_http = pool._thread_http()
+        seen = []
+
+        thread = threading.Thread(target=lambda: seen.append(pool._thread_http()))
+        thread.start()
+        thread.join()
+
+        assert pool._thread_http() is main_http
+        assert seen[0] is not main_http
+
+    def test_token_refreshed_once(self):
+        credentials = FakeCredentials()
+        pool = GoogleClientPool(credentials)
+
+        threads = [threading.Thread(target=pool.ensure_token) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert credentials.refreshes == 1
+
+
+# ============================================================================
+# Cache Warmer Tests
+# ============================================================================
+
+class TestCacheWarmer:
+    """Tests for background cache warm-up."""
+
+    def test_run_once_records_each_task(self):
+        calls = []
+
+        def failing():
+            calls.append('broken')
+            raise RuntimeError("sheet missing")
+
+        warmer = CacheWarmer({
+            'first': ('First', lambda: calls.append('first') or '3 tabs'),
+            'broken': ('Broken', failing),
+            'last': ('Last', lambda: calls.append('last')),
+        }, interval=0)
+        warmer.run_once()
+
+        assert calls == ['first', 'broken', 'last']
+        status = {row['key']: row for row in warmer.status()}
+        assert status['first']['state'] == 'done' and status['first']['detail'] == '3 tabs'
+        assert status['broken']['state'] == 'failed' and 'sheet missing' in status['broken']['error']
+        assert status['last']['runs'] == 1
+        summary = warmer.summary()
+        assert summary['runs'] == 1 and not summary['running']
+        assert summary['last_run']['failed'] == 1
+
+    def test_trigger_starts_another_run(self):
+        runs = []
+        warmer = CacheWarmer({'task': ('Task', lambda: runs.append(1))}, interval=0)
+        warmer.start()
+
+        deadline = time.monotonic() + 5
+        while warmer.summary()['runs'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        warmer.trigger()
+        while warmer.summary()['runs'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(runs) == 2
+        assert warmer.summary()['next_run'] is None  # no schedule with interval 0
+
+
+# ============================================================================
+# Run Tests
+# ============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
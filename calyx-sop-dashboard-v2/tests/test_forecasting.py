@@ -0,0 +1,427 @@
+"""
+Unit Tests for the forecasting models
+Small synthetic monthly series, no network or credentials
+
+Author: Xander @ Calyx Containers
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+import tempfile
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import forecasting_models
+from src.forecasting_models import _aic_lower_bound, _fit_arima_candidate, auto_arima_params, forecast_arima
+from src.forecasting_models import _ets_fit, _to_wide, forecast_batch, generate_forecast
+from src.forecasting_models import RecursiveFeatureState, create_ml_features, forecast_ml
+from src.forecasting_models import forecast_exponential_smoothing
+from src import forecast_cache
+from src.forecast_cache import ForecastCache, cached_forecast, forecast_key, pack_result, unpack_result
+from src.forecast_cache import series_state_key
+from src.shared_cache import SQLiteBackend
+from statsmodels.tsa.holtwinters import Holt, SimpleExpSmoothing
+
+
+@pytest.fixture(autouse=True)
+def no_forecast_cache(monkeypatch):
+    """Fit every forecast (tests that use the cache point it at a temp dir)."""
+    monkeypatch.setenv('CALYX_FORECAST_CACHE', '0')
+
+
+@pytest.fixture
+def monthly_series():
+    """Four years of trending, seasonal monthly demand."""
+    rng = np.random.default_rng(0)
+    t = np.arange(48)
+    values = 100 + 2 * t + 20 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 5, 48)
+    return pd.Series(values, index=pd.date_range('2022-01-01', periods=48, freq='MS'))
+
+
+# ============================================================================
+# ARIMA Order Search Tests
+# ============================================================================
+
+class TestArimaSearch:
+    """Tests for auto_arima_params / forecast_arima."""
+
+    def test_aic_lower_bound_from_nesting_models(self):
+        results = {
+            (2, 1, 2): {'aic': 100.0, 'converged': True},
+            (1, 1, 2): {'aic': 99.0, 'converged': True},
+            (3, 1, 3): {'aic': 90.0, 'converged': False},  # not at its MLE: no bound
+            (2, 0, 2): {'aic': 50.0, 'converged': True},   # different d: no bound
+        }
+        assert _aic_lower_bound((1, 1, 1), results) == 97.0
+        assert _aic_lower_bound((0, 1, 0), results) == 93.0
+        assert _aic_lower_bound((2, 1, 2), results) == -np.inf
+
+    def test_grid_matches_exhaustive_search(self, monthly_series):
+        orders = [(p, d, q) for p in range(3) for d in range(2) for q in range(3)]
+        fits = [_fit_arima_candidate(monthly_series, order, (0, 0, 0, 0), 100) for order in orders]
+        best_aic = min(fit['aic'] for fit in fits if fit is not None)
+
+        params = auto_arima_params(monthly_series, seasonal=False, max_p=2, max_q=2, max_d=1,
+                                   method='grid', n_jobs=1)
+
+        assert params['aic'] == pytest.approx(best_aic)
+        assert params['fits'] + params['pruned'] == len(orders)
+        assert params['pruned'] > 0
+
+    def test_stepwise_returns_fitted_model(self, monthly_series):
+        params = auto_arima_params(monthly_series, seasonal=False, n_jobs=1, return_model=True)
+
+        model = params['model']
+        assert model.aic == pytest.approx(params['aic'])
+        assert model.model.order == params['order']
+        assert len(model.forecast(6)) == 6
+
+    def test_pool_search_matches_in_process(self, monthly_series):
+        kwargs = dict(seasonal=False, max_p=2, max_q=2, max_d=1, return_model=True)
+        serial = auto_arima_params(monthly_series, n_jobs=1, **kwargs)
+        pooled = auto_arima_params(monthly_series, n_jobs=2, **kwargs)
+
+        assert pooled['order'] == serial['order']
+        assert pooled['model'].aic == pytest.approx(serial['aic'])
+
+    def test_unknown_method(self, monthly_series):
+        with pytest.raises(ValueError):
+            auto_arima_params(monthly_series, method='exhaustive')
+
+    def test_forecast_arima_reuses_search_fit(self, monthly_series, monkeypatch):
+        fit_calls = []
+        original = forecasting_models._arima_model
+
+        def recording_model(*args):
+            model = original(*args)
+            fit = model.fit
+            model.fit = lambda **kwargs: fit_calls.append(kwargs) or fit(**kwargs)
+            return model
+
+        monkeypatch.setenv('CALYX_FORECAST_WORKERS', '1')
+        monkeypatch.setattr(forecasting_models, '_arima_model', recording_model)
+        result = forecast_arima(monthly_series, horizon=6)
+
+        assert len(result.forecast) == 6
+        assert (result.forecast >= 0).all()
+        # Every fit was a search candidate or a warm-started finish, never a cold refit
+        assert all(call['maxiter'] == 100 or 'start_params' in call for call in fit_calls)
+
+
+@pytest.fixture
+def long_history(monthly_series):
+    """Three series in long format: a full one, a late starter, and one with a gap."""
+    late = monthly_series.iloc[30:] * 0.5
+    gappy = monthly_series.drop(monthly_series.index[40])
+    return pd.concat([
+        pd.DataFrame({'series_id': name, 'period': s.index, 'value': s.to_numpy()})
+        for name, s in [('full', monthly_series), ('late', late), ('gappy', gappy)]
+    ], ignore_index=True)
+
+
+# ============================================================================
+# Batch Forecast Tests
+# ============================================================================
+
+class TestBatchForecast:
+    """Tests for forecast_batch and the vectorized models."""
+
+    def test_long_to_wide(self, long_history):
+        wide = _to_wide(long_history, 'series_id', 'period', 'value')
+
+        assert wide.shape == (48, 3)
+        assert wide['late'].isna().sum() == 30
+        assert wide['gappy'].iloc[40] == 0
+
+    def test_ses_matches_statsmodels(self, monthly_series):
+        level, trend, _, _, _ = _ets_fit(monthly_series.to_numpy().reshape(-1, 1), np.array([0.3]))
+        expected = SimpleExpSmoothing(monthly_series, initialization_method='known',
+                                      initial_level=monthly_series.iloc[0]).fit(smoothing_level=0.3, optimized=False)
+
+        assert level[0] == pytest.approx(expected.forecast(1).iloc[0])
+        assert trend[0] == 0
+
+    def test_damped_holt_matches_statsmodels(self, monthly_series):
+        level, trend, _, _, _ = _ets_fit(monthly_series.to_numpy().reshape(-1, 1),
+                                         np.array([0.4]), np.array([0.2]), phi=0.9)
+        expected = Holt(monthly_series, damped_trend=True, initialization_method='known',
+                        initial_level=monthly_series.iloc[0], initial_trend=0.0).fit(
+            smoothing_level=0.4, smoothing_trend=0.2, damping_trend=0.9, optimized=False)
+
+        assert level[0] + 0.9 * trend[0] == pytest.approx(expected.forecast(1).iloc[0])
+
+    def test_vectorized_matches_single_series(self, long_history, monthly_series):
+        result = forecast_batch(long_history, model='ses', horizon=6)
+        late = generate_forecast(monthly_series.iloc[30:] * 0.5, model='ses', horizon=6)
+
+        assert len(result) == 18
+        assert list(result.columns) == ['series_id', 'period', 'forecast', 'lower', 'upper', 'model']
+        np.testing.assert_allclose(result.loc[result['series_id'] == 'late', 'forecast'], late.forecast)
+        assert (result['lower'] <= result['forecast']).all() and (result['forecast'] <= result['upper']).all()
+
+    def test_seasonal_naive(self, long_history, monthly_series):
+        result = forecast_batch(long_history.query("series_id != 'late' or period >= '2025-08-01'"),
+                                model='seasonal_naive', horizon=3)
+        full = result[result['series_id'] == 'full']
+        short = result[result['series_id'] == 'late']
+
+        np.testing.assert_allclose(full['forecast'], monthly_series.iloc[-12:-9])
+        # Less than a season of history: repeats the last value
+        assert (short['forecast'] == monthly_series.iloc[-1] * 0.5).all()
+        assert full['period'].iloc[0] == pd.Timestamp('2026-01-01')
+
+    def test_pooled_model_matches_generate_forecast(self, long_history, monthly_series):
+        result = forecast_batch(long_history, model='exponential_smoothing', horizon=6, n_jobs=1)
+        expected = generate_forecast(monthly_series, model='exponential_smoothing', horizon=6)
+
+        np.testing.assert_allclose(result.loc[result['series_id'] == 'full', 'forecast'], expected.forecast)
+        assert result.attrs['failed'] == {}
+
+    def test_failures_are_reported(self, long_history, monkeypatch):
+        original = forecasting_models.generate_forecast
+
+        def flaky(series, **kwargs):
+            if series.index[0].year > 2022:
+                raise ValueError('too short')
+            return original(series, **kwargs)
+
+        monkeypatch.setattr(forecasting_models, 'generate_forecast', flaky)
+        result = forecast_batch(long_history, model='exponential_smoothing', horizon=3, n_jobs=1)
+
+        assert set(result['series_id']) == {'full', 'gappy'}
+        assert result.attrs['failed'] == {'late': 'too short'}
+
+    def test_unknown_model(self, long_history):
+        with pytest.raises(ValueError):
+            forecast_batch(long_history, model='prophet')
+
+
+# ============================================================================
+# Recursive ML Feature Tests
+# ============================================================================
+
+class TestRecursiveFeatures:
+    """Tests for RecursiveFeatureState / forecast_ml feature modes."""
+
+    def test_features_match_rebuilt_features(self, monthly_series):
+        lags, windows = [1, 2, 3, 6, 12], [3, 6, 12]
+        feature_cols = [c for c in create_ml_features(monthly_series, lags, windows).columns if c != 'value']
+        state = RecursiveFeatureState(monthly_series, lags, windows)
+        current = monthly_series.copy()
+
+        for value in [120.0, 0.0, 0.0, 95.5, 130.25]:
+            expected = create_ml_features(current, lags, windows)[feature_cols].iloc[-1:].values
+            np.testing.assert_allclose(state.features(feature_cols), expected, rtol=1e-12, atol=1e-9)
+
+            date = current.index[-1] + pd.DateOffset(months=1)
+            current = pd.concat([current, pd.Series([value], index=[date])])
+            state.append(value, date)
+
+    def test_short_history_gives_nan(self):
+        series = pd.Series([1.0, 2.0, 3.0], index=pd.date_range('2024-01-01', periods=3, freq='MS'))
+        state = RecursiveFeatureState(series, [1, 6], [3])
+        cols = ['lag_1', 'lag_6', 'rolling_mean_3', 'trend']
+        features = dict(zip(cols, state.features(cols)[0]))
+
+        assert features['lag_1'] == 2.0
+        assert np.isnan(features['lag_6']) and np.isnan(features['rolling_mean_3'])
+        assert features['trend'] == 2
+
+    @pytest.mark.parametrize('model_type', ['random_forest', 'gradient_boosting'])
+    def test_forecasts_identical_to_rebuild(self, monthly_series, model_type):
+        kwargs = dict(horizon=18, model_type=model_type, n_estimators=20)
+        rebuilt = forecast_ml(monthly_series, feature_mode='rebuild', **kwargs)
+        incremental = forecast_ml(monthly_series, feature_mode='incremental', **kwargs)
+
+        np.testing.assert_array_equal(incremental.forecast.values, rebuilt.forecast.values)
+        assert incremental.forecast.index.equals(rebuilt.forecast.index)
+
+    def test_unknown_feature_mode(self, monthly_series):
+        with pytest.raises(ValueError):
+            forecast_ml(monthly_series, feature_mode='cached')
+
+
+# ============================================================================
+# Forecast Cache Tests
+# ============================================================================
+
+class TestForecastCache:
+    """Tests for forecast_cache."""
+
+    def test_key_follows_content_and_settings(self, monthly_series):
+        key = forecast_key(monthly_series, 'arima', 12, {})
+
+        assert forecast_key(monthly_series.copy().rename('Demand'), 'arima', 12, {}) == key
+        assert forecast_key(monthly_series + 1, 'arima', 12, {}) != key
+        assert forecast_key(monthly_series.shift(1, freq='MS'), 'arima', 12, {}) != key
+        assert forecast_key(monthly_series, 'exponential_smoothing', 12, {}) != key
+        assert forecast_key(monthly_series, 'arima', 6, {}) != key
+        assert forecast_key(monthly_series, 'arima', 12, {'search_method': 'grid'}) != key
+
+    def test_key_and_state_follow_model_code(self, monthly_series, monkeypatch):
+        key = forecast_key(monthly_series, 'arima', 12, {})
+        state = series_state_key(monthly_series, 'arima', {}, 'SKU-1')
+        monkeypatch.setattr(forecast_cache, 'MODEL_CODE_HASH', 'edited')
+
+        assert forecast_key(monthly_series, 'arima', 12, {}) != key
+        assert series_state_key(monthly_series, 'arima', {}, 'SKU-1') != state
+
+    def test_unnamed_series_get_their_own_state(self, monthly_series):
+        key = series_state_key(monthly_series.iloc[:-2], 'arima', {})
+
+        assert series_state_key(monthly_series, 'arima', {}) == key  # same series, two new periods
+        assert series_state_key(monthly_series * 2, 'arima', {}) != key
+        assert series_state_key(monthly_series.rename('SKU-1'), 'arima', {}) != key
+
+    def test_default_location_is_app_cache_dir(self, monkeypatch):
+        opened = []
+        monkeypatch.delenv('CALYX_FORECAST_CACHE')
+        monkeypatch.delenv('CALYX_SHARED_CACHE', raising=False)
+        monkeypatch.setattr(forecast_cache, '_create_forecast_cache', lambda path, *args: opened.append(path))
+        forecast_cache.get_forecast_cache()
+
+        assert opened == [str(forecast_cache.DEFAULT_FORECAST_CACHE_PATH)]
+        assert not opened[0].startswith(tempfile.gettempdir())
+
+    def test_pack_round_trip(self, monthly_series):
+        result = forecast_ml(monthly_series, horizon=6, n_estimators=10)
+        restored = unpack_result(pack_result(result))
+
+        pd.testing.assert_series_equal(restored.forecast, result.forecast)
+        pd.testing.assert_series_equal(restored.confidence_lower, result.confidence_lower)
+        pd.testing.assert_frame_equal(restored.feature_importance.reset_index(drop=True),
+                                      result.feature_importance.reset_index(drop=True))
+        assert restored.metrics == pytest.approx(result.metrics)
+        assert restored.parameters == result.parameters and restored.model_name == result.model_name
+
+    def test_fits_once_and_persists(self, monthly_series, tmp_path):
+        path = str(tmp_path / 'forecasts.sqlite')
+        fits = []
+
+        def fit():
+            fits.append(1)
+            return generate_forecast(monthly_series, model='ses', horizon=6)
+
+        first = ForecastCache(SQLiteBackend(path, 1 << 20)).get_or_fit(monthly_series, 'ses', 6, {}, fit)
+        reopened = ForecastCache(SQLiteBackend(path, 1 << 20))
+        second = reopened.get_or_fit(monthly_series, 'ses', 6, {}, fit)
+
+        assert len(fits) == 1
+        pd.testing.assert_series_equal(second.forecast, first.forecast)
+        assert reopened.stats()['hits'] == 1 and reopened.stats()['entries'] == 1
+
+    def test_cached_forecast_and_batch_reuse(self, long_history, monthly_series, tmp_path, monkeypatch):
+        monkeypatch.setenv('CALYX_FORECAST_CACHE', str(tmp_path))
+        first = cached_forecast(monthly_series, model='exponential_smoothing', horizon=6)
+        batch = forecast_batch(long_history, model='exponential_smoothing', horizon=6, n_jobs=1)
+
+        def no_refit(*args, **kwargs):
+            raise AssertionError('refit')
+
+        monkeypatch.setattr(forecasting_models, 'generate_forecast', no_refit)
+        again = forecast_batch(long_history, model='exponential_smoothing', horizon=6, n_jobs=1)
+
+        pd.testing.assert_frame_equal(again, batch)
+        np.testing.assert_allclose(batch.loc[batch['series_id'] == 'full', 'forecast'], first.forecast)
+
+
+# ============================================================================
+# Warm Start Tests
+# ============================================================================
+
+class TestWarmStart:
+    """Tests for warm-started refits (forecasting_models / forecast_cache)."""
+
+    def test_ets_warm_start(self, monthly_series):
+        previous = forecast_exponential_smoothing(monthly_series.iloc[:-1], horizon=6, seasonal=True)
+        cold = forecast_exponential_smoothing(monthly_series, horizon=6, seasonal=True)
+        warm = forecast_exponential_smoothing(monthly_series, horizon=6, seasonal=True,
+                                              warm_start=previous.parameters)
+
+        assert warm.parameters['warm_started'] and not cold.parameters['warm_started']
+        np.testing.assert_allclose(warm.forecast, cold.forecast, rtol=0.02)
+
+    def test_ets_structure_change_fits_cold(self, monthly_series):
+        previous = forecast_exponential_smoothing(monthly_series.iloc[:-1], horizon=6, seasonal=True)
+        result = forecast_exponential_smoothing(monthly_series, horizon=6, seasonal=False,
+                                                warm_start=previous.parameters)
+
+        assert not result.parameters['warm_started']
+
+    def test_arima_warm_start_skips_search(self, monthly_series, monkeypatch):
+        monkeypatch.setenv('CALYX_FORECAST_WORKERS', '1')
+        previous = forecast_arima(monthly_series.iloc[:-1], horizon=6)
+
+        def no_search(*args, **kwargs):
+            raise AssertionError('searched')
+
+        monkeypatch.setattr(forecasting_models, 'auto_arima_params', no_search)
+        warm = forecast_arima(monthly_series, horizon=6, warm_start=previous.parameters)
+
+        assert warm.parameters['order'] == previous.parameters['order']
+        assert warm.parameters['warm_started']
+        assert len(warm.forecast) == 6
+
+    @pytest.mark.parametrize('change', ['became_seasonal', 'reuse_exhausted'])
+    def test_arima_warm_start_searches_again(self, monthly_series, monkeypatch, change):
+        monkeypatch.setenv('CALYX_FORECAST_WORKERS', '1')
+        if change == 'became_seasonal':
+            # Under two years nothing is seasonal; at 25 months the pattern shows
+            previous, current = monthly_series.iloc[:22], monthly_series.iloc[:25]
+        else:
+            monkeypatch.setattr(forecasting_models, 'ARIMA_ORDER_REUSE_PERIODS', 1)
+            previous, current = monthly_series.iloc[:-2], monthly_series
+        earlier = forecast_arima(previous, horizon=6)
+
+        searches = []
+        original = forecasting_models.auto_arima_params
+
+        def recording(*args, **kwargs):
+            searches.append(kwargs.get('seasonal'))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(forecasting_models, 'auto_arima_params', recording)
+        result = forecast_arima(current, horizon=6, warm_start=earlier.parameters)
+
+        assert len(searches) == 1 and not result.parameters['warm_started']
+        assert result.parameters['order_search']['periods'] == len(current)
+        if change == 'became_seasonal':
+            assert earlier.parameters['seasonal_order'][3] == 0
+            assert searches == [True] and result.parameters['seasonal_order'][3] == 12
+
+    def test_cache_accepts_only_extended_history(self, monthly_series, tmp_path):
+        cache = ForecastCache(SQLiteBackend(str(tmp_path / 'forecasts.sqlite'), 1 << 20), warm_start_periods=2)
+        history = monthly_series.iloc[:-3].rename('SKU-1')
+        cache.remember(history, 'exponential_smoothing', {},
+                       generate_forecast(history, model='exponential_smoothing', horizon=3))
+
+        assert cache.warm_start(monthly_series.iloc[:-1].rename('SKU-1'), 'exponential_smoothing', {}) is not None
+        assert cache.warm_start(monthly_series.rename('SKU-1'), 'exponential_smoothing', {}) is None  # 3 new
+        assert cache.warm_start(monthly_series.iloc[:-1].rename('SKU-2'), 'exponential_smoothing', {}) is None
+        assert cache.warm_start(monthly_series.iloc[:-1].rename('SKU-1'), 'arima', {}) is None
+        revised = monthly_series.iloc[:-1].rename('SKU-1').copy()
+        revised.iloc[5] += 1
+        assert cache.warm_start(revised, 'exponential_smoothing', {}) is None
+
+    def test_batch_refresh_warm_starts(self, long_history, tmp_path, monkeypatch):
+        monkeypatch.setenv('CALYX_FORECAST_CACHE', str(tmp_path))
+        closed = long_history[long_history['period'] < '2025-12-01']
+        forecast_batch(closed, model='exponential_smoothing', horizon=3, n_jobs=1)
+
+        warm_starts = []
+        original = forecasting_models.generate_forecast
+
+        def recording(series, **kwargs):
+            warm_starts.append(kwargs.get('warm_start') is not None)
+            return original(series, **kwargs)
+
+        monkeypatch.setattr(forecasting_models, 'generate_forecast', recording)
+        result = forecast_batch(long_history, model='exponential_smoothing', horizon=3, n_jobs=1)
+
+        assert warm_starts == [True, True, True]
+        assert result['period'].min() == pd.Timestamp('2026-01-01')
+